@@ -5,27 +5,93 @@ Mock 또는 실제 분석 DB와 연동하여 React UI에 데이터 제공
 """
 
 from fastapi import FastAPI, Query, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from datetime import date, datetime, timedelta
-from typing import Optional, List, Dict, Any
-import sqlite3
+from typing import Optional, List, Dict, Any, Sequence
+import asyncio
 import pandas as pd
-import json
 from pathlib import Path
+import sys
+import threading
 import logging
 
+# 프로젝트 경로 설정
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.utils.org_rollup import RollupNotBuiltError, get_rollup_cube, stored_generation
+from src.utils.response_cache import ResponseCache, ResponseCacheMiddleware
+from src.utils.sqlite_pool import ORJSON_AVAILABLE, SQLiteReadPool, loads_json
+
+if ORJSON_AVAILABLE:
+    from fastapi.responses import ORJSONResponse as APIResponse
+else:
+    APIResponse = JSONResponse
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# FastAPI 앱 초기화
+# FastAPI 앱 초기화 (orjson이 있으면 응답을 orjson으로 인코딩)
 app = FastAPI(
     title="Sambio Analytics API",
     description="조직 분석 대시보드 API",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=APIResponse
 )
 
+# DB 경로 설정
+# Mock DB를 기본으로 사용 (실제 분석 완료 후 변경)
+DB_PATH = project_root / 'data' / 'sambio_analytics_mock.db'
+# DB_PATH = project_root / 'data' / 'sambio_analytics.db'  # 실제 분석 DB
+
+_db_pool: Optional[SQLiteReadPool] = None
+_db_pool_lock = threading.Lock()
+
+
+def get_db_pool() -> SQLiteReadPool:
+    """읽기 전용 DB 연결 풀 (첫 요청에서 생성)"""
+    global _db_pool
+    if not DB_PATH.exists():
+        raise HTTPException(status_code=500, detail=f"Database not found: {DB_PATH}")
+    with _db_pool_lock:
+        if _db_pool is None or _db_pool.db_path != DB_PATH:
+            _db_pool = SQLiteReadPool(DB_PATH)
+        return _db_pool
+
+
+async def fetch_all(query: str, params: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+    """스레드 풀에서 쿼리 실행 (이벤트 루프를 막지 않음)"""
+    return await run_in_threadpool(get_db_pool().fetch_all, query, params)
+
+
+async def fetch_one(query: str, params: Sequence[Any] = ()) -> Optional[Dict[str, Any]]:
+    """스레드 풀에서 쿼리 실행 후 첫 레코드 반환"""
+    return await run_in_threadpool(get_db_pool().fetch_one, query, params)
+
+
+def analytics_generation() -> int:
+    """분석 DB 세대 번호 (배치 분석이 끝날 때마다 증가, 롤업이 없으면 0)"""
+    with get_db_pool().connection() as conn:
+        return stored_generation(conn) or 0
+
+
+def parse_json_fields(records: List[Dict[str, Any]], fields: Sequence[str], default_factory=dict):
+    """레코드의 JSON 문자열 컬럼을 파싱 (잘못된 값은 default_factory() 값)"""
+    for record in records:
+        for field in fields:
+            if record.get(field):
+                record[field] = loads_json(record[field], default_factory())
+    return records
+
+
+# 응답 캐시: 분석 DB 세대가 바뀌면 무효화, ETag 조건부 요청 지원
+# (캐시 응답에도 CORS 헤더가 붙도록 CORS 미들웨어보다 먼저 등록해 안쪽에 배치)
+response_cache = ResponseCache(analytics_generation)
+app.add_middleware(ResponseCacheMiddleware, cache=response_cache, exclude_paths=('/api/status',))
+
 # CORS 설정
 app.add_middleware(
     CORSMiddleware,
@@ -35,18 +101,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# DB 경로 설정
-project_root = Path(__file__).parent.parent
-# Mock DB를 기본으로 사용 (실제 분석 완료 후 변경)
-DB_PATH = project_root / 'data' / 'sambio_analytics_mock.db'
-# DB_PATH = project_root / 'data' / 'sambio_analytics.db'  # 실제 분석 DB
-
-
-def get_db_connection():
-    """DB 연결 생성"""
-    if not DB_PATH.exists():
-        raise HTTPException(status_code=500, detail=f"Database not found: {DB_PATH}")
-    return sqlite3.connect(str(DB_PATH))
+@app.on_event("shutdown")
+def close_db_pool():
+    """서버 종료 시 연결 풀 정리"""
+    if _db_pool is not None:
+        _db_pool.close()
 
 
 @app.get("/")
@@ -61,53 +120,155 @@ async def root():
     }
 
 
+def _headcount(employee_days: float, days: float, single_day: bool):
+    """일평균 인원 (하루 조회면 정수 인원)"""
+    value = employee_days / days if days else 0
+    return int(round(value)) if single_day else round(float(value), 1)
+
+
+def _json_safe(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """NaN 값을 None으로 변환"""
+    return [{k: (None if isinstance(v, float) and pd.isna(v) else v) for k, v in record.items()}
+            for record in records]
+
+
+def rollup_summaries(level: str, start_date: date, end_date: Optional[date] = None,
+                     parent_id: str = None) -> pd.DataFrame:
+    """
+    조직 롤업 큐브에서 조직별 기간 요약 조회 (daily_analysis를 스캔하지 않음)
+    
+    grade_distribution(직급별 일평균 인원)과 efficiency_by_grade(직급별 평균 효율) 컬럼을 포함합니다.
+    
+    Raises:
+        RollupNotBuiltError: 롤업이 아직 없음 (배치 분석에서만 생성)
+    """
+    cube = get_rollup_cube(DB_PATH, get_db_pool())
+    end_date = end_date or start_date
+    single_day = end_date == start_date
+    orgs = cube.query(level, start_date, end_date, parent_id=parent_id)
+    grades = cube.query(level, start_date, end_date, parent_id=parent_id, by_grade=True)
+    grades = grades[grades['job_grade'] != ''].merge(
+        orgs[['org_id', 'days']], on='org_id', suffixes=('', '_org'))
+    
+    grade_distribution = {org_id: {} for org_id in orgs['org_id']}
+    efficiency_by_grade = {org_id: {} for org_id in orgs['org_id']}
+    for row in grades.itertuples(index=False):
+        grade_distribution[row.org_id][row.job_grade] = _headcount(row.employee_days, row.days_org, single_day)
+        if pd.notna(row.avg_efficiency_ratio):
+            efficiency_by_grade[row.org_id][row.job_grade] = float(row.avg_efficiency_ratio)
+    
+    orgs['total_employees'] = [_headcount(n, d, single_day) for n, d in zip(orgs['employee_days'], orgs['days'])]
+    orgs['analyzed_employees'] = [_headcount(n, d, single_day) for n, d in zip(orgs['analyzed_days'], orgs['days'])]
+    orgs['grade_distribution'] = orgs['org_id'].map(grade_distribution)
+    orgs['efficiency_by_grade'] = orgs['org_id'].map(efficiency_by_grade)
+    return orgs
+
+
+def _require_single_day(error: RollupNotBuiltError, analysis_date: date, end_date: Optional[date]):
+    """롤업 이전 DB의 일별 요약 테이블은 하루 조회만 지원 (기간 조회는 503)"""
+    if end_date and end_date != analysis_date:
+        raise HTTPException(status_code=503, detail=f"{error} (기간 조회는 배치 분석 실행 후 다시 시도하세요)")
+
+
+async def summary_table_centers(analysis_date: date) -> List[Dict[str, Any]]:
+    """롤업이 없는 DB: center_daily_summary에서 하루 센터 요약 조회"""
+    query = """
+        SELECT 
+            center_id,
+            center_name,
+            total_employees,
+            analyzed_employees,
+            total_teams,
+            avg_efficiency_ratio,
+            avg_work_hours,
+            avg_focus_ratio,
+            team_performance,
+            grade_distribution
+        FROM center_daily_summary
+        WHERE analysis_date = ?
+        ORDER BY center_name
+    """
+    records = await fetch_all(query, (analysis_date.isoformat(),))
+    return parse_json_fields(records, ('team_performance', 'grade_distribution'))
+
+
+async def summary_table_teams(center_id: str, analysis_date: date) -> List[Dict[str, Any]]:
+    """롤업이 없는 DB: team_daily_summary에서 하루 팀 요약 조회"""
+    query = """
+        SELECT 
+            team_id,
+            team_name,
+            center_id,
+            center_name,
+            total_employees,
+            analyzed_employees,
+            avg_efficiency_ratio,
+            avg_work_hours,
+            avg_focus_ratio,
+            avg_productivity_score,
+            grade_distribution,
+            efficiency_by_grade
+        FROM team_daily_summary
+        WHERE center_id = ? AND analysis_date = ?
+        ORDER BY team_name
+    """
+    records = await fetch_all(query, (center_id, analysis_date.isoformat()))
+    return parse_json_fields(records, ('grade_distribution', 'efficiency_by_grade'))
+
+
 @app.get("/api/centers")
 async def get_centers(
-    analysis_date: date = Query(..., description="분석 날짜 (YYYY-MM-DD)")
+    analysis_date: date = Query(..., description="분석 날짜 (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="기간 조회 종료 날짜 (없으면 하루)")
 ):
-    """센터 목록 및 요약 정보"""
+    """센터 목록 및 요약 정보 (end_date가 있으면 기간 일평균)"""
     try:
-        conn = get_db_connection()
-        query = """
-            SELECT 
-                center_id,
-                center_name,
-                total_employees,
-                analyzed_employees,
-                total_teams,
-                avg_efficiency_ratio,
-                avg_work_hours,
-                avg_focus_ratio,
-                team_performance,
-                grade_distribution
-            FROM center_daily_summary
-            WHERE analysis_date = ?
-            ORDER BY center_name
-        """
-        
-        df = pd.read_sql_query(query, conn, params=(analysis_date.isoformat(),))
-        conn.close()
-        
-        # JSON 필드 파싱
-        records = df.to_dict('records')
-        for record in records:
-            if record.get('team_performance'):
-                try:
-                    record['team_performance'] = json.loads(record['team_performance'])
-                except:
-                    record['team_performance'] = {}
-            if record.get('grade_distribution'):
-                try:
-                    record['grade_distribution'] = json.loads(record['grade_distribution'])
-                except:
-                    record['grade_distribution'] = {}
-        
-        return {
+        try:
+            centers, teams = await asyncio.gather(
+                run_in_threadpool(rollup_summaries, 'center', analysis_date, end_date),
+                run_in_threadpool(rollup_summaries, 'team', analysis_date, end_date)
+            )
+        except RollupNotBuiltError as e:
+            # 롤업 이전에 기록된 DB는 일별 요약 테이블로 응답
+            _require_single_day(e, analysis_date, end_date)
+            records = await summary_table_centers(analysis_date)
+            return {
+                "date": analysis_date.isoformat(),
+                "total_centers": len(records),
+                "centers": _json_safe(records)
+            }
+        
+        records = []
+        for center in centers.itertuples(index=False):
+            center_teams = teams[teams['parent_id'] == center.org_id]
+            records.append({
+                'center_id': center.org_id,
+                'center_name': center.org_name,
+                'total_employees': center.total_employees,
+                'analyzed_employees': center.analyzed_employees,
+                'total_teams': len(center_teams),
+                'avg_efficiency_ratio': center.avg_efficiency_ratio,
+                'avg_work_hours': center.avg_work_hours,
+                'avg_focus_ratio': center.avg_focus_ratio,
+                'team_performance': {
+                    name: float(value) for name, value
+                    in zip(center_teams['org_name'], center_teams['avg_efficiency_ratio'])
+                    if pd.notna(value)
+                },
+                'grade_distribution': center.grade_distribution
+            })
+        
+        response = {
             "date": analysis_date.isoformat(),
             "total_centers": len(records),
-            "centers": records
+            "centers": _json_safe(records)
         }
+        if end_date:
+            response["end_date"] = end_date.isoformat()
+        return response
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching centers: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -116,50 +277,51 @@ async def get_centers(
 @app.get("/api/teams/{center_id}")
 async def get_teams_by_center(
     center_id: str,
-    analysis_date: date = Query(..., description="분석 날짜")
+    analysis_date: date = Query(..., description="분석 날짜"),
+    end_date: Optional[date] = Query(None, description="기간 조회 종료 날짜 (없으면 하루)")
 ):
-    """특정 센터의 팀 목록"""
+    """특정 센터의 팀 목록 (end_date가 있으면 기간 일평균)"""
     try:
-        conn = get_db_connection()
-        query = """
-            SELECT 
-                team_id,
-                team_name,
-                center_id,
-                center_name,
-                total_employees,
-                analyzed_employees,
-                avg_efficiency_ratio,
-                avg_work_hours,
-                avg_focus_ratio,
-                avg_productivity_score,
-                grade_distribution,
-                efficiency_by_grade
-            FROM team_daily_summary
-            WHERE center_id = ? AND analysis_date = ?
-            ORDER BY team_name
-        """
-        
-        df = pd.read_sql_query(query, conn, params=(center_id, analysis_date.isoformat()))
-        conn.close()
-        
-        # JSON 필드 파싱
-        records = df.to_dict('records')
-        for record in records:
-            for field in ['grade_distribution', 'efficiency_by_grade']:
-                if record.get(field):
-                    try:
-                        record[field] = json.loads(record[field])
-                    except:
-                        record[field] = {}
-        
-        return {
+        try:
+            teams = await run_in_threadpool(rollup_summaries, 'team', analysis_date, end_date, center_id)
+        except RollupNotBuiltError as e:
+            # 롤업 이전에 기록된 DB는 일별 요약 테이블로 응답
+            _require_single_day(e, analysis_date, end_date)
+            records = await summary_table_teams(center_id, analysis_date)
+            return {
+                "center_id": center_id,
+                "date": analysis_date.isoformat(),
+                "total_teams": len(records),
+                "teams": _json_safe(records)
+            }
+        
+        records = [{
+            'team_id': team.org_id,
+            'team_name': team.org_name,
+            'center_id': team.parent_id,
+            'center_name': team.parent_name,
+            'total_employees': team.total_employees,
+            'analyzed_employees': team.analyzed_employees,
+            'avg_efficiency_ratio': team.avg_efficiency_ratio,
+            'avg_work_hours': team.avg_work_hours,
+            'avg_focus_ratio': team.avg_focus_ratio,
+            'avg_productivity_score': team.avg_productivity_score,
+            'grade_distribution': team.grade_distribution,
+            'efficiency_by_grade': team.efficiency_by_grade
+        } for team in teams.itertuples(index=False)]
+        
+        response = {
             "center_id": center_id,
             "date": analysis_date.isoformat(),
             "total_teams": len(records),
-            "teams": records
+            "teams": _json_safe(records)
         }
+        if end_date:
+            response["end_date"] = end_date.isoformat()
+        return response
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching teams: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -172,7 +334,6 @@ async def get_groups_by_team(
 ):
     """특정 팀의 그룹별 집계"""
     try:
-        conn = get_db_connection()
         query = """
             SELECT 
                 group_id,
@@ -189,10 +350,7 @@ async def get_groups_by_team(
             ORDER BY group_name
         """
         
-        df = pd.read_sql_query(query, conn, params=(team_id, analysis_date.isoformat()))
-        conn.close()
-        
-        records = df.to_dict('records')
+        records = await fetch_all(query, (team_id, analysis_date.isoformat()))
         
         return {
             "team_id": team_id,
@@ -214,8 +372,6 @@ async def get_employees_by_team(
 ):
     """특정 팀/그룹의 직원 상세"""
     try:
-        conn = get_db_connection()
-        
         # 기본 쿼리
         query = """
             SELECT 
@@ -254,18 +410,10 @@ async def get_employees_by_team(
         
         query += " ORDER BY efficiency_ratio DESC"
         
-        df = pd.read_sql_query(query, conn, params=params)
-        conn.close()
+        records = await fetch_all(query, params)
         
         # JSON 필드 파싱
-        records = df.to_dict('records')
-        for record in records:
-            for field in ['peak_hours', 'activity_distribution']:
-                if record.get(field):
-                    try:
-                        record[field] = json.loads(record[field])
-                    except:
-                        record[field] = []
+        parse_json_fields(records, ['peak_hours', 'activity_distribution'], list)
         
         return {
             "team_id": team_id,
@@ -287,28 +435,19 @@ async def get_employee_detail(
 ):
     """특정 직원 상세 정보"""
     try:
-        conn = get_db_connection()
         query = """
             SELECT *
             FROM daily_analysis
             WHERE employee_id = ? AND analysis_date = ?
         """
         
-        df = pd.read_sql_query(query, conn, params=(employee_id, analysis_date.isoformat()))
-        conn.close()
+        record = await fetch_one(query, (employee_id, analysis_date.isoformat()))
         
-        if df.empty:
+        if record is None:
             raise HTTPException(status_code=404, detail="Employee data not found")
         
-        record = df.to_dict('records')[0]
-        
         # JSON 필드 파싱
-        for field in ['peak_hours', 'activity_distribution', 'location_patterns', 'hourly_efficiency']:
-            if record.get(field):
-                try:
-                    record[field] = json.loads(record[field])
-                except:
-                    record[field] = {}
+        parse_json_fields([record], ['peak_hours', 'activity_distribution', 'location_patterns', 'hourly_efficiency'])
         
         return record
         
@@ -326,7 +465,6 @@ async def get_employee_trend(
 ):
     """직원 추세 데이터"""
     try:
-        conn = get_db_connection()
         query = """
             SELECT 
                 analysis_date,
@@ -342,12 +480,10 @@ async def get_employee_trend(
             LIMIT ?
         """
         
-        df = pd.read_sql_query(query, conn, params=(employee_id, days))
-        conn.close()
+        records = await fetch_all(query, (employee_id, days))
         
         # 날짜순 정렬 (오래된 것부터)
-        df = df.sort_values('analysis_date')
-        records = df.to_dict('records')
+        records.reverse()
         
         return {
             "employee_id": employee_id,
@@ -366,8 +502,6 @@ async def get_analytics_summary(
 ):
     """전체 요약 통계"""
     try:
-        conn = get_db_connection()
-        
         # 전체 통계
         total_query = """
             SELECT 
@@ -382,8 +516,6 @@ async def get_analytics_summary(
             WHERE analysis_date = ?
         """
         
-        total_df = pd.read_sql_query(total_query, conn, params=(analysis_date.isoformat(),))
-        
         # 직급별 분포
         grade_query = """
             SELECT 
@@ -398,8 +530,6 @@ async def get_analytics_summary(
             ORDER BY job_grade
         """
         
-        grade_df = pd.read_sql_query(grade_query, conn, params=(analysis_date.isoformat(),))
-        
         # 상위/하위 팀
         team_ranking_query = """
             SELECT 
@@ -411,16 +541,19 @@ async def get_analytics_summary(
             ORDER BY avg_efficiency_ratio DESC
         """
         
-        team_df = pd.read_sql_query(team_ranking_query, conn, params=(analysis_date.isoformat(),))
-        
-        conn.close()
+        params = (analysis_date.isoformat(),)
+        total, grades, teams = await asyncio.gather(
+            fetch_one(total_query, params),
+            fetch_all(grade_query, params),
+            fetch_all(team_ranking_query, params)
+        )
         
         return {
             "date": analysis_date.isoformat(),
-            "summary": total_df.to_dict('records')[0] if not total_df.empty else {},
-            "grade_distribution": grade_df.to_dict('records'),
-            "top_teams": team_df.head(5).to_dict('records'),
-            "bottom_teams": team_df.tail(5).to_dict('records')
+            "summary": total or {},
+            "grade_distribution": grades,
+            "top_teams": teams[:5],
+            "bottom_teams": teams[-5:]
         }
         
     except Exception as e:
@@ -432,7 +565,6 @@ async def get_analytics_summary(
 async def get_available_dates():
     """분석 가능한 날짜 목록"""
     try:
-        conn = get_db_connection()
         query = """
             SELECT DISTINCT analysis_date
             FROM daily_analysis
@@ -440,10 +572,7 @@ async def get_available_dates():
             LIMIT 30
         """
         
-        df = pd.read_sql_query(query, conn)
-        conn.close()
-        
-        dates = df['analysis_date'].tolist()
+        dates = [row['analysis_date'] for row in await fetch_all(query)]
         
         return {
             "available_dates": dates,
@@ -461,8 +590,6 @@ async def get_available_dates():
 async def get_system_status():
     """시스템 상태 확인"""
     try:
-        conn = get_db_connection()
-        
         # DB 통계
         stats_query = """
             SELECT 
@@ -474,10 +601,7 @@ async def get_system_status():
             FROM daily_analysis
         """
         
-        stats_df = pd.read_sql_query(stats_query, conn)
-        conn.close()
-        
-        stats = stats_df.to_dict('records')[0] if not stats_df.empty else {}
+        stats = await fetch_one(stats_query) or {}
         
         return {
             "status": "healthy",
@@ -487,6 +611,7 @@ async def get_system_status():
                 "is_mock": "mock" in DB_PATH.name
             },
             "statistics": stats,
+            "response_cache": response_cache.stats(),
             "timestamp": datetime.now().isoformat()
         }
         
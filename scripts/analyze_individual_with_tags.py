@@ -7,13 +7,12 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import pandas as pd
-import pickle
-import gzip
 from datetime import datetime, timedelta
 import logging
 from sqlalchemy import create_engine
 from src.tag_system.tag_system_adapter import TagSystemAdapter
 from src.tag_system.meal_tag_processor import MealTagProcessor
+from src.data_processing import PickleManager
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -25,11 +24,10 @@ def get_db_url():
 
 def load_o_tags():
     """O 태그 데이터 로드"""
-    o_tag_file = 'data/pickles/o_tags_equipment_v20250726_120702.pkl.gz'
-    logger.info(f"O 태그 데이터 로드 중: {o_tag_file}")
+    logger.info("O 태그 데이터 로드 중: o_tags_equipment")
     
-    with gzip.open(o_tag_file, 'rb') as f:
-        o_tags_df = pickle.load(f)
+    # 저장 형식(Parquet/pickle)과 관계없이 최신 버전 로드
+    o_tags_df = PickleManager().load_dataframe('o_tags_equipment')
     
     logger.info(f"O 태그 {len(o_tags_df):,}개 로드 완료")
     return o_tags_df
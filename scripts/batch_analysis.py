@@ -26,6 +26,8 @@ sys.path.append(str(project_root))
 from src.database import get_database_manager
 from src.analysis.individual_analyzer import IndividualAnalyzer
 from src.data_processing import PickleManager
+from src.analysis.employee_day_fingerprint import EmployeeDayFingerprinter, changed_targets, normalize_employee_ids
+from src.utils.org_rollup import OrgRollupCube, stored_generation
 
 # 로깅 설정
 logging.basicConfig(
@@ -196,6 +198,18 @@ class BatchAnalysisProcessor:
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )""")
         
+        # 직원-일자별 입력 데이터 지문 (증분 분석용)
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS analysis_fingerprints (
+            employee_id TEXT NOT NULL,
+            analysis_date DATE NOT NULL,
+            fingerprint TEXT NOT NULL,
+            rule_version TEXT NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            
+            PRIMARY KEY (employee_id, analysis_date)
+        )""")
+        
         # 인덱스 생성
         cursor.execute("""
         CREATE INDEX IF NOT EXISTS idx_daily_employee_date 
@@ -217,9 +231,17 @@ class BatchAnalysisProcessor:
         ON daily_analysis(team_id, analysis_date)
         """)
         
+        # 조직 롤업 큐브 (센터/팀/그룹 × 날짜 × 직급)
+        OrgRollupCube.ensure_schema(conn)
+        
         conn.commit()
+        rollup_missing = stored_generation(conn) is None
         conn.close()
         
+        # 롤업은 쓰기 경로에서만 생성 (API/대시보드는 롤업이 없으면 조회하지 않음)
+        if rollup_missing:
+            OrgRollupCube(self.target_db).refresh()
+        
         logger.info(f"Analytics DB 초기화 완료: {self.target_db}")
     
     def get_analysis_targets(self, 
@@ -418,11 +440,109 @@ class BatchAnalysisProcessor:
         conn.commit()
         conn.close()
     
-    def run_parallel_analysis(self, 
+    def load_fingerprints(self, start_date: date, end_date: date) -> pd.DataFrame:
+        """저장된 직원-일자 지문 조회"""
+        conn = sqlite3.connect(self.target_db)
+        df = pd.read_sql_query("""
+            SELECT employee_id, analysis_date, fingerprint, rule_version
+            FROM analysis_fingerprints
+            WHERE analysis_date BETWEEN ? AND ?
+        """, conn, params=(start_date.isoformat(), end_date.isoformat()))
+        conn.close()
+        return df
+        
+    def save_fingerprints(self, tasks: List[Tuple[str, date]], fingerprints: pd.DataFrame,
+                          rule_version: str):
+        """분석이 끝난 직원-일자의 지문 저장"""
+        if not tasks:
+            return
+        
+        lookup = dict(zip(zip(fingerprints['employee_id'], fingerprints['analysis_date']),
+                          fingerprints['fingerprint']))
+        employee_ids = normalize_employee_ids(pd.Series([t[0] for t in tasks], dtype=object))
+        rows = []
+        for employee_id, (_, work_date) in zip(employee_ids, tasks):
+            key = (employee_id, work_date.isoformat())
+            rows.append((employee_id, key[1], lookup.get(key, ''), rule_version))
+        
+        conn = sqlite3.connect(self.target_db)
+        conn.executemany("""
+        INSERT OR REPLACE INTO analysis_fingerprints
+            (employee_id, analysis_date, fingerprint, rule_version, updated_at)
+        VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """, rows)
+        conn.commit()
+        conn.close()
+        
+    def select_changed_targets(self, targets: List[Tuple[str, date]],
+                               start_date: date, end_date: date) -> Tuple[List[Tuple[str, date]], pd.DataFrame, str]:
+        """
+        지난 실행 이후 입력 데이터나 규칙/모델 버전이 바뀐 직원-일자만 선별
+        
+        Returns:
+            (재분석 대상, 현재 지문, 현재 규칙 버전)
+        """
+        fingerprinter = EmployeeDayFingerprinter(PickleManager())
+        rule_version = fingerprinter.rule_version()
+        current = fingerprinter.compute(start_date, end_date)
+        stored = self.load_fingerprints(start_date, end_date)
+        
+        changed = changed_targets(targets, current, stored, rule_version)
+        logger.info(f"증분 분석 대상: {len(changed)}/{len(targets)}건 "
+                    f"(규칙 버전: {rule_version})")
+        return changed, current, rule_version
+        
+    def invalidate_aggregations(self, changed: List[Tuple[str, date]]) -> List[date]:
+        """
+        변경된 직원-일자에 의존하는 팀/센터 집계 삭제
+        
+        재분석 전 소속(기존 daily_analysis) 기준으로 지우므로 소속이 바뀐 직원의
+        이전 팀/센터 집계도 다시 생성됩니다.
+        
+        Returns:
+            집계를 다시 생성해야 하는 날짜 목록
+        """
+        if not changed:
+            return []
+        
+        conn = sqlite3.connect(self.target_db)
+        cursor = conn.cursor()
+        cursor.execute("CREATE TEMP TABLE changed_days (employee_id TEXT, analysis_date DATE)")
+        employee_ids = normalize_employee_ids(pd.Series([t[0] for t in changed], dtype=object))
+        cursor.executemany("INSERT INTO changed_days VALUES (?, ?)",
+                           [(employee_id, work_date.isoformat())
+                            for employee_id, (_, work_date) in zip(employee_ids, changed)])
+        
+        cursor.execute("""
+        DELETE FROM team_daily_summary
+        WHERE (team_id, analysis_date) IN (
+            SELECT da.team_id, da.analysis_date
+            FROM daily_analysis da
+            JOIN changed_days cd
+                ON da.employee_id = cd.employee_id AND da.analysis_date = cd.analysis_date
+        )""")
+        cursor.execute("""
+        DELETE FROM center_daily_summary
+        WHERE (center_id, analysis_date) IN (
+            SELECT da.center_id, da.analysis_date
+            FROM daily_analysis da
+            JOIN changed_days cd
+                ON da.employee_id = cd.employee_id AND da.analysis_date = cd.analysis_date
+        )""")
+        
+        conn.commit()
+        conn.close()
+        
+        affected_dates = sorted({work_date for _, work_date in changed})
+        logger.info(f"집계 무효화: {len(affected_dates)}일")
+        return affected_dates
+    
+    def run_parallel_analysis(self,
                             start_date: date,
                             end_date: date,
                             use_claim_filter: bool = True,
-                            resume_from: int = 0):
+                            resume_from: int = 0,
+                            incremental: bool = True):
         """
         병렬 분석 실행
         
@@ -431,6 +551,7 @@ class BatchAnalysisProcessor:
             end_date: 종료 날짜  
             use_claim_filter: Claim 데이터 필터링 사용 여부
             resume_from: 재시작 위치 (실패 시 복구용)
+            incremental: 입력 데이터 지문이 바뀐 직원-일자만 분석 (False면 전체 재분석)
         """
         batch_id = datetime.now().strftime("%Y%m%d_%H%M%S")
         logger.info(f"배치 분석 시작 - ID: {batch_id}")
@@ -438,10 +559,17 @@ class BatchAnalysisProcessor:
         # 분석 대상 추출
         targets = self.get_analysis_targets(start_date, end_date, use_claim_filter)
         
+        # 재시작 위치는 전체 대상 기준 (증분 필터 이후 목록은 실행마다 줄어듦)
         if resume_from > 0:
             targets = targets[resume_from:]
             logger.info(f"재시작 위치: {resume_from}")
         
+        # 증분 모드: 지문이 바뀐 직원-일자만 분석하고 의존 집계 무효화
+        fingerprints = pd.DataFrame(columns=['employee_id', 'analysis_date', 'fingerprint'])
+        rule_version = None
+        if incremental:
+            targets, fingerprints, rule_version = self.select_changed_targets(targets, start_date, end_date)
+        
         total_targets = len(targets)
         logger.info(f"총 분석 대상: {total_targets}건")
         
@@ -459,6 +587,8 @@ class BatchAnalysisProcessor:
         self._log_processing_start(batch_id, total_targets)
         
         try:
+            aggregation_dates = self.invalidate_aggregations(targets) if incremental else None
+            
             with ProcessPoolExecutor(max_workers=self.num_workers) as executor:
                 futures = {executor.submit(self.process_batch, batch): i 
                           for i, batch in enumerate(batches)}
@@ -471,6 +601,11 @@ class BatchAnalysisProcessor:
                         self.save_results(results)
                         completed += len(results)
                         
+                        if incremental:
+                            analyzed = [(r['employee_id'], date.fromisoformat(r['analysis_date']))
+                                        for r in results]
+                            self.save_fingerprints(analyzed, fingerprints, rule_version)
+                        
                         # 진행률 표시
                         elapsed = (datetime.now() - start_time).total_seconds()
                         rate = completed / elapsed if elapsed > 0 else 0
@@ -491,8 +626,15 @@ class BatchAnalysisProcessor:
                         logger.error(f"배치 {batch_idx} 처리 실패: {e}")
                         failed += self.batch_size
             
-            # 집계 생성
-            self.generate_aggregations(start_date, end_date)
+            # 집계 생성 (증분 모드는 무효화된 날짜만)
+            if aggregation_dates is None:
+                self.generate_aggregations(start_date, end_date)
+                aggregation_dates = [start_date + timedelta(days=i)
+                                     for i in range((end_date - start_date).days + 1)]
+            else:
+                for aggregation_date in aggregation_dates:
+                    self.generate_aggregations(aggregation_date, aggregation_date)
+            OrgRollupCube(self.target_db).refresh(aggregation_dates)
             
             # 처리 로그 완료
             self._log_processing_end(batch_id, completed, failed, "completed")
@@ -610,6 +752,8 @@ def main():
                        help='Claim 필터링 비활성화 (모든 날짜 분석)')
     parser.add_argument('--resume-from', type=int, default=0,
                        help='재시작 위치 (실패 시 복구용)')
+    parser.add_argument('--full', action='store_true',
+                       help='입력 데이터 변경 여부와 관계없이 전체 재분석')
     
     args = parser.parse_args()
     
@@ -625,7 +769,8 @@ def main():
             start_date=start_date,
             end_date=end_date,
             use_claim_filter=not args.no_claim_filter,
-            resume_from=args.resume_from
+            resume_from=args.resume_from,
+            incremental=not args.full
         )
     except KeyboardInterrupt:
         logger.info("사용자에 의해 중단됨")
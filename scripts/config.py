@@ -27,7 +27,8 @@ LOG_DIR.mkdir(exist_ok=True)
 # 파일 경로 패턴
 TAG_LOCATION_MASTER_PATTERN = "tag_location_master_*.pkl.gz"
 EQUIPMENT_DATA_PATTERN = "equipment_data_*.pkl.gz"
-O_TAGS_PATTERN = "o_tags_equipment_*.pkl.gz"
+O_TAGS_NAME = "o_tags_equipment"  # PickleManager 저장 이름
+O_TAGS_PATTERN = "o_tags_equipment_*"  # 저장 형식(.parquet/.pkl.gz)과 무관
 
 # Excel 파일 경로
 TAG_TRANSITION_PROB_FILE = DOC_DIR / "tag_transition_probabilities.xlsx"
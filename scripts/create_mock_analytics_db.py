@@ -19,6 +19,7 @@ project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
 
 from src.database import get_database_manager
+from src.utils.org_rollup import OrgRollupCube
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -558,6 +559,7 @@ def main():
     
     # 집계 생성
     generator.generate_aggregations()
+    OrgRollupCube(generator.target_db).refresh()
     
     # 요약 출력
     generator.print_summary()
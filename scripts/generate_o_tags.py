@@ -10,8 +10,8 @@ import pandas as pd
 import pickle
 import gzip
 import logging
-from datetime import datetime
-from src.data.equipment_processors import create_o_tags_from_equipment
+from src.data.equipment_processors import create_o_tags_from_equipment, O_TAG_VERSION
+from src.data_processing import PickleManager
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -26,23 +26,18 @@ def main():
     
     logger.info(f"로드 완료: {len(equipment_df):,}개 레코드")
     
-    # O 태그 생성
+    # O 태그 생성 (장비 데이터나 생성 로직이 바뀐 경우에만 다시 생성해 저장)
     logger.info("O 태그 생성 시작...")
-    o_tags = create_o_tags_from_equipment(equipment_df)
-    
-    # DataFrame으로 변환
-    o_tags_df = pd.DataFrame(o_tags)
+    o_tags_df = PickleManager().get_or_build_artifact(
+        'o_tags_equipment',
+        lambda: pd.DataFrame(create_o_tags_from_equipment(equipment_df)),
+        inputs={'equipment_data_merged': equipment_df},
+        version=O_TAG_VERSION,
+        description='장비 사용 데이터에서 생성한 O 태그'
+    )
     
     if len(o_tags_df) > 0:
-        # 타임스탬프 생성
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        
-        # Pickle 파일로 저장
-        output_file = f'data/pickles/o_tags_equipment_v{timestamp}.pkl.gz'
-        with gzip.open(output_file, 'wb') as f:
-            pickle.dump(o_tags_df, f)
-        
-        logger.info(f"O 태그 데이터 저장 완료: {output_file}")
+        logger.info(f"O 태그 데이터 준비 완료: {len(o_tags_df):,}개")
         
         # 통계 출력
         logger.info(f"\n=== O 태그 생성 통계 ===")
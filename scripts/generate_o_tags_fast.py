@@ -12,6 +12,7 @@ import gzip
 import logging
 from datetime import datetime
 import numpy as np
+from src.data_processing import PickleManager
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -70,10 +71,11 @@ def main():
         # 타임스탬프 생성
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         
-        # Pickle 파일로 저장
-        output_file = f'data/pickles/o_tags_equipment_v{timestamp}.pkl.gz'
-        with gzip.open(output_file, 'wb') as f:
-            pickle.dump(o_tags_df, f)
+        # PickleManager로 저장 (generate_o_tags.py와 같은 이름/형식)
+        output_file = PickleManager().save_dataframe(
+            o_tags_df, 'o_tags_equipment', version=timestamp,
+            description='장비 사용 데이터에서 생성한 O 태그 (30분 단위 간소화)'
+        )
         
         logger.info(f"O 태그 데이터 저장 완료: {output_file}")
         
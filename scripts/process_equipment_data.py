@@ -14,8 +14,9 @@ from datetime import datetime
 import logging
 from src.data.equipment_processors import (
     process_eam_data, process_lams_data, process_mes_data, 
-    merge_equipment_data, create_o_tags_from_equipment
+    merge_equipment_data, create_o_tags_from_equipment, O_TAG_VERSION
 )
+from src.data_processing import PickleManager
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -128,14 +129,16 @@ def main():
         # 통합 데이터 Pickle 저장
         equipment_pickle = save_pickle(equipment_merged, f'equipment_data_merged_v{timestamp}.pkl.gz')
         
-        # O 태그 생성
+        # O 태그 생성 (통합 장비 데이터나 생성 로직이 바뀐 경우에만)
         logger.info("\n=== O 태그 생성 ===")
-        o_tags = create_o_tags_from_equipment(equipment_merged)
-        o_tags_df = pd.DataFrame(o_tags)
-        
-        if len(o_tags_df) > 0:
-            o_tags_pickle = save_pickle(o_tags_df, f'o_tags_equipment_v{timestamp}.pkl.gz')
-            logger.info(f"O 태그 데이터 저장 완료: {len(o_tags_df)}개")
+        o_tags_df = PickleManager().get_or_build_artifact(
+            'o_tags_equipment',
+            lambda: pd.DataFrame(create_o_tags_from_equipment(equipment_merged)),
+            inputs={'equipment_data_merged': equipment_merged},
+            version=O_TAG_VERSION,
+            description='장비 사용 데이터에서 생성한 O 태그'
+        )
+        logger.info(f"O 태그 데이터 준비 완료: {len(o_tags_df)}개")
         
         # 통계 출력
         logger.info("\n=== 처리 완료 통계 ===")
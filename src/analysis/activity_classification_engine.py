@@ -0,0 +1,1144 @@
+"""
+활동 분류 엔진
+IndividualDashboard.classify_activities의 태그 기반 분류 규칙을 UI와 분리한
+단계별 파이프라인입니다.
+
+각 단계는 행 단위 .loc 루프 대신 NumPy 마스크 연산으로 동작하며, 식사 그룹/장비 로그처럼
+건수가 적은 단위만 순회합니다. Streamlit 없이 배치 처리기에서 바로 사용할 수 있고
+단계별 실행 시간은 stage_timings에 기록됩니다.
+"""
+
+import time
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..config.activity_types import get_activity_type
+
+# 시간대별 식사 활동 코드
+MEAL_ACTIVITY_CODES = ['BREAKFAST', 'LUNCH', 'DINNER', 'MIDNIGHT_MEAL']
+
+# 활동 코드 → 활동 타입 (이전 버전과의 호환성)
+ACTIVITY_TYPE_MAPPING = {
+    'WORK': 'work',
+    'FOCUSED_WORK': 'work',
+    'EQUIPMENT_OPERATION': 'work',
+    'WORK_PREPARATION': 'work',
+    'WORKING': 'work',
+    'TRAINING': 'education',
+    'MEETING': 'meeting',
+    'G3_MEETING': 'meeting',
+    'MOVEMENT': 'movement',
+    'COMMUTE_IN': 'commute',
+    'COMMUTE_OUT': 'commute',
+    'BREAKFAST': 'meal',
+    'LUNCH': 'meal',
+    'DINNER': 'meal',
+    'MIDNIGHT_MEAL': 'meal',
+    'REST': 'rest',
+    'FITNESS': 'rest',
+    'LEAVE': 'rest',
+    'IDLE': 'rest',
+    'NON_WORK': 'non_work',
+    'UNKNOWN': 'work'
+}
+
+# 분류 실패 시 사용하는 매핑 (기존 오류 처리 경로와 동일)
+FALLBACK_ACTIVITY_TYPE_MAPPING = {
+    'WORK': 'work',
+    'FOCUSED_WORK': 'work',
+    'EQUIPMENT_OPERATION': 'work',
+    'WORK_PREPARATION': 'work',
+    'WORKING': 'work',
+    'MEETING': 'meeting',
+    'BREAKFAST': 'meal',
+    'LUNCH': 'meal',
+    'DINNER': 'meal',
+    'MIDNIGHT_MEAL': 'meal',
+    'BREAK': 'rest',
+    'MOVEMENT': 'movement',
+    'COMMUTE_IN': 'commute',
+    'COMMUTE_OUT': 'commute',
+    'LEAVE': 'rest',
+    'IDLE': 'rest',
+    'NON_WORK': 'non_work',
+    'UNKNOWN': 'work'
+}
+
+# 분류 전 기본값 (기존 값이 없는 컬럼만 설정)
+DEFAULT_COLUMNS = {
+    'activity_code': 'WORK',
+    'work_area_type': 'Y',
+    'work_status': 'W',
+    'activity_label': 'YW',
+    'confidence': 80,
+    'is_takeout': False,
+    'protected_from_meal': False
+}
+
+# 마스터 조인 컬럼 후보 (DR_NO_str 다음 순서)
+MASTER_JOIN_COLUMNS = ['Tag_Code', '공간구분_NM', '세부유형_NM', '라벨링_활동', '근무구역여부', '근무', '라벨링', 'INOUT_GB']
+
+# Tag_Code별 기본 활동 코드
+TAG_CODE_ACTIVITIES = {
+    'G1': 'WORK',
+    'G2': 'WORK_PREPARATION',
+    'G3': 'MEETING',
+    'G4': 'TRAINING',
+    'N1': 'REST',
+    'N2': 'REST'
+}
+
+# Tag_Code별 신뢰도
+TAG_CODE_CONFIDENCE = [
+    (['T2', 'T3'], 100),
+    (['G3', 'G4'], 95),
+    (['G1', 'G2'], 90),
+    (['N1', 'N2'], 90),
+    (['T1'], 85)
+]
+
+GATE_PATTERN = r'정문|SPEED\s*GATE'
+GATE_NAME_PATTERN = '정문|SPEED GATE'
+GATE_ENTRY_PATTERN = 'SPEED GATE.*입문|정문.*입문'
+GATE_EXIT_PATTERN = 'SPEED GATE.*출문|정문.*출문'
+
+MINUTE = np.timedelta64(1, 'm')
+
+
+@dataclass
+class ClassificationContext:
+    """한 번의 분류 실행에 필요한 직원/날짜별 입력"""
+    work_type: str = 'standard'
+    equipment_data: Optional[pd.DataFrame] = None
+    master_joined: bool = False
+
+
+def _contains(series: pd.Series, pattern: str, case: bool = False) -> np.ndarray:
+    """문자열 컬럼 정규식 포함 여부 (결측값은 False)"""
+    return series.astype(object).str.contains(pattern, case=case, na=False, regex=True).to_numpy(dtype=bool)
+
+
+def _equals(data: pd.DataFrame, column: str, value) -> np.ndarray:
+    """컬럼 값 비교 마스크 (컬럼이 없으면 모두 False)"""
+    if column not in data.columns:
+        return np.zeros(len(data), dtype=bool)
+    return (data[column] == value).to_numpy(dtype=bool)
+
+
+def _flag(series: pd.Series) -> np.ndarray:
+    """True/결측값이 섞인 플래그 컬럼을 불리언 마스크로 변환"""
+    return series.astype(object).fillna(False).astype(bool).to_numpy()
+
+
+def _truthy(series: pd.Series) -> np.ndarray:
+    """파이썬 진리값 기준 마스크 (row.get(...) 조건과 동일하게 NaN은 True)"""
+    if pd.api.types.is_bool_dtype(series):
+        return series.to_numpy(dtype=bool)
+    return np.array([bool(value) for value in series.to_numpy(dtype=object)], dtype=bool)
+
+
+def _minutes_to_next(times: np.ndarray) -> np.ndarray:
+    """다음 행까지의 시간(분), 마지막 행은 NaN"""
+    minutes = np.full(len(times), np.nan)
+    if len(times) > 1:
+        minutes[:-1] = (times[1:] - times[:-1]) / MINUTE
+    return minutes
+
+
+def _runs(mask: np.ndarray) -> List[Tuple[int, int]]:
+    """연속된 True 구간의 (시작, 끝) 위치 목록 (끝 포함)"""
+    padded = np.concatenate(([False], mask, [False])).astype(np.int8)
+    edges = np.flatnonzero(np.diff(padded))
+    return list(zip(edges[0::2].tolist(), (edges[1::2] - 1).tolist()))
+
+
+def _assign(data: pd.DataFrame, mask: np.ndarray, values: Dict[str, object]) -> int:
+    """마스크 행에 컬럼 값들을 설정하고 설정한 행 수 반환"""
+    count = int(mask.sum())
+    if count:
+        for column, value in values.items():
+            data.loc[mask, column] = value
+    return count
+
+
+def _commute_in_hours(hours: np.ndarray, work_type: str) -> np.ndarray:
+    """출근 시간대 (야간 근무 17~22시, 그 외 5~10시 미만)"""
+    if work_type == 'night_shift':
+        return (hours >= 17) & (hours <= 22)
+    return (hours >= 5) & (hours < 10)
+
+
+def _commute_out_hours(hours: np.ndarray, work_type: str) -> np.ndarray:
+    """퇴근 시간대 (야간 근무 5~10시, 그 외 17~22시)"""
+    if work_type == 'night_shift':
+        return (hours >= 5) & (hours <= 10)
+    return (hours >= 17) & (hours <= 22)
+
+
+class ActivityClassificationEngine:
+    """태그 기반 활동 분류 파이프라인"""
+
+    # (단계 이름, 메서드) - 이 순서대로 실행
+    STAGES = (
+        ('source_tags', '_stage_source_tags'),
+        ('master_join', '_stage_master_join'),
+        ('gate_codes', '_stage_gate_codes'),
+        ('meal_windows', '_stage_meal_windows'),
+        ('tag_rules', '_stage_tag_rules'),
+        ('commute_protection', '_stage_commute_protection'),
+        ('meal_tags', '_stage_meal_tags'),
+        ('equipment', '_stage_equipment'),
+        ('location_rules', '_stage_location_rules'),
+        ('durations', '_stage_durations'),
+        ('focused_work', '_stage_focused_work'),
+        ('non_work', '_stage_non_work'),
+        ('final_protection', '_stage_final_protection'),
+    )
+
+    def __init__(self, tag_location_master: Optional[pd.DataFrame] = None, rule_integration=None):
+        """
+        Args:
+            tag_location_master: 태깅지점 마스터 (DR_NO, Tag_Code 등)
+            rule_integration: 식사 시간 계산에 사용할 RuleIntegration (없으면 공용 인스턴스)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.tag_location_master = tag_location_master
+        self._master = self._prepare_master(tag_location_master)
+        self._rule_integration = rule_integration
+        self.stage_timings: Dict[str, float] = {}
+
+        # 활동 타입 조회는 코드별로 한 번만
+        self._activity_types = {}
+
+    @property
+    def rule_integration(self):
+        """확정적 규칙 엔진 통합 인스턴스"""
+        if self._rule_integration is None:
+            from ..tag_system.rule_integration import get_rule_integration
+            self._rule_integration = get_rule_integration()
+        return self._rule_integration
+
+    @staticmethod
+    def _prepare_master(tag_location_master: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+        """조인용 DR_NO_str 컬럼을 추가한 마스터 복사본 (엔진 생성 시 1회)"""
+        if tag_location_master is None or 'DR_NO' not in tag_location_master.columns:
+            return None
+
+        master = tag_location_master.copy()
+        if master['DR_NO'].dtype in ['int64', 'float64']:
+            master['DR_NO_str'] = master['DR_NO'].astype(int).astype(str)
+        else:
+            master['DR_NO_str'] = master['DR_NO'].astype(str).str.strip()
+        return master
+
+    def _activity(self, code: str, default_category: str, default_name: str) -> Tuple[str, str]:
+        """활동 코드의 (category, name_ko) - 정의가 없으면 기본값"""
+        if code not in self._activity_types:
+            self._activity_types[code] = get_activity_type(code)
+        activity_type = self._activity_types[code]
+        if activity_type:
+            return activity_type.category, activity_type.name_ko
+        return default_category, default_name
+
+    def classify(self, daily_data: pd.DataFrame, work_type: str = 'standard',
+                 equipment_data: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        일일 태그 데이터 활동 분류
+
+        Args:
+            daily_data: 직원 하루치 태그 데이터 (datetime, DR_NO, DR_NM, INOUT_GB 등)
+            work_type: 근무 유형 ('night_shift'면 야간 출퇴근 시간대 적용)
+            equipment_data: 장비 사용 로그 (timestamp, system_type)
+
+        Returns:
+            pd.DataFrame: activity_code, activity_type, confidence, duration_minutes 등이 추가된 데이터
+        """
+        self.stage_timings = {}
+        context = ClassificationContext(work_type=work_type, equipment_data=equipment_data)
+        data = daily_data.reset_index(drop=True)
+
+        try:
+            for name, method in self.STAGES:
+                stage_start = time.perf_counter()
+                data = getattr(self, method)(data, context)
+                self.stage_timings[name] = time.perf_counter() - stage_start
+
+            self.logger.debug(f"활동 분류 완료: {len(data)}건, 단계별 시간: "
+                              + ", ".join(f"{name}={seconds * 1000:.1f}ms"
+                                          for name, seconds in self.stage_timings.items()))
+            return data
+
+        except Exception as e:
+            self.logger.error(f"활동 분류 실패: {e}")
+            return self._finalize_on_error(data)
+
+    # ------------------------------------------------------------------
+    # 분류 단계
+    # ------------------------------------------------------------------
+
+    def _stage_source_tags(self, data: pd.DataFrame, context: ClassificationContext) -> pd.DataFrame:
+        """기본값 설정 및 O 태그(장비/Knox) 원천별 분류"""
+        for column, value in DEFAULT_COLUMNS.items():
+            if column not in data.columns:
+                data[column] = value
+
+        o_tag_mask = _equals(data, 'INOUT_GB', 'O')
+        count = _assign(data, o_tag_mask, {
+            'activity_code': 'EQUIPMENT_OPERATION',
+            'confidence': 98,
+            'work_area_type': 'Y',
+            'work_status': 'O',
+            'activity_label': 'YO'
+        })
+        if count:
+            self.logger.info(f"O 태그 {count}건을 EQUIPMENT_OPERATION으로 분류")
+
+        if 'Tag_Code' not in data.columns:
+            return data
+
+        _assign(data, _equals(data, 'Tag_Code', 'G3'), {
+            'activity_code': 'G3_MEETING',
+            'confidence': 100,
+            'work_area_type': 'Y',
+            'work_status': 'M',
+            'activity_label': 'YM'
+        })
+
+        o_code_mask = _equals(data, 'Tag_Code', 'O')
+        if o_code_mask.any():
+            if 'source' in data.columns:
+                source = data['source']
+                for source_name, activity_code in (('knox_approval', 'KNOX_APPROVAL'),
+                                                   ('knox_mail', 'KNOX_MAIL'),
+                                                   ('equipment_eam', 'EAM_WORK'),
+                                                   ('equipment_lams', 'LAMS_WORK'),
+                                                   ('equipment_mes', 'MES_WORK')):
+                    _assign(data, o_code_mask & (source == source_name).to_numpy(dtype=bool),
+                            {'activity_code': activity_code})
+            else:
+                data.loc[o_code_mask, 'activity_code'] = 'O_TAG_WORK'
+
+            _assign(data, o_code_mask, {
+                'confidence': 95,
+                'work_area_type': 'Y',
+                'work_status': 'W',
+                'activity_label': 'YW'
+            })
+
+        return data
+
+    def _stage_master_join(self, data: pd.DataFrame, context: ClassificationContext) -> pd.DataFrame:
+        """태깅지점 마스터 조인 (표기명 → DR_NO+INOUT_GB → DR_NO prefix 순)"""
+        master = self._master
+        if master is None:
+            return data
+        context.master_joined = True
+
+        data['DR_NO_str'] = data['DR_NO'].astype(str).str.strip()
+        join_columns = ['DR_NO_str'] + [c for c in MASTER_JOIN_COLUMNS if c in master.columns]
+
+        # INOUT_GB 값 형식을 마스터에 맞춤 (입문/출문 ↔ IN/OUT)
+        if 'INOUT_GB' in data.columns:
+            data['INOUT_GB_ORIGINAL'] = data['INOUT_GB'].copy()
+            data_values = set(data['INOUT_GB'].dropna().unique())
+            master_values = set(master['INOUT_GB'].dropna().unique()) if 'INOUT_GB' in master.columns else set()
+            if '입문' in data_values and 'IN' in master_values:
+                data['INOUT_GB'] = data['INOUT_GB'].replace({'입문': 'IN', '출문': 'OUT'})
+            elif 'IN' in data_values and '입문' in master_values:
+                data['INOUT_GB'] = data['INOUT_GB'].replace({'IN': '입문', 'OUT': '출문'})
+
+        # 1. DR_NM ↔ 표기명, 2. 표기명으로 못 찾으면 DR_NM ↔ 게이트명
+        matched = False
+        if 'DR_NM' in data.columns and '표기명' in master.columns:
+            matched = self._apply_name_lookup(
+                data, '표기명', '_display',
+                ['공간구분_NM', '세부유형_NM', '라벨링_활동', '근무구역여부', '근무', '라벨링', 'INOUT_GB'],
+                only_missing=False)
+        if not matched and 'DR_NM' in data.columns and '게이트명' in master.columns:
+            self._apply_name_lookup(
+                data, '게이트명', '_gate',
+                ['공간구분_NM', '세부유형_NM', '라벨링_활동', '근무구역여부', '근무', '라벨링'],
+                only_missing=True)
+
+        if 'INOUT_GB' in data.columns and 'INOUT_GB' in master.columns:
+            data = data.merge(master[join_columns], on=['DR_NO_str', 'INOUT_GB'],
+                              how='left', suffixes=('', '_master'))
+        else:
+            data = data.merge(master[join_columns], on='DR_NO_str',
+                              how='left', suffixes=('', '_master'))
+
+        self._apply_prefix_match(data, join_columns)
+
+        if 'Tag_Code' in data.columns:
+            matched_count = data['Tag_Code'].notna().sum()
+        elif '근무구역여부' in data.columns:
+            matched_count = data['근무구역여부'].notna().sum()
+        else:
+            matched_count = 0
+        self.logger.info(f"조인 결과: {matched_count}/{len(data)} 매칭됨")
+        return data
+
+    def _apply_name_lookup(self, data: pd.DataFrame, name_column: str, suffix: str,
+                           extra_columns: List[str], only_missing: bool) -> bool:
+        """DR_NM과 마스터 이름 컬럼을 매칭해 이미 있는 컬럼만 갱신 (이름당 첫 마스터 행)"""
+        # 기존 merge(suffixes) 방식과 같이 데이터에 Tag_Code가 있을 때만 갱신
+        if 'Tag_Code' not in data.columns:
+            return False
+
+        master = self._master
+        lookup_columns = [name_column, 'Tag_Code'] + [c for c in extra_columns if c in master.columns]
+        lookup = master[lookup_columns].drop_duplicates(name_column)
+        merged = data[['DR_NM']].merge(lookup, left_on='DR_NM', right_on=name_column, how='left')
+
+        update_mask = merged['Tag_Code'].notna().to_numpy()
+        if only_missing:
+            update_mask &= data['Tag_Code'].isna().to_numpy()
+        if not update_mask.any():
+            return False
+
+        for column in lookup_columns[1:]:
+            if column in data.columns:
+                data.loc[update_mask, column] = merged.loc[update_mask, column].to_numpy()
+        self.logger.info(f"{name_column} 매칭으로 {int(update_mask.sum())}건의 Tag_Code 찾음")
+        return True
+
+    def _apply_prefix_match(self, data: pd.DataFrame, join_columns: List[str]):
+        """
+        마스터에 없는 DR_NO는 앞 두 자리(예: '701-10')가 같고 DR_NM 단어가 겹치는
+        첫 마스터 행으로 보완 ((prefix, DR_NM) 조합당 1회 탐색)
+        """
+        master = self._master
+        if 'Tag_Code' in data.columns:
+            unmatched = data['Tag_Code'].isna().to_numpy()
+        else:
+            unmatched = np.ones(len(data), dtype=bool)
+
+        dr_no = data['DR_NO_str'].to_numpy(dtype=object)
+        has_prefix = np.array(['-' in value for value in dr_no], dtype=bool)
+        positions = np.flatnonzero(unmatched & has_prefix)
+        if len(positions) == 0:
+            return
+
+        self.logger.info(f"매칭되지 않은 {int(unmatched.sum())}건에 대해 prefix 매칭 시도")
+        master_dr_no = master['DR_NO_str']
+        master_words = [str(name).split() for name in master['DR_NM'].to_numpy(dtype=object)] \
+            if 'DR_NM' in master.columns else [[] for _ in range(len(master))]
+
+        dr_nm = data['DR_NM'].to_numpy(dtype=object)
+        candidates_by_prefix: Dict[str, np.ndarray] = {}
+        match_by_key: Dict[Tuple[str, str], int] = {}
+        matches = np.full(len(positions), -1, dtype=np.int64)
+
+        for i, position in enumerate(positions):
+            prefix = '-'.join(dr_no[position].split('-')[:2])
+            name = str(dr_nm[position])
+            key = (prefix, name)
+            if key not in match_by_key:
+                if prefix not in candidates_by_prefix:
+                    candidates_by_prefix[prefix] = np.flatnonzero(master_dr_no.str.startswith(prefix).to_numpy(dtype=bool))
+                match_by_key[key] = next(
+                    (m for m in candidates_by_prefix[prefix] if any(word in name for word in master_words[m])), -1)
+            matches[i] = match_by_key[key]
+
+        found = matches >= 0
+        if not found.any():
+            return
+
+        target_rows = positions[found]
+        master_rows = matches[found]
+        for column in join_columns[1:]:
+            data.loc[data.index[target_rows], column] = master[column].to_numpy(dtype=object)[master_rows]
+        self.logger.info(f"Prefix 매칭 성공: {len(target_rows)}건")
+
+    def _stage_gate_codes(self, data: pd.DataFrame, context: ClassificationContext) -> pd.DataFrame:
+        """정문/스피드게이트 T2/T3 매핑과 Tag_Code(G/N/T) 기본 분류"""
+        if not context.master_joined:
+            return data
+
+        gate_mask = _contains(data['DR_NM'], GATE_PATTERN)
+        gate_entry = gate_mask & _equals(data, 'INOUT_GB', '입문')
+        gate_exit = gate_mask & _equals(data, 'INOUT_GB', '출문')
+
+        if 'Tag_Code' in data.columns:
+            _assign(data, gate_entry, {'Tag_Code': 'T2'})
+            _assign(data, gate_exit, {'Tag_Code': 'T3'})
+
+            data['Tag_Code'] = data['Tag_Code'].fillna('G1')
+            data['space_type'] = data['공간구분_NM'].fillna('근무영역')
+            data['detail_type'] = data['세부유형_NM'].fillna('주업무공간')
+            data['allowed_activities'] = data['라벨링_활동'].fillna('업무, 식사, 휴게')
+
+            tag_code = data['Tag_Code'].astype(str)
+            for prefix, area_type in (('G', 'Y'), ('N', 'N'), ('T', 'T')):
+                data.loc[tag_code.str.startswith(prefix).to_numpy(dtype=bool), 'work_area_type'] = area_type
+        else:
+            if '근무구역여부' in data.columns:
+                data['work_area_type'] = data['근무구역여부'].fillna('Y')
+            if '근무' in data.columns:
+                data['work_status'] = data['근무'].fillna('W')
+            if '라벨링' in data.columns:
+                data['activity_label'] = data['라벨링'].fillna('YW')
+                _assign(data, gate_entry, {'Tag_Code': 'T2'})
+                _assign(data, gate_exit, {'Tag_Code': 'T3'})
+
+        if 'Tag_Code' in data.columns:
+            self._classify_tag_codes(data, context)
+        elif 'activity_label' in data.columns:
+            self._classify_activity_labels(data)
+        return data
+
+    def _classify_tag_codes(self, data: pd.DataFrame, context: ClassificationContext):
+        """Tag_Code별 기본 활동 (T1은 체류시간, T3는 퇴근 시간대 기준)"""
+        tag_code = data['Tag_Code']
+        for code, activity_code in TAG_CODE_ACTIVITIES.items():
+            _assign(data, (tag_code == code).to_numpy(dtype=bool), {'activity_code': activity_code})
+
+        t1_mask = (tag_code == 'T1').to_numpy(dtype=bool)
+        if t1_mask.any():
+            if 'duration_minutes' in data.columns:
+                duration = pd.to_numeric(data['duration_minutes'], errors='coerce').to_numpy(dtype=float)
+                short = np.isnan(duration) | (duration <= 10)
+            else:
+                short = np.ones(len(data), dtype=bool)
+            data.loc[t1_mask & short, 'activity_code'] = 'MOVEMENT'
+            data.loc[t1_mask & ~short, 'activity_code'] = 'WORK'
+
+        t2_mask = (tag_code == 'T2').to_numpy(dtype=bool)
+        if t2_mask.any():
+            values = {'activity_code': 'COMMUTE_IN', 'activity_type': 'commute',
+                      'confidence': 100, 'activity_label': ''}
+            activity_type = get_activity_type('COMMUTE_IN')
+            if activity_type:
+                values['활동분류'] = activity_type.name_ko
+            values['protected_from_meal'] = True
+            _assign(data, t2_mask, values)
+
+        t3_mask = (tag_code == 'T3').to_numpy(dtype=bool)
+        if t3_mask.any():
+            commute_out = _commute_out_hours(data['datetime'].dt.hour.to_numpy(), context.work_type)
+            _assign(data, t3_mask & commute_out, {'activity_code': 'COMMUTE_OUT',
+                                                  'activity_type': 'commute', 'confidence': 100})
+            _assign(data, t3_mask & ~commute_out, {'activity_code': 'MOVEMENT',
+                                                   'activity_type': 'movement'})
+            data.loc[t3_mask, 'protected_from_meal'] = True
+
+    @staticmethod
+    def _classify_activity_labels(data: pd.DataFrame):
+        """라벨링(GM/NM/YW/NN/YM) 기반 분류 (Tag_Code가 없는 이전 마스터 호환)"""
+        label = data['activity_label']
+        for value, activity_code in (('GM', 'MOVEMENT'), ('NM', 'MOVEMENT'), ('YW', 'WORK'), ('NN', 'REST')):
+            _assign(data, (label == value).to_numpy(dtype=bool), {'activity_code': activity_code})
+
+        ym_mask = (label == 'YM').to_numpy(dtype=bool)
+        if ym_mask.any():
+            if 'duration_minutes' in data.columns:
+                duration = pd.to_numeric(data['duration_minutes'], errors='coerce').to_numpy(dtype=float)
+                short = np.isnan(duration) | (duration <= 15)
+            else:
+                short = np.ones(len(data), dtype=bool)
+            data.loc[ym_mask & short, 'activity_code'] = 'MOVEMENT'
+            data.loc[ym_mask & ~short, 'activity_code'] = 'WORK'
+
+    def _stage_meal_windows(self, data: pd.DataFrame, context: ClassificationContext) -> pd.DataFrame:
+        """식사 그룹 전 30분 출문은 이동, 후 30분 첫 입문은 업무 복귀로 사전 설정"""
+        if 'is_actual_meal' not in data.columns:
+            data['is_actual_meal'] = False
+
+        meal_mask = _equals(data, 'INOUT_GB', '식사') | (data['is_actual_meal'] == True).to_numpy(dtype=bool)
+        if meal_mask.any():
+            self._apply_meal_group_windows(data, meal_mask, before_confidence=95, keep_commute_in=False)
+        return data
+
+    @staticmethod
+    def _apply_meal_group_windows(data: pd.DataFrame, meal_mask: np.ndarray,
+                                  before_confidence: int, keep_commute_in: bool):
+        """연속된 식사 그룹별 전후 출문/입문 처리"""
+        times = data['datetime'].to_numpy()
+        exit_mask = _equals(data, 'INOUT_GB', '출문')
+        entry_mask = _equals(data, 'INOUT_GB', '입문')
+        window = np.timedelta64(30, 'm')
+
+        for first, last in _runs(meal_mask):
+            first_time, last_time = times[first], times[last]
+
+            before = exit_mask & (times >= first_time - window) & (times < first_time)
+            _assign(data, before, {'activity_code': 'MOVEMENT', 'confidence': before_confidence})
+
+            after = np.flatnonzero(entry_mask & (times > last_time) & (times <= last_time + window))
+            if len(after):
+                first_entry = data.index[after[0]]
+                if keep_commute_in and data.at[first_entry, 'activity_code'] == 'COMMUTE_IN':
+                    continue
+                data.loc[first_entry, 'activity_code'] = 'WORK'
+                data.loc[first_entry, 'confidence'] = 95
+
+    def _stage_tag_rules(self, data: pd.DataFrame, context: ClassificationContext) -> pd.DataFrame:
+        """태그 코드 규칙과 게이트/식사 보정 (실패 시 이전 단계 결과 유지)"""
+        try:
+            data = self._apply_tag_code_rules(data)
+            self._apply_gate_and_meal_fixes(data, context)
+        except Exception as e:
+            self.logger.warning(f"태그 기반 분류 실패, 규칙 기반으로 대체: {e}")
+        return data
+
+    def _apply_tag_code_rules(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Tag_Code별 확정 규칙 (T2/T3/O/G1~G3/M1/M2/N1, T1 연속 구간)"""
+        tag_code = data['Tag_Code']
+
+        _assign(data, (tag_code == 'T2').to_numpy(dtype=bool), {
+            'activity_code': 'COMMUTE_IN', 'activity_type': 'commute', '활동분류': '출근',
+            'confidence': 100, 'activity_label': ''
+        })
+        _assign(data, (tag_code == 'T3').to_numpy(dtype=bool), {
+            'activity_code': 'COMMUTE_OUT', 'activity_type': 'commute', '활동분류': '퇴근', 'confidence': 100
+        })
+
+        for code, activity_code, default_category, default_name, confidence in (
+                ('O', 'WORK', 'work', '작업', 98),
+                ('G1', 'WORK', 'work', '작업', 85),
+                ('G2', 'WORK_PREPARATION', 'work', '준비', 90)):
+            category, name_ko = self._activity(activity_code, default_category, default_name)
+            _assign(data, (tag_code == code).to_numpy(dtype=bool), {
+                'activity_code': activity_code, 'activity_type': category,
+                '활동분류': name_ko, 'confidence': confidence
+            })
+
+        g3_mask = (tag_code == 'G3').to_numpy(dtype=bool)
+        if g3_mask.any():
+            if 'source' in data.columns:
+                knox_source = (data['source'] == 'knox_pims').to_numpy(dtype=bool)
+                knox_pims_mask = g3_mask & knox_source
+                regular_g3_mask = g3_mask & ~knox_source
+            else:
+                knox_pims_mask = np.zeros(len(data), dtype=bool)
+                regular_g3_mask = g3_mask
+
+            # Knox PIMS 회의는 G3_MEETING으로 고정하고 이후 단계에서 보호
+            _, knox_name = self._activity('G3_MEETING', 'meeting', 'G3회의')
+            _assign(data, knox_pims_mask, {
+                'activity_code': 'G3_MEETING', 'activity_type': 'meeting', '활동분류': knox_name,
+                'confidence': 100, 'is_knox_pims_protected': True
+            })
+
+            if 'is_knox_pims_protected' in data.columns:
+                regular_g3_mask = regular_g3_mask & ~_flag(data['is_knox_pims_protected'])
+            category, name_ko = self._activity('MEETING', 'meeting', '회의')
+            _assign(data, regular_g3_mask, {
+                'activity_code': 'MEETING', 'activity_type': category,
+                '활동분류': name_ko, 'confidence': 95
+            })
+
+        m1_mask = (tag_code == 'M1').to_numpy(dtype=bool)
+        if m1_mask.any():
+            max_duration = self.rule_integration.get_meal_duration('M1', None)
+            to_next = _minutes_to_next(data['datetime'].to_numpy())
+            durations = np.where(np.isnan(to_next), max_duration, np.minimum(to_next, max_duration))
+            data.loc[m1_mask, 'duration_minutes'] = durations[m1_mask]
+            _assign(data, m1_mask, {'activity_code': 'MEAL', 'activity_type': 'meal',
+                                    '활동분류': '식사중', 'confidence': 100})
+
+        m2_mask = (tag_code == 'M2').to_numpy(dtype=bool)
+        if m2_mask.any():
+            _assign(data, m2_mask, {
+                'duration_minutes': self.rule_integration.get_meal_duration('M2', None),
+                'activity_code': 'MEAL', 'activity_type': 'meal', '활동분류': '식사중',
+                'confidence': 100, 'is_takeout': True
+            })
+
+        category, name_ko = self._activity('REST', 'rest', '휴식')
+        _assign(data, (tag_code == 'N1').to_numpy(dtype=bool), {
+            'activity_code': 'REST', 'activity_type': category, '활동분류': name_ko, 'confidence': 90
+        })
+
+        if (tag_code == 'T1').any():
+            data = data.sort_values('datetime').reset_index(drop=True)
+            self._apply_t1_blocks(data)
+
+        # T2가 아닌데 정문 입문으로 찍힌 태그
+        gate_entry_mask = (_equals(data, 'INOUT_GB', '입문')
+                           & _contains(data['DR_NM'], GATE_NAME_PATTERN)
+                           & (data['Tag_Code'] != 'T2').to_numpy(dtype=bool))
+        category, name_ko = self._activity('COMMUTE_IN', 'movement', '출근')
+        _assign(data, gate_entry_mask, {
+            'activity_code': 'COMMUTE_IN', 'activity_type': category, '활동분류': name_ko, 'confidence': 95
+        })
+        return data
+
+    def _apply_t1_blocks(self, data: pd.DataFrame):
+        """
+        연속(인접 행 또는 5분 이내) T1 태그 블록 판정
+        30분 이상 머문 블록은 꼬리물기로 보고 업무, 짧은 블록은 이동
+        """
+        positions = np.flatnonzero((data['Tag_Code'] == 'T1').to_numpy(dtype=bool))
+        times = data['datetime'].to_numpy()
+
+        gaps = (times[positions[1:]] - times[positions[:-1]]) / MINUTE
+        continues = (np.diff(positions) == 1) | (gaps <= 5)
+        starts = np.concatenate(([0], np.flatnonzero(~continues) + 1))
+        ends = np.append(starts[1:], len(positions)) - 1
+
+        blocks = ends > starts
+        if not blocks.any():
+            return
+        starts, ends = starts[blocks], ends[blocks]
+
+        spans = (times[positions[ends]] - times[positions[starts]]) / MINUTE
+        work_category, work_name = self._activity('WORK', 'work', '작업')
+        move_category, move_name = self._activity('MOVEMENT', 'movement', '이동')
+
+        for start, end, span in zip(starts, ends, spans):
+            rows = np.zeros(len(data), dtype=bool)
+            rows[positions[start:end + 1]] = True
+            if span >= 30:
+                _assign(data, rows, {'activity_code': 'WORK', 'activity_type': work_category,
+                                     '활동분류': work_name, 'confidence': 85 if span >= 120 else 60})
+            else:
+                _assign(data, rows, {'activity_code': 'MOVEMENT', 'activity_type': move_category,
+                                     '활동분류': move_name, 'confidence': 85})
+
+    def _apply_gate_and_meal_fixes(self, data: pd.DataFrame, context: ClassificationContext):
+        """식사 오분류/게이트 출퇴근 시간대/식사 전후 출입문 보정"""
+        meal_codes = data['activity_code'].isin(MEAL_ACTIVITY_CODES).to_numpy(dtype=bool)
+        hours = data['datetime'].dt.hour.to_numpy()
+
+        # 실제 식사 태그 없이 식사로 분류된 경우
+        if 'is_actual_meal' in data.columns:
+            false_meal_mask = meal_codes & ~_flag(data['is_actual_meal'])
+            if false_meal_mask.any():
+                gate_in_mask = false_meal_mask & _contains(data['DR_NM'], GATE_ENTRY_PATTERN)
+                _assign(data, gate_in_mask, {'activity_code': 'COMMUTE_IN', 'confidence': 100})
+                _assign(data, false_meal_mask & ~gate_in_mask, {'activity_code': 'WORK', 'confidence': 85})
+
+        # 게이트 입문은 출근 시간대면 출근, 아니면 이동
+        speed_gate_mask = _contains(data['DR_NM'], GATE_ENTRY_PATTERN)
+        commute_in = _commute_in_hours(hours, context.work_type)
+        _assign(data, speed_gate_mask & commute_in, {'activity_code': 'COMMUTE_IN', 'confidence': 100})
+        _assign(data, speed_gate_mask & ~commute_in, {'activity_code': 'MOVEMENT', 'confidence': 90})
+
+        # 게이트 출문은 퇴근 시간대만 퇴근
+        gate_exit_mask = _contains(data['DR_NM'], GATE_EXIT_PATTERN)
+        _assign(data, gate_exit_mask & _commute_out_hours(hours, context.work_type),
+                {'activity_code': 'COMMUTE_OUT', 'confidence': 100})
+
+        # 식사 그룹 전후 출문/입문
+        meal_mask = (data['activity_code'].isin(MEAL_ACTIVITY_CODES).to_numpy(dtype=bool)
+                     | _equals(data, 'INOUT_GB', '식사'))
+        if not meal_mask.any():
+            return
+        self._apply_meal_group_windows(data, meal_mask, before_confidence=90, keep_commute_in=True)
+
+        # 각 식사 후 30분 이내 첫 입문(출근 제외)은 업무 복귀
+        times = data['datetime'].to_numpy()
+        entry_mask = _equals(data, 'INOUT_GB', '입문')
+        window = np.timedelta64(30, 'm')
+        for meal_position in np.flatnonzero(meal_mask):
+            meal_time = times[meal_position]
+            candidates = np.flatnonzero(entry_mask & (times > meal_time) & (times <= meal_time + window)
+                                        & (data['activity_code'] != 'COMMUTE_IN').to_numpy(dtype=bool))
+            if len(candidates):
+                data.loc[data.index[candidates[0]], ['activity_code', 'confidence']] = ['WORK', 95]
+
+    def _stage_commute_protection(self, data: pd.DataFrame, context: ClassificationContext) -> pd.DataFrame:
+        """T2/T3 출퇴근 고정 및 Tag_Code별 신뢰도"""
+        if 'Tag_Code' not in data.columns:
+            return data
+
+        self._protect_commute_tags(data)
+        tag_code = data['Tag_Code']
+        for codes, confidence in TAG_CODE_CONFIDENCE:
+            data.loc[tag_code.isin(codes).to_numpy(dtype=bool), 'confidence'] = confidence
+        return data
+
+    def _protect_commute_tags(self, data: pd.DataFrame):
+        """T2는 출근, T3는 퇴근으로 강제"""
+        activity_code = data['activity_code']
+        for code, commute_code in (('T2', 'COMMUTE_IN'), ('T3', 'COMMUTE_OUT')):
+            wrong = ((data['Tag_Code'] == code) & (activity_code != commute_code)).to_numpy(dtype=bool)
+            count = _assign(data, wrong, {'activity_code': commute_code, 'activity_type': 'commute',
+                                          'confidence': 100})
+            if count and code == 'T3':
+                self.logger.warning(f"T3 태그 {count}건을 COMMUTE_OUT으로 수정")
+
+    def _stage_meal_tags(self, data: pd.DataFrame, context: ClassificationContext) -> pd.DataFrame:
+        """M1/M2 식사 태그 시간 계산과 테이크아웃 판별"""
+        if 'Tag_Code' in data.columns:
+            tag_code = data['Tag_Code']
+            m1_mask = (tag_code == 'M1').to_numpy(dtype=bool)
+            m2_mask = (tag_code == 'M2').to_numpy(dtype=bool)
+
+            if m1_mask.any() or m2_mask.any():
+                max_duration = self.rule_integration.get_meal_duration('M1', None)
+                to_next = _minutes_to_next(data['datetime'].to_numpy())
+                durations = np.where(np.isnan(to_next), max_duration, np.minimum(to_next, max_duration))
+                durations[m2_mask] = self.rule_integration.get_meal_duration('M2', None)
+
+                meal_mask = m1_mask | m2_mask
+                data.loc[meal_mask, 'duration_minutes'] = durations[meal_mask]
+                _assign(data, meal_mask, {'activity_code': 'MEAL', '활동분류': '식사중', 'confidence': 100,
+                                          'is_actual_meal': True, 'activity_type': 'meal'})
+                _assign(data, m2_mask, {'is_takeout': True})
+
+        if 'is_actual_meal' not in data.columns:
+            data['is_actual_meal'] = False
+
+        takeout_mask = _equals(data, 'INOUT_GB', '식사') & _contains(data['DR_NM'], '테이크아웃')
+        _assign(data, takeout_mask, {'is_takeout': True})
+
+        if 'Tag_Code' in data.columns:
+            meal_g1 = (data['activity_code'].isin(MEAL_ACTIVITY_CODES) & (data['Tag_Code'] == 'G1')).to_numpy(dtype=bool)
+            _assign(data, meal_g1, {'confidence': 95})
+        return data
+
+    def _stage_equipment(self, data: pd.DataFrame, context: ClassificationContext) -> pd.DataFrame:
+        """장비 사용 로그 시각에 가장 가까운 태그(±5분)와 같은 위치 전후 10분을 장비 조작으로"""
+        equipment_data = context.equipment_data
+        if equipment_data is None or equipment_data.empty:
+            return data
+
+        self.logger.info(f"장비 사용 데이터 {len(equipment_data)}건을 활동 분류에 반영합니다.")
+        equip_times = pd.to_datetime(equipment_data['timestamp']).to_numpy()
+        if 'system_type' in equipment_data.columns:
+            system_types = equipment_data['system_type'].to_numpy(dtype=object)
+        elif 'system' in equipment_data.columns:
+            system_types = equipment_data['system'].to_numpy(dtype=object)
+        else:
+            system_types = np.full(len(equipment_data), '', dtype=object)
+
+        times = data['datetime'].to_numpy()
+        dr_no = data['DR_NO'].to_numpy(dtype=object)
+        near, session = np.timedelta64(5, 'm'), np.timedelta64(10, 'm')
+
+        # 앞선 장비 로그의 결과(WORK → 장비 조작)가 다음 로그의 세션 판정에 반영되므로 순서대로 처리
+        for equip_time, system_type in zip(equip_times, system_types):
+            nearby = np.flatnonzero((times >= equip_time - near) & (times <= equip_time + near))
+            if len(nearby) == 0:
+                continue
+
+            closest = nearby[np.argmin(np.abs(times[nearby] - equip_time))]
+            closest_label = data.index[closest]
+            data.loc[closest_label, ['activity_code', 'confidence']] = ['EQUIPMENT_OPERATION', 98]
+            data.loc[closest_label, 'equipment_type'] = system_type
+
+            session_mask = ((times >= equip_time - session) & (times <= equip_time + session)
+                            & (dr_no == dr_no[closest])
+                            & (data['activity_code'] == 'WORK').to_numpy(dtype=bool))
+            _assign(data, session_mask, {'activity_code': 'EQUIPMENT_OPERATION', 'confidence': 95,
+                                         'equipment_type': system_type})
+        return data
+
+    def _stage_location_rules(self, data: pd.DataFrame, context: ClassificationContext) -> pd.DataFrame:
+        """위치명 키워드 기반 세부 분류 (회의실/운동실/장비실/준비실/휴게실)"""
+        dr_nm = data['DR_NM']
+        has_tag_code = 'Tag_Code' in data.columns
+
+        for pattern, activity_code, exempt_code, confidence in (
+                ('MEETING|회의|CONFERENCE', 'MEETING', 'G3', 88),
+                ('FITNESS|GYM|체력단련|운동실', 'FITNESS', 'N2', 87)):
+            mask = _contains(dr_nm, pattern)
+            data.loc[mask, 'activity_code'] = activity_code
+            if has_tag_code:
+                data.loc[mask & (data['Tag_Code'] != exempt_code).to_numpy(dtype=bool), 'confidence'] = confidence
+
+        for pattern, activity_code in (('EQUIPMENT|MACHINE|장비|기계실', 'EQUIPMENT_OPERATION'),
+                                       ('PREP|준비실|SETUP', 'WORK_PREPARATION')):
+            mask = _contains(dr_nm, pattern) & (data['activity_code'] == 'WORK').to_numpy(dtype=bool)
+            data.loc[mask, 'activity_code'] = activity_code
+
+        rest_mask = _contains(dr_nm, 'REST|LOUNGE|휴게실|탈의실')
+        data.loc[rest_mask, 'activity_code'] = 'REST'
+        if has_tag_code:
+            data.loc[rest_mask & (data['Tag_Code'] != 'N1').to_numpy(dtype=bool), 'confidence'] = 86
+        return data
+
+    def _stage_durations(self, data: pd.DataFrame, context: ClassificationContext) -> pd.DataFrame:
+        """체류시간 계산 (M1/M2, Knox PIMS 시간은 유지), 식사 직전 업무 종료 시각 조정 후 시간순 재정렬"""
+        preserved = self._preserved_durations(data, knox_column='knox_duration', require_tag_code=False)
+        times = data['datetime'].to_numpy()
+        to_next = _minutes_to_next(times)
+
+        data['next_time'] = data['datetime'].shift(-1)
+        durations = np.where(np.isnan(to_next), 5.0, to_next)
+        if len(durations):
+            durations[-1] = 5
+        data['duration_minutes'] = durations
+        self._restore_durations(data, preserved)
+
+        # O 태그(장비 사용)는 10분, 다음 태그가 30분 이내면 그 시간
+        o_positions = np.flatnonzero(_equals(data, 'INOUT_GB', 'O'))
+        if len(o_positions):
+            o_durations = np.full(len(o_positions), 10.0)
+            has_next = o_positions < len(data) - 1
+            next_minutes = to_next[o_positions]
+            use_next = has_next & (next_minutes < 30)
+            o_durations[use_next] = next_minutes[use_next]
+            data.loc[data.index[o_positions], 'duration_minutes'] = o_durations
+
+        # 식사 직전 업무는 식사 시작 시각에 종료
+        meal_mask = data['activity_code'].isin(MEAL_ACTIVITY_CODES).to_numpy(dtype=bool)
+        if meal_mask.any():
+            previous_work = np.zeros(len(data), dtype=bool)
+            previous_work[1:] = data['activity_code'].isin(['WORK', 'FOCUSED_WORK', 'EQUIPMENT_OPERATION']).to_numpy()[:-1]
+            meal_positions = np.flatnonzero(meal_mask & previous_work)
+            if len(meal_positions):
+                previous_labels = data.index[meal_positions - 1]
+                data.loc[previous_labels, 'next_time'] = data['datetime'].to_numpy()[meal_positions]
+                data.loc[previous_labels, 'duration_minutes'] = (times[meal_positions] - times[meal_positions - 1]) / MINUTE
+
+            actual_meal = meal_mask & _truthy(data['is_actual_meal'])
+            if actual_meal.any():
+                if 'meal_location' in data.columns:
+                    has_location = actual_meal & data['meal_location'].notna().to_numpy()
+                    data.loc[has_location, 'DR_NM'] = data.loc[has_location, 'meal_location']
+                else:
+                    has_location = np.zeros(len(data), dtype=bool)
+                cafeteria = _contains(data['DR_NM'].astype(str), 'BP|식당|CAFETERIA', case=True)
+                data.loc[actual_meal & ~has_location & ~cafeteria, 'DR_NM'] = 'BP_CAFETERIA'
+
+        return data.sort_values('datetime').reset_index(drop=True)
+
+    def _stage_focused_work(self, data: pd.DataFrame, context: ClassificationContext) -> pd.DataFrame:
+        """재정렬된 데이터의 체류시간 재계산과 집중근무 판별"""
+        # M1/M2, Knox PIMS 시간은 유지
+        preserved = self._preserved_durations(data, knox_column='duration_minutes', require_tag_code=True)
+        to_next = _minutes_to_next(data['datetime'].to_numpy())
+        data['next_time'] = data['datetime'].shift(-1)
+        data['duration_minutes'] = np.where(np.isnan(to_next), 5.0, to_next)
+        self._restore_durations(data, preserved)
+
+        # 작업 구역에서 30분 이상 업무는 집중근무 (추론이므로 신뢰도 83)
+        focused_work_mask = ((data['activity_code'] == 'WORK').to_numpy(dtype=bool)
+                             & (data['duration_minutes'] >= 30).to_numpy(dtype=bool)
+                             & _contains(data['DR_NM'], 'WORK_AREA'))
+        data.loc[focused_work_mask, 'activity_code'] = 'FOCUSED_WORK'
+        data.loc[focused_work_mask & (data['confidence'] > 85).to_numpy(dtype=bool), 'confidence'] = 83
+        return data
+
+    @staticmethod
+    def _preserved_durations(data: pd.DataFrame, knox_column: str,
+                             require_tag_code: bool) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """재계산에서 유지할 (마스크, 값) 목록 - M1/M2 식사 시간과 Knox PIMS 회의 시간"""
+        preserved = []
+        if require_tag_code or 'Tag_Code' in data.columns:
+            meal_mask = data['Tag_Code'].isin(['M1', 'M2']).to_numpy(dtype=bool)
+            if meal_mask.any() and 'duration_minutes' in data.columns:
+                preserved.append((meal_mask, data['duration_minutes'].to_numpy()[meal_mask]))
+
+        knox_mask = _equals(data, 'source', 'knox_pims')
+        if knox_mask.any() and knox_column in data.columns:
+            preserved.append((knox_mask, data[knox_column].to_numpy()[knox_mask]))
+        return preserved
+
+    @staticmethod
+    def _restore_durations(data: pd.DataFrame, preserved: List[Tuple[np.ndarray, np.ndarray]]):
+        """_preserved_durations로 보관한 시간 복원"""
+        for mask, values in preserved:
+            data.loc[mask, 'duration_minutes'] = values
+
+    def _stage_non_work(self, data: pd.DataFrame, context: ClassificationContext) -> pd.DataFrame:
+        """꼬리물기, 활동 타입 매핑, 출문-재입문 외출, 비근무구역 체류"""
+        times = data['datetime'].to_numpy()
+
+        # 식사 30분 전 T3 출문부터 식사 직전까지 꼬리물기(비근무)
+        meal_positions = np.flatnonzero(data['activity_code'].isin(MEAL_ACTIVITY_CODES).to_numpy(dtype=bool))
+        t3_mask = _equals(data, 'INOUT_GB', 'T3')
+        for meal_position in meal_positions[meal_positions > 0]:
+            meal_time = times[meal_position]
+            gate_out = np.flatnonzero(t3_mask & (times >= meal_time - np.timedelta64(30, 'm')) & (times < meal_time))
+            if len(gate_out):
+                rows = np.zeros(len(data), dtype=bool)
+                rows[gate_out[-1]:meal_position] = True
+                data.loc[rows, 'activity_code'] = 'NON_WORK'
+                if 'is_tailgating' not in data.columns:
+                    data['is_tailgating'] = False
+                data.loc[rows, 'is_tailgating'] = True
+
+        # 활동 타입 매핑 (Knox PIMS 보호 항목은 유지)
+        mapped_types = data['activity_code'].map(ACTIVITY_TYPE_MAPPING).fillna('work')
+        if 'is_knox_pims_protected' in data.columns:
+            non_protected = ~_flag(data['is_knox_pims_protected'])
+            data.loc[non_protected, 'activity_type'] = mapped_types[non_protected]
+        else:
+            data['activity_type'] = mapped_types
+
+        # 출문(T3) 직후 재입문(T2)은 두 태그 모두 비근무 (3시간 이상이면 신뢰도 95)
+        if 'Tag_Code' in data.columns and len(data) > 1:
+            tag_code = data['Tag_Code'].to_numpy(dtype=object)
+            pair_starts = np.flatnonzero((tag_code[:-1] == 'T3') & (tag_code[1:] == 'T2'))
+            if len(pair_starts):
+                gap_hours = (times[pair_starts + 1] - times[pair_starts]) / np.timedelta64(1, 'h')
+                short_outing = (gap_hours > 0) & (gap_hours < 3)
+                rows = np.concatenate([pair_starts, pair_starts + 1])
+                confidence = np.tile(np.where(short_outing, 90, 95), 2)
+                labels = data.index[rows]
+                data.loc[labels, 'activity_code'] = 'NON_WORK'
+                data.loc[labels, 'confidence'] = confidence
+                data.loc[labels, 'activity_type'] = 'non_work'
+
+        # 비근무구역(N) 연속 체류 10분 이상은 비근무
+        if 'work_area_type' in data.columns:
+            area = data['work_area_type']
+            run_starts = np.flatnonzero((area != area.shift()).to_numpy(dtype=bool))
+            run_ends = np.append(run_starts[1:], len(data)) - 1
+            non_work_runs = (area.to_numpy(dtype=object)[run_starts] == 'N')
+
+            for start, end in zip(run_starts[non_work_runs], run_ends[non_work_runs]):
+                if end > start:
+                    duration = (times[end] - times[start]) / MINUTE
+                elif end + 1 < len(data):
+                    duration = (times[end + 1] - times[start]) / MINUTE
+                else:
+                    duration = 5
+                if duration >= 10:
+                    labels = data.index[start:end + 1]
+                    data.loc[labels, ['activity_code', 'confidence', 'activity_type']] = ['NON_WORK', 85, 'non_work']
+        return data
+
+    def _stage_final_protection(self, data: pd.DataFrame, context: ClassificationContext) -> pd.DataFrame:
+        """출입문 식사 오분류 복구, 빈 활동 타입 재매핑, T2/T3 최종 보호"""
+        hours = data['datetime'].dt.hour.to_numpy()
+        meal_codes = data['activity_code'].isin(MEAL_ACTIVITY_CODES).to_numpy(dtype=bool)
+        exit_mask = _equals(data, 'INOUT_GB', '출문')
+        entry_mask = _equals(data, 'INOUT_GB', '입문')
+
+        # 출입문 태그는 식사가 아님
+        wrong_classification = (exit_mask | entry_mask) & meal_codes
+        if wrong_classification.any():
+            dr_nm = data['DR_NM'].astype(str)
+            is_gate = (dr_nm.str.upper().str.contains('SPEED GATE', regex=False)
+                       | dr_nm.str.contains('정문', regex=False)).to_numpy(dtype=bool)
+            wrong_entry = wrong_classification & entry_mask
+            commute_entry = wrong_entry & is_gate & _commute_in_hours(hours, context.work_type)
+
+            _assign(data, wrong_classification & exit_mask, {'activity_code': 'MOVEMENT', 'activity_type': 'movement'})
+            _assign(data, commute_entry, {'activity_code': 'COMMUTE_IN', 'activity_type': 'commute'})
+            _assign(data, wrong_entry & ~commute_entry, {'activity_code': 'WORK', 'activity_type': 'work'})
+            data.loc[wrong_classification, 'confidence'] = 100
+
+        # 출근 시간대 정문 입문이 식사로 남아 있으면 출근
+        if context.work_type == 'night_shift':
+            commute_time_mask = (hours >= 17) & (hours <= 22)
+        else:
+            commute_time_mask = (hours >= 5) & (hours <= 10)
+        meal_gate_entries = (entry_mask & _contains(data['DR_NM'], GATE_NAME_PATTERN) & commute_time_mask
+                             & data['activity_code'].isin(MEAL_ACTIVITY_CODES).to_numpy(dtype=bool))
+        _assign(data, meal_gate_entries, {'activity_code': 'COMMUTE_IN', 'activity_type': 'commute', 'confidence': 100})
+
+        empty_type_mask = (data['activity_type'].isna() | (data['activity_type'] == '')).to_numpy(dtype=bool)
+        if empty_type_mask.any():
+            data.loc[empty_type_mask, 'activity_type'] = (
+                data.loc[empty_type_mask, 'activity_code'].map(ACTIVITY_TYPE_MAPPING).fillna('work'))
+
+        if 'Tag_Code' in data.columns:
+            self._protect_commute_tags(data)
+        return data
+
+    def _finalize_on_error(self, data: pd.DataFrame) -> pd.DataFrame:
+        """분류 실패 시 필수 컬럼 기본값과 Knox PIMS 회의 보호만 적용"""
+        if 'activity_code' not in data.columns:
+            data['activity_code'] = 'WORK'
+        if 'activity_type' not in data.columns:
+            mapped_types = data['activity_code'].map(FALLBACK_ACTIVITY_TYPE_MAPPING).fillna('work')
+            if 'is_knox_pims_protected' in data.columns:
+                non_protected = ~_flag(data['is_knox_pims_protected'])
+                data.loc[non_protected, 'activity_type'] = mapped_types[non_protected]
+            else:
+                data['activity_type'] = mapped_types
+        if 'duration_minutes' not in data.columns:
+            data['duration_minutes'] = 5
+        if 'confidence' not in data.columns:
+            data['confidence'] = 80
+
+        if 'is_knox_pims_protected' in data.columns:
+            protected = _flag(data['is_knox_pims_protected'])
+            if protected.any():
+                wrong_activity = protected & (data['activity_code'] != 'G3_MEETING').to_numpy(dtype=bool)
+                count = _assign(data, wrong_activity, {'activity_code': 'G3_MEETING',
+                                                       'activity_type': 'meeting', '활동분류': 'G3회의'})
+                if count:
+                    self.logger.warning(f"Knox PIMS {count}건이 잘못 변경되어 복원됨")
+
+                if 'knox_duration' in data.columns:
+                    with_duration = protected & data['knox_duration'].notna().to_numpy()
+                    data.loc[with_duration, 'duration_minutes'] = data.loc[with_duration, 'knox_duration']
+        return data
+
+    # ------------------------------------------------------------------
+    # 시간 간격 채우기
+    # ------------------------------------------------------------------
+
+    def fill_time_gaps(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        태그 사이의 시간 간격을 채워 연속적인 활동 데이터 생성
+
+        - 체류시간은 다음 태그까지 (60분 초과 간격은 5분, 마지막 태그 5분)
+        - Knox PIMS 보호 항목은 knox_duration 유지
+        - 출문(T3) 직후 재입문(T2)이면 출문 5분 뒤부터 비근무 행을 추가
+        """
+        if data.empty:
+            return data
+
+        stage_start = time.perf_counter()
+        data = data.sort_values('datetime').reset_index(drop=True)
+        n = len(data)
+        times = data['datetime'].to_numpy()
+        # 재입문 행의 식사 여부는 보정 전 값으로 판단
+        activity_code = data['activity_code'].to_numpy(dtype=object, copy=True) if 'activity_code' in data.columns \
+            else np.full(n, None, dtype=object)
+
+        to_next = _minutes_to_next(times)
+        durations = np.where(np.isnan(to_next) | (to_next > 60), 5.0, to_next)
+        durations[-1] = 5
+
+        if 'is_knox_pims_protected' in data.columns and 'knox_duration' in data.columns:
+            knox_duration = pd.to_numeric(data['knox_duration'], errors='coerce').to_numpy(dtype=float)
+            knox_protected = _truthy(data['is_knox_pims_protected']) & ~np.isnan(knox_duration)
+        else:
+            knox_duration = np.full(n, np.nan)
+            knox_protected = np.zeros(n, dtype=bool)
+
+        # 장비 사용은 10~30분
+        equipment_mask = _equals(data, 'INOUT_GB', 'O') | (activity_code == 'EQUIPMENT_OPERATION')
+        durations[equipment_mask] = np.clip(durations[equipment_mask], 10, 30)
+
+        # 실제 식사 태그가 있는 식사만 식사 시간(테이크아웃 10분, 최대 60분), 없으면 업무
+        meal_mask = np.isin(activity_code, MEAL_ACTIVITY_CODES)
+        if meal_mask.any():
+            actual_meal = _truthy(data['is_actual_meal']) if 'is_actual_meal' in data.columns \
+                else np.zeros(n, dtype=bool)
+            takeout = _truthy(data['is_takeout']) if 'is_takeout' in data.columns else np.zeros(n, dtype=bool)
+            durations[meal_mask & actual_meal & takeout] = 10
+            long_meal = meal_mask & actual_meal & ~takeout & (durations > 60)
+            durations[long_meal] = 60
+
+            false_meal = meal_mask & ~actual_meal
+            _assign(data, false_meal, {'activity_code': 'WORK', 'activity_type': 'work', 'confidence': 85})
+
+        data['duration_minutes'] = np.where(knox_protected, knox_duration, durations)
+
+        # 출문(T3) → 재입문(T2) 사이 비근무 행
+        gap_rows = pd.DataFrame()
+        if 'Tag_Code' in data.columns and n > 1:
+            tag_code = data['Tag_Code'].to_numpy(dtype=object)
+            exits = np.flatnonzero((tag_code[:-1] == 'T3') & (tag_code[1:] == 'T2') & (to_next[:-1] > 5))
+            if len(exits):
+                data.loc[exits, 'duration_minutes'] = 5
+
+                gap_rows = data.iloc[exits].copy()
+                gap_rows['datetime'] = gap_rows['datetime'] + pd.Timedelta(minutes=5)
+                gap_rows['duration_minutes'] = to_next[exits] - 10
+                non_work = ~np.isin(activity_code[exits + 1], MEAL_ACTIVITY_CODES)
+                _assign(gap_rows, non_work, {'activity_code': 'NON_WORK', 'activity_type': 'non_work',
+                                             'confidence': 90})
+
+        if not gap_rows.empty:
+            # 비근무 행은 해당 출문 바로 뒤에 위치 (인덱스는 출문 행과 동일)
+            combined = pd.concat([data, gap_rows])
+            order = np.lexsort((np.r_[np.zeros(n), np.ones(len(gap_rows))], combined.index.to_numpy()))
+            data = combined.iloc[order]
+
+        self.stage_timings['gap_fill'] = time.perf_counter() - stage_start
+        return data
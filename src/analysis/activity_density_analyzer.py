@@ -5,10 +5,15 @@
 
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict, List, Tuple, Optional
 import logging
 
+from .activity_kernels import (
+    NS_PER_MINUTE, group_codes, idle_gaps, real_activity_mask, timestamps_ns,
+    first_rows_in_windows, window_counts
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -39,40 +44,28 @@ class ActivityDensityAnalyzer:
         self.TAILGATING_THRESHOLD_HOURS = 2
     
     def calculate_activity_density(self, data: pd.DataFrame, 
-                                  window_minutes: int = 30) -> pd.Series:
+                                  window_minutes: int = 30,
+                                  employee_column: Optional[str] = None) -> pd.Series:
         """
         시간 윈도우 기반 활동 밀도 계산
         
         Args:
             data: 태그 데이터
             window_minutes: 윈도우 크기 (기본 30분)
+            employee_column: 직원 구분 컬럼 (지정하면 같은 직원의 활동만 셈)
             
         Returns:
             활동 밀도 Series (시간당 활동 횟수)
         """
-        activity_density = []
+        times, valid = timestamps_ns(data['timestamp'])
+        half_window_ns = int(pd.Timedelta(minutes=window_minutes / 2).value)
         
-        for i in range(len(data)):
-            row = data.iloc[i]
-            window_start = row['timestamp'] - timedelta(minutes=window_minutes/2)
-            window_end = row['timestamp'] + timedelta(minutes=window_minutes/2)
-            
-            # 윈도우 내 실제 활동 카운트
-            actual_activities = data[
-                (data['timestamp'] >= window_start) & 
-                (data['timestamp'] <= window_end) &
-                (
-                    (data['INOUT_GB'] == 'O') |  # 장비 조작
-                    (data['source'].isin(['Knox_Approval', 'Knox_Mail', 'EAM', 'LAMS', 'MES'])) |  # 시스템 활동
-                    (data['Tag_Code'] == 'G3')  # 회의
-                )
-            ]
-            
-            # 시간당 활동 수로 변환
-            density = len(actual_activities) / (window_minutes / 60)
-            activity_density.append(density)
+        # 윈도우 내 실제 활동 카운트
+        counts = window_counts(times, valid, real_activity_mask(data), group_codes(data, employee_column),
+                               half_window_ns)
         
-        return pd.Series(activity_density, index=data.index)
+        # 시간당 활동 수로 변환
+        return pd.Series(counts / (window_minutes / 60), index=data.index)
     
     def classify_density_level(self, density: float) -> str:
         """활동 밀도 레벨 분류"""
@@ -85,118 +78,127 @@ class ActivityDensityAnalyzer:
         else:
             return 'idle'
     
-    def detect_idle_periods(self, data: pd.DataFrame) -> List[Dict]:
+    def detect_idle_periods(self, data: pd.DataFrame,
+                            employee_column: Optional[str] = None) -> List[Dict]:
         """
         무활동 구간 감지
         
+        Args:
+            data: 태그 데이터 (직원별로는 행 순서가 시간 순서)
+            employee_column: 직원 구분 컬럼 (지정하면 직원별로 감지하고 employee 키 추가)
+        
         Returns:
             무활동 구간 리스트
         """
+        times, valid = timestamps_ns(data['timestamp'])
+        groups = group_codes(data, employee_column)
+        starts, ends, gaps = idle_gaps(times, valid, real_activity_mask(data), groups,
+                                       self.IDLE_THRESHOLD_MINUTES)
+        
+        # 구간 사이 행 위치 (같은 직원 안에서 행 순서)
+        order = np.argsort(groups, kind='stable')
+        rank = np.empty(len(order), dtype=np.int64)
+        rank[order] = np.arange(len(order))
+        
         idle_periods = []
-        last_activity_time = None
-        last_activity_idx = None
-        
-        for i, row in data.iterrows():
-            # 실제 활동인지 확인
-            is_real_activity = (
-                row.get('INOUT_GB') == 'O' or  # 장비 조작
-                row.get('source') in ['Knox_Approval', 'Knox_Mail', 'EAM', 'LAMS', 'MES'] or
-                row.get('Tag_Code') == 'G3'  # 회의
-            )
+        for start, end, gap_minutes in zip(starts, ends, gaps):
+            # 무활동 구간 동안 가장 빈번한 위치 (첫/끝 제외)
+            main_location = 'Unknown'
+            if 'DR_NM' in data.columns:
+                between = order[rank[start] + 1:rank[end]]
+                location_counts = data['DR_NM'].iloc[between].value_counts()
+                if len(location_counts) > 0:
+                    main_location = location_counts.index[0]
             
-            if is_real_activity:
-                if last_activity_time is not None:
-                    gap_minutes = (row['timestamp'] - last_activity_time).total_seconds() / 60
-                    
-                    if gap_minutes > self.IDLE_THRESHOLD_MINUTES:
-                        # 무활동 구간 동안의 위치 파악
-                        idle_data = data.loc[last_activity_idx:i]
-                        if len(idle_data) > 2:  # 첫/끝 제외하고 중간 데이터가 있으면
-                            idle_data = idle_data.iloc[1:-1]  # 첫/끝 제외
-                            
-                            # 가장 빈번한 위치
-                            if not idle_data.empty and 'DR_NM' in idle_data.columns:
-                                location_counts = idle_data['DR_NM'].value_counts()
-                                main_location = location_counts.index[0] if len(location_counts) > 0 else 'Unknown'
-                            else:
-                                main_location = 'Unknown'
-                            
-                            idle_periods.append({
-                                'start': last_activity_time,
-                                'end': row['timestamp'],
-                                'duration_minutes': gap_minutes,
-                                'location': main_location,
-                                'start_idx': last_activity_idx,
-                                'end_idx': i
-                            })
-                
-                last_activity_time = row['timestamp']
-                last_activity_idx = i
+            period = {
+                'start': data['timestamp'].iloc[start],
+                'end': data['timestamp'].iloc[end],
+                'duration_minutes': float(gap_minutes),
+                'location': main_location,
+                'start_idx': data.index[start],
+                'end_idx': data.index[end]
+            }
+            if employee_column is not None:
+                period['employee'] = data[employee_column].iloc[start]
+            idle_periods.append(period)
         
         return idle_periods
     
-    def detect_tailgating_patterns(self, data: pd.DataFrame) -> List[Dict]:
+    def detect_tailgating_patterns(self, data: pd.DataFrame,
+                                   employee_column: Optional[str] = None) -> List[Dict]:
         """
         꼬리물기 패턴 감지
         
+        Args:
+            data: 태그 데이터
+            employee_column: 직원 구분 컬럼 (지정하면 같은 직원의 이후 태그만 보고 employee 키 추가)
+        
         Returns:
             꼬리물기 의심 구간 리스트
         """
-        tailgating_suspects = []
+        if 'Tag_Code' not in data.columns or len(data) < 2:
+            return []
+        
+        times, valid = timestamps_ns(data['timestamp'])
+        groups = group_codes(data, employee_column)
+        
+        # T2(입문) 태그 (직원별 마지막 행 제외)
+        order = np.argsort(groups, kind='stable')
+        is_last = np.zeros(len(data), dtype=bool)
+        is_last[order] = np.r_[groups[order][1:] != groups[order][:-1], True]
+        entries = np.flatnonzero((data['Tag_Code'] == 'T2').to_numpy(dtype=bool) & ~is_last)
+        
+        # 이후 2시간 내 첫 태그 (그 사이 실제 활동이 있으면 제외)
+        window_ns = self.TAILGATING_THRESHOLD_HOURS * 60 * NS_PER_MINUTE
+        activities = real_activity_mask(data, include_meetings=False)
+        next_rows = first_rows_in_windows(times, valid, groups, entries, window_ns, activities)
         
-        for i in range(len(data) - 1):
-            curr = data.iloc[i]
+        tailgating_suspects = []
+        for entry, next_row in zip(entries, next_rows):
+            if next_row is None:
+                continue
             
-            # T2(입문) 태그 찾기
-            if curr.get('Tag_Code') == 'T2':
-                # 이후 2시간 내 활동 확인
-                time_limit = curr['timestamp'] + timedelta(hours=self.TAILGATING_THRESHOLD_HOURS)
-                future_data = data[(data['timestamp'] > curr['timestamp']) & 
-                                  (data['timestamp'] <= time_limit)]
+            # 2시간 동안 활동 없음 - 꼬리물기 의심
+            gap_hours = (times[next_row] - times[entry]) / 1_000_000_000 / 3600
+            if gap_hours >= 2:
+                confidence = 0.9 if data['Tag_Code'].iloc[next_row] == 'G1' else 0.5
                 
-                if not future_data.empty:
-                    # 첫 번째 활동까지의 시간
-                    first_activity = future_data[
-                        (future_data['INOUT_GB'] == 'O') |
-                        (future_data['source'].isin(['Knox_Approval', 'Knox_Mail', 'EAM', 'LAMS', 'MES']))
-                    ]
-                    
-                    if first_activity.empty:
-                        # 2시간 동안 활동 없음 - 꼬리물기 의심
-                        next_tag = future_data.iloc[0] if len(future_data) > 0 else None
-                        
-                        if next_tag is not None:
-                            gap_hours = (next_tag['timestamp'] - curr['timestamp']).total_seconds() / 3600
-                            
-                            if gap_hours >= 2:
-                                confidence = 0.9 if next_tag.get('Tag_Code') == 'G1' else 0.5
-                                
-                                tailgating_suspects.append({
-                                    'start': curr['timestamp'],
-                                    'end': next_tag['timestamp'],
-                                    'duration_hours': gap_hours,
-                                    'entry_location': curr.get('DR_NM', 'Unknown'),
-                                    'next_location': next_tag.get('DR_NM', 'Unknown'),
-                                    'confidence': confidence
-                                })
+                suspect = {
+                    'start': data['timestamp'].iloc[entry],
+                    'end': data['timestamp'].iloc[next_row],
+                    'duration_hours': gap_hours,
+                    'entry_location': data['DR_NM'].iloc[entry] if 'DR_NM' in data.columns else 'Unknown',
+                    'next_location': data['DR_NM'].iloc[next_row] if 'DR_NM' in data.columns else 'Unknown',
+                    'confidence': confidence
+                }
+                if employee_column is not None:
+                    suspect['employee'] = data[employee_column].iloc[entry]
+                tailgating_suspects.append(suspect)
         
         return tailgating_suspects
     
-    def adjust_confidence_by_density(self, data: pd.DataFrame) -> pd.DataFrame:
+    def adjust_confidence_by_density(self, data: pd.DataFrame,
+                                     employee_column: Optional[str] = None) -> pd.DataFrame:
         """
         활동 밀도에 따른 신뢰도 조정
         
         Args:
             data: 활동 분류된 데이터
+            employee_column: 직원 구분 컬럼
             
         Returns:
             신뢰도 조정된 데이터
         """
         # 활동 밀도 계산
-        data['activity_density'] = self.calculate_activity_density(data)
+        data['activity_density'] = self.calculate_activity_density(data, employee_column=employee_column)
         
-        # 밀도 레벨 분류
-        data['density_level'] = data['activity_density'].apply(self.classify_density_level)
+        # 밀도 레벨 분류 (classify_density_level과 같은 기준)
+        density = data['activity_density'].to_numpy()
+        data['density_level'] = np.select(
+            [density >= self.DENSITY_THRESHOLDS['high'],
+             density >= self.DENSITY_THRESHOLDS['medium'],
+             density >= self.DENSITY_THRESHOLDS['low']],
+            ['high', 'medium', 'low'], default='idle').astype(object)
         
         # 신뢰도 조정
         for level, adjustment in self.CONFIDENCE_ADJUSTMENTS.items():
@@ -208,18 +210,36 @@ class ActivityDensityAnalyzer:
         
         return data
     
-    def reclassify_idle_periods(self, data: pd.DataFrame) -> pd.DataFrame:
+    def reclassify_idle_periods(self, data: pd.DataFrame,
+                                employee_column: Optional[str] = None) -> pd.DataFrame:
         """
         무활동 구간 재분류
         
         Args:
             data: 활동 분류된 데이터
+            employee_column: 직원 구분 컬럼 (직원별 행이 연속되어 있어야 함)
             
         Returns:
             재분류된 데이터
         """
         # 무활동 구간 감지
-        idle_periods = self.detect_idle_periods(data)
+        idle_periods = self.detect_idle_periods(data, employee_column)
+        
+        if idle_periods and data.index.is_monotonic_increasing:
+            # 정렬된 인덱스는 구간 라벨 범위를 위치 범위로 바꿔 한 번에 표시 (뒤 구간이 우선)
+            labels = np.zeros(len(data), dtype=np.int8)
+            for period in idle_periods:
+                lo = data.index.searchsorted(period['start_idx'], side='left')
+                hi = data.index.searchsorted(period['end_idx'], side='left')
+                labels[lo:hi] = 1 if period['duration_minutes'] <= 60 else 2
+                logger.info(f"무활동 구간 감지: {period['duration_minutes']:.1f}분 at {period['location']}")
+            
+            for code, activity_code, confidence in ((1, 'SHORT_REST', 70), (2, 'LONG_REST', 30)):
+                idle_mask = labels == code
+                if idle_mask.any():
+                    data.loc[idle_mask, 'activity_code'] = activity_code
+                    data.loc[idle_mask, 'confidence'] = confidence
+            return data
         
         for period in idle_periods:
             # 해당 구간을 IDLE로 재분류
@@ -239,27 +259,32 @@ class ActivityDensityAnalyzer:
         
         return data
     
-    def apply_comprehensive_analysis(self, data: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
+    def apply_comprehensive_analysis(self, data: pd.DataFrame,
+                                     employee_column: Optional[str] = None) -> Tuple[pd.DataFrame, pd.Series]:
         """
         종합적인 활동 밀도 분석 적용
         
         Args:
             data: 원본 활동 데이터
+            employee_column: 직원 구분 컬럼 (조직-일자 전체 데이터를 한 번에 분석할 때,
+                             직원별 행이 연속되고 시간 순서여야 함)
             
         Returns:
             (분석된 데이터, 실근무 마스크)
         """
         # 1. 활동 밀도 기반 신뢰도 조정
-        data = self.adjust_confidence_by_density(data)
+        data = self.adjust_confidence_by_density(data, employee_column)
         
         # 2. 무활동 구간 재분류
-        data = self.reclassify_idle_periods(data)
+        data = self.reclassify_idle_periods(data, employee_column)
         
         # 3. 꼬리물기 패턴 감지
-        tailgating = self.detect_tailgating_patterns(data)
+        tailgating = self.detect_tailgating_patterns(data, employee_column)
         for suspect in tailgating:
             mask = (data['timestamp'] >= suspect['start']) & \
                    (data['timestamp'] <= suspect['end'])
+            if employee_column is not None:
+                mask &= data[employee_column] == suspect['employee']
             data.loc[mask, 'activity_code'] = 'TAILGATING_SUSPECT'
             data.loc[mask, 'confidence'] = 100 * (1 - suspect['confidence'])
             
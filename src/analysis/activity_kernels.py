@@ -0,0 +1,214 @@
+"""
+활동 시계열 벡터 커널
+정렬된 int64 나노초 타임스탬프 위에서 윈도우 활동 수(searchsorted + 누적합)와
+무활동/집중 구간(런 길이 분할)을 계산합니다.
+
+모든 커널은 그룹 코드(예: 사번)를 받아 여러 직원을 한 번에 처리하며,
+그룹 안에서는 기존 행 단위 구현과 같은 순서 규칙을 따릅니다.
+"""
+
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+NS_PER_SECOND = 1_000_000_000
+NS_PER_MINUTE = 60 * NS_PER_SECOND
+
+# 실제 업무 활동으로 보는 시스템 원천
+REAL_ACTIVITY_SOURCES = ['Knox_Approval', 'Knox_Mail', 'EAM', 'LAMS', 'MES']
+
+
+def timestamps_ns(values: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """datetime 컬럼을 int64 나노초 배열과 유효(NaT 아님) 마스크로 변환"""
+    timestamps = pd.to_datetime(values).to_numpy(dtype='datetime64[ns]')
+    return timestamps.view('int64'), ~np.isnat(timestamps)
+
+
+def group_codes(data: pd.DataFrame, group_column: Optional[str] = None) -> np.ndarray:
+    """그룹 컬럼을 정수 코드로 변환 (없으면 전체가 한 그룹, 결측은 -1 그룹)"""
+    if group_column is None:
+        return np.zeros(len(data), dtype=np.int64)
+    return pd.factorize(data[group_column])[0].astype(np.int64)
+
+
+def real_activity_mask(data: pd.DataFrame, include_meetings: bool = True) -> np.ndarray:
+    """실제 업무 활동 행 (장비 조작 O, 시스템 활동, 선택적으로 G3 회의)"""
+    mask = np.zeros(len(data), dtype=bool)
+    if 'INOUT_GB' in data.columns:
+        mask |= (data['INOUT_GB'] == 'O').to_numpy(dtype=bool)
+    if 'source' in data.columns:
+        mask |= data['source'].isin(REAL_ACTIVITY_SOURCES).to_numpy(dtype=bool)
+    if include_meetings and 'Tag_Code' in data.columns:
+        mask |= (data['Tag_Code'] == 'G3').to_numpy(dtype=bool)
+    return mask
+
+
+def _grouped_time_order(times: np.ndarray, valid: np.ndarray, groups: np.ndarray) -> np.ndarray:
+    """(그룹, 시각) 안정 정렬 순서 (NaT는 그룹의 마지막)"""
+    sortable = np.where(valid, times, np.iinfo(np.int64).max)
+    return np.lexsort((sortable, groups))
+
+
+def window_counts(times: np.ndarray, valid: np.ndarray, indicator: np.ndarray,
+                  groups: np.ndarray, half_window_ns: int) -> np.ndarray:
+    """
+    행마다 같은 그룹의 [t - half_window, t + half_window] 안에 있는 indicator 행 수
+
+    그룹별로 시각을 겹치지 않는 구간으로 옮긴 하나의 정렬 키에서 searchsorted로 구간 경계를 찾고,
+    indicator 누적합의 차이로 개수를 셉니다. NaT 행은 세지 않으며 결과는 0입니다.
+    """
+    size = len(times)
+    counts = np.zeros(size, dtype=np.int64)
+    positions = np.flatnonzero(valid)
+    if not len(positions):
+        return counts
+
+    order = positions[np.lexsort((times[positions], groups[positions]))]
+    sorted_times = times[order]
+    sorted_groups = groups[order]
+    cumulative = np.r_[0, np.cumsum(indicator[order], dtype=np.int64)]
+
+    starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+    ends = np.r_[starts[1:], len(order)]
+    spans = sorted_times[ends - 1] - sorted_times[starts]
+    strides = spans.astype(np.float64) + 2 * half_window_ns + 1
+
+    if strides.sum() < 2 ** 62:
+        # 그룹마다 (최소 시각을 0으로) 옮긴 뒤 이전 그룹 구간 뒤에 이어 붙인 단조 키
+        offsets = np.r_[0, np.cumsum(spans + 2 * half_window_ns + 1)[:-1]]
+        run_lengths = ends - starts
+        keys = sorted_times - np.repeat(sorted_times[starts] - offsets, run_lengths)
+        lo = np.searchsorted(keys, keys - half_window_ns, side='left')
+        hi = np.searchsorted(keys, keys + half_window_ns, side='right')
+    else:
+        # 기간이 너무 길어 키가 넘치면 그룹별로 검색
+        lo = np.empty(len(order), dtype=np.int64)
+        hi = np.empty(len(order), dtype=np.int64)
+        for start, end in zip(starts, ends):
+            segment = sorted_times[start:end]
+            lo[start:end] = start + np.searchsorted(segment, segment - half_window_ns, side='left')
+            hi[start:end] = start + np.searchsorted(segment, segment + half_window_ns, side='right')
+
+    counts[order] = cumulative[hi] - cumulative[lo]
+    return counts
+
+
+def idle_gaps(times: np.ndarray, valid: np.ndarray, indicator: np.ndarray, groups: np.ndarray,
+              threshold_minutes: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    같은 그룹에서 연속된 실제 활동 사이의 공백이 threshold_minutes보다 긴 구간
+
+    그룹 안에서는 프레임 행 순서를 따르며, 사이에 다른 행이 한 개 이상 있는 공백만 반환합니다.
+
+    Returns:
+        (시작 행 위치, 끝 행 위치, 공백 분) - 위치는 원본 프레임 기준
+    """
+    order = np.argsort(groups, kind='stable')
+    active = order[indicator[order]]
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    if len(active) < 2:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, np.empty(0)
+
+    previous, current = active[:-1], active[1:]
+    comparable = (groups[previous] == groups[current]) & valid[previous] & valid[current]
+    gap_minutes = (times[current] - times[previous]) / NS_PER_SECOND / 60
+    idle = comparable & (gap_minutes > threshold_minutes) & (rank[current] - rank[previous] >= 2)
+    return previous[idle], current[idle], gap_minutes[idle]
+
+
+def concentration_runs(times: np.ndarray, valid: np.ndarray, weights: np.ndarray, groups: np.ndarray,
+                       max_gap_seconds: float = 600, min_weight: float = 0.7,
+                       min_activities: int = 5) -> List[Dict]:
+    """
+    연속 집중 구간 (그룹별 시각 순서)
+
+    가중치 min_weight 이상 활동이 직전 행과 max_gap_seconds 이내이면 구간을 잇고, 그보다 멀면 끊습니다.
+    낮은 가중치 행은 구간을 잇지도 끊지도 않습니다. 직전 행 시각부터 마지막 연결 활동까지가
+    구간이며, 활동 수(연결 수 + 1)가 min_activities 이상인 구간만 반환합니다.
+
+    Returns:
+        [{'group', 'start_row', 'end_row', 'activities', 'intensity'}] (행 위치는 원본 프레임 기준)
+    """
+    size = len(times)
+    if size < 2:
+        return []
+
+    order = _grouped_time_order(times, valid, groups)
+    sorted_times = times[order]
+    sorted_valid = valid[order]
+    sorted_weights = weights[order]
+    sorted_groups = groups[order]
+
+    group_start = np.r_[True, sorted_groups[1:] != sorted_groups[:-1]]
+    both_valid = np.r_[False, sorted_valid[1:] & sorted_valid[:-1]]
+    gaps = np.r_[0, sorted_times[1:] - sorted_times[:-1]] / NS_PER_SECOND
+    high = sorted_weights >= min_weight
+    link = high & ~group_start & both_valid & (gaps <= max_gap_seconds)
+
+    # 끊는 행(연결되지 않은 고가중치 행, 그룹 시작)마다 새 세그먼트
+    segment = np.cumsum((high & ~link) | group_start)
+    link_positions = np.flatnonzero(link)
+    if not len(link_positions):
+        return []
+
+    link_segments = segment[link_positions]
+    run_starts = np.flatnonzero(np.r_[True, link_segments[1:] != link_segments[:-1]])
+    run_ends = np.r_[run_starts[1:], len(link_positions)]
+
+    periods = []
+    for run_start, run_end in zip(run_starts, run_ends):
+        if run_end - run_start + 1 < min_activities:
+            continue
+        positions = link_positions[run_start:run_end]
+        intensity = float(sorted_weights[positions[0]])
+        for weight in sorted_weights[positions[1:]]:
+            intensity = (intensity + weight) / 2
+        periods.append({
+            'group': int(sorted_groups[positions[0]]),
+            'start_row': int(order[positions[0] - 1]),
+            'end_row': int(order[positions[-1]]),
+            'activities': int(run_end - run_start + 1),
+            'intensity': intensity,
+        })
+    return periods
+
+
+def first_rows_in_windows(times: np.ndarray, valid: np.ndarray, groups: np.ndarray,
+                          anchors: Sequence[int], window_ns: int,
+                          excluded: np.ndarray) -> List[Optional[int]]:
+    """
+    기준 행마다 같은 그룹의 (t, t + window] 안에서 프레임 순서상 첫 행 위치
+
+    구간 안에 excluded 행이 하나라도 있거나 구간이 비어 있으면 None입니다.
+    """
+    positions = np.flatnonzero(valid)
+    order = positions[np.lexsort((times[positions], groups[positions]))]
+    sorted_times = times[order]
+    sorted_groups = groups[order]
+    cumulative = np.r_[0, np.cumsum(excluded[order], dtype=np.int64)]
+
+    starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]]) if len(order) else order
+    ends = np.r_[starts[1:], len(order)]
+    group_slices = dict(zip(sorted_groups[starts].tolist(), zip(starts.tolist(), ends.tolist())))
+
+    results: List[Optional[int]] = []
+    for anchor in anchors:
+        bounds = group_slices.get(int(groups[anchor])) if valid[anchor] else None
+        if bounds is None:
+            results.append(None)
+            continue
+        start, end = bounds
+        segment = sorted_times[start:end]
+        lo = start + np.searchsorted(segment, times[anchor], side='right')
+        hi = start + np.searchsorted(segment, times[anchor] + window_ns, side='right')
+        if hi == lo or cumulative[hi] - cumulative[lo] > 0:
+            results.append(None)
+        else:
+            results.append(int(order[lo:hi].min()))
+    return results
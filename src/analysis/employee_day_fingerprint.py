@@ -0,0 +1,208 @@
+"""
+직원-일자 단위 입력 데이터 지문(fingerprint)
+분석 입력(태그, 식사, Claim, 장비, Knox)과 규칙/모델 버전으로 (사번, 날짜)별 지문을
+계산해, 배치 분석이 지난 실행 이후 입력이 바뀐 직원-일자만 다시 분석하도록 합니다.
+
+행 해시는 pd.util.hash_pandas_object로 한 번에 계산하고 (사번, 날짜)별로 합산하므로
+행 순서와 무관하며 소스 데이터를 한 번씩만 읽습니다.
+"""
+
+import hashlib
+import logging
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .shared_data_plane import DAY_WINDOW_BEFORE
+
+# 데이터 이름 → (사번 컬럼 후보, 날짜 컬럼 후보)
+FINGERPRINT_SOURCES: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    'tag_data': (('사번',), ('ENTE_DT',)),
+    'meal_data': (('사번', 'employee_id'), ('취식일시', 'meal_datetime')),
+    'claim_data': (('사번',), ('근무일',)),
+    'knox_approval_data': (('UserNo', '사번'), ('Timestamp', 'timestamp')),
+    'knox_pims_data': (('사번',), ('시작일시_GMT+9', 'start_time')),
+    'knox_mail_data': (('발신인사번_text',), ('발신일시_GMT9', 'timestamp')),
+    'lams_data': (('employee_id',), ('timestamp', 'DATE')),
+    'mes_data': (('employee_id',), ('timestamp', 'login_time')),
+    'eam_data': (('employee_id',), ('timestamp', 'ATTEMPTDATE')),
+    'equipment_data_merged': (('employee_id',), ('timestamp',)),
+}
+
+# 분석 로직이 바뀌면 올려서 전체 재분석을 유도
+ANALYSIS_VERSION = '1.0.0'
+
+# 규칙 버전에 포함할 파일 (태그 분류/전이 규칙)
+RULE_FILES_DIR = Path(__file__).parent.parent.parent / 'config' / 'rules'
+
+
+def normalize_employee_ids(values: pd.Series) -> pd.Series:
+    """사번을 문자열로 정규화 (정수/실수/문자열 혼용 대응: 20170124.0 → '20170124')"""
+    numeric = pd.to_numeric(values, errors='coerce')
+    as_text = values.astype(str).str.strip()
+    is_integral = numeric.notna() & (numeric == np.floor(numeric))
+    as_text[is_integral] = numeric[is_integral].astype('int64').astype(str)
+    return as_text
+
+
+def _to_day(values: pd.Series) -> pd.Series:
+    """날짜 컬럼을 자정 기준 datetime으로 변환 (YYYYMMDD 정수 포함)"""
+    if pd.api.types.is_integer_dtype(values):
+        return pd.to_datetime(values.astype(str), format='%Y%m%d', errors='coerce')
+    return pd.to_datetime(values, errors='coerce').dt.normalize()
+
+
+def _row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """행 단위 uint64 해시 (해시할 수 없는 값은 문자열로 변환)"""
+    try:
+        return pd.util.hash_pandas_object(df, index=False).to_numpy()
+    except TypeError:
+        return pd.util.hash_pandas_object(df.astype(str), index=False).to_numpy()
+
+
+class EmployeeDayFingerprinter:
+    """(사번, 날짜)별 입력 데이터 지문 계산기"""
+
+    def __init__(self, pickle_manager=None, rule_files_dir: Path = RULE_FILES_DIR):
+        """
+        Args:
+            pickle_manager: 소스 데이터 로드에 사용할 PickleManager
+            rule_files_dir: 규칙 버전 계산에 사용할 규칙 JSON 디렉토리
+        """
+        self.logger = logging.getLogger(__name__)
+        if pickle_manager is None:
+            from ..database import get_pickle_manager
+            pickle_manager = get_pickle_manager()
+        self.pickle_manager = pickle_manager
+        self.rule_files_dir = Path(rule_files_dir)
+
+    def rule_version(self) -> str:
+        """분석 버전 + 규칙 파일 + 태깅지점 마스터 내용으로 만든 규칙/모델 버전"""
+        digest = hashlib.sha1(ANALYSIS_VERSION.encode('utf-8'))
+
+        if self.rule_files_dir.is_dir():
+            for path in sorted(self.rule_files_dir.glob('*.json')):
+                digest.update(path.name.encode('utf-8'))
+                digest.update(path.read_bytes())
+
+        try:
+            master = self.pickle_manager.load_dataframe('tag_location_master')
+            digest.update(_row_hashes(master).tobytes())
+        except Exception as e:
+            self.logger.info(f"태깅지점 마스터 없음, 규칙 버전에서 제외: {e}")
+
+        return digest.hexdigest()[:16]
+
+    def _source_day_hashes(self, name: str, start: date, end: date) -> Optional[pd.DataFrame]:
+        """소스 하나의 (사번, 날짜)별 행 수와 해시 합계"""
+        employee_columns, date_columns = FINGERPRINT_SOURCES[name]
+        try:
+            df = self.pickle_manager.load_dataframe(name)
+        except Exception as e:
+            self.logger.info(f"{name} 지문 스킵: {e}")
+            return None
+
+        if df is None or df.empty:
+            return None
+
+        employee_column = next((c for c in employee_columns if c in df.columns), None)
+        date_column = next((c for c in date_columns if c in df.columns), None)
+        if employee_column is None or date_column is None:
+            self.logger.warning(f"{name}: 사번/날짜 컬럼을 찾을 수 없어 지문에서 제외합니다")
+            return None
+
+        days = _to_day(df[date_column])
+        in_range = ((days >= pd.Timestamp(start)) & (days <= pd.Timestamp(end))).to_numpy()
+        df = df[in_range]
+        if df.empty:
+            return None
+
+        keyed = pd.DataFrame({
+            'employee_id': normalize_employee_ids(df[employee_column]).to_numpy(),
+            'work_date': days[in_range].to_numpy(),
+            f'{name}_count': 1,
+            f'{name}_hash': _row_hashes(df),
+        })
+        # uint64 합계는 2^64로 순환하므로 행 순서와 무관한 해시 합이 됨
+        return keyed.groupby(['employee_id', 'work_date'], sort=False).sum().reset_index()
+
+    def compute(self, start_date: date, end_date: date) -> pd.DataFrame:
+        """
+        기간 내 (사번, 날짜)별 지문 계산
+
+        날짜 D의 지문에는 야간 근무 분석에 쓰이는 전날(D-1) 데이터도 포함됩니다.
+
+        Returns:
+            pd.DataFrame: employee_id, analysis_date(ISO 문자열), fingerprint 컬럼
+        """
+        load_start = start_date - timedelta(days=DAY_WINDOW_BEFORE)
+
+        day_hashes = None
+        for name in FINGERPRINT_SOURCES:
+            source = self._source_day_hashes(name, load_start, end_date)
+            if source is None:
+                continue
+            day_hashes = source if day_hashes is None else day_hashes.merge(
+                source, on=['employee_id', 'work_date'], how='outer')
+
+        if day_hashes is None:
+            return pd.DataFrame(columns=['employee_id', 'analysis_date', 'fingerprint'])
+
+        value_columns = [c for c in day_hashes.columns if c not in ('employee_id', 'work_date')]
+        day_hashes[value_columns] = day_hashes[value_columns].fillna(0).astype('uint64')
+
+        # 날짜 D 행에 D-1 ... D-DAY_WINDOW_BEFORE의 값을 붙여 분석 구간 전체를 반영
+        windowed = day_hashes
+        for offset in range(1, DAY_WINDOW_BEFORE + 1):
+            previous = day_hashes.copy()
+            previous['work_date'] = previous['work_date'] + pd.Timedelta(days=offset)
+            windowed = windowed.merge(previous, on=['employee_id', 'work_date'], how='outer',
+                                      suffixes=('', f'_prev{offset}'))
+
+        windowed = windowed[(windowed['work_date'] >= pd.Timestamp(start_date))
+                            & (windowed['work_date'] <= pd.Timestamp(end_date))]
+        values = windowed.drop(columns=['employee_id', 'work_date']).fillna(0).astype('uint64')
+
+        fingerprints = _row_hashes(values)
+        result = pd.DataFrame({
+            'employee_id': windowed['employee_id'].to_numpy(),
+            'analysis_date': windowed['work_date'].dt.strftime('%Y-%m-%d').to_numpy(),
+            'fingerprint': [f"{value:016x}" for value in fingerprints],
+        })
+        self.logger.info(f"직원-일자 지문 계산 완료: {len(result):,}건")
+        return result.reset_index(drop=True)
+
+
+def changed_targets(targets: Iterable[Tuple[str, date]], current: pd.DataFrame,
+                    stored: pd.DataFrame, rule_version: str) -> List[Tuple[str, date]]:
+    """
+    저장된 지문과 비교해 다시 분석해야 하는 대상만 반환
+
+    Args:
+        targets: [(employee_id, work_date), ...] 분석 후보
+        current: compute() 결과
+        stored: employee_id, analysis_date, fingerprint, rule_version 컬럼의 저장된 지문
+        rule_version: 현재 규칙/모델 버전
+    """
+    targets = list(targets)
+    if not targets:
+        return []
+
+    candidates = pd.DataFrame({
+        'employee_id': normalize_employee_ids(pd.Series([t[0] for t in targets], dtype=object)).to_numpy(),
+        'analysis_date': [t[1].isoformat() for t in targets],
+    })
+    keys = ['employee_id', 'analysis_date']
+    candidates = candidates.merge(current, on=keys, how='left')
+    candidates = candidates.merge(stored[keys + ['fingerprint', 'rule_version']], on=keys,
+                                  how='left', suffixes=('', '_stored'))
+
+    # 소스 데이터가 전혀 없는 직원-일자는 빈 지문으로 비교
+    candidates['fingerprint'] = candidates['fingerprint'].fillna('')
+    unchanged = ((candidates['fingerprint'] == candidates['fingerprint_stored'])
+                 & (candidates['rule_version'] == rule_version)).to_numpy()
+
+    return [target for target, same in zip(targets, unchanged) if not same]
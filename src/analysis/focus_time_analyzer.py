@@ -6,9 +6,11 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta, time
-from typing import Dict, List, Tuple, Optional
+from typing import Any, Dict, List, Tuple, Optional
 import logging
 
+from .activity_kernels import NS_PER_SECOND, concentration_runs, group_codes, timestamps_ns
+
 logger = logging.getLogger(__name__)
 
 
@@ -114,6 +116,22 @@ class FocusTimeAnalyzer:
     def identify_job_type(self, daily_data: pd.DataFrame, 
                           employee_info: Dict = None) -> str:
         """직군 판별 (생산직/사무직/교대근무)"""
+        job_type = self._job_type_from_info(employee_info)
+        if job_type:
+            return job_type
+        
+        # 태그 패턴으로 추정
+        if 'Tag_Code' in daily_data.columns:
+            o_tags = (daily_data['Tag_Code'] == 'O').sum()
+            total = len(daily_data)
+            
+            if o_tags / total > 0.3:  # O태그가 30% 이상이면 생산직
+                return 'production'
+        
+        return 'office'  # 기본값
+    
+    def _job_type_from_info(self, employee_info: Dict = None) -> Optional[str]:
+        """직원 정보(부서/직급 키워드)로 직군 판별 (판별할 수 없으면 None)"""
         if employee_info:
             dept = str(employee_info.get('부서', '')).lower()
             position = str(employee_info.get('직급', '')).lower()
@@ -133,15 +151,7 @@ class FocusTimeAnalyzer:
             if any(word in dept or word in position for word in production_keywords):
                 return 'production'
         
-        # 태그 패턴으로 추정
-        if 'Tag_Code' in daily_data.columns:
-            o_tags = (daily_data['Tag_Code'] == 'O').sum()
-            total = len(daily_data)
-            
-            if o_tags / total > 0.3:  # O태그가 30% 이상이면 생산직
-                return 'production'
-        
-        return 'office'  # 기본값
+        return None
     
     def calculate_hourly_density(self, daily_data: pd.DataFrame, 
                                  time_col: str) -> Dict[int, float]:
@@ -235,60 +245,57 @@ class FocusTimeAnalyzer:
         return min(1.0, max_continuous / 4)
     
     def find_concentration_periods(self, daily_data: pd.DataFrame, 
-                                   time_col: str) -> List[Dict]:
-        """연속 집중 구간 찾기"""
-        periods = []
+                                   time_col: str,
+                                   employee_column: Optional[str] = None) -> List[Dict]:
+        """
+        연속 집중 구간 찾기
         
+        Args:
+            daily_data: 활동 데이터
+            time_col: 시간 컬럼
+            employee_column: 직원 구분 컬럼 (지정하면 직원별 구간에 employee 키 추가)
+        """
         if len(daily_data) < 2:
-            return periods
+            return []
         
-        # 시간순 정렬
-        daily_data = daily_data.sort_values(time_col)
+        weights = self._activity_weights(daily_data, use_source=False)
+        times, valid = timestamps_ns(daily_data[time_col])
+        groups = group_codes(daily_data, employee_column)
+        employees = pd.factorize(daily_data[employee_column])[1] if employee_column else None
         
-        current_period = None
-        prev_time = None
-        
-        for _, row in daily_data.iterrows():
-            curr_time = row[time_col]
-            
-            # 활동 가중치 확인
-            weight = 1.0
-            if 'Tag_Code' in row and pd.notna(row['Tag_Code']):
-                weight = self.ACTIVITY_WEIGHTS.get(row['Tag_Code'], 0.5)
-            
-            # 고가중치 활동만 집중으로 판정
-            if weight >= 0.7:
-                if prev_time and (curr_time - prev_time).total_seconds() <= 600:  # 10분 이내
-                    if not current_period:
-                        current_period = {
-                            'start': prev_time,
-                            'end': curr_time,
-                            'activities': 2,
-                            'intensity': weight
-                        }
-                    else:
-                        current_period['end'] = curr_time
-                        current_period['activities'] += 1
-                        current_period['intensity'] = \
-                            (current_period['intensity'] + weight) / 2
-                else:
-                    if current_period and current_period['activities'] >= 5:
-                        periods.append(current_period)
-                    current_period = None
-            
-            prev_time = curr_time
-        
-        # 마지막 구간 추가
-        if current_period and current_period['activities'] >= 5:
-            periods.append(current_period)
-        
-        # 구간별 지속시간 계산
-        for period in periods:
-            duration = (period['end'] - period['start']).total_seconds() / 3600
-            period['duration_hours'] = duration
+        periods = []
+        for run in concentration_runs(times, valid, weights, groups):
+            start = daily_data[time_col].iloc[run['start_row']]
+            end = daily_data[time_col].iloc[run['end_row']]
+            period = {
+                'start': start,
+                'end': end,
+                'activities': run['activities'],
+                'intensity': run['intensity'],
+                # 구간별 지속시간
+                'duration_hours': (end - start).total_seconds() / 3600
+            }
+            if employees is not None:
+                period['employee'] = employees[run['group']] if run['group'] >= 0 else None
+            periods.append(period)
         
         return periods
     
+    def _activity_weights(self, data: pd.DataFrame, use_source: bool = True) -> np.ndarray:
+        """
+        행별 활동 가중치 (Tag_Code 우선, 없으면 source, 둘 다 없으면 1.0, 목록에 없으면 0.5)
+        
+        use_source=False면 Tag_Code만 사용합니다 (집중 구간 판정 기준).
+        """
+        weights = pd.Series(1.0, index=data.index)
+        if use_source and 'source' in data.columns:
+            sources = data['source']
+            weights = sources.map(self.ACTIVITY_WEIGHTS).fillna(0.5).where(sources.notna(), weights)
+        if 'Tag_Code' in data.columns:
+            tags = data['Tag_Code']
+            weights = tags.map(self.ACTIVITY_WEIGHTS).fillna(0.5).where(tags.notna(), weights)
+        return weights.to_numpy(dtype=float)
+    
     def find_distraction_periods(self, daily_data: pd.DataFrame, 
                                  time_col: str) -> List[Dict]:
         """분산 구간 찾기 (긴 공백 시간)"""
@@ -354,6 +361,129 @@ class FocusTimeAnalyzer:
         else:
             return 'irregular'  # 불규칙
     
+    def hourly_density_matrix(self, data: pd.DataFrame, group_ids: np.ndarray,
+                              n_groups: int, time_col: str) -> np.ndarray:
+        """
+        그룹별 시간대 활동 밀도 행렬 (그룹 × 24, 그룹별 최대값으로 정규화)
+        
+        calculate_hourly_density를 여러 그룹에 한 번에 적용한 결과와 같습니다.
+        """
+        hours = pd.to_datetime(data[time_col]).dt.hour.to_numpy()
+        matrix = np.bincount(group_ids * 24 + hours, weights=self._activity_weights(data),
+                             minlength=n_groups * 24).reshape(n_groups, 24)
+        max_density = matrix.max(axis=1, keepdims=True)
+        return np.divide(matrix, max_density, out=matrix.copy(), where=max_density > 0)
+    
+    def analyze_focus_time_batch(self, data: pd.DataFrame, employee_column: str = '사번',
+                                 employee_info: Optional[Dict[Any, Dict]] = None,
+                                 by_day: bool = True) -> pd.DataFrame:
+        """
+        여러 직원(일자)의 집중근무 지표를 한 번에 계산
+        
+        analyze_focus_time의 직군 판별, 시간별 밀도, 피크 시간대, 집중도 점수, 연속 집중 구간,
+        분산 구간, 근무 패턴을 그룹(직원 또는 직원-일자)별로 배열 연산으로 계산합니다.
+        
+        Args:
+            data: 여러 직원의 활동 데이터 (timestamp 또는 datetime 컬럼, 시각이 없는 행은 제외)
+            employee_column: 직원 구분 컬럼
+            employee_info: 직원 ID → 직원 정보(부서, 직급) 딕셔너리
+            by_day: True면 직원-일자별, False면 직원별 (전체 기간 합산)
+        
+        Returns:
+            pd.DataFrame: 그룹별 job_type, focus_score, peak_hours, work_pattern,
+                concentration_periods, concentration_hours, distraction_periods,
+                distraction_minutes, records 컬럼
+        """
+        time_col = 'timestamp' if 'timestamp' in data.columns else 'datetime'
+        timestamps = pd.to_datetime(data[time_col])
+        data = data[timestamps.notna().to_numpy()]
+        timestamps = timestamps[timestamps.notna()]
+        
+        # 그룹 (직원 또는 직원-일자)
+        keys = pd.DataFrame({employee_column: data[employee_column].to_numpy()}, index=data.index)
+        if by_day:
+            keys['date'] = timestamps.dt.date
+        grouper = keys.groupby(list(keys.columns), sort=True)
+        group_ids = grouper.ngroup().to_numpy()
+        result = grouper.size().rename('records').reset_index()
+        n_groups = len(result)
+        if n_groups == 0:
+            return result
+        
+        # 1. 직군 판별 (직원 정보 키워드 > O 태그 비율)
+        job_types = result[employee_column].map(
+            lambda employee: self._job_type_from_info((employee_info or {}).get(employee)))
+        if 'Tag_Code' in data.columns:
+            o_ratio = np.bincount(group_ids, weights=(data['Tag_Code'] == 'O').to_numpy(dtype=float),
+                                  minlength=n_groups) / result['records'].to_numpy()
+            tag_types = np.where(o_ratio > 0.3, 'production', 'office')
+        else:
+            tag_types = np.full(n_groups, 'office')
+        result['job_type'] = job_types.where(job_types.notna(), pd.Series(tag_types, index=result.index))
+        
+        # 2. 시간별 활동 밀도 (그룹 × 24)
+        density = self.hourly_density_matrix(data.assign(**{time_col: timestamps}), group_ids, n_groups, time_col)
+        
+        # 3. 피크 시간대 (직군별 임계값 이상)
+        thresholds = result['job_type'].map(
+            {job: pattern['peak_threshold'] for job, pattern in self.WORK_PATTERNS.items()}).fillna(0.6)
+        peaks = density >= thresholds.to_numpy()[:, None]
+        peak_count = peaks.sum(axis=1)
+        hours = np.arange(24)
+        result['peak_hours'] = [hours[row].tolist() for row in peaks]
+        
+        # 4. 집중도 점수 = (피크 밀도 - 비피크 밀도) * 70 + 연속성 보너스 * 30
+        peak_density = np.where(peak_count > 0, (density * peaks).sum(axis=1) / np.maximum(peak_count, 1), 0.0)
+        non_peak_count = 24 - peak_count
+        non_peak_density = np.where(non_peak_count > 0,
+                                    (density * ~peaks).sum(axis=1) / np.maximum(non_peak_count, 1), 0.0)
+        
+        # 가장 긴 연속 피크 구간 (경계 차분으로 구간 분할)
+        edges = np.diff(np.pad(peaks.astype(np.int8), ((0, 0), (1, 1))), axis=1)
+        run_rows, run_starts = np.nonzero(edges == 1)
+        _, run_ends = np.nonzero(edges == -1)
+        longest = np.zeros(n_groups)
+        np.maximum.at(longest, run_rows, run_ends - run_starts)
+        continuity_bonus = np.where(peak_count > 1, np.minimum(1.0, longest / 4), 0.0)
+        
+        focus_score = (peak_density - non_peak_density) * 70 + continuity_bonus * 30
+        result['focus_score'] = np.where(peak_count > 0, np.clip(focus_score, 0, 100), 0.0)
+        
+        # 5. 연속 집중 구간
+        times, valid = timestamps_ns(timestamps)
+        runs = concentration_runs(times, valid, self._activity_weights(data, use_source=False), group_ids)
+        run_groups = np.array([run['group'] for run in runs], dtype=np.int64)
+        run_hours = np.array([(times[run['end_row']] - times[run['start_row']]) / NS_PER_SECOND / 3600
+                              for run in runs])
+        result['concentration_periods'] = np.bincount(run_groups, minlength=n_groups)
+        result['concentration_hours'] = np.bincount(run_groups, weights=run_hours, minlength=n_groups)
+        
+        # 6. 분산 구간 (그룹 내 시간순 30분 이상 공백)
+        order = np.lexsort((times, group_ids))
+        sorted_groups = group_ids[order]
+        gap_minutes = np.diff(times[order]) / NS_PER_SECOND / 60
+        is_gap = (sorted_groups[1:] == sorted_groups[:-1]) & (gap_minutes >= 30)
+        result['distraction_periods'] = np.bincount(sorted_groups[1:][is_gap], minlength=n_groups)
+        result['distraction_minutes'] = np.bincount(sorted_groups[1:][is_gap], weights=gap_minutes[is_gap],
+                                                    minlength=n_groups)
+        
+        # 7. 근무 패턴 (활동 밀도 0.1 초과 시간대 범위)
+        active = density > 0.1
+        has_active = active.any(axis=1)
+        min_hour = active.argmax(axis=1)
+        max_hour = 23 - active[:, ::-1].argmax(axis=1)
+        result['work_pattern'] = np.select(
+            [~has_active,
+             (min_hour >= 7) & (max_hour <= 19),
+             (min_hour >= 19) | (max_hour <= 7),
+             max_hour - min_hour > 12,
+             active.sum(axis=1) < 4],
+            ['no_pattern', 'regular_day', 'night_shift', 'extended_hours', 'minimal_activity'],
+            default='irregular').astype(object)
+        
+        logger.info(f"집중근무 일괄 분석 완료: {n_groups:,}개 그룹, {len(data):,}건")
+        return result
+    
     def get_pattern_description(self, pattern: str) -> str:
         """패턴 설명"""
         descriptions = {
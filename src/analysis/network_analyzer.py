@@ -253,50 +253,24 @@ class NetworkAnalyzer:
             from data_processing import PickleManager
             pickle_manager = PickleManager()
             
-            # 태그 데이터 가져오기 (pickle에서)
-            tag_data = pickle_manager.load_dataframe(name='tag_data')
+            # 태그 데이터 가져오기 (정렬 인덱스에서 직원/기간 구간만 슬라이스)
+            from ..utils.performance_cache import get_performance_cache
+            tag_index = get_performance_cache().get_tag_index()
             df = pd.DataFrame()
             
-            if tag_data is not None and not tag_data.empty:
+            if tag_index is not None and len(tag_index) > 0:
                 # 사번 처리
                 if ' - ' in str(employee_id):
                     employee_id = employee_id.split(' - ')[0].strip()
                 
-                # 날짜 필터링
-                start_dt = pd.to_datetime(start_date)
-                end_dt = pd.to_datetime(end_date)
-                
-                # ENTE_DT를 날짜로 변환
-                tag_data['date'] = pd.to_datetime(tag_data['ENTE_DT'].astype(str), format='%Y%m%d', errors='coerce')
-                
-                # 사번과 날짜로 필터링
                 try:
-                    emp_id_int = int(employee_id)
-                    tag_data['사번'] = pd.to_numeric(tag_data['사번'], errors='coerce')
-                    filtered_data = tag_data[
-                        (tag_data['사번'] == emp_id_int) & 
-                        (tag_data['date'] >= start_dt) & 
-                        (tag_data['date'] <= end_dt)
-                    ].copy()
-                except:
-                    tag_data['사번'] = tag_data['사번'].astype(str)
-                    filtered_data = tag_data[
-                        (tag_data['사번'] == str(employee_id)) & 
-                        (tag_data['date'] >= start_dt) & 
-                        (tag_data['date'] <= end_dt)
-                    ].copy()
+                    filtered_data = tag_index.get_date_range(int(employee_id), start_date, end_date)
+                except (TypeError, ValueError):
+                    filtered_data = pd.DataFrame()
                 
                 if not filtered_data.empty:
-                    # timestamp 생성
-                    filtered_data['time_str'] = filtered_data['출입시각'].astype(str).str.zfill(6)
-                    filtered_data['timestamp'] = pd.to_datetime(
-                        filtered_data['ENTE_DT'].astype(str) + ' ' + filtered_data['time_str'],
-                        format='%Y%m%d %H%M%S',
-                        errors='coerce'
-                    )
-                    
-                    # 필요한 컬럼만 선택
-                    df = filtered_data[['timestamp', 'DR_NM', 'DR_NO', 'INOUT_GB']].copy()
+                    # 필요한 컬럼만 선택 (timestamp는 인덱스 생성 시 계산된 datetime 사용)
+                    df = filtered_data[['datetime', 'DR_NM', 'DR_NO', 'INOUT_GB']].copy()
                     df.columns = ['timestamp', 'tag_location', 'gate_name', 'work_area_type']
                     df['work_area_type'] = 'Y'  # 기본값
             
@@ -23,6 +23,33 @@ from src.database import get_database_manager, get_pickle_manager
 from src.analysis import IndividualAnalyzer
 from src.analysis.analysis_result_saver import AnalysisResultSaver
 from src.ui.components.individual_dashboard import IndividualDashboard
+from src.analysis.shared_data_plane import SharedDataPlane, attach_shared_data, install_shared_data
+
+
+# 워커 프로세스별 상태 (initializer에서 1회 생성)
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def _init_worker(manifest: Dict[str, str], analysis_date: date):
+    """
+    워커 프로세스 초기화
+    
+    공유 데이터에 메모리 맵으로 연결하고 분석 객체를 프로세스당 한 번만 생성합니다.
+    """
+    if manifest:
+        install_shared_data(attach_shared_data(manifest))
+    
+    db_manager = get_database_manager()
+    analyzer = IndividualAnalyzer(db_manager)
+    _WORKER_STATE['dashboard'] = IndividualDashboard(analyzer)
+    _WORKER_STATE['analysis_date'] = analysis_date
+
+
+def _analyze_employee_in_worker(employee_id) -> Dict[str, Any]:
+    """initializer로 준비된 워커에서 직원 ID만 받아 분석"""
+    return ParallelBatchAnalyzer.analyze_with_dashboard(
+        _WORKER_STATE['dashboard'], employee_id, _WORKER_STATE['analysis_date']
+    )
 
 
 class ParallelBatchAnalyzer:
@@ -115,7 +142,23 @@ class ParallelBatchAnalyzer:
             db_manager = get_database_manager()
             analyzer = IndividualAnalyzer(db_manager)
             dashboard = IndividualDashboard(analyzer)
-            
+        except Exception as e:
+            return {
+                'employee_id': employee_id,
+                'status': 'error',
+                'error': str(e),
+                'analysis_date': analysis_date.isoformat()
+            }
+        
+        result = ParallelBatchAnalyzer.analyze_with_dashboard(dashboard, employee_id, analysis_date)
+        if result['status'] == 'success':
+            result['employee_info'] = employee_info
+        return result
+    
+    @staticmethod
+    def analyze_with_dashboard(dashboard, employee_id, analysis_date: date) -> Dict[str, Any]:
+        """준비된 IndividualDashboard로 단일 직원 분석"""
+        try:
             # 분석 수행
             daily_data = dashboard.get_daily_tag_data(employee_id, analysis_date)
             
@@ -143,7 +186,6 @@ class ParallelBatchAnalyzer:
                 del result['timeline_data']
             
             result['status'] = 'success'
-            result['employee_info'] = employee_info
             
             return result
             
@@ -191,23 +233,23 @@ class ParallelBatchAnalyzer:
         total_count = len(employees)
         self.logger.info(f"🚀 병렬 분석 시작: {total_count:,}명, 워커: {self.num_workers}개")
         
-        # 분석 태스크 준비
-        tasks = [
-            (emp['employee_id'], analysis_date, emp)
-            for emp in employees
-        ]
+        # 분석일 데이터를 한 번만 로드해 공유 메모리에 기록
+        data_plane = SharedDataPlane()
+        manifest = data_plane.publish_day(analysis_date)
         
         # 병렬 처리 실행
         results = []
         success_count = 0
         error_count = 0
         
-        # ProcessPoolExecutor 사용 (더 안정적)
-        with ProcessPoolExecutor(max_workers=self.num_workers) as executor:
+        # ProcessPoolExecutor 사용 (더 안정적), 워커에는 직원 ID만 전달
+        with data_plane, ProcessPoolExecutor(max_workers=self.num_workers,
+                                             initializer=_init_worker,
+                                             initargs=(manifest, analysis_date)) as executor:
             # 모든 태스크 제출
             futures = {
-                executor.submit(self.analyze_single_employee, task): task[0]
-                for task in tasks
+                executor.submit(_analyze_employee_in_worker, emp['employee_id']): emp
+                for emp in employees
             }
             
             # 진행률 표시
@@ -218,6 +260,7 @@ class ParallelBatchAnalyzer:
                         
                         if result['status'] == 'success':
                             success_count += 1
+                            result['employee_info'] = futures[future]
                             
                             # DB 저장
                             if save_to_db:
@@ -0,0 +1,223 @@
+"""
+병렬 배치 분석용 공유 데이터 플레인
+부모 프로세스가 분석일 데이터(태그, 식사, Claim, Knox, 장비)를 한 번만 로드해
+Arrow IPC 파일로 공유 메모리(/dev/shm)에 기록하고, 워커는 메모리 맵으로 연결합니다.
+
+워커마다 전체 pickle을 다시 로드하지 않으므로 워커 수가 늘어도 메모리 사용량이
+분석일 구간 크기 정도로 유지됩니다.
+"""
+
+import os
+import shutil
+import tempfile
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# 공유 대상 데이터와 날짜 컬럼 후보 (IndividualDashboard가 읽는 순서와 동일)
+SHARED_SOURCES: Dict[str, Tuple[str, ...]] = {
+    'tag_data': ('ENTE_DT',),
+    'meal_data': ('취식일시', 'meal_datetime'),
+    'claim_data': ('근무일',),
+    'knox_approval_data': ('Timestamp', 'timestamp'),
+    'knox_pims_data': ('시작일시_GMT+9', 'start_time'),
+    'knox_mail_data': ('발신일시_GMT9', 'timestamp'),
+    'lams_data': ('timestamp', 'DATE'),
+    'mes_data': ('timestamp', 'login_time'),
+    'eam_data': ('timestamp', 'ATTEMPTDATE'),
+    'equipment_data_merged': ('timestamp',),
+}
+
+# 야간 근무(전날 17:00 ~ 당일 12:00)를 포함하도록 전날부터 다음날까지 공유
+DAY_WINDOW_BEFORE = 1
+DAY_WINDOW_AFTER = 1
+
+
+def _shared_memory_dir() -> Optional[str]:
+    """RAM 기반 공유 메모리 디렉토리 (없으면 시스템 임시 디렉토리)"""
+    shm = '/dev/shm'
+    if os.path.isdir(shm) and os.access(shm, os.W_OK):
+        return shm
+    return None
+
+
+def _yyyymmdd_values(series: pd.Series) -> Optional[pd.Series]:
+    """YYYYMMDD 값(정수, 20170124.0 같은 정수값 실수, 숫자 문자열)이면 정수 시리즈, 아니면 None"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return None
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype(object)
+
+    numeric = pd.to_numeric(series, errors='coerce')
+    present = numeric.notna()
+    if not present.any() or present.sum() != series.notna().sum():
+        return None
+
+    values = numeric[present]
+    if not ((values == values.round()) & (values >= 19000101) & (values <= 99991231)).all():
+        return None
+    return numeric
+
+
+def _day_mask(series: pd.Series, start: date, end: date) -> pd.Series:
+    """start ~ end(포함) 날짜에 해당하는 행 마스크 (YYYYMMDD 값 또는 날짜형)"""
+    values = _yyyymmdd_values(series)
+    if values is not None:
+        return (values >= int(start.strftime('%Y%m%d'))) & (values <= int(end.strftime('%Y%m%d')))
+
+    timestamps = pd.to_datetime(series, errors='coerce')
+    return (timestamps >= pd.Timestamp(start)) & (timestamps < pd.Timestamp(end + timedelta(days=1)))
+
+
+def slice_analysis_day(df: pd.DataFrame, name: str, analysis_date: date) -> pd.DataFrame:
+    """분석일 구간 행만 남김 (날짜 컬럼을 찾지 못하면 전체 유지)"""
+    start = analysis_date - timedelta(days=DAY_WINDOW_BEFORE)
+    end = analysis_date + timedelta(days=DAY_WINDOW_AFTER)
+
+    for column in SHARED_SOURCES.get(name, ()):
+        if column in df.columns:
+            sliced = df[_day_mask(df[column], start, end).to_numpy()].reset_index(drop=True)
+            if sliced.empty and not df.empty:
+                logger.warning(f"{name}: {column} 기준 {start} ~ {end} 구간 행이 없습니다 "
+                               f"(전체 {len(df):,}행, dtype={df[column].dtype})")
+            return sliced
+
+    logger.warning(f"{name}: 날짜 컬럼을 찾을 수 없어 전체 데이터를 공유합니다")
+    return df
+
+
+class SharedDataPlane:
+    """분석일 데이터를 Arrow IPC 파일로 공유하는 부모 프로세스 측 관리자"""
+
+    def __init__(self, base_dir: Optional[str] = None):
+        """
+        Args:
+            base_dir: 공유 파일을 둘 디렉토리 (없으면 /dev/shm 또는 임시 디렉토리)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.directory = tempfile.mkdtemp(prefix='sambio_shared_', dir=base_dir or _shared_memory_dir())
+        self.manifest: Dict[str, str] = {}
+
+    def publish(self, name: str, df: pd.DataFrame) -> str:
+        """DataFrame을 Arrow IPC 파일로 기록하고 경로 반환"""
+        path = os.path.join(self.directory, f"{name}.arrow")
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        with pa.OSFile(path, 'wb') as sink:
+            with ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+        self.manifest[name] = path
+        return path
+
+    def publish_day(self, analysis_date: date, pickle_manager=None) -> Dict[str, str]:
+        """
+        분석일 구간의 공유 대상 데이터를 모두 기록
+
+        Args:
+            analysis_date: 분석 날짜
+            pickle_manager: 데이터 로드에 사용할 PickleManager
+
+        Returns:
+            Dict[str, str]: 데이터 이름 → 공유 파일 경로 (워커 initializer 인자)
+        """
+        if not PYARROW_AVAILABLE:
+            self.logger.warning("pyarrow가 없어 공유 데이터 플레인을 사용하지 않습니다")
+            return {}
+
+        if pickle_manager is None:
+            from ..database import get_pickle_manager
+            pickle_manager = get_pickle_manager()
+
+        start_time = datetime.now()
+        start = analysis_date - timedelta(days=DAY_WINDOW_BEFORE)
+        end = analysis_date + timedelta(days=DAY_WINDOW_AFTER)
+
+        for name in SHARED_SOURCES:
+            try:
+                if name == 'tag_data':
+                    # Parquet이면 해당 날짜 row group만 읽음
+                    df = pickle_manager.load_dataframe(name, filters=[
+                        ('ENTE_DT', '>=', int(start.strftime('%Y%m%d'))),
+                        ('ENTE_DT', '<=', int(end.strftime('%Y%m%d')))
+                    ])
+                else:
+                    df = pickle_manager.load_dataframe(name)
+                    if df is not None:
+                        df = slice_analysis_day(df, name, analysis_date)
+            except Exception as e:
+                self.logger.info(f"{name} 공유 스킵: {e}")
+                continue
+
+            if df is None:
+                continue
+
+            try:
+                self.publish(name, df)
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+                # 타입이 섞인 컬럼 등은 공유하지 않고 워커가 직접 로드
+                self.logger.warning(f"{name} Arrow 변환 실패, 공유 스킵: {e}")
+                continue
+            self.logger.info(f"{name} 공유: {len(df):,}건")
+
+        load_time = (datetime.now() - start_time).total_seconds()
+        self.logger.info(f"공유 데이터 플레인 준비 완료: {len(self.manifest)}개 데이터, {load_time:.1f}초")
+        return dict(self.manifest)
+
+    def close(self):
+        """공유 파일 삭제 (워커 종료 후 호출)"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.manifest.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def attach_shared_data(manifest: Dict[str, str]) -> Dict[str, pd.DataFrame]:
+    """
+    공유 파일을 메모리 맵으로 열어 DataFrame으로 변환 (워커 프로세스 측)
+
+    null이 없는 숫자 컬럼은 split_blocks 변환으로 공유 버퍼를 그대로 참조합니다.
+    """
+    frames = {}
+    for name, path in manifest.items():
+        source = pa.memory_map(path, 'r')
+        table = ipc.open_file(source).read_all()
+        frames[name] = table.to_pandas(split_blocks=True)
+    return frames
+
+
+def install_shared_data(frames: Dict[str, pd.DataFrame]):
+    """
+    공유 데이터를 현재 프로세스의 PickleManager/PerformanceCache에 고정
+
+    이후 IndividualDashboard의 load_dataframe / 성능 캐시 조회는 파일을 읽지 않고
+    공유 데이터를 사용합니다.
+    """
+    from ..database import get_pickle_manager
+    from ..utils.performance_cache import get_performance_cache
+
+    pickle_manager = get_pickle_manager()
+    cache = get_performance_cache()
+
+    for name, df in frames.items():
+        pickle_manager.preload(name, df)
+
+    if 'tag_data' in frames:
+        cache.preload('tag_data', frames['tag_data'])
+        cache.get_tag_index()
+    if 'claim_data' in frames:
+        cache.preload('claim_data', frames['claim_data'])
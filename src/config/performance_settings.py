@@ -40,9 +40,22 @@ else:
 CACHE_EXPIRY_HOURS = 24
 USE_MEMORY_CACHE = True
 
+# 직원-일자 단위 분석 캐시 (일별 태그, 활동 분류 결과, 분석 결과) - 메모리 예산과 유지 시간
+ANALYSIS_CACHE_MAX_MB = int(os.getenv('ANALYSIS_CACHE_MAX_MB', 512 if is_apple_silicon() else 256))
+ANALYSIS_CACHE_TTL_SECONDS = 300
+
 # 쿼리 최적화
 USE_INDEX = True
 
+# 읽기 전용 SQLite 연결 풀 (API 서버) - 연결 수, 메모리 맵 크기, 연결별 준비된 문장 캐시 수
+SQLITE_POOL_SIZE = int(os.getenv('SQLITE_POOL_SIZE', 16 if is_apple_silicon() else 8))
+SQLITE_MMAP_MB = 256
+SQLITE_CACHED_STATEMENTS = 256
+
+# API 응답 캐시 - 메모리 예산, 분석 DB 세대 확인 주기
+API_RESPONSE_CACHE_MAX_MB = int(os.getenv('API_RESPONSE_CACHE_MAX_MB', 128))
+API_GENERATION_CHECK_SECONDS = 1.0
+
 # 시각화 설정
 PLOT_DPI = 100 if is_apple_silicon() else 72  # Apple Silicon은 고해상도 가능
 ANIMATION_FRAMES = 20 if is_apple_silicon() else 10
@@ -9,6 +9,9 @@ import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# O 태그 생성 로직(create_o_tags_from_equipment)을 수정하면 올려서 캐시된 O 태그를 무효화
+O_TAG_VERSION = '1.0.0'
+
 def process_eam_data(df):
     """EAM(안전설비시스템) 데이터 처리"""
     logger.info(f"EAM 데이터 처리 시작: {len(df)}개 레코드")
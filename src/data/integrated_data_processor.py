@@ -10,6 +10,9 @@ from typing import Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# 통합 로그 생성 로직을 수정하면 올려서 캐시된 통합 결과를 무효화
+INTEGRATION_VERSION = '1.0.0'
+
 class IntegratedDataProcessor:
     """Knox와 Equipment 데이터를 통합 처리하는 클래스"""
     
@@ -19,6 +22,12 @@ class IntegratedDataProcessor:
     
     def process_and_integrate_knox_data(self, approval_df=None, pims_df=None, mail_df=None):
         """Knox 데이터를 처리하고 데이터베이스에 저장 및 daily_logs와 통합"""
+        all_logs = self.build_knox_logs(approval_df, pims_df, mail_df)
+        self.save_knox_data(approval_df, pims_df, mail_df, all_logs)
+        return all_logs
+    
+    def build_knox_logs(self, approval_df=None, pims_df=None, mail_df=None) -> List[Dict]:
+        """Knox 데이터를 daily_logs 형식 로그로 변환 (데이터베이스에 쓰지 않음)"""
         
         all_logs = []
         
@@ -26,9 +35,6 @@ class IntegratedDataProcessor:
         if approval_df is not None and not approval_df.empty:
             self.logger.info(f"Knox Approval 데이터 처리 중: {len(approval_df)}개 레코드")
             
-            # 데이터베이스에 저장
-            self._save_knox_approval_to_db(approval_df)
-            
             # daily_logs 형식으로 변환
             for _, row in approval_df.iterrows():
                 if pd.notna(row.get('timestamp')) and pd.notna(row.get('employee_id')):
@@ -50,9 +56,6 @@ class IntegratedDataProcessor:
         if pims_df is not None and not pims_df.empty:
             self.logger.info(f"Knox PIMS 데이터 처리 중: {len(pims_df)}개 레코드")
             
-            # 데이터베이스에 저장
-            self._save_knox_pims_to_db(pims_df)
-            
             # daily_logs 형식으로 변환
             for _, row in pims_df.iterrows():
                 if pd.notna(row.get('timestamp')) and pd.notna(row.get('employee_id')):
@@ -84,9 +87,6 @@ class IntegratedDataProcessor:
         if mail_df is not None and not mail_df.empty:
             self.logger.info(f"Knox Mail 데이터 처리 중: {len(mail_df)}개 레코드")
             
-            # 데이터베이스에 저장
-            self._save_knox_mail_to_db(mail_df)
-            
             # daily_logs 형식으로 변환
             for _, row in mail_df.iterrows():
                 if pd.notna(row.get('timestamp')) and pd.notna(row.get('employee_id')):
@@ -104,15 +104,30 @@ class IntegratedDataProcessor:
                     }
                     all_logs.append(log_entry)
         
-        # daily_logs 테이블에 통합
-        if all_logs:
-            self._integrate_with_daily_logs(all_logs)
-            self.logger.info(f"총 {len(all_logs)}개의 Knox 로그를 daily_logs에 통합")
-        
         return all_logs
     
+    def save_knox_data(self, approval_df=None, pims_df=None, mail_df=None, logs=None):
+        """Knox 원천 데이터를 데이터베이스에 저장하고 변환된 로그를 daily_logs와 통합"""
+        if approval_df is not None and not approval_df.empty:
+            self._save_knox_approval_to_db(approval_df)
+        if pims_df is not None and not pims_df.empty:
+            self._save_knox_pims_to_db(pims_df)
+        if mail_df is not None and not mail_df.empty:
+            self._save_knox_mail_to_db(mail_df)
+        
+        # daily_logs 테이블에 통합
+        if logs:
+            self._integrate_with_daily_logs(logs)
+            self.logger.info(f"총 {len(logs)}개의 Knox 로그를 daily_logs에 통합")
+    
     def process_and_integrate_equipment_data(self, eam_df=None, lams_df=None, mes_df=None):
         """Equipment 데이터를 처리하고 데이터베이스에 저장 및 daily_logs와 통합"""
+        all_logs = self.build_equipment_logs(eam_df, lams_df, mes_df)
+        self.save_equipment_data(eam_df, lams_df, mes_df, all_logs)
+        return all_logs
+    
+    def build_equipment_logs(self, eam_df=None, lams_df=None, mes_df=None) -> List[Dict]:
+        """Equipment 데이터를 daily_logs 형식 로그로 변환 (데이터베이스에 쓰지 않음)"""
         
         all_logs = []
         
@@ -120,9 +135,6 @@ class IntegratedDataProcessor:
         if eam_df is not None and not eam_df.empty:
             self.logger.info(f"EAM 데이터 처리 중: {len(eam_df)}개 레코드")
             
-            # 데이터베이스에 저장
-            self._save_equipment_to_db(eam_df, 'EAM')
-            
             # daily_logs 형식으로 변환
             for _, row in eam_df.iterrows():
                 if pd.notna(row.get('timestamp')) and pd.notna(row.get('employee_id')):
@@ -144,9 +156,6 @@ class IntegratedDataProcessor:
         if lams_df is not None and not lams_df.empty:
             self.logger.info(f"LAMS 데이터 처리 중: {len(lams_df)}개 레코드")
             
-            # 데이터베이스에 저장
-            self._save_equipment_to_db(lams_df, 'LAMS')
-            
             # daily_logs 형식으로 변환
             for _, row in lams_df.iterrows():
                 if pd.notna(row.get('timestamp')) and pd.notna(row.get('employee_id')):
@@ -168,9 +177,6 @@ class IntegratedDataProcessor:
         if mes_df is not None and not mes_df.empty:
             self.logger.info(f"MES 데이터 처리 중: {len(mes_df)}개 레코드")
             
-            # 데이터베이스에 저장
-            self._save_equipment_to_db(mes_df, 'MES')
-            
             # daily_logs 형식으로 변환
             for _, row in mes_df.iterrows():
                 if pd.notna(row.get('timestamp')) and pd.notna(row.get('employee_id')):
@@ -188,13 +194,27 @@ class IntegratedDataProcessor:
                     }
                     all_logs.append(log_entry)
         
-        # daily_logs 테이블에 통합
-        if all_logs:
-            self._integrate_with_daily_logs(all_logs)
-            self.logger.info(f"총 {len(all_logs)}개의 Equipment 로그를 daily_logs에 통합")
-        
         return all_logs
     
+    def save_equipment_data(self, eam_df=None, lams_df=None, mes_df=None, logs=None):
+        """Equipment 원천 데이터를 데이터베이스에 저장하고 변환된 로그를 daily_logs와 통합"""
+        for df, system_type in ((eam_df, 'EAM'), (lams_df, 'LAMS'), (mes_df, 'MES')):
+            if df is not None and not df.empty:
+                self._save_equipment_to_db(df, system_type)
+        
+        # daily_logs 테이블에 통합
+        if logs:
+            self._integrate_with_daily_logs(logs)
+            self.logger.info(f"총 {len(logs)}개의 Equipment 로그를 daily_logs에 통합")
+    
+    def has_saved_data(self, table_name: str) -> bool:
+        """대상 데이터베이스의 테이블에 저장된 행이 있는지 확인 (테이블이 없으면 False)"""
+        try:
+            rows = pd.read_sql(f"SELECT 1 FROM {table_name} LIMIT 1", self.db_manager.engine)
+        except Exception:
+            return False
+        return not rows.empty
+    
     def _save_knox_approval_to_db(self, df):
         """Knox Approval 데이터를 데이터베이스에 저장"""
         try:
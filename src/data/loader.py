@@ -6,6 +6,9 @@ from typing import Optional, Union
 from pathlib import Path
 import logging
 
+from ..data_processing.excel_loader import ExcelLoader, PYARROW_AVAILABLE
+from ..config.performance_settings import PARALLEL_WORKERS
+
 logger = logging.getLogger(__name__)
 
 
@@ -33,8 +36,15 @@ class DataLoader:
         """
         file_path = Path(file_path)
         cache_path = self._get_cache_path(file_path)
+        parquet_cache_path = cache_path.with_suffix('.parquet')
+        excel_loader = ExcelLoader()
+        
+        # 캐시 확인 (스트리밍 Parquet 캐시 우선)
+        if use_cache and parquet_cache_path.exists() and PYARROW_AVAILABLE:
+            if parquet_cache_path.stat().st_mtime > file_path.stat().st_mtime:
+                logger.info(f"Loading from cache: {parquet_cache_path}")
+                return excel_loader.read_streamed(parquet_cache_path)
         
-        # 캐시 확인
         if use_cache and cache_path.exists():
             # 캐시가 원본보다 최신인지 확인
             if cache_path.stat().st_mtime > file_path.stat().st_mtime:
@@ -46,14 +56,20 @@ class DataLoader:
         start_time = time.time()
         
         try:
-            df = pd.read_excel(file_path)
+            if use_cache and PYARROW_AVAILABLE:
+                # 청크 단위로 Parquet 캐시에 기록한 뒤 컬럼 형식으로 로드
+                excel_loader.stream_to_parquet(file_path, parquet_cache_path, auto_merge_sheets=False)
+                df = excel_loader.read_streamed(parquet_cache_path)
+            else:
+                df = pd.read_excel(file_path)
+                
+                # 캐시 저장
+                if use_cache:
+                    self._save_pickle(df, cache_path)
+            
             load_time = time.time() - start_time
             logger.info(f"Excel loaded in {load_time:.2f} seconds")
             
-            # 캐시 저장
-            if use_cache:
-                self._save_pickle(df, cache_path)
-                
             return df
             
         except Exception as e:
@@ -125,20 +141,31 @@ class DataLoader:
         Returns:
             dict: 파일명을 키로 하는 데이터프레임 딕셔너리
         """
+        from ..data_processing.ingestion_scheduler import IngestionScheduler
+        
+        # 파일마다 별도 프로세스에서 로드 (캐시도 각 프로세스가 기록)
+        scheduler = IngestionScheduler(max_workers=min(len(file_paths), PARALLEL_WORKERS) or None)
+        task_names = [scheduler.add_task(f"{idx}:{Path(file_path).name}", load_excel_file,
+                                         str(self.cache_dir), str(file_path))
+                      for idx, file_path in enumerate(file_paths)]
+        
+        outcome = scheduler.run()
+        
         data_dict = {}
+        for task_name, file_path in zip(task_names, file_paths):
+            if task_name in outcome.errors:
+                logger.error(f"Failed to load {file_path}: {outcome.errors[task_name]}")
+                continue
+            data_dict[Path(file_path).stem] = outcome.results[task_name]
         
-        for file_path in file_paths:
-            file_path = Path(file_path)
-            try:
-                df = self.load_excel(file_path)
-                data_dict[file_path.stem] = df
-                
-            except Exception as e:
-                logger.error(f"Failed to load {file_path}: {e}")
-                
         return data_dict
 
 
+def load_excel_file(cache_dir: str, file_path: str) -> pd.DataFrame:
+    """DataLoader.load_excel 프로세스 작업용 래퍼"""
+    return DataLoader(cache_dir).load_excel(file_path)
+
+
 # 사용 예시
 if __name__ == "__main__":
     loader = DataLoader()
@@ -10,6 +10,54 @@ import logging
 from datetime import datetime, timedelta
 import warnings
 
+# 업로드 전처리(process_* 함수) 결과가 바뀌도록 로직을 수정하면 올려서 캐시된 적재 결과를 무효화
+TRANSFORMER_VERSION = '1.0.0'
+
+NS_PER_SECOND = 1_000_000_000
+NS_PER_HOUR = 3600 * NS_PER_SECOND
+NS_PER_DAY = 24 * NS_PER_HOUR
+
+
+def _timestamps_ns(values: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """datetime 컬럼을 int64 나노초 배열과 유효(NaT 아님) 마스크로 변환"""
+    timestamps = values.to_numpy(dtype='datetime64[ns]')
+    return timestamps.view('int64'), ~np.isnat(timestamps)
+
+
+def _time_of_day_ns(hhmm: str) -> int:
+    """'HH:MM' 문자열을 자정 기준 나노초로 변환"""
+    parsed = datetime.strptime(hhmm, '%H:%M')
+    return (parsed.hour * 3600 + parsed.minute * 60) * NS_PER_SECOND
+
+
+def _grouped_diff_ns(df: pd.DataFrame, key: str) -> np.ndarray:
+    """
+    key별로 프레임 순서상 직전 행과의 datetime 차이 (int64 나노초, 단일 패스)
+    
+    그룹의 첫 행, NaT, key가 결측인 행은 비교가 항상 거짓이 되도록 0을 반환합니다.
+    """
+    timestamps, valid = _timestamps_ns(df['datetime'])
+    if len(df) == 0:
+        return timestamps
+    
+    codes = pd.factorize(df[key])[0]
+    
+    # 그룹별로 모은 뒤 (그룹 내 프레임 순서 유지) 인접 차이 계산
+    order = np.argsort(codes, kind='stable')
+    sorted_codes = codes[order]
+    sorted_times = timestamps[order]
+    sorted_valid = valid[order]
+    
+    diffs = np.zeros(len(df), dtype=np.int64)
+    same_group = (sorted_codes[1:] == sorted_codes[:-1]) & (sorted_codes[1:] >= 0)
+    both_valid = sorted_valid[1:] & sorted_valid[:-1]
+    diffs[1:] = np.where(same_group & both_valid, sorted_times[1:] - sorted_times[:-1], 0)
+    
+    result = np.empty(len(df), dtype=np.int64)
+    result[order] = diffs
+    return result
+
+
 class DataTransformer:
     """데이터 변환 및 전처리를 위한 클래스"""
     
@@ -57,12 +105,8 @@ class DataTransformer:
         # 4. 꼬리물기 현상 처리
         processed_df = self._handle_tailgating(processed_df)
         
-        # 5. 입문/출문 매칭 및 체류시간 계산 (대용량 데이터에서는 선택적)
-        if len(processed_df) < 100000:  # 10만 건 미만일 때만 체류시간 계산
-            processed_df = self._calculate_stay_duration(processed_df)
-        else:
-            self.logger.info(f"대용량 데이터({len(processed_df):,}행)로 체류시간 계산 생략")
-            processed_df['stay_duration'] = None
+        # 5. 입문/출문 매칭 및 체류시간 계산
+        processed_df = self._calculate_stay_duration(processed_df)
         
         # 6. 근무구역/비근무구역 분류
         processed_df = self._classify_work_areas(processed_df)
@@ -119,19 +163,9 @@ class DataTransformer:
         )
         
         # 자정 이후 시간 처리 (23:30-01:00 야식시간 고려)
-        df['cross_midnight'] = False
-        
-        # 사번별로 그룹화하여 자정 넘어가는 패턴 찾기
-        for emp_id in df['사번'].unique():
-            emp_mask = df['사번'] == emp_id
-            emp_data = df[emp_mask].copy()
-            
-            # 시간 순서가 거꾸로 된 경우 (자정 넘어간 경우) 식별
-            time_diff = emp_data['datetime'].diff()
-            midnight_cross_mask = time_diff < timedelta(hours=-12)  # 시간이 거꾸로 간 경우
-            
-            if midnight_cross_mask.any():
-                df.loc[emp_mask & midnight_cross_mask, 'cross_midnight'] = True
+        # 사번별 직전 태그와의 시간 차가 거꾸로 간 경우 (자정 넘어간 경우) 식별
+        time_diff = _grouped_diff_ns(df, '사번')
+        df['cross_midnight'] = time_diff < -12 * NS_PER_HOUR
         
         return df
     
@@ -140,24 +174,26 @@ class DataTransformer:
         self.logger.info("식사시간 탐지 시작")
         
         # CAFETERIA 위치 식별
-        cafeteria_mask = df['DR_NM'].str.contains('CAFETERIA', case=False, na=False)
+        cafeteria_mask = df['DR_NM'].str.contains('CAFETERIA', case=False, na=False).to_numpy()
+        
+        # 자정 기준 경과 시간(ns)으로 시간대 비교
+        timestamps, valid = _timestamps_ns(df['datetime'])
+        time_of_day = timestamps % NS_PER_DAY
         
         # 식사시간 분류
         df['meal_type'] = None
         
         for meal, times in self.meal_times.items():
-            start_time = datetime.strptime(times['start'], '%H:%M').time()
-            end_time = datetime.strptime(times['end'], '%H:%M').time()
+            start_time = _time_of_day_ns(times['start'])
+            end_time = _time_of_day_ns(times['end'])
             
             if meal == 'midnight_meal':
                 # 야식의 경우 자정을 넘나드는 시간 처리
-                late_night_mask = (df['datetime'].dt.time >= start_time) | \
-                                 (df['datetime'].dt.time <= end_time)
+                late_night_mask = (time_of_day >= start_time) | (time_of_day <= end_time)
             else:
-                late_night_mask = (df['datetime'].dt.time >= start_time) & \
-                                 (df['datetime'].dt.time <= end_time)
+                late_night_mask = (time_of_day >= start_time) & (time_of_day <= end_time)
             
-            meal_mask = cafeteria_mask & late_night_mask
+            meal_mask = cafeteria_mask & late_night_mask & valid
             df.loc[meal_mask, 'meal_type'] = meal
         
         meal_count = df['meal_type'].notna().sum()
@@ -170,24 +206,13 @@ class DataTransformer:
         self.logger.info("꼬리물기 현상 처리 시작")
         
         # 같은 게이트에서 짧은 시간 간격으로 연속된 태깅 탐지
-        tailgating_threshold = timedelta(seconds=30)  # 30초 이내 연속 태깅
+        tailgating_threshold = 30 * NS_PER_SECOND  # 30초 이내 연속 태깅
         
-        df['is_tailgating'] = False
+        # 게이트별 직전 태그와의 시간 간격
+        time_diff = _grouped_diff_ns(df, 'DR_NO')
         
-        # 게이트별로 그룹화
-        for gate in df['DR_NO'].unique():
-            gate_mask = df['DR_NO'] == gate
-            gate_data = df[gate_mask].copy()
-            
-            # 시간 간격 계산
-            gate_data['time_diff'] = gate_data['datetime'].diff()
-            
-            # 꼬리물기 의심 케이스 식별
-            tailgating_mask = (gate_data['time_diff'] <= tailgating_threshold) & \
-                             (gate_data['time_diff'] > timedelta(seconds=0))
-            
-            if tailgating_mask.any():
-                df.loc[gate_mask & tailgating_mask, 'is_tailgating'] = True
+        # 꼬리물기 의심 케이스 식별
+        df['is_tailgating'] = (time_diff <= tailgating_threshold) & (time_diff > 0)
         
         tailgating_count = df['is_tailgating'].sum()
         self.logger.info(f"꼬리물기 현상 탐지: {tailgating_count:,}건")
@@ -195,53 +220,45 @@ class DataTransformer:
         return df
     
     def _calculate_stay_duration(self, df: pd.DataFrame) -> pd.DataFrame:
-        """입문/출문 매칭 및 체류시간 계산 (최적화된 버전)"""
+        """입문/출문 매칭 및 체류시간 계산 (사번·시간 정렬 후 다음 출문 역방향 채우기)"""
         self.logger.info("체류시간 계산 시작")
         
-        # 체류시간 컬럼 초기화
-        df['stay_duration'] = None
+        n = len(df)
+        if n == 0:
+            df['stay_duration'] = pd.Series(dtype=float)
+            return df
         
-        # 전체 사번 수 확인
-        unique_employees = df['사번'].unique()
-        total_employees = len(unique_employees)
-        self.logger.info(f"처리할 사번 수: {total_employees:,}명")
+        # 사번, 시간순 안정 정렬 (원래 위치는 order로 복원)
+        keys = df[['사번', 'datetime']].reset_index(drop=True)
+        order = keys.sort_values(['사번', 'datetime'], kind='mergesort').index.to_numpy()
         
-        # 진행상황 표시를 위한 카운터
-        processed_employees = 0
+        employee = pd.factorize(df['사번'].to_numpy()[order], use_na_sentinel=False)[0]
+        times = df['datetime'].to_numpy()[order]
+        inout = df['INOUT_GB'].to_numpy()[order]
         
-        # 배치 처리로 성능 개선
-        batch_size = 100  # 한 번에 처리할 사번 수
+        # 각 위치(포함) 이후 같은 사번의 첫 출문 시각
+        exit_times = pd.Series(np.where(inout == '출문', times, np.datetime64('NaT')))
+        next_exit_from = exit_times.groupby(employee).bfill().to_numpy()
         
-        for i in range(0, total_employees, batch_size):
-            batch_employees = unique_employees[i:i+batch_size]
-            
-            for emp_id in batch_employees:
-                emp_mask = df['사번'] == emp_id
-                emp_data = df[emp_mask]
-                
-                # 입문과 출문 분리
-                entry_indices = emp_data[emp_data['INOUT_GB'] == '입문'].index
-                
-                for idx in entry_indices:
-                    entry_time = df.loc[idx, 'datetime']
-                    
-                    # 같은 사번의 다음 출문 찾기
-                    next_exit_mask = (
-                        (df['사번'] == emp_id) & 
-                        (df['INOUT_GB'] == '출문') & 
-                        (df['datetime'] > entry_time)
-                    )
-                    
-                    next_exits = df[next_exit_mask]
-                    
-                    if not next_exits.empty:
-                        next_exit = next_exits.iloc[0]
-                        duration = (next_exit['datetime'] - entry_time).total_seconds() / 3600
-                        df.loc[idx, 'stay_duration'] = duration
-            
-            processed_employees += len(batch_employees)
-            if processed_employees % 1000 == 0:
-                self.logger.info(f"체류시간 계산 진행: {processed_employees:,}/{total_employees:,} 사번 ({processed_employees/total_employees*100:.1f}%)")
+        # 같은 사번·같은 시각 묶음의 다음 위치에서 찾아야 "이후" 출문이 됨
+        new_block = np.ones(n, dtype=bool)
+        new_block[1:] = (employee[1:] != employee[:-1]) | (times[1:] != times[:-1])
+        block_start = np.flatnonzero(new_block)
+        block_end = np.append(block_start[1:], n)
+        next_position = np.repeat(block_end, block_end - block_start)
+        
+        has_next = next_position < n
+        has_next[has_next] = employee[next_position[has_next]] == employee[has_next]
+        
+        next_exit = np.full(n, np.datetime64('NaT'), dtype=times.dtype)
+        next_exit[has_next] = next_exit_from[next_position[has_next]]
+        
+        durations = (next_exit - times) / np.timedelta64(1, 'h')
+        durations[inout != '입문'] = np.nan
+        
+        stay_duration = np.empty(n)
+        stay_duration[order] = durations
+        df['stay_duration'] = stay_duration
         
         duration_count = df['stay_duration'].notna().sum()
         self.logger.info(f"체류시간 계산 완료: {duration_count:,}건")
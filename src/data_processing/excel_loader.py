@@ -5,11 +5,106 @@
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 import logging
+import os
+import shutil
+import tempfile
 from pathlib import Path
 import time
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    pq = None
+    PYARROW_AVAILABLE = False
+
+# 이 크기(MB)를 넘는 파일은 청크 단위 스트리밍으로 로딩
+LARGE_FILE_MB = 100
+
+# 문자열/혼합 타입 컬럼과, 이후 청크 값이 첫 청크 타입에 맞지 않을 때 넓혀 쓰는 타입
+WIDENED_TYPE = pa.dictionary(pa.int32(), pa.string()) if PYARROW_AVAILABLE else None
+
+# 진행 상황 콜백: (처리한 행 수, 전체 예상 행 수 또는 None)
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+
+def _column_names(header: Tuple[Any, ...]) -> List[str]:
+    """헤더 행을 컬럼명으로 변환 (pd.read_excel과 같은 Unnamed/중복 처리)"""
+    names = []
+    seen: Dict[str, int] = {}
+    for i, value in enumerate(header):
+        name = f"Unnamed: {i}" if value is None else str(value)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _infer_column_type(values: pd.Series):
+    """첫 청크 값으로 컬럼의 Arrow 타입 결정 (이후 청크에 맞지 않는 값이 있으면 문자열로 넓힘)"""
+    inferred = pd.api.types.infer_dtype(values.dropna(), skipna=True)
+    if inferred == 'integer':
+        return pa.int64()
+    if inferred in ('floating', 'mixed-integer-float', 'decimal'):
+        return pa.float64()
+    if inferred in ('datetime', 'datetime64', 'date'):
+        return pa.timestamp('ns')
+    if inferred == 'boolean':
+        return pa.bool_()
+    # 문자열 및 혼합 타입은 사전(category) 인코딩
+    return WIDENED_TYPE
+
+
+def _coerce_column(values: pd.Series, arrow_type) -> Optional[Any]:
+    """
+    청크 컬럼을 지정 타입의 Arrow 배열로 변환
+    
+    값이 있는데 타입에 맞지 않는 항목이 하나라도 있으면 결측 처리하지 않고 None을
+    반환합니다 (호출 측에서 컬럼을 문자열로 넓힘).
+    """
+    present = values.notna()
+    
+    if pa.types.is_dictionary(arrow_type):
+        text = values.where(~present, values.astype(str))
+        return pa.array(text, type=pa.string(), from_pandas=True).dictionary_encode()
+    
+    if pa.types.is_timestamp(arrow_type):
+        converted = pd.to_datetime(values, errors='coerce')
+    elif pa.types.is_boolean(arrow_type):
+        converted = values.map({True: True, False: False})
+    else:
+        converted = pd.to_numeric(values, errors='coerce')
+        if pa.types.is_integer(arrow_type):
+            # 정수 컬럼에 소수가 섞이면 타입에 맞지 않는 값으로 취급
+            converted = converted.where(converted == np.floor(converted))
+    
+    if (present & converted.isna()).any():
+        return None
+    
+    if pa.types.is_boolean(arrow_type):
+        return pa.array(converted.astype(object).where(converted.notna(), None), type=arrow_type)
+    if pa.types.is_integer(arrow_type):
+        converted = converted.astype('Int64')
+    return pa.array(converted, type=arrow_type, from_pandas=True)
+
+
+def _widen_table_columns(table, column_names: List[str]):
+    """이미 기록한 테이블의 컬럼을 문자열 사전 타입으로 변환 (청크 변환과 같은 문자열 표현)"""
+    for name in column_names:
+        index = table.schema.get_field_index(name)
+        values = table.column(name).to_pandas(integer_object_nulls=True)
+        table = table.set_column(index, pa.field(name, WIDENED_TYPE),
+                                 _coerce_column(values, WIDENED_TYPE))
+    return table
+
+
 class ExcelLoader:
     """엑셀 파일 효율적 로딩을 위한 클래스"""
     
@@ -65,7 +160,7 @@ class ExcelLoader:
             self.logger.info(f"로딩할 시트: {sheet_name}")
             
             # 100MB 이상 파일의 경우 최적화된 로딩
-            if file_size > 100:
+            if file_size > LARGE_FILE_MB:
                 self.logger.info(f"대용량 파일 감지 ({file_size:.1f}MB) - 최적화된 로딩 시작...")
                 df = self._load_large_file(file_path, sheet_name)
             else:
@@ -82,34 +177,213 @@ class ExcelLoader:
             raise
     
     def _load_large_file(self, file_path: Path, sheet_name: str) -> pd.DataFrame:
-        """대용량 파일을 청크 단위로 로딩"""
-        # pd.read_excel은 chunksize를 지원하지 않으므로 직접 로딩
-        self.logger.info("대용량 Excel 파일 로딩 시작...")
+        """대용량 파일을 청크 단위로 로딩 (Parquet 임시 파일 경유)"""
+        return self._load_streamed(file_path, [sheet_name])
+    
+    def _load_streamed(self, file_path: Path, sheet_names: List[str]) -> pd.DataFrame:
+        """시트들을 청크 단위로 임시 Parquet 파일에 기록한 뒤 컬럼 형식으로 다시 로드"""
+        self.logger.info("대용량 Excel 파일 스트리밍 로딩 시작...")
+        
+        if not PYARROW_AVAILABLE:
+            self.logger.warning("pyarrow가 없어 전체 로딩으로 대체합니다")
+            return self._optimize_dtypes(pd.concat(
+                [pd.read_excel(file_path, sheet_name=sheet, engine='openpyxl') for sheet in sheet_names],
+                ignore_index=True))
         
+        fd, spill_path = tempfile.mkstemp(suffix='.parquet')
+        os.close(fd)
         try:
-            # 진행상황 표시를 위해 먼저 행 수 추정
-            self.logger.info("파일 정보 확인 중...")
-            
-            # 엑셀 파일 직접 로딩 (openpyxl 엔진 사용)
-            self.logger.info("데이터 로딩 중... (이 작업은 시간이 걸릴 수 있습니다)")
-            df = pd.read_excel(
-                file_path, 
-                sheet_name=sheet_name,
-                engine='openpyxl'  # 대용량 파일에 더 적합
-            )
-            
-            # 메모리 효율을 위한 데이터 타입 최적화
-            self.logger.info("데이터 타입 최적화 중...")
-            df = self._optimize_dtypes(df)
-            
-            return df
-            
+            self.stream_to_parquet(file_path, spill_path, sheet_names=sheet_names)
+            return self.read_streamed(spill_path)
         except Exception as e:
-            self.logger.error(f"대용량 파일 로딩 실패: {e}")
+            self.logger.error(f"스트리밍 로딩 실패: {e}")
             # 기본 엔진으로 재시도
             self.logger.info("기본 엔진으로 재시도...")
-            df = pd.read_excel(file_path, sheet_name=sheet_name)
-            return df
+            return pd.concat([pd.read_excel(file_path, sheet_name=sheet) for sheet in sheet_names],
+                             ignore_index=True)
+        finally:
+            if os.path.exists(spill_path):
+                os.unlink(spill_path)
+    
+    def stream_to_parquet(self, file_paths: Union[str, Path, List[Union[str, Path]]],
+                          output_path: Union[str, Path], sheet_names: List[str] = None,
+                          auto_merge_sheets: bool = True,
+                          progress_callback: ProgressCallback = None) -> Dict[str, Any]:
+        """
+        엑셀 파일을 chunk_size 행 단위로 읽어 Parquet 파일에 이어 쓰기
+        
+        openpyxl 읽기 전용 모드로 행을 순차적으로 읽고, 청크마다 타입 변환과
+        문자열 사전(category) 인코딩을 적용해 바로 디스크에 기록하므로 메모리 사용량은
+        파일 크기가 아니라 청크 크기에 비례합니다. 컬럼 타입은 첫 청크로 결정되며,
+        이후 청크에 그 타입으로 표현할 수 없는 값이 나오면 결측 처리하지 않고 해당 컬럼을
+        문자열로 넓혀 이미 기록한 부분까지 다시 씁니다. 여러 파일/시트는 첫 시트의 컬럼
+        기준으로 이어 붙입니다.
+        
+        Args:
+            file_paths: 엑셀 파일 경로 (여러 개면 순서대로 이어 붙임)
+            output_path: 기록할 Parquet 파일 경로
+            sheet_names: 읽을 시트 목록 (없으면 load_excel_file과 같은 규칙으로 선택)
+            auto_merge_sheets: sheet_names가 없을 때 Sheet1, Sheet2... 시트 자동 병합 여부
+            progress_callback: 청크마다 (처리한 행 수, 전체 예상 행 수) 호출
+        
+        Returns:
+            Dict: path, rows, columns, widened_columns(문자열로 넓혀 저장한 컬럼)
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("스트리밍 로딩에는 pyarrow 패키지가 필요합니다")
+        
+        import openpyxl
+        
+        if isinstance(file_paths, (str, Path)):
+            file_paths = [file_paths]
+        
+        start_time = time.time()
+        writer = None
+        schema = None
+        columns: List[str] = []
+        rows_written = 0
+        widened_columns: List[str] = []
+        
+        try:
+            for file_path in file_paths:
+                workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+                try:
+                    sheets = sheet_names or self._select_sheets(workbook.sheetnames, auto_merge_sheets)
+                    # 시트 크기 정보(dimension)가 있으면 진행률 계산에 사용
+                    sheet_rows = sum(max((workbook[sheet].max_row or 0) - 1, 0) for sheet in sheets)
+                    total_rows = rows_written + sheet_rows if sheet_rows else None
+                    
+                    for sheet in sheets:
+                        self.logger.info(f"{Path(file_path).name} / {sheet} 스트리밍 시작")
+                        for chunk in self._iter_sheet_chunks(workbook[sheet]):
+                            if schema is None:
+                                columns = list(chunk.columns)
+                                schema = pa.schema([(col, _infer_column_type(chunk[col])) for col in columns])
+                                writer = pq.ParquetWriter(str(output_path), schema, compression='zstd')
+                            elif list(chunk.columns) != columns:
+                                missing = set(columns) - set(chunk.columns)
+                                if missing:
+                                    self.logger.warning(f"{sheet} 시트에 없는 컬럼은 결측 처리합니다: {missing}")
+                                chunk = chunk.reindex(columns=columns)
+                            
+                            arrays = [_coerce_column(chunk[field.name], field.type) for field in schema]
+                            
+                            # 첫 청크 타입에 맞지 않는 값이 나온 컬럼은 문자열로 넓힘
+                            misfit = [field.name for field, array in zip(schema, arrays) if array is None]
+                            if misfit:
+                                writer, schema = self._widen_written_columns(
+                                    output_path, writer, schema, misfit, rows_written)
+                                widened_columns.extend(misfit)
+                                arrays = [_coerce_column(chunk[field.name], field.type) if array is None else array
+                                          for field, array in zip(schema, arrays)]
+                            
+                            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+                            
+                            rows_written += len(chunk)
+                            self.logger.info(f"청크 기록: 누적 {rows_written:,}행"
+                                             + (f" / 약 {total_rows:,}행" if total_rows else ""))
+                            if progress_callback:
+                                progress_callback(rows_written, total_rows)
+                finally:
+                    workbook.close()
+        except Exception:
+            # 중간에 실패하면 불완전한 파일을 남기지 않음
+            if writer is not None:
+                writer.close()
+                writer = None
+            Path(output_path).unlink(missing_ok=True)
+            raise
+        finally:
+            if writer is not None:
+                writer.close()
+        
+        if schema is None:
+            raise ValueError("엑셀 파일에 데이터가 없습니다.")
+        
+        if widened_columns:
+            self.logger.warning(f"첫 청크 타입에 맞지 않는 값이 있어 문자열로 저장한 컬럼: {widened_columns}")
+        
+        load_time = time.time() - start_time
+        self.logger.info(f"스트리밍 완료: {rows_written:,}행 x {len(columns)}열 → {output_path}, "
+                         f"소요시간: {load_time:.2f}초")
+        
+        return {
+            'path': str(output_path),
+            'rows': rows_written,
+            'columns': columns,
+            'widened_columns': widened_columns
+        }
+    
+    def _widen_written_columns(self, output_path: Union[str, Path], writer, schema,
+                               column_names: List[str], rows_written: int):
+        """
+        기록 중인 Parquet 파일의 컬럼을 문자열 사전 타입으로 넓혀 다시 쓰기
+        
+        Returns:
+            (새 writer, 넓힌 schema)
+        """
+        self.logger.warning(f"첫 청크 타입에 맞지 않는 값이 있어 컬럼을 문자열로 넓힙니다: {column_names} "
+                            f"(기록된 {rows_written:,}행 다시 쓰기)")
+        for name in column_names:
+            schema = schema.set(schema.get_field_index(name), pa.field(name, WIDENED_TYPE))
+        
+        writer.close()
+        written_path = Path(f"{output_path}.widen")
+        os.replace(output_path, written_path)
+        new_writer = pq.ParquetWriter(str(output_path), schema, compression='zstd')
+        try:
+            written = pq.ParquetFile(str(written_path))
+            for row_group in range(written.num_row_groups):
+                table = _widen_table_columns(written.read_row_group(row_group), column_names)
+                new_writer.write_table(table.cast(schema))
+        except Exception:
+            new_writer.close()
+            raise
+        finally:
+            written_path.unlink(missing_ok=True)
+        return new_writer, schema
+    
+    def _iter_sheet_chunks(self, worksheet) -> Iterator[pd.DataFrame]:
+        """읽기 전용 워크시트를 chunk_size 행 DataFrame으로 순차 반환 (첫 행은 헤더)"""
+        rows = worksheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        
+        columns = _column_names(header)
+        width = len(columns)
+        buffer = []
+        for row in rows:
+            # 빈 행은 건너뜀
+            if all(value is None for value in row):
+                continue
+            row = tuple(row[:width]) + (None,) * (width - len(row))
+            buffer.append(row)
+            if len(buffer) >= self.chunk_size:
+                yield pd.DataFrame.from_records(buffer, columns=columns)
+                buffer = []
+        
+        if buffer:
+            yield pd.DataFrame.from_records(buffer, columns=columns)
+    
+    def read_streamed(self, parquet_path: Union[str, Path]) -> pd.DataFrame:
+        """stream_to_parquet 결과를 DataFrame으로 로드 (_optimize_dtypes와 같은 타입 규칙)"""
+        df = pq.read_table(str(parquet_path)).to_pandas()
+        
+        # 반복이 적은 문자열 컬럼은 category 대신 일반 문자열로 유지
+        for col in df.columns:
+            if isinstance(df[col].dtype, pd.CategoricalDtype) and len(df) > 0:
+                if len(df[col].cat.categories) / len(df) >= 0.5:
+                    df[col] = df[col].astype(object)
+        
+        return self._optimize_dtypes(df)
+    
+    @staticmethod
+    def _select_sheets(sheet_names: List[str], auto_merge_sheets: bool = True) -> List[str]:
+        """병합 대상 시트 선택 (Sheet1, Sheet2... 패턴이면 모두, 아니면 첫 시트)"""
+        if auto_merge_sheets and len(sheet_names) > 1 and any('sheet' in name.lower() for name in sheet_names):
+            return sorted(name for name in sheet_names if 'sheet' in name.lower() or name.startswith('Sheet'))
+        return sheet_names[:1]
     
     def _optimize_dtypes(self, df: pd.DataFrame) -> pd.DataFrame:
         """데이터 타입 최적화로 메모리 사용량 줄이기"""
@@ -157,16 +431,15 @@ class ExcelLoader:
         
         self.logger.info(f"병합할 시트: {sheets_to_merge}")
         
+        # 시트별 파싱을 병렬로 실행 (대용량 파일은 시트마다 Parquet로 스트리밍)
+        parsed_sheets = self._parse_sheets_parallel(file_path, sheets_to_merge, file_size)
+        
         for idx, sheet in enumerate(sheets_to_merge):
+            df_sheet = parsed_sheets.get(sheet)
+            if df_sheet is None:
+                continue
+            
             try:
-                self.logger.info(f"[{idx+1}/{len(sheets_to_merge)}] {sheet} 시트 로딩 중...")
-                
-                # 각 시트 로드
-                if file_size > 100:
-                    df_sheet = self._load_large_file(file_path, sheet)
-                else:
-                    df_sheet = pd.read_excel(file_path, sheet_name=sheet)
-                
                 rows_in_sheet = len(df_sheet)
                 self.logger.info(f"{sheet}: {rows_in_sheet:,}행 로드됨")
                 
@@ -200,11 +473,51 @@ class ExcelLoader:
         self.logger.info(f"병합 완료: 총 {len(combined_df):,}행 (원본 {total_rows:,}행)")
         
         # 메모리 최적화
-        if file_size > 100:
+        if file_size > LARGE_FILE_MB:
             combined_df = self._optimize_dtypes(combined_df)
         
         return combined_df
     
+    def _parse_sheets_parallel(self, file_path: Path, sheets: List[str], file_size: float) -> Dict[str, pd.DataFrame]:
+        """시트들을 프로세스 풀에서 동시에 파싱 (실패한 시트는 제외)"""
+        from .ingestion_scheduler import IngestionScheduler, parse_excel_sheet
+        from ..config.performance_settings import PARALLEL_WORKERS
+        
+        spill_dir = tempfile.mkdtemp(prefix='sambio_sheets_')
+        try:
+            scheduler = IngestionScheduler(max_workers=min(len(sheets), PARALLEL_WORKERS))
+            for idx, sheet in enumerate(sheets):
+                spill_path = None
+                if file_size > LARGE_FILE_MB and PYARROW_AVAILABLE:
+                    spill_path = os.path.join(spill_dir, f"sheet_{idx}.parquet")
+                scheduler.add_task(sheet, parse_excel_sheet, str(file_path), sheet, spill_path, self.chunk_size)
+            
+            def report_progress(done: int, total: int, sheet: str):
+                self.logger.info(f"[{done}/{total}] {sheet} 시트 로딩 완료")
+            
+            outcome = scheduler.run(progress_callback=report_progress)
+            
+            parsed = {}
+            for sheet in sheets:
+                if sheet in outcome.errors:
+                    self.logger.error(f"{sheet} 시트 로딩 실패: {outcome.errors[sheet]}")
+                    continue
+                result = outcome.results[sheet]
+                parsed[sheet] = self.read_streamed(result) if isinstance(result, str) else result
+            return parsed
+        finally:
+            shutil.rmtree(spill_dir, ignore_errors=True)
+    
+    def get_sheet_names(self, file_path: Union[str, Path]) -> List[str]:
+        """시트 목록 조회 (읽기 전용 모드, 셀 데이터는 읽지 않음)"""
+        import openpyxl
+        
+        workbook = openpyxl.load_workbook(file_path, read_only=True)
+        try:
+            return list(workbook.sheetnames)
+        finally:
+            workbook.close()
+    
     def validate_data(self, df: pd.DataFrame, required_columns: List[str] = None) -> Dict[str, any]:
         """
         데이터 검증 및 기본 통계 정보 제공
@@ -0,0 +1,306 @@
+"""
+병렬 데이터 적재 스케줄러
+파일/시트별 파싱 작업과 병합·전처리 작업, 데이터 유형 간 통합 작업을 의존성 그래프(DAG)로
+구성해 준비된 작업부터 프로세스 풀에서 동시에 실행합니다.
+
+메인 프로세스 작업(in_process=True)은 DB 연결이나 UI 상태처럼 프로세스 간에 넘길 수 없는
+자원을 쓰는 작업에 사용하며, 실행되는 동안에도 프로세스 풀의 작업은 계속 진행됩니다.
+"""
+
+import inspect
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+from .excel_loader import ExcelLoader
+from ..config.performance_settings import PARALLEL_WORKERS
+
+logger = logging.getLogger(__name__)
+
+# 진행 상황 콜백: (완료된 작업 수, 전체 작업 수, 방금 끝난 작업 이름)
+SchedulerProgress = Callable[[int, int, str], None]
+
+
+@dataclass
+class IngestionTask:
+    """적재 DAG의 작업 하나"""
+    name: str
+    func: Callable
+    args: Tuple = ()
+    depends_on: Tuple[str, ...] = ()
+    in_process: bool = False  # True면 메인 프로세스에서 실행
+    pass_inputs: bool = False  # True면 선행 작업 결과 리스트를 첫 인자로 전달
+
+
+@dataclass
+class SchedulerResult:
+    """스케줄러 실행 결과"""
+    results: Dict[str, Any] = field(default_factory=dict)
+    errors: Dict[str, BaseException] = field(default_factory=dict)
+
+    @property
+    def succeeded(self) -> bool:
+        return not self.errors
+
+
+class DependencyError(RuntimeError):
+    """선행 작업이 실패해 실행하지 않은 작업"""
+
+
+@dataclass
+class SheetParseFailure:
+    """파싱에 실패한 시트 (병합 작업은 이 시트를 건너뛰고 나머지를 병합)"""
+    file_path: str
+    sheet_name: str
+    error: str
+
+
+class IngestionScheduler:
+    """의존성 그래프 기반 병렬 적재 스케줄러"""
+
+    def __init__(self, max_workers: int = None):
+        """
+        Args:
+            max_workers: 프로세스 풀 워커 수 (없으면 성능 설정의 PARALLEL_WORKERS)
+        """
+        self.max_workers = max_workers or PARALLEL_WORKERS
+        self.tasks: Dict[str, IngestionTask] = {}
+        self.logger = logging.getLogger(__name__)
+
+    def add_task(self, name: str, func: Callable, *args, depends_on: Sequence[str] = (),
+                 in_process: bool = False, pass_inputs: bool = False) -> str:
+        """
+        작업 추가
+
+        Args:
+            name: 작업 이름 (고유)
+            func: 실행할 함수 (프로세스 작업은 모듈 최상위 함수여야 함)
+            *args: 함수 인자
+            depends_on: 먼저 끝나야 하는 작업 이름들
+            in_process: 메인 프로세스에서 실행 여부
+            pass_inputs: 선행 작업 결과를 depends_on 순서의 리스트로 첫 인자에 전달
+
+        Returns:
+            str: 작업 이름
+        """
+        if name in self.tasks:
+            raise ValueError(f"중복된 작업 이름: {name}")
+        self.tasks[name] = IngestionTask(name, func, tuple(args), tuple(depends_on),
+                                         in_process, pass_inputs)
+        return name
+
+    def _validate(self):
+        """알 수 없는 의존성과 순환 의존성 검사"""
+        for task in self.tasks.values():
+            unknown = [dep for dep in task.depends_on if dep not in self.tasks]
+            if unknown:
+                raise ValueError(f"{task.name}: 알 수 없는 선행 작업 {unknown}")
+
+        visiting, done = set(), set()
+
+        def visit(name: str):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"순환 의존성: {name}")
+            visiting.add(name)
+            for dep in self.tasks[name].depends_on:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.tasks:
+            visit(name)
+
+    def run(self, progress_callback: SchedulerProgress = None) -> SchedulerResult:
+        """
+        모든 작업 실행
+
+        선행 작업이 실패하면 그 작업에 의존하는 작업은 실행하지 않고 DependencyError로
+        기록합니다. 서로 관계없는 작업은 계속 진행됩니다.
+        """
+        self._validate()
+        outcome = SchedulerResult()
+        remaining = dict(self.tasks)
+        running: Dict[Future, str] = {}
+        total = len(self.tasks)
+
+        def finish(name: str, result: Any = None, error: BaseException = None):
+            if error is None:
+                outcome.results[name] = result
+            else:
+                outcome.errors[name] = error
+                self.logger.error(f"적재 작업 실패: {name} - {error}")
+            if progress_callback:
+                progress_callback(len(outcome.results) + len(outcome.errors), total, name)
+
+        def arguments(task: IngestionTask) -> Tuple:
+            if task.pass_inputs:
+                return ([outcome.results[dep] for dep in task.depends_on],) + task.args
+            return task.args
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            while remaining or running:
+                # 선행 작업이 실패한 작업은 건너뜀
+                for name, task in list(remaining.items()):
+                    failed = [dep for dep in task.depends_on if dep in outcome.errors]
+                    if failed:
+                        del remaining[name]
+                        finish(name, error=DependencyError(f"선행 작업 실패: {failed}"))
+
+                ready = [task for task in remaining.values()
+                         if all(dep in outcome.results for dep in task.depends_on)]
+
+                for task in ready:
+                    if not task.in_process:
+                        del remaining[task.name]
+                        running[executor.submit(task.func, *arguments(task))] = task.name
+
+                # 메인 프로세스 작업은 하나씩 실행 (그동안 풀 작업은 계속 진행)
+                main_task = next((task for task in ready if task.in_process), None)
+                if main_task is not None:
+                    del remaining[main_task.name]
+                    try:
+                        finish(main_task.name, main_task.func(*arguments(main_task)))
+                    except Exception as e:
+                        finish(main_task.name, error=e)
+                    continue
+
+                if not running:
+                    if remaining:
+                        # 검증을 통과했다면 도달할 수 없음
+                        raise RuntimeError(f"실행할 수 없는 작업: {list(remaining)}")
+                    break
+
+                completed, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in completed:
+                    name = running.pop(future)
+                    try:
+                        finish(name, future.result())
+                    except Exception as e:
+                        finish(name, error=e)
+
+        return outcome
+
+
+def parse_excel_sheet(file_path: str, sheet_name: str, spill_path: Optional[str] = None,
+                      chunk_size: int = 10000) -> Union[pd.DataFrame, str]:
+    """
+    시트 하나 파싱 (프로세스 작업)
+
+    spill_path가 있으면 청크 단위로 Parquet에 기록하고 경로를 반환하며(대용량),
+    없으면 DataFrame을 그대로 반환합니다.
+    """
+    loader = ExcelLoader(chunk_size=chunk_size)
+    if spill_path is None:
+        return pd.read_excel(file_path, sheet_name=sheet_name)
+
+    loader.stream_to_parquet(file_path, spill_path, sheet_names=[sheet_name])
+    return spill_path
+
+
+def try_parse_excel_sheet(file_path: str, sheet_name: str, spill_path: Optional[str] = None,
+                          chunk_size: int = 10000) -> Union[pd.DataFrame, str, SheetParseFailure]:
+    """
+    시트 하나 파싱 (프로세스 작업, 실패해도 병합 작업이 진행되도록 SheetParseFailure 반환)
+    """
+    try:
+        return parse_excel_sheet(file_path, sheet_name, spill_path, chunk_size)
+    except Exception as e:
+        return SheetParseFailure(file_path, sheet_name, f"{type(e).__name__}: {e}")
+
+
+def stream_excel_files(file_paths: List[str], spill_path: str, chunk_size: int = 10000) -> Dict[str, Any]:
+    """여러 엑셀 파일을 하나의 Parquet 파일로 스트리밍 (프로세스 작업)"""
+    return ExcelLoader(chunk_size=chunk_size).stream_to_parquet(file_paths, spill_path)
+
+
+def _as_frame(parsed: Union[pd.DataFrame, str]) -> pd.DataFrame:
+    """파싱 결과(DataFrame 또는 Parquet 경로)를 DataFrame으로 변환"""
+    if isinstance(parsed, str):
+        return ExcelLoader().read_streamed(parsed)
+    return parsed
+
+
+def merge_sheet_frames(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """한 파일의 시트들을 병합 (컬럼이 다르면 공통 컬럼만 사용)"""
+    if len(frames) == 1:
+        return frames[0]
+
+    columns = list(frames[0].columns)
+    if any(not frame.columns.equals(frames[0].columns) for frame in frames[1:]):
+        common = set(columns).intersection(*(frame.columns for frame in frames[1:]))
+        columns = [col for col in columns if col in common]
+        logger.warning("시트의 컬럼이 첫 번째 시트와 다릅니다. 공통 컬럼만 사용합니다.")
+        frames = [frame[columns] for frame in frames]
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def resolve_process_func(process_func_name: Optional[str]) -> Optional[Callable]:
+    """
+    전처리 함수 이름을 함수로 변환 (DataTransformer 메서드 또는 설비/Knox 처리 함수)
+
+    Raises:
+        ValueError: 알 수 없는 전처리 함수 이름 (전처리를 건너뛰지 않도록)
+    """
+    if not process_func_name:
+        return None
+
+    from .data_transformer import DataTransformer
+    from ..data import equipment_processors, knox_processors
+
+    transformer = DataTransformer()
+    candidates = {name: getattr(transformer, name) for name in dir(transformer)
+                  if not name.startswith('_') and callable(getattr(transformer, name))}
+    for module in (equipment_processors, knox_processors):
+        for name, func in vars(module).items():
+            if (not name.startswith('_') and inspect.isfunction(func)
+                    and func.__module__ == module.__name__):
+                candidates.setdefault(name, func)
+
+    func = candidates.get(process_func_name)
+    if func is None:
+        raise ValueError(f"알 수 없는 전처리 함수: {process_func_name!r} "
+                         f"(사용 가능: {', '.join(sorted(candidates))})")
+    return func
+
+
+def merge_and_process(parsed: List[Union[pd.DataFrame, str]], file_sheet_counts: List[int],
+                      process_func_name: Optional[str] = None) -> pd.DataFrame:
+    """
+    파일/시트별 파싱 결과를 병합하고 전처리 (프로세스 작업)
+
+    파싱에 실패한 시트(SheetParseFailure)는 오류를 기록하고 건너뛰며,
+    병합할 수 있는 시트가 하나도 없을 때만 실패합니다 (ExcelLoader와 동일).
+
+    Args:
+        parsed: 파싱 작업 결과 (파일 순서, 파일 내 시트 순서)
+        file_sheet_counts: 파일별 시트 수
+        process_func_name: 전처리 함수 이름 (없으면 병합만 수행)
+    """
+    file_frames = []
+    offset = 0
+    for count in file_sheet_counts:
+        frames = []
+        for item in parsed[offset:offset + count]:
+            if isinstance(item, SheetParseFailure):
+                logger.error(f"{item.sheet_name} 시트 로딩 실패 ({item.file_path}): {item.error}")
+                continue
+            frames.append(_as_frame(item))
+        if frames:
+            file_frames.append(merge_sheet_frames(frames))
+        offset += count
+
+    if not file_frames:
+        raise ValueError("병합할 수 있는 시트가 없습니다.")
+
+    combined = pd.concat(file_frames, ignore_index=True) if len(file_frames) > 1 else file_frames[0]
+
+    process_func = resolve_process_func(process_func_name)
+    if process_func is not None:
+        combined = process_func(combined)
+    return combined
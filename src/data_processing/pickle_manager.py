@@ -1,27 +1,96 @@
 """
 Pickle 파일 관리 모듈
 데이터프레임 직렬화/역직렬화, 버전 관리, 캐싱 전략을 제공합니다.
+
+저장 형식:
+- 'pickle': gzip 압축 pickle (.pkl.gz) - 기존 형식
+- 'parquet': 컬럼 기반 Parquet (.parquet) - 메모리 맵, 컬럼 선택, row group 필터 지원
 """
 
+import os
 import pickle
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, Optional, Union
+from typing import Callable, Dict, Any, Optional, Union, List, Tuple
 from pathlib import Path
 import logging
 import hashlib
 import json
 from datetime import datetime
 import gzip
+import shutil
 import warnings
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    pq = None
+    PYARROW_AVAILABLE = False
+
+# 기본 저장 형식 (환경 변수로 오버라이드 가능)
+DEFAULT_STORAGE_FORMAT = os.getenv(
+    'SAMBIO_STORAGE_FORMAT', 'parquet' if PYARROW_AVAILABLE else 'pickle'
+)
+
+# Parquet row group 크기 - 직원/날짜 단위 조회 시 읽는 범위를 결정
+PARQUET_ROW_GROUP_SIZE = 65536
+
+# 정렬(클러스터링) 기준 컬럼 - row group 통계로 필터링이 가능하도록 정렬 저장
+CLUSTER_COLUMNS = ['사번', 'ENTE_DT']
+
+# 정렬 저장 시 원래 행 순서를 보관하는 내부 컬럼 (로드 시 순서 복원 후 제거)
+ROW_ORDER_COLUMN = '__row_order__'
+
+# 지원하는 필터 연산자
+FILTER_OPERATORS = ('==', '=', '!=', '<', '<=', '>', '>=', 'in', 'not in')
+
+# 지원하는 파일 확장자 (검색 우선순위 순)
+STORAGE_EXTENSIONS = ['.parquet', '.pkl.gz', '.pkl']
+
+# 필터 타입: [(컬럼, 연산자, 값), ...] (pyarrow filters 형식)
+FilterList = List[Tuple[str, str, Any]]
+
+# 파생 데이터 입력: DataFrame, 저장된 데이터 이름(str), 원본 파일 바이트(bytes) 또는 None
+ArtifactInput = Union[pd.DataFrame, str, bytes, None]
+
+
+def _filter_values(op: str, value: Any) -> list:
+    """필터 값을 리스트로 (in/not in은 값 목록, 그 외는 단일 값)"""
+    if op not in FILTER_OPERATORS:
+        raise ValueError(f"지원하지 않는 필터 연산자: {op}")
+    return list(value) if op in ('in', 'not in') else [value]
+
+
+def _cast_filter_values(column: str, op: str, value: Any, dtype) -> Any:
+    """
+    필터 값을 컬럼의 pandas dtype으로 변환 (예: int 컬럼에 '20250602' → 20250602)
+    
+    Parquet 저장본과 같은 결과를 내도록 변환할 수 없으면 ValueError
+    """
+    values = _filter_values(op, value)
+    if isinstance(dtype, pd.CategoricalDtype):
+        dtype = dtype.categories.dtype
+    if dtype != object:
+        try:
+            values = pd.Series(values).astype(dtype).tolist()
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"필터 값을 {column} 컬럼 타입({dtype})으로 변환할 수 없습니다: {value!r}") from e
+    return values if op in ('in', 'not in') else values[0]
+
+
 class PickleManager:
     """Pickle 파일 관리를 위한 클래스"""
     
-    def __init__(self, base_path: Union[str, Path] = "data/pickles"):
+    def __init__(self, base_path: Union[str, Path] = "data/pickles",
+                 storage_format: str = None, auto_migrate: bool = True):
         """
         Args:
             base_path: pickle 파일 저장 기본 경로
+            storage_format: 저장 형식 ('parquet' 또는 'pickle', 없으면 기본값)
+            auto_migrate: 컬럼 형식 사용 시 기존 .pkl.gz 파일을 로드하면서 자동 변환
         """
         # 상대 경로로 유지
         self.base_path = Path(base_path)
@@ -29,14 +98,26 @@ class PickleManager:
         self.logger = logging.getLogger(__name__)
         self.logger.debug(f"PickleManager 초기화 - base_path: {self.base_path}")
         
+        storage_format = storage_format or DEFAULT_STORAGE_FORMAT
+        if storage_format == 'parquet' and not PYARROW_AVAILABLE:
+            self.logger.warning("pyarrow가 설치되지 않아 pickle 형식으로 저장합니다")
+            storage_format = 'pickle'
+        if storage_format not in ('parquet', 'pickle'):
+            raise ValueError(f"지원하지 않는 저장 형식: {storage_format}")
+        self.storage_format = storage_format
+        self.auto_migrate = auto_migrate
+        
         # 메타데이터 파일 경로
         self.metadata_file = self.base_path / "metadata.json"
         self.metadata = self._load_metadata()
     
     def save_dataframe(self, df: pd.DataFrame, name: str, version: str = None, 
-                      compress: bool = True, description: str = None) -> str:
+                      compress: bool = True, description: str = None,
+                      storage_format: str = None, artifact_key: str = None) -> str:
         """
-        DataFrame을 pickle 파일로 저장
+        DataFrame을 저장 (기본 형식은 Parquet, pyarrow 미설치 시 pickle)
+        
+        내용이 같은 데이터가 이미 저장되어 있으면 다시 쓰지 않고 기존 파일을 사용합니다.
         
         Args:
             df: 저장할 DataFrame
@@ -44,32 +125,44 @@ class PickleManager:
             version: 버전 정보 (없으면 자동 생성)
             compress: 압축 여부
             description: 파일 설명
+            storage_format: 저장 형식 ('parquet' 또는 'pickle', 없으면 인스턴스 기본값)
+            artifact_key: 파생 데이터 캐시 키 (artifact_key() 결과)
             
         Returns:
             str: 저장된 파일 경로
         """
+        data_hash = self._generate_data_hash(df)
+        existing_path = self._find_existing_data(name, data_hash)
+        if existing_path is not None:
+            info = self.metadata[str(existing_path)]
+            if artifact_key is not None and info.get('artifact_key') != artifact_key:
+                info['artifact_key'] = artifact_key
+                self._save_metadata()
+            self.logger.info(f"{name}: 내용이 같아 저장을 건너뜁니다 ({existing_path})")
+            return str(existing_path)
+        
         # 기존 파일들 삭제 (버전 관리하지 않음)
         self._remove_old_versions(name)
         
         if version is None:
             version = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        # 파일명 생성
-        extension = ".pkl.gz" if compress else ".pkl"
-        filename = f"{name}_v{version}{extension}"
-        file_path = self.base_path / filename
+        storage_format = storage_format or self.storage_format
+        if storage_format == 'parquet' and not PYARROW_AVAILABLE:
+            storage_format = 'pickle'
         
         try:
-            # 저장 실행
-            if compress:
-                with gzip.open(file_path, 'wb') as f:
-                    pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
-            else:
-                with open(file_path, 'wb') as f:
-                    pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+            file_path = None
+            if storage_format == 'parquet':
+                file_path = self._write_parquet(df, name, version, compress)
             
-            # 메타데이터 업데이트 (해시 없이)
-            self._update_metadata(name, version, file_path, df, None, description)
+            # Parquet로 변환할 수 없는 데이터(혼합 타입 등)는 pickle로 저장
+            if file_path is None:
+                file_path = self._write_pickle(df, name, version, compress)
+            
+            # 메타데이터 업데이트
+            self._update_metadata(name, version, file_path, df, data_hash, description,
+                                  artifact_key)
             
             # 파일 크기 정보
             file_size = file_path.stat().st_size / (1024 * 1024)  # MB
@@ -85,6 +178,106 @@ class PickleManager:
             self.logger.error(f"DataFrame 저장 실패: {e}")
             raise
     
+    def save_parquet_file(self, source_path: Union[str, Path], name: str, version: str = None,
+                          description: str = None, artifact_key: str = None) -> str:
+        """
+        외부에서 기록한 Parquet 파일(예: 엑셀 스트리밍 결과)을 DataFrame 로드 없이 저장소에 등록
+        
+        정렬 없이 기록된 파일은 row group 통계로 건너뛸 수 있는 범위가 줄어들 뿐
+        load_dataframe의 컬럼 선택/필터는 그대로 동작합니다.
+        
+        Args:
+            source_path: 등록할 Parquet 파일 경로 (저장소로 이동됨)
+            name: 파일명 (확장자 제외)
+            version: 버전 정보 (없으면 자동 생성)
+            description: 파일 설명
+            artifact_key: 파생 데이터 캐시 키 (artifact_key() 결과)
+        
+        Returns:
+            str: 저장된 파일 경로
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("Parquet 파일을 등록하려면 pyarrow 패키지가 필요합니다")
+        
+        self._remove_old_versions(name)
+        
+        if version is None:
+            version = datetime.now().strftime("%Y%m%d_%H%M%S")
+        
+        file_path = self.base_path / f"{name}_v{version}.parquet"
+        shutil.move(str(source_path), str(file_path))
+        
+        parquet_file = pq.ParquetFile(file_path)
+        schema = parquet_file.schema_arrow
+        self.metadata[str(file_path)] = {
+            'name': name,
+            'version': version,
+            'file_path': str(file_path),
+            'rows': parquet_file.metadata.num_rows,
+            'columns': len(schema),
+            'size_mb': file_path.stat().st_size / (1024 * 1024),
+            'created_at': datetime.now().isoformat(),
+            'data_hash': None,
+            'artifact_key': artifact_key,
+            'description': description or '',
+            'dtypes': {field.name: str(field.type) for field in schema}
+        }
+        self._save_metadata()
+        
+        self.logger.info(f"Parquet 파일 등록 완료: {file_path} ({parquet_file.metadata.num_rows:,}행)")
+        return str(file_path)
+    
+    def _write_pickle(self, df: pd.DataFrame, name: str, version: str,
+                      compress: bool) -> Path:
+        """DataFrame을 pickle 파일로 저장"""
+        extension = ".pkl.gz" if compress else ".pkl"
+        file_path = self.base_path / f"{name}_v{version}{extension}"
+        
+        if compress:
+            with gzip.open(file_path, 'wb') as f:
+                pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+        else:
+            with open(file_path, 'wb') as f:
+                pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+        
+        return file_path
+    
+    def _write_parquet(self, df: pd.DataFrame, name: str, version: str,
+                       compress: bool) -> Optional[Path]:
+        """
+        DataFrame을 Parquet 파일로 저장
+        
+        사번/ENTE_DT 기준으로 정렬하여 저장하므로 row group 통계만으로
+        특정 직원/날짜에 해당하지 않는 구간을 건너뛸 수 있습니다.
+        원래 행 순서와 인덱스도 함께 저장해 로드 시 pickle과 같은 DataFrame으로 복원합니다.
+        
+        Returns:
+            Optional[Path]: 저장된 경로, Arrow로 변환할 수 없으면 None
+        """
+        file_path = self.base_path / f"{name}_v{version}.parquet"
+        
+        preserve_index = None
+        sort_columns = [col for col in CLUSTER_COLUMNS if col in df.columns]
+        if sort_columns:
+            # 기본 RangeIndex는 순서 복원 후 다시 부여되므로 별도 저장하지 않음
+            preserve_index = not df.index.equals(pd.RangeIndex(len(df)))
+            df = df.assign(**{ROW_ORDER_COLUMN: np.arange(len(df), dtype=np.int64)})
+            df = df.sort_values(sort_columns, kind='stable')
+        
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=preserve_index)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+            self.logger.warning(f"Parquet 변환 불가, pickle로 저장합니다: {name} - {e}")
+            return None
+        
+        pq.write_table(
+            table, file_path,
+            compression='zstd' if compress else 'none',
+            row_group_size=PARQUET_ROW_GROUP_SIZE,
+            write_statistics=True
+        )
+        return file_path
+    
     def _remove_old_versions(self, name: str):
         """특정 이름의 모든 이전 버전 파일 삭제"""
         pattern = f"{name}_v*"
@@ -97,13 +290,23 @@ class PickleManager:
             except Exception as e:
                 self.logger.warning(f"파일 삭제 실패: {old_file} - {e}")
     
-    def load_dataframe(self, name: str, version: str = None) -> pd.DataFrame:
+    def load_dataframe(self, name: str, version: str = None,
+                       columns: List[str] = None,
+                       filters: FilterList = None) -> pd.DataFrame:
         """
-        pickle 파일에서 DataFrame 로드
+        저장된 파일에서 DataFrame 로드
+        
+        Parquet 파일은 메모리 맵으로 열어 요청한 컬럼과 필터에 해당하는
+        row group만 읽습니다. pickle 파일은 전체 로드 후 동일한 조건을 적용하며,
+        auto_migrate가 켜져 있으면 Parquet로 변환해 둡니다.
         
         Args:
             name: 파일명
             version: 버전 (없으면 최신 버전)
+            columns: 로드할 컬럼 목록 (없으면 전체)
+            filters: 행 필터 [(컬럼, 연산자, 값), ...]
+                     예: [('사번', '==', 20170124), ('ENTE_DT', '==', 20250630)]
+                     연산자: ==, !=, <, <=, >, >=, in, not in
             
         Returns:
             pd.DataFrame: 로드된 DataFrame
@@ -118,12 +321,20 @@ class PickleManager:
                 raise FileNotFoundError(f"파일을 찾을 수 없습니다: {name} (version: {version})")
             
             # 로드 실행
-            if file_path.suffix == '.gz':
-                with gzip.open(file_path, 'rb') as f:
-                    df = pickle.load(f)
+            if file_path.suffix == '.parquet':
+                df = self._read_parquet(file_path, columns, filters)
             else:
-                with open(file_path, 'rb') as f:
-                    df = pickle.load(f)
+                if file_path.suffix == '.gz':
+                    with gzip.open(file_path, 'rb') as f:
+                        df = pickle.load(f)
+                else:
+                    with open(file_path, 'rb') as f:
+                        df = pickle.load(f)
+                
+                if self.auto_migrate and self.storage_format == 'parquet':
+                    self._migrate_to_parquet(name, file_path, df)
+                
+                df = self._apply_projection(df, columns, filters)
             
             # 대용량 데이터만 로깅
             if len(df) > 10000:  # 10,000행 이상
@@ -141,6 +352,152 @@ class PickleManager:
                 self.logger.error(f"DataFrame 로드 실패: {e}")
             raise
     
+    def _read_parquet(self, file_path: Path, columns: List[str] = None,
+                      filters: FilterList = None) -> pd.DataFrame:
+        """Parquet 파일을 컬럼 선택/row group 필터와 함께 로드"""
+        if not PYARROW_AVAILABLE:
+            raise ImportError("Parquet 파일을 읽으려면 pyarrow 패키지가 필요합니다")
+        
+        schema = pq.read_schema(file_path)
+        has_row_order = ROW_ORDER_COLUMN in schema.names
+        
+        arrow_filters = None
+        if filters:
+            arrow_filters = [(col, '=' if op == '==' else op,
+                              self._cast_arrow_filter_value(schema, col, op, value))
+                             for col, op, value in filters]
+        
+        if columns is not None and has_row_order:
+            columns = list(columns) + [ROW_ORDER_COLUMN]
+        
+        table = pq.read_table(file_path, columns=columns, filters=arrow_filters,
+                              memory_map=True, use_pandas_metadata=True)
+        df = table.to_pandas()
+        
+        index_columns = (schema.pandas_metadata or {}).get('index_columns', [])
+        if has_row_order:
+            # 사번/ENTE_DT 정렬 저장본: 원래 행 순서 복원
+            df = df.iloc[np.argsort(df[ROW_ORDER_COLUMN].to_numpy(), kind='stable')]
+            df = df.drop(columns=ROW_ORDER_COLUMN)
+            if not any(isinstance(col, str) for col in index_columns):
+                df = df.reset_index(drop=True)
+        
+        # 필터가 적용되면 인덱스가 끊기므로 0부터 다시 부여
+        if filters:
+            df = df.reset_index(drop=True)
+        return df
+    
+    @staticmethod
+    def _cast_arrow_filter_value(schema, column: str, op: str, value: Any) -> Any:
+        """필터 값을 Parquet 스키마의 컬럼 타입으로 변환 (변환 불가 시 ValueError)"""
+        values = _filter_values(op, value)
+        field_type = schema.field(column).type
+        if pa.types.is_dictionary(field_type):
+            field_type = field_type.value_type
+        try:
+            values = pa.array(values).cast(field_type).to_pylist()
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+            raise ValueError(f"필터 값을 {column} 컬럼 타입({field_type})으로 변환할 수 없습니다: {value!r}") from e
+        return values if op in ('in', 'not in') else values[0]
+    
+    def _apply_projection(self, df: pd.DataFrame, columns: List[str] = None,
+                          filters: FilterList = None) -> pd.DataFrame:
+        """메모리에 로드된 DataFrame에 컬럼 선택/필터 적용 (pickle 파일용)"""
+        if filters:
+            mask = np.ones(len(df), dtype=bool)
+            for col, op, value in filters:
+                series = df[col]
+                value = _cast_filter_values(col, op, value, series.dtype)
+                if op in ('==', '='):
+                    mask &= (series == value).to_numpy()
+                elif op == '!=':
+                    mask &= (series != value).to_numpy()
+                elif op == '<':
+                    mask &= (series < value).to_numpy()
+                elif op == '<=':
+                    mask &= (series <= value).to_numpy()
+                elif op == '>':
+                    mask &= (series > value).to_numpy()
+                elif op == '>=':
+                    mask &= (series >= value).to_numpy()
+                elif op == 'in':
+                    mask &= series.isin(value).to_numpy()
+                elif op == 'not in':
+                    mask &= (~series.isin(value)).to_numpy()
+                else:
+                    raise ValueError(f"지원하지 않는 필터 연산자: {op}")
+            df = df[mask].reset_index(drop=True)
+        
+        if columns is not None:
+            df = df[columns]
+        
+        return df
+    
+    def _migrate_to_parquet(self, name: str, pickle_path: Path, df: pd.DataFrame):
+        """기존 pickle 파일을 같은 버전의 Parquet 파일로 변환"""
+        version = self._version_from_path(pickle_path)
+        try:
+            parquet_path = self._write_parquet(df, name, version, compress=True)
+        except Exception as e:
+            self.logger.warning(f"Parquet 변환 실패: {pickle_path} - {e}")
+            return
+        
+        if parquet_path is None:
+            return
+        
+        old_info = self.metadata.pop(str(pickle_path), {})
+        self._update_metadata(name, version, parquet_path, df,
+                              old_info.get('data_hash'), old_info.get('description'),
+                              old_info.get('artifact_key'))
+        
+        try:
+            pickle_path.unlink()
+        except Exception as e:
+            self.logger.warning(f"파일 삭제 실패: {pickle_path} - {e}")
+        
+        self.logger.info(f"Parquet 변환 완료: {pickle_path} -> {parquet_path}")
+    
+    def migrate_all(self) -> int:
+        """
+        저장된 모든 pickle 파일을 Parquet 형식으로 변환
+        
+        Returns:
+            int: 변환된 파일 수
+        """
+        if not PYARROW_AVAILABLE:
+            self.logger.warning("pyarrow가 설치되지 않아 변환할 수 없습니다")
+            return 0
+        
+        migrated = 0
+        for file_path in sorted(self.base_path.glob("*_v*.pkl*")):
+            name = file_path.name.rsplit('_v', 1)[0]
+            try:
+                if file_path.suffix == '.gz':
+                    with gzip.open(file_path, 'rb') as f:
+                        df = pickle.load(f)
+                else:
+                    with open(file_path, 'rb') as f:
+                        df = pickle.load(f)
+            except Exception as e:
+                self.logger.warning(f"pickle 로드 실패: {file_path} - {e}")
+                continue
+            
+            self._migrate_to_parquet(name, file_path, df)
+            if not file_path.exists():
+                migrated += 1
+        
+        return migrated
+    
+    @staticmethod
+    def _version_from_path(file_path: Path) -> str:
+        """파일 경로에서 버전 문자열 추출"""
+        file_name = file_path.name
+        for extension in STORAGE_EXTENSIONS:
+            if file_name.endswith(extension):
+                file_name = file_name[:-len(extension)]
+                break
+        return file_name.rsplit('_v', 1)[-1]
+    
     def list_files(self, name: str = None) -> pd.DataFrame:
         """
         저장된 파일 목록 조회
@@ -238,6 +595,28 @@ class PickleManager:
             self.logger.error(f"파일 삭제 실패: {e}")
             return False
     
+    def clear_all(self) -> int:
+        """
+        저장된 모든 데이터 파일(.parquet/.pkl.gz/.pkl) 삭제 및 메타데이터 초기화
+        
+        Returns:
+            int: 삭제된 파일 수
+        """
+        deleted_count = 0
+        for extension in STORAGE_EXTENSIONS:
+            for file_path in self.base_path.glob(f"*{extension}"):
+                try:
+                    file_path.unlink()
+                    deleted_count += 1
+                except FileNotFoundError:
+                    pass
+        
+        self.metadata = {}
+        self._save_metadata()
+        
+        self.logger.info(f"저장소 초기화 완료: {deleted_count}개 파일 삭제")
+        return deleted_count
+    
     def cleanup_old_versions(self, name: str, keep_versions: int = 3) -> int:
         """
         오래된 버전 파일 정리
@@ -289,17 +668,97 @@ class PickleManager:
             'name_stats': name_stats
         }
     
+    def artifact_key(self, inputs: Dict[str, ArtifactInput], version: str) -> str:
+        """
+        파생 데이터 캐시 키 생성 (입력 내용 해시 + 변환 로직 버전)
+        
+        Args:
+            inputs: 입력 이름 → DataFrame, 저장된 데이터 이름, 원본 파일 바이트 또는 None
+            version: 파생 데이터를 만드는 변환 로직의 버전
+        """
+        digest = hashlib.md5(version.encode('utf-8'))
+        for input_name in sorted(inputs):
+            value = inputs[input_name]
+            if isinstance(value, pd.DataFrame):
+                value_hash = self._generate_data_hash(value)
+            elif isinstance(value, str):
+                value_hash = self.stored_data_hash(value) or 'missing'
+            elif isinstance(value, (bytes, bytearray, memoryview)):
+                value_hash = hashlib.md5(value).hexdigest()
+            else:
+                value_hash = 'none'
+            digest.update(f"{input_name}={value_hash};".encode('utf-8'))
+        return digest.hexdigest()
+    
+    def stored_data_hash(self, name: str) -> Optional[str]:
+        """
+        저장된 최신 데이터의 내용 식별자
+        
+        해시 없이 등록된 파일(스트리밍 Parquet 등)은 경로/크기/수정 시각으로 대신합니다.
+        """
+        file_path = self._find_file(name)
+        if file_path is None:
+            return None
+        
+        info = self.metadata.get(str(file_path), {})
+        if info.get('data_hash'):
+            return info['data_hash']
+        stat = file_path.stat()
+        return f"{file_path.name}:{stat.st_size}:{stat.st_mtime_ns}"
+    
+    def find_artifact(self, name: str, artifact_key: str) -> Optional[Dict[str, Any]]:
+        """캐시 키가 같은 최신 파생 데이터의 메타데이터 (없으면 None)"""
+        file_path = self._find_file(name)
+        if file_path is None:
+            return None
+        
+        info = self.metadata.get(str(file_path))
+        if info and info.get('artifact_key') == artifact_key:
+            return info
+        return None
+    
+    def get_or_build_artifact(self, name: str, build_func: Callable[[], pd.DataFrame],
+                              inputs: Dict[str, ArtifactInput], version: str,
+                              description: str = None) -> pd.DataFrame:
+        """
+        파생 데이터를 캐시에서 로드하거나, 입력/버전이 바뀐 경우에만 다시 생성해 저장
+        
+        Args:
+            name: 파생 데이터 이름
+            build_func: 파생 데이터를 생성하는 함수 (인자 없음)
+            inputs: 캐시 키에 포함할 입력 (artifact_key() 참고)
+            version: 변환 로직 버전 (로직이 바뀌면 올려서 재생성)
+            description: 파일 설명
+        """
+        key = self.artifact_key(inputs, version)
+        if self.find_artifact(name, key) is not None:
+            self.logger.info(f"{name}: 입력이 바뀌지 않아 캐시된 파생 데이터를 사용합니다")
+            return self.load_dataframe(name)
+        
+        df = build_func()
+        self.save_dataframe(df, name, description=description, artifact_key=key)
+        return df
+    
     def _generate_data_hash(self, df: pd.DataFrame) -> str:
-        """데이터 해시 생성"""
-        # DataFrame을 문자열로 변환하여 해시 생성
-        data_str = df.to_string()
-        return hashlib.md5(data_str.encode()).hexdigest()
+        """데이터 해시 생성 (컬럼 이름/타입과 행 해시 기준, 인덱스 제외)"""
+        digest = hashlib.md5()
+        digest.update(json.dumps([[str(col), str(dtype)] for col, dtype in df.dtypes.items()],
+                                 ensure_ascii=False).encode('utf-8'))
+        try:
+            row_hashes = pd.util.hash_pandas_object(df, index=False)
+        except TypeError:
+            # 리스트 등 해시할 수 없는 값이 있으면 문자열로 변환
+            row_hashes = pd.util.hash_pandas_object(df.astype(str), index=False)
+        digest.update(row_hashes.to_numpy().tobytes())
+        return digest.hexdigest()
     
     def _find_existing_data(self, name: str, data_hash: str) -> Optional[Path]:
         """동일한 데이터가 이미 존재하는지 확인"""
         for info in self.metadata.values():
             if info['name'] == name and info.get('data_hash') == data_hash:
-                return Path(info['file_path'])
+                file_path = Path(info['file_path'])
+                if file_path.exists():
+                    return file_path
         return None
     
     def _find_file(self, name: str, version: str = None) -> Optional[Path]:
@@ -312,25 +771,27 @@ class PickleManager:
                 if version is None or info['version'] == version:
                     matching_files.append((info['created_at'], Path(info['file_path'])))
         
+        # 메타데이터에 기록된 파일이 삭제/변환된 경우 제외
+        matching_files = [(created, path) for created, path in matching_files
+                          if path.exists()]
+        
         # 메타데이터에 없으면 직접 파일 시스템에서 찾기
         if not matching_files:
             self.logger.debug(f"메타데이터에서 {name} 파일을 찾을 수 없어 파일 시스템에서 검색")
             
-            pattern = f"{name}_v*.pkl.gz" if version is None else f"{name}_v{version}.pkl.gz"
-            files = list(self.base_path.glob(pattern))
-            self.logger.debug(f"패턴 '{pattern}'으로 찾은 파일: {len(files)}개")
-            
-            if not files:
-                # .pkl 파일도 확인
-                pattern = f"{name}_v*.pkl" if version is None else f"{name}_v{version}.pkl"
+            files = []
+            for extension in STORAGE_EXTENSIONS:
+                pattern = (f"{name}_v*{extension}" if version is None
+                           else f"{name}_v{version}{extension}")
                 files = list(self.base_path.glob(pattern))
                 self.logger.debug(f"패턴 '{pattern}'으로 찾은 파일: {len(files)}개")
+                if files:
+                    break
             
             for file_path in files:
                 # 파일명에서 버전 추출
-                file_name = file_path.stem
-                if '_v' in file_name:
-                    file_version = file_name.split('_v')[-1]
+                if '_v' in file_path.name:
+                    file_version = self._version_from_path(file_path)
                     if version is None or file_version == version:
                         # 파일 수정 시간을 기준으로 정렬하기 위해 사용
                         matching_files.append((file_path.stat().st_mtime, file_path))
@@ -366,7 +827,8 @@ class PickleManager:
             self.logger.debug(f"메타데이터 저장 실패: {e}")
     
     def _update_metadata(self, name: str, version: str, file_path: Path, 
-                        df: pd.DataFrame, data_hash: str, description: str = None):
+                        df: pd.DataFrame, data_hash: str, description: str = None,
+                        artifact_key: str = None):
         """메타데이터 업데이트"""
         file_key = str(file_path)
         
@@ -379,6 +841,7 @@ class PickleManager:
             'size_mb': file_path.stat().st_size / (1024 * 1024),
             'created_at': datetime.now().isoformat(),
             'data_hash': data_hash,
+            'artifact_key': artifact_key,
             'description': description or '',
             'dtypes': {str(k): str(v) for k, v in df.dtypes.to_dict().items()}
         }
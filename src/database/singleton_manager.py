@@ -4,7 +4,7 @@
 """
 
 import threading
-from typing import Optional
+from typing import Optional, List
 from .db_manager import DatabaseManager
 from ..data_processing import PickleManager
 import logging
@@ -59,6 +59,7 @@ class SingletonPickleManager(PickleManager, metaclass=SingletonMeta):
     """
     _initialized = False
     _cache = {}
+    _pinned = set()
     
     def __init__(self, *args, **kwargs):
         if not self._initialized:
@@ -66,12 +67,23 @@ class SingletonPickleManager(PickleManager, metaclass=SingletonMeta):
             SingletonPickleManager._initialized = True
             # SingletonPickleManager initialized - removed debug logging
     
-    def load_dataframe(self, name: str, version: Optional[str] = None):
+    def load_dataframe(self, name: str, version: Optional[str] = None,
+                       columns: Optional[List[str]] = None,
+                       filters: Optional[list] = None):
         """
         캐시를 확인한 후 데이터프레임 로드
+        
+        컬럼/필터가 지정된 부분 조회는 캐시하지 않습니다. 전체 데이터가 이미
+        캐시되어 있으면 메모리에서 조건을 적용하고, 없으면 파일에서 필요한
+        부분만 읽습니다.
         """
         cache_key = f"{name}_{version or 'latest'}"
         
+        if columns is not None or filters:
+            if cache_key in self._cache:
+                return self._apply_projection(self._cache[cache_key], columns, filters)
+            return super().load_dataframe(name, version, columns=columns, filters=filters)
+        
         if cache_key in self._cache:
             # Cache hit - removed debug logging
             return self._cache[cache_key]
@@ -82,9 +94,10 @@ class SingletonPickleManager(PickleManager, metaclass=SingletonMeta):
         if df is not None:
             # 캐시에 저장 (메모리 사용량 제한을 위해 최대 10개만 유지)
             if len(self._cache) >= 10:
-                # 가장 오래된 항목 제거
-                first_key = next(iter(self._cache))
-                del self._cache[first_key]
+                # 가장 오래된 항목 제거 (고정 항목 제외)
+                evictable = [key for key in self._cache if key not in self._pinned]
+                if evictable:
+                    del self._cache[evictable[0]]
                 # Cache overflow - removed debug logging
             
             self._cache[cache_key] = df
@@ -92,9 +105,44 @@ class SingletonPickleManager(PickleManager, metaclass=SingletonMeta):
         
         return df
     
+    def save_dataframe(self, df, name: str, *args, **kwargs) -> str:
+        """저장 후 해당 이름의 캐시 무효화 (다음 로드 시 새 데이터 사용)"""
+        file_path = super().save_dataframe(df, name, *args, **kwargs)
+        self._invalidate(name)
+        return file_path
+    
+    def save_parquet_file(self, source_path, name: str, *args, **kwargs) -> str:
+        """등록 후 해당 이름의 캐시 무효화"""
+        file_path = super().save_parquet_file(source_path, name, *args, **kwargs)
+        self._invalidate(name)
+        return file_path
+    
+    def clear_all(self) -> int:
+        """저장소 초기화 후 메모리 캐시도 비움"""
+        deleted_count = super().clear_all()
+        self.clear_cache()
+        return deleted_count
+    
+    def _invalidate(self, name: str):
+        """고정되지 않은 최신 버전 캐시 항목 제거"""
+        cache_key = f"{name}_latest"
+        if cache_key not in self._pinned:
+            self._cache.pop(cache_key, None)
+    
+    def preload(self, name: str, df, version: Optional[str] = None):
+        """
+        외부에서 준비된 데이터프레임을 캐시에 고정 (병렬 분석 워커의 공유 데이터용)
+        
+        고정된 항목은 캐시 개수 제한으로 제거되지 않습니다.
+        """
+        cache_key = f"{name}_{version or 'latest'}"
+        self._cache[cache_key] = df
+        self._pinned.add(cache_key)
+    
     def clear_cache(self):
         """캐시 비우기"""
         self._cache.clear()
+        self._pinned.clear()
         # PickleManager cache cleared - removed debug logging
 
 
@@ -114,4 +162,5 @@ def reset_singletons():
     SingletonDatabaseManager._initialized = False
     SingletonPickleManager._initialized = False
     SingletonPickleManager._cache.clear()
+    SingletonPickleManager._pinned.clear()
     # All singleton instances reset - removed debug logging
\ No newline at end of file
@@ -3,12 +3,94 @@ Baum-Welch 학습 알고리즘 구현
 HMM 모델 파라미터 최적화를 위한 EM 알고리즘
 """
 
+import os
 import numpy as np
 import logging
 from typing import Dict, List, Tuple, Optional, Any
 from datetime import datetime
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 import json
 
+from .kernels import emission_columns, forward_backward, compute_gamma, compute_xi
+from .vocabulary import ObservationVocabulary, observation_value
+
+
+def accumulate_statistics(encoded_sequences: List[List[int]], initial: np.ndarray,
+                          transition: np.ndarray,
+                          emission_matrix: Optional[np.ndarray]) -> Dict[str, Any]:
+    """
+    시퀀스 묶음에 대한 E-step 충분 통계량
+
+    시퀀스별 gamma/xi를 보관하지 않고 합계만 누적하므로, 여러 프로세스가
+    나눠 계산한 결과를 더하기만 하면 전체 E-step 결과가 됩니다.
+
+    Returns:
+        Dict: initial_count (N,), transition_count (N, N), transition_denominator (N,),
+              emission_count (N, M), emission_denominator (N,), log_likelihood, n_sequences
+    """
+    N = len(initial)
+    n_observations = emission_matrix.shape[1] if emission_matrix is not None else 0
+    stats = {
+        'initial_count': np.zeros(N),
+        'transition_count': np.zeros((N, N)),
+        'transition_denominator': np.zeros(N),
+        'emission_count': np.zeros((N, n_observations)),
+        'emission_denominator': np.zeros(N),
+        'log_likelihood': 0.0,
+        'n_sequences': 0
+    }
+
+    for seq in encoded_sequences:
+        if len(seq) == 0:
+            continue
+
+        emission = emission_columns(emission_matrix, seq, N)
+        alpha, beta, log_likelihood = forward_backward(initial, transition, emission)
+        gamma = compute_gamma(alpha, beta)
+
+        stats['initial_count'] += gamma[0]
+        stats['log_likelihood'] += log_likelihood
+        stats['n_sequences'] += 1
+
+        if len(seq) > 1:
+            stats['transition_count'] += np.sum(compute_xi(alpha, beta, transition, emission), axis=0)
+            stats['transition_denominator'] += np.sum(gamma[:-1], axis=0)
+
+        if n_observations:
+            observations = np.asarray(seq, dtype=np.int64)
+            in_range = (observations >= 0) & (observations < n_observations)
+            np.add.at(stats['emission_count'].T, observations[in_range], gamma[in_range])
+            stats['emission_denominator'] += np.sum(gamma[in_range], axis=0)
+
+    return stats
+
+
+def merge_statistics(partials: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """샤드별 충분 통계량 합산"""
+    merged = dict(partials[0])
+    for partial in partials[1:]:
+        for key, value in partial.items():
+            merged[key] = merged[key] + value
+    return merged
+
+
+# 워커 프로세스별 시퀀스 샤드 (initializer에서 한 번만 전달받음)
+_WORKER_SHARDS: List[List[List[int]]] = []
+
+
+def _init_statistics_worker(shards: List[List[List[int]]]):
+    """워커 초기화: 시퀀스 샤드를 프로세스 전역에 보관"""
+    global _WORKER_SHARDS
+    _WORKER_SHARDS = shards
+
+
+def _shard_statistics(shard_id: int, initial: np.ndarray, transition: np.ndarray,
+                      emission_matrix: Optional[np.ndarray]) -> Dict[str, Any]:
+    """워커에서 샤드 하나의 충분 통계량 계산"""
+    return accumulate_statistics(_WORKER_SHARDS[shard_id], initial, transition, emission_matrix)
+
+
 class BaumWelchAlgorithm:
     """Baum-Welch 학습 알고리즘 클래스"""
     
@@ -28,12 +110,21 @@ class BaumWelchAlgorithm:
         self.training_history = []
         self.current_iteration = 0
         
-    def fit(self, observation_sequences: List[List[Dict[str, Any]]]) -> Dict[str, Any]:
+    def fit(self, observation_sequences: List[List[Dict[str, Any]]], n_jobs: int = 1,
+            checkpoint_path: Optional[str] = None, resume: bool = False) -> Dict[str, Any]:
         """
         관측 시퀀스들을 이용한 HMM 파라미터 학습
         
+        각 반복의 E-step은 충분 통계량(초기/전이/방출 카운트, 로그 우도)만
+        누적하며, n_jobs > 1이면 시퀀스를 샤드로 나눠 프로세스 풀에서 계산한 뒤
+        합산합니다. 로그 우도는 E-step에서 계산한 값을 그대로 사용하므로
+        반복마다 기록되는 값은 해당 반복의 업데이트 이전 파라미터 기준입니다.
+        
         Args:
             observation_sequences: 관측 시퀀스 리스트
+            n_jobs: E-step 병렬 프로세스 수 (-1이면 CPU 코어 수)
+            checkpoint_path: 반복마다 파라미터를 저장할 JSON 경로
+            resume: checkpoint_path의 체크포인트에서 학습 재개
             
         Returns:
             Dict: 학습 결과 및 통계
@@ -46,259 +137,201 @@ class BaumWelchAlgorithm:
         # 관측값 인코딩
         encoded_sequences = self._encode_observation_sequences(observation_sequences)
         
-        # 초기 로그 우도 계산
-        prev_log_likelihood = self._compute_total_log_likelihood(encoded_sequences)
-        self.logger.info(f"초기 로그 우도: {prev_log_likelihood:.6f}")
-        
-        # EM 알고리즘 반복
-        for iteration in range(self.max_iterations):
-            self.current_iteration = iteration + 1
-            
-            # E-step: Forward-Backward 알고리즘
-            gamma_list, xi_list = self._expectation_step(encoded_sequences)
-            
-            # M-step: 파라미터 업데이트
-            self._maximization_step(encoded_sequences, gamma_list, xi_list)
-            
-            # 수렴 검사
-            current_log_likelihood = self._compute_total_log_likelihood(encoded_sequences)
-            likelihood_change = abs(current_log_likelihood - prev_log_likelihood)
-            
-            # 학습 통계 저장
-            training_stats = {
-                'iteration': self.current_iteration,
-                'log_likelihood': current_log_likelihood,
-                'likelihood_change': likelihood_change,
-                'timestamp': datetime.now().isoformat()
-            }
-            self.training_history.append(training_stats)
-            
-            self.logger.info(f"반복 {self.current_iteration}: 로그 우도 = {current_log_likelihood:.6f}, "
-                           f"변화량 = {likelihood_change:.8f}")
-            
-            # 수렴 체크
-            if likelihood_change < self.convergence_threshold:
-                self.logger.info(f"수렴 완료: 반복 {self.current_iteration}회")
-                break
+        start_iteration = 0
+        prev_log_likelihood = None
+        if resume and checkpoint_path and Path(checkpoint_path).exists():
+            start_iteration, prev_log_likelihood = self._load_checkpoint(
+                checkpoint_path, len(observation_sequences)
+            )
+            self.logger.info(f"체크포인트에서 재개: 반복 {start_iteration}회 완료 상태")
+        
+        if n_jobs is None or n_jobs < 1:
+            n_jobs = os.cpu_count() or 1
+        
+        executor = None
+        n_shards = 1
+        if n_jobs > 1 and len(encoded_sequences) > 1:
+            n_shards = min(n_jobs, len(encoded_sequences))
+            shards = [encoded_sequences[k::n_shards] for k in range(n_shards)]
+            executor = ProcessPoolExecutor(max_workers=n_shards,
+                                           initializer=_init_statistics_worker,
+                                           initargs=(shards,))
+            self.logger.info(f"병렬 E-step: {n_shards}개 프로세스")
+        
+        converged = False
+        current_log_likelihood = prev_log_likelihood
+        self.current_iteration = start_iteration
+        
+        try:
+            # EM 알고리즘 반복
+            for iteration in range(start_iteration, self.max_iterations):
+                self.current_iteration = iteration + 1
+                
+                # E-step: 충분 통계량 (로그 우도 포함)
+                stats = self._collect_statistics(encoded_sequences, executor, n_shards)
+                current_log_likelihood = stats['log_likelihood']
+                
+                # M-step: 파라미터 업데이트
+                self._update_parameters(stats)
                 
-            prev_log_likelihood = current_log_likelihood
+                likelihood_change = (abs(current_log_likelihood - prev_log_likelihood)
+                                     if prev_log_likelihood is not None else float('inf'))
+                
+                # 학습 통계 저장
+                training_stats = {
+                    'iteration': self.current_iteration,
+                    'log_likelihood': current_log_likelihood,
+                    'likelihood_change': likelihood_change,
+                    'timestamp': datetime.now().isoformat()
+                }
+                self.training_history.append(training_stats)
+                
+                self.logger.info(f"반복 {self.current_iteration}: 로그 우도 = {current_log_likelihood:.6f}, "
+                               f"변화량 = {likelihood_change:.8f}")
+                
+                if checkpoint_path:
+                    self._save_checkpoint(checkpoint_path, current_log_likelihood,
+                                          len(observation_sequences))
+                
+                # 수렴 체크
+                if likelihood_change < self.convergence_threshold:
+                    converged = True
+                    self.logger.info(f"수렴 완료: 반복 {self.current_iteration}회")
+                    break
+                
+                prev_log_likelihood = current_log_likelihood
+        finally:
+            if executor is not None:
+                executor.shutdown()
         
         # 학습 완료 통계
         final_stats = {
-            'converged': likelihood_change < self.convergence_threshold,
+            'converged': converged,
             'total_iterations': self.current_iteration,
-            'final_log_likelihood': prev_log_likelihood,
+            'final_log_likelihood': current_log_likelihood,
             'training_sequences': len(observation_sequences),
             'training_history': self.training_history
         }
         
         self.logger.info(f"Baum-Welch 학습 완료: {self.current_iteration}회 반복, "
-                        f"최종 로그 우도 = {prev_log_likelihood:.6f}")
+                        f"최종 로그 우도 = {current_log_likelihood}")
         
         return final_stats
     
-    def _encode_observation_sequences(self, observation_sequences: List[List[Dict[str, Any]]]) -> List[List[int]]:
-        """관측 시퀀스를 정수로 인코딩"""
-        encoded_sequences = []
-        
-        # 각 특성별로 관측값 매핑 생성
-        self.observation_mappings = {}
-        for feature in self.hmm_model.observation_features:
-            self.observation_mappings[feature] = {}
-            obs_index = 0
-            
-            # 모든 시퀀스에서 해당 특성의 고유값 수집
-            unique_values = set()
-            for seq in observation_sequences:
-                for obs in seq:
-                    if feature in obs:
-                        unique_values.add(obs[feature])
-            
-            # 고유값을 정수로 매핑
-            for value in sorted(unique_values):
-                self.observation_mappings[feature][value] = obs_index
-                obs_index += 1
-        
-        # 시퀀스 인코딩 (현재는 TAG_LOCATION 특성만 사용)
-        for seq in observation_sequences:
-            encoded_seq = []
-            for obs in seq:
-                # 태그 위치 특성을 기본으로 사용
-                tag_location = obs.get('태그위치', 'unknown')
-                if tag_location in self.observation_mappings['태그위치']:
-                    encoded_seq.append(self.observation_mappings['태그위치'][tag_location])
-                else:
-                    encoded_seq.append(0)  # 기본값
-            encoded_sequences.append(encoded_seq)
-        
-        return encoded_sequences
-    
-    def _expectation_step(self, encoded_sequences: List[List[int]]) -> Tuple[List[np.ndarray], List[np.ndarray]]:
-        """E-step: Forward-Backward 알고리즘으로 상태 확률 계산"""
-        gamma_list = []
-        xi_list = []
-        
-        for seq in encoded_sequences:
-            if len(seq) == 0:
-                continue
-                
-            # Forward-Backward 알고리즘 실행
-            alpha, beta, log_likelihood = self._forward_backward(seq)
-            
-            # Gamma 계산 (상태 확률)
-            gamma = self._compute_gamma(alpha, beta)
-            gamma_list.append(gamma)
-            
-            # Xi 계산 (상태 전이 확률)
-            xi = self._compute_xi(seq, alpha, beta)
-            xi_list.append(xi)
-        
-        return gamma_list, xi_list
+    def _collect_statistics(self, encoded_sequences: List[List[int]],
+                            executor: Optional[ProcessPoolExecutor], n_shards: int) -> Dict[str, Any]:
+        """현재 파라미터로 전체 시퀀스의 충분 통계량 계산 (직렬 또는 샤드 병렬)"""
+        initial = self.hmm_model.initial_probabilities
+        transition = self.hmm_model.transition_matrix
+        emission_matrix = self._tag_emission_matrix()
+        
+        if executor is None:
+            return accumulate_statistics(encoded_sequences, initial, transition, emission_matrix)
+        
+        futures = [executor.submit(_shard_statistics, shard_id, initial, transition, emission_matrix)
+                   for shard_id in range(n_shards)]
+        return merge_statistics([future.result() for future in futures])
     
-    def _forward_backward(self, sequence: List[int]) -> Tuple[np.ndarray, np.ndarray, float]:
-        """Forward-Backward 알고리즘"""
-        T = len(sequence)
-        N = self.hmm_model.n_states
-        
-        # Forward 알고리즘
-        alpha = np.zeros((T, N))
-        scaling_factors = np.zeros(T)
-        
-        # 초기화
-        for i in range(N):
-            alpha[0, i] = self.hmm_model.initial_probabilities[i] * self._get_emission_probability(i, sequence[0])
+    def _update_parameters(self, stats: Dict[str, Any]):
+        """M-step: 충분 통계량으로 파라미터 업데이트"""
+        if stats['n_sequences'] == 0:
+            return
         
-        # 정규화
-        scaling_factors[0] = np.sum(alpha[0, :])
-        if scaling_factors[0] > 0:
-            alpha[0, :] /= scaling_factors[0]
+        self.hmm_model.initial_probabilities = stats['initial_count'] / stats['n_sequences']
         
-        # Forward 단계
-        for t in range(1, T):
-            for j in range(N):
-                alpha[t, j] = self._get_emission_probability(j, sequence[t]) * \
-                             np.sum(alpha[t-1, :] * self.hmm_model.transition_matrix[:, j])
-            
-            # 정규화
-            scaling_factors[t] = np.sum(alpha[t, :])
-            if scaling_factors[t] > 0:
-                alpha[t, :] /= scaling_factors[t]
-        
-        # Backward 알고리즘
-        beta = np.zeros((T, N))
-        beta[T-1, :] = 1.0
-        
-        for t in range(T-2, -1, -1):
-            for i in range(N):
-                beta[t, i] = np.sum(
-                    self.hmm_model.transition_matrix[i, :] * 
-                    beta[t+1, :] * 
-                    [self._get_emission_probability(j, sequence[t+1]) for j in range(N)]
-                )
-            
-            # 정규화
-            if scaling_factors[t+1] > 0:
-                beta[t, :] /= scaling_factors[t+1]
-        
-        # 로그 우도 계산
-        log_likelihood = np.sum(np.log(scaling_factors + 1e-10))
+        denominator = stats['transition_denominator']
+        rows = denominator > 0
+        self.hmm_model.transition_matrix = self.hmm_model.transition_matrix.copy()
+        self.hmm_model.transition_matrix[rows] = stats['transition_count'][rows] / denominator[rows, None]
         
-        return alpha, beta, log_likelihood
+        # 방출 확률 업데이트 (TAG_LOCATION 특성만)
+        feature = '태그위치'
+        if self._tag_emission_matrix() is not None:
+            denominator = stats['emission_denominator']
+            rows = denominator > 0
+            self.hmm_model.emission_matrix[feature][rows] = stats['emission_count'][rows] / denominator[rows, None]
     
-    def _compute_gamma(self, alpha: np.ndarray, beta: np.ndarray) -> np.ndarray:
-        """Gamma 계산 (상태 확률)"""
-        gamma = alpha * beta
-        
-        # 정규화
-        for t in range(gamma.shape[0]):
-            total = np.sum(gamma[t, :])
-            if total > 0:
-                gamma[t, :] /= total
-        
-        return gamma
+    def _tag_emission_matrix(self) -> Optional[np.ndarray]:
+        """태그위치 방출 확률 행렬 (없으면 None)"""
+        if self.hmm_model.emission_matrix:
+            return self.hmm_model.emission_matrix.get('태그위치')
+        return None
     
-    def _compute_xi(self, sequence: List[int], alpha: np.ndarray, beta: np.ndarray) -> np.ndarray:
-        """Xi 계산 (상태 전이 확률)"""
-        T = len(sequence)
-        N = self.hmm_model.n_states
-        xi = np.zeros((T-1, N, N))
-        
-        for t in range(T-1):
-            denominator = 0
-            for i in range(N):
-                for j in range(N):
-                    xi[t, i, j] = alpha[t, i] * self.hmm_model.transition_matrix[i, j] * \
-                                 self._get_emission_probability(j, sequence[t+1]) * beta[t+1, j]
-                    denominator += xi[t, i, j]
-            
-            # 정규화
-            if denominator > 0:
-                xi[t, :, :] /= denominator
+    def _save_checkpoint(self, checkpoint_path: str, log_likelihood: float, n_sequences: int):
+        """현재 반복까지의 파라미터와 학습 이력을 저장 (임시 파일 후 교체)"""
+        checkpoint = {
+            'iteration': self.current_iteration,
+            'log_likelihood': log_likelihood,
+            'n_sequences': n_sequences,
+            'initial_probabilities': self.hmm_model.initial_probabilities.tolist(),
+            'transition_matrix': self.hmm_model.transition_matrix.tolist(),
+            'emission_matrix': {k: v.tolist() for k, v in self.hmm_model.emission_matrix.items()}
+                               if self.hmm_model.emission_matrix else None,
+            'observation_vocabulary': self.hmm_model.observation_vocabulary.to_dict(),
+            'training_history': self.training_history,
+            'saved_at': datetime.now().isoformat()
+        }
         
-        return xi
+        checkpoint_path = Path(checkpoint_path)
+        checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = checkpoint_path.with_suffix(checkpoint_path.suffix + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f, ensure_ascii=False)
+        os.replace(temp_path, checkpoint_path)
     
-    def _maximization_step(self, encoded_sequences: List[List[int]], 
-                          gamma_list: List[np.ndarray], xi_list: List[np.ndarray]):
-        """M-step: 파라미터 업데이트"""
-        N = self.hmm_model.n_states
-        
-        # 초기 상태 확률 업데이트
-        initial_count = np.zeros(N)
-        for gamma in gamma_list:
-            if len(gamma) > 0:
-                initial_count += gamma[0, :]
-        
-        self.hmm_model.initial_probabilities = initial_count / len(gamma_list)
-        
-        # 전이 확률 행렬 업데이트
-        transition_count = np.zeros((N, N))
-        transition_denominator = np.zeros(N)
+    def _load_checkpoint(self, checkpoint_path: str, n_sequences: int) -> Tuple[int, float]:
+        """
+        체크포인트의 파라미터를 모델에 적용하고 (완료 반복 수, 로그 우도) 반환
         
-        for xi, gamma in zip(xi_list, gamma_list):
-            if len(xi) > 0:
-                transition_count += np.sum(xi, axis=0)
-                transition_denominator += np.sum(gamma[:-1, :], axis=0)
+        Raises:
+            ValueError: 체크포인트의 관측값 어휘가 현재 어휘와 다름 (방출 행렬 열이 맞지 않음)
+        """
+        with open(checkpoint_path, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+        
+        stored_vocabulary = checkpoint.get('observation_vocabulary')
+        current_vocabulary = self.hmm_model.observation_vocabulary
+        if (stored_vocabulary is None or current_vocabulary is None
+                or stored_vocabulary.get('values') != current_vocabulary.to_dict()['values']):
+            raise ValueError(f"체크포인트의 관측값 어휘가 현재 어휘와 달라 재개할 수 없습니다: {checkpoint_path}")
+        
+        if checkpoint.get('n_sequences') != n_sequences:
+            self.logger.warning(f"체크포인트 시퀀스 수({checkpoint.get('n_sequences')})가 "
+                              f"현재 입력({n_sequences})과 다릅니다")
+        
+        self.hmm_model.initial_probabilities = np.array(checkpoint['initial_probabilities'])
+        self.hmm_model.transition_matrix = np.array(checkpoint['transition_matrix'])
+        if checkpoint.get('emission_matrix'):
+            self.hmm_model.emission_matrix = {k: np.array(v) for k, v in checkpoint['emission_matrix'].items()}
+        self.hmm_model.set_observation_vocabulary(ObservationVocabulary.from_dict(stored_vocabulary))
+        self.training_history = checkpoint.get('training_history', [])
+        
+        return checkpoint['iteration'], checkpoint['log_likelihood']
+    
+    def _encode_observation_sequences(self, observation_sequences: List[List[Dict[str, Any]]]) -> List[List[int]]:
+        """
+        관측 시퀀스를 정수로 인코딩
         
-        for i in range(N):
-            if transition_denominator[i] > 0:
-                self.hmm_model.transition_matrix[i, :] = transition_count[i, :] / transition_denominator[i]
+        모델에 관측값 어휘가 있으면 그대로 사용하고, 없으면 학습 데이터의
+        태그위치로 어휘를 만들어 모델에 설정합니다 (방출 행렬 크기도 맞춰짐).
+        """
+        vocabulary = self.hmm_model.observation_vocabulary
+        if vocabulary is None:
+            vocabulary = ObservationVocabulary(
+                observation_value(obs) for seq in observation_sequences for obs in seq
+            )
+            self.hmm_model.set_observation_vocabulary(vocabulary)
         
-        # 방출 확률 업데이트 (TAG_LOCATION 특성만)
-        feature = '태그위치'
-        if feature in self.hmm_model.emission_matrix:
-            n_observations = self.hmm_model.emission_matrix[feature].shape[1]
-            emission_count = np.zeros((N, n_observations))
-            emission_denominator = np.zeros(N)
-            
-            for seq, gamma in zip(encoded_sequences, gamma_list):
-                for t, obs in enumerate(seq):
-                    if t < len(gamma) and obs < n_observations:
-                        emission_count[:, obs] += gamma[t, :]
-                        emission_denominator += gamma[t, :]
-            
-            for i in range(N):
-                if emission_denominator[i] > 0:
-                    self.hmm_model.emission_matrix[feature][i, :] = emission_count[i, :] / emission_denominator[i]
-    
-    def _get_emission_probability(self, state: int, observation: int) -> float:
-        """방출 확률 계산"""
-        feature = '태그위치'
-        if feature in self.hmm_model.emission_matrix:
-            emission_matrix = self.hmm_model.emission_matrix[feature]
-            if observation < emission_matrix.shape[1]:
-                return emission_matrix[state, observation]
-        return 1e-10  # 매우 작은 값으로 언더플로우 방지
-    
-    def _compute_total_log_likelihood(self, encoded_sequences: List[List[int]]) -> float:
-        """전체 로그 우도 계산"""
-        total_log_likelihood = 0
+        # 현재는 TAG_LOCATION 특성만 사용
+        self.observation_mappings = {'태그위치': vocabulary.mapping()}
         
-        for seq in encoded_sequences:
-            if len(seq) > 0:
-                _, _, log_likelihood = self._forward_backward(seq)
-                total_log_likelihood += log_likelihood
+        if not observation_sequences:
+            return []
         
-        return total_log_likelihood
+        # 전체 관측을 한 번에 조회한 뒤 시퀀스 길이로 분할
+        lengths = [len(seq) for seq in observation_sequences]
+        encoded = vocabulary.encode([observation_value(obs) for seq in observation_sequences for obs in seq])
+        return [part.tolist() for part in np.split(encoded, np.cumsum(lengths)[:-1])]
     
     def get_training_stats(self) -> Dict[str, Any]:
         """학습 통계 반환"""
@@ -12,6 +12,8 @@ from datetime import datetime, time
 import json
 from pathlib import Path
 
+from .vocabulary import ObservationVocabulary
+
 class ActivityState(Enum):
     """활동 상태 정의 (2교대 근무 반영)"""
     # 근무 상태
@@ -82,6 +84,9 @@ class HMMModel:
         self.emission_matrix = None
         self.initial_probabilities = None
         
+        # 태그위치 관측값 어휘 (DR_NO → 정수 ID)
+        self.observation_vocabulary: Optional[ObservationVocabulary] = None
+        
         # 식사시간 정의 (24시간 2교대 근무 반영)
         self.meal_time_windows = {
             'breakfast': (time(6, 30), time(9, 0)),
@@ -132,6 +137,38 @@ class HMMModel:
         
         self.logger.info(f"파라미터 초기화 완료: {initialization_method}")
     
+    def set_observation_vocabulary(self, vocabulary: ObservationVocabulary):
+        """
+        태그위치 관측값 어휘 설정
+        
+        태그위치 방출 행렬의 열 수가 어휘 크기와 다르면 균등 분포로 다시 만듭니다.
+        
+        Args:
+            vocabulary: 관측값 어휘
+        """
+        self.observation_vocabulary = vocabulary
+        
+        feature = ObservationFeature.TAG_LOCATION.value
+        if self.emission_matrix is not None:
+            current = self.emission_matrix.get(feature)
+            if current is None or current.shape[1] != len(vocabulary):
+                self.emission_matrix[feature] = np.full((self.n_states, len(vocabulary)),
+                                                        1.0 / len(vocabulary))
+        
+        self.logger.info(f"관측값 어휘 설정: {len(vocabulary)}개 ID")
+    
+    def build_observation_vocabulary(self, tag_location_master: pd.DataFrame) -> ObservationVocabulary:
+        """태깅지점 마스터의 DR_NO로 관측값 어휘를 만들어 설정"""
+        vocabulary = ObservationVocabulary.from_tag_location_master(tag_location_master)
+        self.set_observation_vocabulary(vocabulary)
+        return vocabulary
+    
+    def _tag_location_observation_count(self) -> int:
+        """태그위치 관측값 개수 (어휘가 있으면 어휘 크기)"""
+        if self.observation_vocabulary is not None:
+            return len(self.observation_vocabulary)
+        return 50
+    
     def _initialize_uniform(self):
         """균등 분포로 초기화"""
         # 전이 확률 행렬
@@ -145,6 +182,8 @@ class HMMModel:
         for feature in self.observation_features:
             # 각 특성별로 임의의 관측값 개수 설정 (실제 데이터 기반으로 업데이트 필요)
             n_observations = 10  # 기본값
+            if feature == ObservationFeature.TAG_LOCATION.value and self.observation_vocabulary is not None:
+                n_observations = len(self.observation_vocabulary)
             self.emission_matrix[feature] = np.full((self.n_states, n_observations), 1.0 / n_observations)
     
     def _initialize_random(self):
@@ -161,6 +200,8 @@ class HMMModel:
         self.emission_matrix = {}
         for feature in self.observation_features:
             n_observations = 10  # 기본값
+            if feature == ObservationFeature.TAG_LOCATION.value and self.observation_vocabulary is not None:
+                n_observations = len(self.observation_vocabulary)
             self.emission_matrix[feature] = np.random.dirichlet(np.ones(n_observations), size=self.n_states)
     
     def _initialize_domain_knowledge(self):
@@ -281,7 +322,7 @@ class HMMModel:
         """특성별 방출 확률 행렬 초기화"""
         # 특성별 기본 관측값 개수 설정
         n_observations_map = {
-            ObservationFeature.TAG_LOCATION.value: 50,
+            ObservationFeature.TAG_LOCATION.value: self._tag_location_observation_count(),
             ObservationFeature.TIME_INTERVAL.value: 20,
             ObservationFeature.DAY_OF_WEEK.value: 7,
             ObservationFeature.TIME_PERIOD.value: 5,
@@ -396,9 +437,10 @@ class HMMModel:
             operator = condition['operator']
             weight = condition.get('weight', 1.0)
             
-            # 시간 윈도우 조건
-            if cond_type == 'time_window' and 'timestamp' in context:
-                current_time = context['timestamp'].time()
+            # 시간 윈도우 조건 (Viterbi 컨텍스트는 current_time 키로 전달됨)
+            timestamp = context.get('timestamp', context.get('current_time'))
+            if cond_type == 'time_window' and timestamp is not None:
+                current_time = timestamp.time()
                 start_time = datetime.strptime(params['start'], '%H:%M').time()
                 end_time = datetime.strptime(params['end'], '%H:%M').time()
                 
@@ -622,6 +664,7 @@ class HMMModel:
             'transition_matrix': self.transition_matrix.tolist() if self.transition_matrix is not None else None,
             'initial_probabilities': self.initial_probabilities.tolist() if self.initial_probabilities is not None else None,
             'emission_matrix': {k: v.tolist() for k, v in self.emission_matrix.items()} if self.emission_matrix else None,
+            'observation_vocabulary': self.observation_vocabulary.to_dict() if self.observation_vocabulary is not None else None,
             'meal_time_windows': {k: str(v) for k, v in self.meal_time_windows.items()},
             'time_periods': {k: str(v) for k, v in self.time_periods.items()}
         }
@@ -649,6 +692,9 @@ class HMMModel:
         if model_data['emission_matrix']:
             self.emission_matrix = {k: np.array(v) for k, v in model_data['emission_matrix'].items()}
         
+        if model_data.get('observation_vocabulary'):
+            self.observation_vocabulary = ObservationVocabulary.from_dict(model_data['observation_vocabulary'])
+        
         self.logger.info(f"모델 로드 완료: {filepath}")
     
     def validate_model(self) -> Dict[str, Any]:
@@ -0,0 +1,202 @@
+"""
+HMM 벡터화 연산 커널
+Viterbi / Forward-Backward / Xi 계산을 시점별 브로드캐스트 연산으로 수행
+
+기존 루프 구현과 동일한 수치 규칙을 따릅니다.
+- Viterbi: log(p + 1e-10) 로그 공간, 동점 시 가장 앞선 상태 선택
+- Forward-Backward: 시점별 스케일링, 로그 우도 = sum(log(scale + 1e-10))
+- 범위를 벗어난 관측값의 방출 확률은 1e-10
+"""
+
+import numpy as np
+from typing import Optional, Tuple
+
+# 로그 계산 시 언더플로우 방지 값
+LOG_EPSILON = 1e-10
+
+
+def safe_log(probabilities: np.ndarray) -> np.ndarray:
+    """log(p + 1e-10) - 기존 구현과 동일한 로그 변환"""
+    return np.log(np.asarray(probabilities, dtype=float) + LOG_EPSILON)
+
+
+def emission_columns(emission_matrix: Optional[np.ndarray], encoded_sequence,
+                     n_states: int) -> np.ndarray:
+    """
+    관측 시퀀스에 해당하는 방출 확률 열을 모은 (T, N) 행렬
+
+    Args:
+        emission_matrix: (N, M) 방출 확률 행렬 (없으면 모두 1e-10)
+        encoded_sequence: 길이 T의 정수 관측 시퀀스
+        n_states: 상태 수 N
+
+    Returns:
+        np.ndarray: out[t, i] = P(obs_t | state_i)
+    """
+    observations = np.asarray(encoded_sequence, dtype=np.int64)
+    columns = np.full((len(observations), n_states), LOG_EPSILON)
+
+    if emission_matrix is None:
+        return columns
+
+    in_range = (observations >= 0) & (observations < emission_matrix.shape[1])
+    columns[in_range] = emission_matrix[:, observations[in_range]].T
+    return columns
+
+
+def viterbi_log(log_initial: np.ndarray, log_transition: np.ndarray,
+                log_emission: np.ndarray,
+                transition_index: Optional[np.ndarray] = None) -> Tuple[np.ndarray, float, np.ndarray]:
+    """
+    로그 공간 Viterbi
+
+    Args:
+        log_initial: (N,) 로그 초기 확률
+        log_transition: (N, N) 로그 전이 확률, 또는 transition_index와 함께
+                        쓰는 (K, N, N) 컨텍스트별 로그 전이 확률
+        log_emission: (T, N) 시점별 로그 방출 확률
+        transition_index: (T,) 시점 t로 들어오는 전이에 사용할 행렬 번호
+
+    Returns:
+        Tuple: (최적 경로 (T,), 최적 로그 확률, log_delta (T, N))
+    """
+    T, N = log_emission.shape
+    log_delta = np.empty((T, N))
+    psi = np.zeros((T, N), dtype=np.int64)
+    state_index = np.arange(N)
+
+    log_delta[0] = log_initial + log_emission[0]
+
+    for t in range(1, T):
+        step_transition = (log_transition if transition_index is None
+                           else log_transition[transition_index[t]])
+        # scores[i, j] = delta[t-1, i] + log A[i, j]
+        scores = log_delta[t - 1][:, None] + step_transition
+        best_prev = np.argmax(scores, axis=0)
+        psi[t] = best_prev
+        log_delta[t] = scores[best_prev, state_index] + log_emission[t]
+
+    path = np.empty(T, dtype=np.int64)
+    path[T - 1] = np.argmax(log_delta[T - 1])
+    best_log_probability = float(log_delta[T - 1, path[T - 1]])
+
+    for t in range(T - 2, -1, -1):
+        path[t] = psi[t + 1, path[t + 1]]
+
+    return path, best_log_probability, log_delta
+
+
+def path_probabilities(log_delta: np.ndarray) -> np.ndarray:
+    """log_delta 각 시점을 정규화한 상태 확률 (T, N) 또는 (B, T, N)"""
+    probs = np.exp(log_delta - np.max(log_delta, axis=-1, keepdims=True))
+    return probs / np.sum(probs, axis=-1, keepdims=True)
+
+
+def forward_backward(initial: np.ndarray, transition: np.ndarray,
+                     emission: np.ndarray) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    스케일링 Forward-Backward
+
+    Args:
+        initial: (N,) 초기 확률
+        transition: (N, N) 전이 확률
+        emission: (T, N) 시점별 방출 확률
+
+    Returns:
+        Tuple: (alpha (T, N), beta (T, N), 로그 우도)
+    """
+    T, N = emission.shape
+    alpha = np.zeros((T, N))
+    scaling_factors = np.zeros(T)
+
+    alpha[0] = initial * emission[0]
+    scaling_factors[0] = np.sum(alpha[0])
+    if scaling_factors[0] > 0:
+        alpha[0] /= scaling_factors[0]
+
+    for t in range(1, T):
+        alpha[t] = emission[t] * (alpha[t - 1] @ transition)
+        scaling_factors[t] = np.sum(alpha[t])
+        if scaling_factors[t] > 0:
+            alpha[t] /= scaling_factors[t]
+
+    beta = np.zeros((T, N))
+    beta[T - 1] = 1.0
+
+    for t in range(T - 2, -1, -1):
+        beta[t] = transition @ (beta[t + 1] * emission[t + 1])
+        if scaling_factors[t + 1] > 0:
+            beta[t] /= scaling_factors[t + 1]
+
+    log_likelihood = float(np.sum(np.log(scaling_factors + LOG_EPSILON)))
+    return alpha, beta, log_likelihood
+
+
+def compute_gamma(alpha: np.ndarray, beta: np.ndarray) -> np.ndarray:
+    """시점별 상태 사후 확률 (T, N)"""
+    gamma = alpha * beta
+    totals = np.sum(gamma, axis=1, keepdims=True)
+    np.divide(gamma, totals, out=gamma, where=totals > 0)
+    return gamma
+
+
+def compute_xi(alpha: np.ndarray, beta: np.ndarray, transition: np.ndarray,
+               emission: np.ndarray) -> np.ndarray:
+    """
+    시점별 상태 전이 사후 확률 (T-1, N, N)
+
+    xi[t, i, j] ∝ alpha[t, i] * A[i, j] * B[t+1, j] * beta[t+1, j]
+    """
+    xi = alpha[:-1, :, None] * transition[None, :, :] * (emission[1:] * beta[1:])[:, None, :]
+    denominators = np.sum(xi, axis=(1, 2), keepdims=True)
+    np.divide(xi, denominators, out=xi, where=denominators > 0)
+    return xi
+
+
+def viterbi_log_batch(log_initial: np.ndarray, log_transition: np.ndarray,
+                      log_emission: np.ndarray,
+                      lengths: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    패딩된 여러 시퀀스에 대한 로그 공간 Viterbi
+
+    길이를 넘는 시점(패딩)에서는 delta를 그대로 유지하고 역추적 포인터를
+    항등 매핑으로 두어, 각 시퀀스의 결과가 viterbi_log 단독 실행과 같아집니다.
+
+    Args:
+        log_initial: (N,) 로그 초기 확률
+        log_transition: (N, N) 로그 전이 확률
+        log_emission: (B, T, N) 시퀀스/시점별 로그 방출 확률 (패딩 구간 값은 무시)
+        lengths: (B,) 각 시퀀스의 실제 길이 (1 이상)
+
+    Returns:
+        Tuple: (경로 (B, T), 최적 로그 확률 (B,), log_delta (B, T, N))
+               패딩 구간의 경로/delta 값은 의미 없음
+    """
+    B, T, N = log_emission.shape
+    lengths = np.asarray(lengths, dtype=np.int64)
+    log_delta = np.empty((B, T, N))
+    psi = np.empty((B, T, N), dtype=np.int64)
+    state_index = np.arange(N)
+    batch_index = np.arange(B)
+
+    log_delta[:, 0] = log_initial[None, :] + log_emission[:, 0]
+    psi[:, 0] = state_index
+
+    for t in range(1, T):
+        active = (lengths > t)[:, None]
+        # scores[b, i, j] = delta[b, t-1, i] + log A[i, j]
+        scores = log_delta[:, t - 1, :, None] + log_transition[None, :, :]
+        best_prev = np.argmax(scores, axis=1)
+        best_scores = np.take_along_axis(scores, best_prev[:, None, :], axis=1)[:, 0, :]
+
+        log_delta[:, t] = np.where(active, best_scores + log_emission[:, t], log_delta[:, t - 1])
+        psi[:, t] = np.where(active, best_prev, state_index[None, :])
+
+    paths = np.empty((B, T), dtype=np.int64)
+    paths[:, T - 1] = np.argmax(log_delta[:, T - 1], axis=1)
+    best_log_probabilities = log_delta[batch_index, T - 1, paths[:, T - 1]]
+
+    for t in range(T - 2, -1, -1):
+        paths[:, t] = psi[batch_index, t + 1, paths[:, t + 1]]
+
+    return paths, best_log_probabilities, log_delta
@@ -0,0 +1,208 @@
+"""
+조건부 전이 규칙 컴파일러
+JSON 전이 규칙을 컨텍스트 버킷별 N×N 로그 전이 행렬로 미리 계산
+
+HMMModel.get_transition_probability_with_conditions는 시점마다 N² 번 호출되며
+매번 규칙 조건을 다시 평가합니다. 전이 확률이 컨텍스트에 의존하는 부분은
+"어떤 조건 원자(시간 구간, 위치, 교대 구분)가 만족되는가"뿐이므로,
+시퀀스의 각 시점을 만족된 조건 조합(버킷)으로 분류하고 버킷마다 한 번만
+전이 행렬을 만들면 디코딩은 시점별로 행렬 하나를 고르는 연산이 됩니다.
+"""
+
+import numpy as np
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from .kernels import safe_log
+
+# 컨텍스트가 하나라도 생기는 관측 키 (RuleBasedViterbiAlgorithm._extract_context 기준)
+CONTEXT_KEYS = ('timestamp', '태그위치', 'DR_NO', 'shift_type', 'tag_code')
+
+
+def _seconds_of_day(value: Any) -> Optional[float]:
+    """timestamp 값을 자정 기준 초로 변환 (문자열은 ISO 형식)"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return (value.hour * 3600 + value.minute * 60 + value.second
+            + value.microsecond / 1_000_000)
+
+
+def _parse_hhmm(value: str) -> float:
+    """'HH:MM' 문자열을 자정 기준 초로 변환"""
+    parsed = datetime.strptime(value, '%H:%M')
+    return float(parsed.hour * 3600 + parsed.minute * 60)
+
+
+class CompiledTransitionRules:
+    """컨텍스트 버킷별 로그 전이 행렬로 컴파일된 전이 규칙"""
+
+    def __init__(self, hmm_model):
+        """
+        Args:
+            hmm_model: transition_rules가 로드된 HMMModel
+        """
+        self.logger = logging.getLogger(__name__)
+        self.hmm_model = hmm_model
+        self.rules = hmm_model.transition_rules
+        self.transition_matrix = hmm_model.transition_matrix
+        N = hmm_model.n_states
+
+        # 규칙이 없는 전이의 기본 확률 (도메인 지식)
+        self.base_matrix = np.array([
+            [hmm_model._get_transition_probability(from_state, to_state)
+             for to_state in hmm_model.states]
+            for from_state in hmm_model.states
+        ])
+
+        # 조건이 없는 규칙은 고정 확률, 조건이 있는 규칙은 가중치로 조정
+        self.fixed_matrix = self.base_matrix.copy()
+        conditional_cells: List[Tuple[int, int]] = []
+        conditional_weights: List[Dict[int, float]] = []
+        self.atoms: List[Tuple[str, Any, Any]] = []
+        atom_ids: Dict[Tuple[str, Any, Any], int] = {}
+
+        assigned = np.zeros((N, N), dtype=bool)
+        for rule in self.rules:
+            if not rule.get('is_active', True):
+                continue
+            i = hmm_model.state_to_index.get(rule['from_state'])
+            j = hmm_model.state_to_index.get(rule['to_state'])
+            # 같은 전이에 여러 규칙이 있으면 먼저 나온 규칙만 적용
+            if i is None or j is None or assigned[i, j]:
+                continue
+            assigned[i, j] = True
+
+            if not rule.get('conditions'):
+                self.fixed_matrix[i, j] = rule['base_probability']
+                continue
+
+            weights: Dict[int, float] = {}
+            for condition in rule['conditions']:
+                atom = self._condition_atom(condition)
+                if atom is None:
+                    continue
+                if atom not in atom_ids:
+                    atom_ids[atom] = len(self.atoms)
+                    self.atoms.append(atom)
+                atom_id = atom_ids[atom]
+                weights[atom_id] = weights.get(atom_id, 0.0) + condition.get('weight', 1.0)
+
+            conditional_cells.append((i, j))
+            conditional_weights.append(weights)
+
+        # (R, A) 규칙별 조건 원자 가중치
+        self.conditional_cells = np.array(conditional_cells, dtype=np.int64).reshape(-1, 2)
+        self.weight_matrix = np.zeros((len(conditional_cells), len(self.atoms)))
+        for r, weights in enumerate(conditional_weights):
+            for atom_id, weight in weights.items():
+                self.weight_matrix[r, atom_id] = weight
+
+        self._bucket_cache: Dict[bytes, np.ndarray] = {}
+        self.logger.debug(f"전이 규칙 컴파일 완료: 조건부 전이 {len(conditional_cells)}개, "
+                          f"조건 원자 {len(self.atoms)}개")
+
+    def is_stale(self) -> bool:
+        """모델의 규칙이나 전이 행렬이 바뀌어 다시 컴파일해야 하는지 여부"""
+        return (self.rules is not self.hmm_model.transition_rules
+                or self.transition_matrix is not self.hmm_model.transition_matrix)
+
+    @staticmethod
+    def _condition_atom(condition: Dict[str, Any]) -> Optional[Tuple[str, Any, Any]]:
+        """HMMModel._evaluate_conditions가 평가하는 조건을 원자 키로 변환"""
+        cond_type = condition.get('type')
+        params = condition.get('parameters', {})
+        operator = condition.get('operator')
+
+        if cond_type == 'time_window':
+            return ('time_window', _parse_hhmm(params['start']), _parse_hhmm(params['end']))
+        if cond_type == 'location' and operator == 'equals':
+            return ('location', params.get('location'), None)
+        if cond_type == 'shift_type' and operator == 'equals':
+            return ('shift_type', params.get('shift'), None)
+        # 그 외 조건은 평가되지 않음 (가중치 0)
+        return None
+
+    def sequence_buckets(self, observation_sequence: List[Dict[str, Any]],
+                         length: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        관측 시퀀스의 시점별 버킷과 버킷별 로그 전이 행렬
+
+        Args:
+            observation_sequence: 원본 관측 시퀀스 (컨텍스트 정보 포함)
+            length: 시점 수 T (인코딩된 시퀀스 길이). 관측이 더 짧으면 나머지 시점은
+                    빈 컨텍스트로 채우고, 더 길면 잘라냄
+
+        Returns:
+            Tuple: (로그 전이 행렬 (K, N, N), 시점별 행렬 번호 (T,))
+                   컨텍스트가 없는 시점은 모델 전이 행렬을 사용
+        """
+        if length is not None:
+            observation_sequence = (list(observation_sequence[:length])
+                                    + [{}] * max(length - len(observation_sequence), 0))
+        T = len(observation_sequence)
+        seconds = np.full(T, np.nan)
+        locations = np.empty(T, dtype=object)
+        shifts = np.empty(T, dtype=object)
+        has_location = np.zeros(T, dtype=bool)
+        has_shift = np.zeros(T, dtype=bool)
+        has_context = np.zeros(T, dtype=bool)
+
+        for t, obs in enumerate(observation_sequence):
+            has_context[t] = any(key in obs for key in CONTEXT_KEYS)
+            if 'timestamp' in obs:
+                value = _seconds_of_day(obs['timestamp'])
+                if value is not None:
+                    seconds[t] = value
+            if '태그위치' in obs:
+                locations[t] = obs['태그위치']
+                has_location[t] = True
+            elif 'DR_NO' in obs:
+                locations[t] = obs['DR_NO']
+                has_location[t] = True
+            if 'shift_type' in obs:
+                shifts[t] = obs['shift_type']
+                has_shift[t] = True
+
+        # (T, A) 조건 원자 만족 여부
+        satisfied = np.zeros((T, len(self.atoms)), dtype=bool)
+        for a, (atom_type, first, second) in enumerate(self.atoms):
+            if atom_type == 'time_window':
+                with np.errstate(invalid='ignore'):
+                    if first <= second:
+                        satisfied[:, a] = (seconds >= first) & (seconds <= second)
+                    else:
+                        satisfied[:, a] = (seconds >= first) | (seconds <= second)
+            elif atom_type == 'location':
+                satisfied[:, a] = has_location & (locations == first)
+            elif atom_type == 'shift_type':
+                satisfied[:, a] = has_shift & (shifts == first)
+
+        signatures, inverse = np.unique(satisfied, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+
+        matrices = [self._bucket_matrix(signature) for signature in signatures]
+        # 마지막 행렬: 컨텍스트가 없는 시점용 모델 전이 행렬
+        matrices.append(safe_log(self.hmm_model.transition_matrix))
+
+        transition_index = np.where(has_context, inverse, len(signatures))
+        return np.stack(matrices), transition_index
+
+    def _bucket_matrix(self, signature: np.ndarray) -> np.ndarray:
+        """만족된 조건 원자 조합에 대한 로그 전이 행렬 (버킷별 1회 계산)"""
+        key = np.packbits(signature).tobytes()
+        cached = self._bucket_cache.get(key)
+        if cached is not None:
+            return cached
+
+        matrix = self.fixed_matrix.copy()
+        if len(self.conditional_cells):
+            condition_weight = self.weight_matrix @ signature.astype(float)
+            rows, cols = self.conditional_cells[:, 0], self.conditional_cells[:, 1]
+            matrix[rows, cols] = np.minimum(self.base_matrix[rows, cols] * (1 + condition_weight), 1.0)
+
+        log_matrix = safe_log(matrix)
+        self._bucket_cache[key] = log_matrix
+        return log_matrix
@@ -11,6 +11,7 @@ from datetime import datetime
 from pathlib import Path
 
 from .hmm_model import ActivityState, ObservationFeature
+from .vocabulary import stable_observation_id
 
 class HMMRuleEditor:
     """HMM 규칙 편집기 클래스"""
@@ -146,9 +147,13 @@ class HMMRuleEditor:
         state_idx = self.hmm_model.state_to_index[state]
         
         # 관측값 인덱스 처리
-        if isinstance(observation, str):
-            # 문자열 관측값의 경우 해싱 사용
-            obs_idx = abs(hash(observation)) % self.hmm_model.emission_matrix[feature].shape[1]
+        vocabulary = self.hmm_model.observation_vocabulary
+        if isinstance(observation, str) and feature == ObservationFeature.TAG_LOCATION.value and vocabulary is not None:
+            # 태그위치는 관측값 어휘의 ID 사용
+            obs_idx = int(vocabulary.encode([observation])[0])
+        elif isinstance(observation, str):
+            # 문자열 관측값의 경우 결정적 해싱 사용
+            obs_idx = stable_observation_id(observation, self.hmm_model.emission_matrix[feature].shape[1])
         else:
             obs_idx = int(observation)
         
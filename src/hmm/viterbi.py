@@ -3,11 +3,16 @@ Viterbi 예측 알고리즘 구현
 최적 상태 시퀀스 추정을 위한 동적 계획법 알고리즘
 """
 
+import hashlib
 import numpy as np
 import logging
 from typing import Dict, List, Tuple, Optional, Any
 from datetime import datetime
 
+from .kernels import (safe_log, emission_columns, viterbi_log, viterbi_log_batch,
+                      path_probabilities)
+from .vocabulary import observation_value, stable_observation_id
+
 class ViterbiAlgorithm:
     """Viterbi 예측 알고리즘 클래스"""
     
@@ -115,77 +120,57 @@ class ViterbiAlgorithm:
         }
     
     def _encode_observation_sequence(self, observation_sequence: List[Dict[str, Any]]) -> List[int]:
-        """관측 시퀀스를 정수로 인코딩"""
-        encoded_sequence = []
-        
-        for obs in observation_sequence:
-            # 태그 위치 특성을 기본으로 사용
-            tag_location = obs.get('태그위치', obs.get('DR_NO', 'unknown'))
-            
-            # 간단한 해싱 방법으로 인코딩 (실제로는 더 정교한 매핑 필요)
-            encoded_obs = abs(hash(str(tag_location))) % 50  # 최대 50개 관측값
-            encoded_sequence.append(encoded_obs)
-        
-        return encoded_sequence
+        """관측 시퀀스를 정수로 인코딩 (모델의 관측값 어휘 사용)"""
+        vocabulary = self.hmm_model.observation_vocabulary
+        if vocabulary is not None:
+            return vocabulary.encode_sequence(observation_sequence).tolist()
+        
+        # 어휘가 없는 모델: 방출 행렬 크기 기준의 결정적 해시 인코딩
+        emission = (self.hmm_model.emission_matrix or {}).get('태그위치')
+        n_observations = emission.shape[1] if emission is not None else 50
+        return [stable_observation_id(observation_value(obs), n_observations)
+                for obs in observation_sequence]
     
     def _viterbi_algorithm(self, encoded_sequence: List[int], observation_sequence: List[Dict[str, Any]] = None) -> Tuple[List[int], float, List[List[float]]]:
         """
-        Viterbi 알고리즘 실행
+        Viterbi 알고리즘 실행 (로그 공간, 시점별 벡터 연산)
         
         Returns:
             Tuple: (상태 시퀀스, 로그 확률, 경로 확률들)
         """
-        T = len(encoded_sequence)
-        N = self.hmm_model.n_states
+        log_initial, log_transition = self._log_parameters()
+        log_emission = safe_log(self._emission_columns(encoded_sequence))
+        
+        optimal_path, best_log_probability, log_delta = viterbi_log(
+            log_initial, log_transition, log_emission
+        )
         
-        # 로그 확률 테이블 초기화
-        log_delta = np.full((T, N), -np.inf)
-        psi = np.zeros((T, N), dtype=int)
-        
-        # 초기화 (t=0)
-        for i in range(N):
-            initial_prob = self.hmm_model.initial_probabilities[i]
-            emission_prob = self._get_emission_probability(i, encoded_sequence[0])
-            log_delta[0, i] = np.log(initial_prob + 1e-10) + np.log(emission_prob + 1e-10)
-        
-        # 순환 단계 (t=1 to T-1)
-        for t in range(1, T):
-            for j in range(N):
-                # 이전 상태에서 현재 상태로의 전이 확률 계산
-                transition_scores = []
-                for i in range(N):
-                    transition_prob = self.hmm_model.transition_matrix[i, j]
-                    score = log_delta[t-1, i] + np.log(transition_prob + 1e-10)
-                    transition_scores.append(score)
-                
-                # 최적 이전 상태 선택
-                best_prev_state = np.argmax(transition_scores)
-                psi[t, j] = best_prev_state
-                
-                # 현재 상태의 로그 확률 계산
-                emission_prob = self._get_emission_probability(j, encoded_sequence[t])
-                log_delta[t, j] = transition_scores[best_prev_state] + np.log(emission_prob + 1e-10)
-        
-        # 종료 단계: 최적 경로 추적
-        # 마지막 시점에서 최적 상태 선택
-        best_final_state = np.argmax(log_delta[T-1, :])
-        best_log_probability = log_delta[T-1, best_final_state]
-        
-        # 역추적으로 최적 경로 구성
-        optimal_path = [0] * T
-        optimal_path[T-1] = best_final_state
-        
-        for t in range(T-2, -1, -1):
-            optimal_path[t] = psi[t+1, optimal_path[t+1]]
-        
-        # 경로 확률들 계산
-        path_probabilities = []
-        for t in range(T):
-            state_probs = np.exp(log_delta[t, :] - np.max(log_delta[t, :]))
-            state_probs = state_probs / np.sum(state_probs)
-            path_probabilities.append(state_probs.tolist())
-        
-        return optimal_path, best_log_probability, path_probabilities
+        return optimal_path.tolist(), best_log_probability, path_probabilities(log_delta).tolist()
+    
+    def _log_parameters(self) -> Tuple[np.ndarray, np.ndarray]:
+        """로그 초기/전이 확률 (모델 파라미터 내용이 바뀌면 다시 계산)
+        
+        HMMModel/HMMRuleEditor가 행렬을 제자리에서 수정하므로 객체가 아니라
+        내용(바이트 해시)을 캐시 키로 사용
+        """
+        initial = np.ascontiguousarray(self.hmm_model.initial_probabilities)
+        transition = np.ascontiguousarray(self.hmm_model.transition_matrix)
+        key = (initial.shape, transition.shape,
+               hashlib.sha1(initial.tobytes()).hexdigest(),
+               hashlib.sha1(transition.tobytes()).hexdigest())
+        
+        cached = getattr(self, '_log_parameter_cache', None)
+        if cached is None or cached[0] != key:
+            self._log_parameter_cache = (key, safe_log(initial), safe_log(transition))
+        
+        return self._log_parameter_cache[1], self._log_parameter_cache[2]
+    
+    def _emission_columns(self, encoded_sequence: List[int]) -> np.ndarray:
+        """관측 시퀀스의 방출 확률 (T, N) - _get_emission_probability의 벡터 버전"""
+        emission_matrix = None
+        if self.hmm_model.emission_matrix:
+            emission_matrix = self.hmm_model.emission_matrix.get('태그위치')
+        return emission_columns(emission_matrix, encoded_sequence, self.hmm_model.n_states)
     
     def _get_emission_probability(self, state: int, observation: int) -> float:
         """방출 확률 계산"""
@@ -242,50 +227,112 @@ class ViterbiAlgorithm:
         return {state: count / total for state, count in state_counts.items()}
     
     def _generate_cache_key(self, observation_sequence: List[Dict[str, Any]]) -> str:
-        """캐시 키 생성"""
-        # 관측 시퀀스의 해시값을 캐시 키로 사용
-        key_data = []
-        for obs in observation_sequence:
-            key_data.append(str(obs.get('태그위치', obs.get('DR_NO', 'unknown'))))
-        
-        return str(hash(tuple(key_data)))
+        """캐시 키 생성 (프로세스 간 동일한 인코딩 ID 기반)"""
+        encoded_sequence = np.asarray(self._encode_observation_sequence(observation_sequence), dtype=np.int64)
+        return hashlib.sha1(encoded_sequence.tobytes()).hexdigest()
     
-    def batch_predict(self, observation_sequences: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    def batch_predict(self, observation_sequences: List[List[Dict[str, Any]]],
+                      chunk_size: int = 1024) -> List[Dict[str, Any]]:
         """
         여러 관측 시퀀스에 대한 배치 예측
         
+        시퀀스를 길이순으로 정렬해 chunk_size개씩 (B, T) 패딩 배열로 묶고,
+        길이 마스크를 둔 Viterbi를 청크 단위로 한 번에 실행합니다.
+        메모리 사용량은 chunk_size × 최대 길이 × 상태 수에 비례합니다.
+        
         Args:
             observation_sequences: 관측 시퀀스들의 리스트
+            chunk_size: 한 번에 디코딩할 시퀀스 수
             
         Returns:
-            List[Dict]: 예측 결과들
+            List[Dict]: 예측 결과들 (입력 순서와 동일)
         """
-        batch_results = []
+        batch_results: List[Optional[Dict[str, Any]]] = [None] * len(observation_sequences)
         
         self.logger.info(f"배치 예측 시작: {len(observation_sequences)}개 시퀀스")
         
+        encoded_sequences = {}
         for i, seq in enumerate(observation_sequences):
             try:
-                result = self.predict(seq)
-                result['sequence_id'] = i
-                batch_results.append(result)
-                
-                if (i + 1) % 100 == 0:
-                    self.logger.info(f"배치 예측 진행: {i + 1}/{len(observation_sequences)} 완료")
-                    
+                if not seq:
+                    result = {'states': [], 'log_probability': float('-inf'), 'confidence': 0.0}
+                    result['sequence_id'] = i
+                    batch_results[i] = result
+                else:
+                    encoded_sequences[i] = self._encode_observation_sequence(seq)
             except Exception as e:
-                self.logger.error(f"시퀀스 {i} 예측 실패: {e}")
-                batch_results.append({
-                    'sequence_id': i,
-                    'error': str(e),
-                    'states': [],
-                    'log_probability': float('-inf'),
-                    'confidence': 0.0
-                })
+                self.logger.error(f"시퀀스 {i} 인코딩 실패: {e}")
+                batch_results[i] = self._batch_error_result(i, e)
+        
+        # 길이순 정렬로 청크 내 패딩 최소화
+        order = sorted(encoded_sequences, key=lambda i: len(encoded_sequences[i]))
+        
+        for chunk_start in range(0, len(order), chunk_size):
+            chunk_ids = order[chunk_start:chunk_start + chunk_size]
+            try:
+                chunk_results = self._decode_chunk([encoded_sequences[i] for i in chunk_ids])
+                for seq_id, result in zip(chunk_ids, chunk_results):
+                    result['sequence_id'] = seq_id
+                    batch_results[seq_id] = result
+            except Exception as e:
+                self.logger.error(f"청크 {chunk_start // chunk_size} 예측 실패: {e}")
+                for seq_id in chunk_ids:
+                    batch_results[seq_id] = self._batch_error_result(seq_id, e)
+            
+            self.logger.info(f"배치 예측 진행: {min(chunk_start + chunk_size, len(order))}/{len(order)} 완료")
         
         self.logger.info(f"배치 예측 완료: {len(batch_results)}개 결과")
         return batch_results
     
+    def _decode_chunk(self, encoded_sequences: List[List[int]]) -> List[Dict[str, Any]]:
+        """인코딩된 시퀀스 묶음을 패딩 배열로 만들어 한 번에 디코딩"""
+        N = self.hmm_model.n_states
+        lengths = np.array([len(seq) for seq in encoded_sequences], dtype=np.int64)
+        B, T = len(encoded_sequences), int(lengths.max())
+        
+        # 패딩 위치는 -1 (범위 밖 관측값 → 방출 확률 1e-10, 마스크로 무시됨)
+        padded = np.full((B, T), -1, dtype=np.int64)
+        for b, seq in enumerate(encoded_sequences):
+            padded[b, :len(seq)] = seq
+        
+        log_initial, log_transition = self._log_parameters()
+        log_emission = safe_log(self._emission_columns(padded.ravel())).reshape(B, T, N)
+        
+        paths, log_probabilities, log_delta = viterbi_log_batch(
+            log_initial, log_transition, log_emission, lengths
+        )
+        probabilities = path_probabilities(log_delta)
+        
+        timestamp = datetime.now().isoformat()
+        results = []
+        for b in range(B):
+            length = int(lengths[b])
+            state_sequence = paths[b, :length].tolist()
+            path_probs = probabilities[b, :length]
+            log_probability = float(log_probabilities[b])
+            
+            results.append({
+                'states': [self.hmm_model.index_to_state[state] for state in state_sequence],
+                'state_indices': state_sequence,
+                'log_probability': log_probability,
+                'confidence': self._calculate_confidence(path_probs.tolist(), log_probability),
+                'state_probabilities': path_probs[np.arange(length), paths[b, :length]].tolist(),
+                'sequence_length': length,
+                'prediction_timestamp': timestamp
+            })
+        
+        return results
+    
+    def _batch_error_result(self, sequence_id: int, error: Exception) -> Dict[str, Any]:
+        """배치 예측 실패 결과"""
+        return {
+            'sequence_id': sequence_id,
+            'error': str(error),
+            'states': [],
+            'log_probability': float('-inf'),
+            'confidence': 0.0
+        }
+    
     def get_prediction_stats(self) -> Dict[str, Any]:
         """예측 통계 반환"""
         return {
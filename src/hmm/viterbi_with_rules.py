@@ -3,12 +3,13 @@
 조건부 전이 확률을 사용하는 개선된 버전
 """
 
-import numpy as np
 import logging
 from typing import Dict, List, Tuple, Optional, Any
 from datetime import datetime
 
 from .viterbi import ViterbiAlgorithm
+from .kernels import safe_log, viterbi_log, path_probabilities
+from .rule_compiler import CompiledTransitionRules
 
 class RuleBasedViterbiAlgorithm(ViterbiAlgorithm):
     """룰 기반 Viterbi 알고리즘"""
@@ -16,6 +17,7 @@ class RuleBasedViterbiAlgorithm(ViterbiAlgorithm):
     def __init__(self, hmm_model):
         super().__init__(hmm_model)
         self.logger = logging.getLogger(__name__)
+        self._compiled_rules: Optional[CompiledTransitionRules] = None
         
     def _viterbi_algorithm(self, encoded_sequence: List[int], 
                           observation_sequence: List[Dict[str, Any]] = None) -> Tuple[List[int], float, List[List[float]]]:
@@ -29,71 +31,28 @@ class RuleBasedViterbiAlgorithm(ViterbiAlgorithm):
         Returns:
             Tuple: (상태 시퀀스, 로그 확률, 경로 확률들)
         """
-        T = len(encoded_sequence)
-        N = self.hmm_model.n_states
-        
-        # 로그 확률 테이블 초기화
-        log_delta = np.full((T, N), -np.inf)
-        psi = np.zeros((T, N), dtype=int)
-        
-        # 초기화 (t=0)
-        for i in range(N):
-            initial_prob = self.hmm_model.initial_probabilities[i]
-            emission_prob = self._get_emission_probability(i, encoded_sequence[0])
-            log_delta[0, i] = np.log(initial_prob + 1e-10) + np.log(emission_prob + 1e-10)
-        
-        # 순환 단계 (t=1 to T-1)
-        for t in range(1, T):
-            # 현재 시점의 컨텍스트 추출
-            context = self._extract_context(t, observation_sequence) if observation_sequence else {}
-            
-            for j in range(N):
-                transition_scores = []
-                
-                for i in range(N):
-                    # 룰 기반 전이 확률 계산
-                    from_state = self.hmm_model.index_to_state[i]
-                    to_state = self.hmm_model.index_to_state[j]
-                    
-                    # 조건부 전이 확률 사용
-                    if context:
-                        transition_prob = self.hmm_model.get_transition_probability_with_conditions(
-                            from_state, to_state, context
-                        )
-                    else:
-                        # 컨텍스트가 없으면 기본 확률 사용
-                        transition_prob = self.hmm_model.transition_matrix[i, j]
-                    
-                    score = log_delta[t-1, i] + np.log(transition_prob + 1e-10)
-                    transition_scores.append(score)
-                
-                # 최적 이전 상태 선택
-                best_prev_state = np.argmax(transition_scores)
-                psi[t, j] = best_prev_state
-                
-                # 현재 상태의 로그 확률 계산
-                emission_prob = self._get_emission_probability(j, encoded_sequence[t])
-                log_delta[t, j] = transition_scores[best_prev_state] + np.log(emission_prob + 1e-10)
-        
-        # 종료 단계: 최적 경로 추적
-        best_final_state = np.argmax(log_delta[T-1, :])
-        best_log_probability = log_delta[T-1, best_final_state]
-        
-        # 역추적으로 최적 경로 구성
-        optimal_path = [0] * T
-        optimal_path[T-1] = best_final_state
-        
-        for t in range(T-2, -1, -1):
-            optimal_path[t] = psi[t+1, optimal_path[t+1]]
-        
-        # 경로 확률들 계산
-        path_probabilities = []
-        for t in range(T):
-            state_probs = np.exp(log_delta[t, :] - np.max(log_delta[t, :]))
-            state_probs = state_probs / np.sum(state_probs)
-            path_probabilities.append(state_probs.tolist())
+        log_initial, log_transition = self._log_parameters()
+        log_emission = safe_log(self._emission_columns(encoded_sequence))
+        
+        # 시점별 컨텍스트 버킷의 미리 계산된 전이 행렬 사용
+        transition_index = None
+        if observation_sequence:
+            compiled_rules = self._get_compiled_rules()
+            log_transition, transition_index = compiled_rules.sequence_buckets(
+                observation_sequence, length=len(encoded_sequence)
+            )
+        
+        optimal_path, best_log_probability, log_delta = viterbi_log(
+            log_initial, log_transition, log_emission, transition_index
+        )
         
-        return optimal_path, best_log_probability, path_probabilities
+        return optimal_path.tolist(), best_log_probability, path_probabilities(log_delta).tolist()
+    
+    def _get_compiled_rules(self) -> CompiledTransitionRules:
+        """컴파일된 전이 규칙 (규칙/전이 행렬이 바뀌면 다시 컴파일)"""
+        if self._compiled_rules is None or self._compiled_rules.is_stale():
+            self._compiled_rules = CompiledTransitionRules(self.hmm_model)
+        return self._compiled_rules
     
     def _extract_context(self, t: int, observation_sequence: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
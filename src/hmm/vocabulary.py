@@ -0,0 +1,102 @@
+"""
+관측값 어휘 (태그 위치 → 정수 ID)
+태깅지점 마스터의 DR_NO를 고정된 정수 ID로 매핑하여 프로세스와 실행에
+관계없이 같은 관측값이 항상 같은 ID로 인코딩되도록 합니다.
+"""
+
+import zlib
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Iterable, List
+
+# ID 0은 어휘에 없는 위치(unknown)에 예약
+UNKNOWN_ID = 0
+UNKNOWN_TOKEN = '<UNK>'
+
+
+def observation_value(obs: Dict[str, Any]) -> Any:
+    """관측 딕셔너리에서 인코딩 대상 태그 위치 값 추출"""
+    return obs.get('태그위치', obs.get('DR_NO', 'unknown'))
+
+
+def stable_observation_id(value: Any, n_observations: int) -> int:
+    """어휘가 없을 때의 대체 인코딩 (프로세스와 무관한 CRC32 기반)"""
+    return zlib.crc32(str(value).strip().encode('utf-8')) % n_observations
+
+
+def _normalize(values: pd.Series) -> pd.Series:
+    """
+    DR_NO 값을 문자열로 정규화 (정수/실수/문자열 혼용 대응: 101.0 → '101')
+    
+    결측값이 섞인 엑셀 컬럼은 실수형으로 읽히므로 정수값 실수의 소수부를 제거합니다.
+    문자열 앞자리 0은 유지합니다.
+    """
+    return values.astype(str).str.strip().str.replace(r'^(-?\d+)\.0+$', r'\1', regex=True)
+
+
+class ObservationVocabulary:
+    """태그 위치 관측값 어휘"""
+
+    def __init__(self, values: Iterable[Any]):
+        """
+        Args:
+            values: 어휘에 포함할 위치 값들 (정렬 후 1부터 ID 부여)
+        """
+        normalized = _normalize(pd.Series(list(values), dtype=object)).drop_duplicates()
+        self.values: List[str] = sorted(v for v in normalized if v and v != 'nan')
+        self._index = pd.Index(self.values)
+
+    @classmethod
+    def from_tag_location_master(cls, tag_location_master: pd.DataFrame,
+                                 column: str = 'DR_NO') -> 'ObservationVocabulary':
+        """태깅지점 마스터의 DR_NO 컬럼으로 어휘 생성"""
+        return cls(tag_location_master[column].dropna())
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ObservationVocabulary':
+        """to_dict 결과에서 복원 (저장된 순서 = ID 순서 유지)"""
+        vocabulary = cls([])
+        vocabulary.values = list(data['values'])
+        vocabulary._index = pd.Index(vocabulary.values)
+        return vocabulary
+
+    def to_dict(self) -> Dict[str, Any]:
+        """모델 파일 저장용 딕셔너리"""
+        return {'unknown_token': UNKNOWN_TOKEN, 'values': self.values}
+
+    def __len__(self) -> int:
+        """ID 개수 (unknown 포함)"""
+        return len(self.values) + 1
+
+    def encode(self, values) -> np.ndarray:
+        """
+        위치 값 배열/컬럼을 정수 ID 배열로 변환 (벡터 연산)
+
+        Args:
+            values: DataFrame 컬럼, 배열 또는 리스트
+
+        Returns:
+            np.ndarray: int64 ID 배열 (어휘에 없으면 0)
+        """
+        series = values if isinstance(values, pd.Series) else pd.Series(list(values), dtype=object)
+
+        # 범주형 컬럼은 범주 값만 변환하고 코드로 펼침
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            category_ids = self.encode(pd.Series(series.cat.categories, dtype=object))
+            codes = series.cat.codes.to_numpy()
+            return np.where(codes >= 0, category_ids[codes], UNKNOWN_ID).astype(np.int64)
+
+        positions = self._index.get_indexer(_normalize(series))
+        return np.where(positions >= 0, positions + 1, UNKNOWN_ID).astype(np.int64)
+
+    def encode_sequence(self, observation_sequence: List[Dict[str, Any]]) -> np.ndarray:
+        """관측 딕셔너리 시퀀스를 정수 ID 배열로 변환"""
+        return self.encode([observation_value(obs) for obs in observation_sequence])
+
+    def decode(self, ids: Iterable[int]) -> List[str]:
+        """정수 ID를 위치 값으로 되돌림"""
+        return [self.values[i - 1] if 0 < i <= len(self.values) else UNKNOWN_TOKEN for i in ids]
+
+    def mapping(self) -> Dict[str, int]:
+        """위치 값 → ID 딕셔너리"""
+        return {value: i + 1 for i, value in enumerate(self.values)}
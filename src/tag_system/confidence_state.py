@@ -9,6 +9,8 @@ from datetime import datetime
 from enum import Enum
 import json
 
+import numpy as np
+
 
 class EvidenceType(Enum):
     """증거 유형 정의"""
@@ -198,6 +200,227 @@ class StateWithConfidence:
                 f"alternatives={len(self.alternative_states)})")
 
 
+# 컬럼형 시퀀스의 코드 테이블 (코드 = 열거형 정의 순서)
+STATE_CODES: Tuple[ActivityState, ...] = tuple(ActivityState)
+EVIDENCE_TYPE_CODES: Tuple[EvidenceType, ...] = tuple(EvidenceType)
+UNMATCHED = -1  # 규칙에 매칭되지 않은 행의 상태 코드
+
+_STATE_INDEX = {state: code for code, state in enumerate(STATE_CODES)}
+_EVIDENCE_TYPE_INDEX = {evidence_type: code for code, evidence_type in enumerate(EVIDENCE_TYPE_CODES)}
+_CONTEXT_BIT = 1 << _EVIDENCE_TYPE_INDEX[EvidenceType.CONTEXT]
+_CONSISTENCY_WEIGHT = 0.3
+
+
+class StateSequence:
+    """
+    컬럼형 상태 시퀀스 (StateWithConfidence 리스트의 배치용 표현)
+    
+    행마다 객체를 만들지 않고 상태는 int8 코드, 신뢰도는 float32로 저장합니다.
+    증거는 포함된 증거 유형의 비트 마스크와 가장 가중치가 큰 증거(주 증거)의 설명 코드/유형/가중치만
+    보관하며, 설명 문자열은 시퀀스별 설명 테이블에 한 번씩만 저장합니다.
+    일관성 조정 비율은 별도 컬럼으로 두고 증거가 필요할 때 설명을 만듭니다.
+    대안 상태, 태그 시퀀스, 증거의 시각과 메타데이터는 보관하지 않습니다.
+    """
+    
+    def __init__(self, states: np.ndarray, confidence: np.ndarray,
+                 evidence_mask: Optional[np.ndarray] = None,
+                 evidence_codes: Optional[np.ndarray] = None,
+                 evidence_types: Optional[np.ndarray] = None,
+                 evidence_weights: Optional[np.ndarray] = None,
+                 consistency: Optional[np.ndarray] = None,
+                 descriptions: Optional[List[str]] = None):
+        """
+        Args:
+            states: 상태 코드 (STATE_CODES 인덱스, 매칭 없음은 UNMATCHED)
+            confidence: 신뢰도 (매칭 없는 행은 0)
+            evidence_mask: 행별 증거 유형 비트 마스크 (비트 = EVIDENCE_TYPE_CODES 인덱스)
+            evidence_codes: 주 증거 설명 코드 (descriptions 인덱스, 없으면 -1)
+            evidence_types: 주 증거 유형 코드 (없으면 -1)
+            evidence_weights: 주 증거 가중치
+            consistency: 일관성 조정 비율 (조정하지 않은 행은 NaN)
+            descriptions: 설명 테이블
+        """
+        size = len(states)
+        self.states = np.asarray(states, dtype=np.int8)
+        self.confidence = np.asarray(confidence, dtype=np.float32)
+        self.evidence_mask = (np.zeros(size, dtype=np.uint8) if evidence_mask is None
+                              else np.asarray(evidence_mask, dtype=np.uint8))
+        self.evidence_codes = (np.full(size, -1, dtype=np.int32) if evidence_codes is None
+                               else np.asarray(evidence_codes, dtype=np.int32))
+        self.evidence_types = (np.full(size, -1, dtype=np.int8) if evidence_types is None
+                               else np.asarray(evidence_types, dtype=np.int8))
+        self.evidence_weights = (np.zeros(size, dtype=np.float32) if evidence_weights is None
+                                 else np.asarray(evidence_weights, dtype=np.float32))
+        self.consistency = (np.full(size, np.nan, dtype=np.float32) if consistency is None
+                            else np.asarray(consistency, dtype=np.float32))
+        self.descriptions: List[str] = list(descriptions or [])
+        self._description_index = {text: code for code, text in enumerate(self.descriptions)}
+    
+    def __len__(self) -> int:
+        return len(self.states)
+    
+    def intern(self, description: str) -> int:
+        """설명 문자열의 코드 (테이블에 없으면 추가)"""
+        code = self._description_index.get(description)
+        if code is None:
+            code = len(self.descriptions)
+            self.descriptions.append(description)
+            self._description_index[description] = code
+        return code
+    
+    @classmethod
+    def from_states(cls, states: List[Optional[StateWithConfidence]]) -> 'StateSequence':
+        """StateWithConfidence 리스트(None 포함)에서 생성"""
+        size = len(states)
+        sequence = cls(np.full(size, UNMATCHED, dtype=np.int8), np.zeros(size, dtype=np.float32))
+        for i, state in enumerate(states):
+            if state is None:
+                continue
+            sequence.states[i] = _STATE_INDEX[state.state]
+            sequence.confidence[i] = state.confidence
+            if state.evidence:
+                primary = max(state.evidence, key=lambda e: e.weight)
+                sequence.evidence_codes[i] = sequence.intern(primary.description)
+                sequence.evidence_types[i] = _EVIDENCE_TYPE_INDEX[primary.type]
+                sequence.evidence_weights[i] = primary.weight
+                for evidence in state.evidence:
+                    sequence.evidence_mask[i] |= 1 << _EVIDENCE_TYPE_INDEX[evidence.type]
+        return sequence
+    
+    @classmethod
+    def concat(cls, sequences: List['StateSequence']) -> 'StateSequence':
+        """여러 시퀀스를 이어 붙이기 (설명 테이블 통합)"""
+        result = cls(np.empty(0, dtype=np.int8), np.empty(0, dtype=np.float32))
+        codes = [result._remap_codes(sequence) for sequence in sequences]
+        for name in ('states', 'confidence', 'evidence_mask', 'evidence_types',
+                     'evidence_weights', 'consistency'):
+            setattr(result, name, np.concatenate([getattr(result, name)]
+                                                 + [getattr(sequence, name) for sequence in sequences]))
+        result.evidence_codes = np.concatenate([result.evidence_codes] + codes)
+        return result
+    
+    def _remap_codes(self, other: 'StateSequence') -> np.ndarray:
+        """다른 시퀀스의 설명 코드를 이 시퀀스의 설명 테이블 코드로 변환"""
+        if other.descriptions == self.descriptions:
+            return other.evidence_codes
+        lookup = np.array([self.intern(text) for text in other.descriptions] + [-1], dtype=np.int32)
+        return lookup[other.evidence_codes]
+    
+    @property
+    def matched(self) -> np.ndarray:
+        """규칙/추론으로 상태가 정해진 행"""
+        return self.states != UNMATCHED
+    
+    @property
+    def is_confident(self) -> np.ndarray:
+        """높은 신뢰도 여부 (임계값 0.8, StateWithConfidence.is_confident와 같음)"""
+        return self.matched & (self.confidence >= np.float32(0.8))
+    
+    @property
+    def is_uncertain(self) -> np.ndarray:
+        """불확실한 상태 여부 (신뢰도 < 0.6)"""
+        return self.matched & (self.confidence < np.float32(0.6))
+    
+    @property
+    def primary_evidence_types(self) -> np.ndarray:
+        """가장 영향력 있는 증거 유형 코드 (일관성 조정 증거 포함, 없으면 -1)"""
+        adjusted = ~np.isnan(self.consistency)
+        context_wins = adjusted & ((self.evidence_types < 0)
+                                   | (self.evidence_weights < np.float32(_CONSISTENCY_WEIGHT)))
+        return np.where(context_wins, _EVIDENCE_TYPE_INDEX[EvidenceType.CONTEXT], self.evidence_types)
+    
+    def merge_with(self, other: 'StateSequence') -> 'StateSequence':
+        """
+        행별 병합 (StateWithConfidence.merge_with와 같은 규칙)
+        
+        상태가 다르면 신뢰도가 높은 쪽(같으면 자신)을, 같으면 신뢰도 평균과 증거 합집합을 사용합니다.
+        """
+        if len(other) != len(self):
+            raise ValueError(f"시퀀스 길이가 다릅니다: {len(self)} != {len(other)}")
+        
+        other_codes = self._remap_codes(other)
+        same = self.states == other.states
+        take_other = ~same & (other.confidence > self.confidence)
+        # 같은 상태에서는 가중치가 큰 증거가 주 증거 (같으면 자신의 증거)
+        other_primary = take_other | (same & (other.evidence_weights > self.evidence_weights))
+        
+        confidence = np.where(take_other, other.confidence, self.confidence)
+        confidence = np.where(same, (self.confidence + other.confidence) / 2, confidence)
+        mask = np.where(take_other, other.evidence_mask, self.evidence_mask)
+        mask = np.where(same, self.evidence_mask | other.evidence_mask, mask)
+        consistency = np.where(take_other | (same & np.isnan(self.consistency)),
+                               other.consistency, self.consistency)
+        
+        return StateSequence(
+            states=np.where(take_other, other.states, self.states),
+            confidence=confidence,
+            evidence_mask=mask,
+            evidence_codes=np.where(other_primary, other_codes, self.evidence_codes),
+            evidence_types=np.where(other_primary, other.evidence_types, self.evidence_types),
+            evidence_weights=np.where(other_primary, other.evidence_weights, self.evidence_weights),
+            consistency=consistency,
+            descriptions=self.descriptions,
+        )
+    
+    def _evidence_at(self, i: int) -> List[Evidence]:
+        evidence = []
+        if self.evidence_codes[i] >= 0:
+            evidence.append(Evidence(
+                type=EVIDENCE_TYPE_CODES[self.evidence_types[i]],
+                description=self.descriptions[self.evidence_codes[i]],
+                weight=float(self.evidence_weights[i])
+            ))
+        if not np.isnan(self.consistency[i]):
+            ratio = float(self.consistency[i])
+            evidence.append(Evidence(
+                type=EvidenceType.CONTEXT,
+                description=f"일관성 조정 (ratio={ratio:.2f})",
+                weight=_CONSISTENCY_WEIGHT,
+                metadata={'consistency_ratio': ratio}
+            ))
+        return evidence
+    
+    def state_at(self, i: int) -> Optional[StateWithConfidence]:
+        """행의 StateWithConfidence (매칭 없으면 None)"""
+        if self.states[i] == UNMATCHED:
+            return None
+        return StateWithConfidence(
+            state=STATE_CODES[self.states[i]],
+            confidence=float(self.confidence[i]),
+            evidence=self._evidence_at(i)
+        )
+    
+    def to_states(self) -> List[Optional[StateWithConfidence]]:
+        """StateWithConfidence 리스트로 변환"""
+        return [self.state_at(i) for i in range(len(self))]
+    
+    def to_dict(self) -> Dict[str, List[Any]]:
+        """
+        컬럼별 리스트로 변환 (JSON 직렬화 가능)
+        
+        StateWithConfidence.to_dict의 state, confidence, is_confident, is_uncertain,
+        primary_evidence_type 키를 컬럼으로 하고, evidence는 행별 주 증거 설명입니다.
+        """
+        state_values = np.array([state.value for state in STATE_CODES] + [None], dtype=object)
+        type_values = np.array([t.value for t in EVIDENCE_TYPE_CODES] + [None], dtype=object)
+        descriptions = np.array(self.descriptions + [None], dtype=object)
+        matched = self.matched
+        return {
+            'state': state_values[self.states].tolist(),
+            'confidence': np.where(matched, np.round(self.confidence.astype(np.float64), 3), np.nan).tolist(),
+            'is_confident': self.is_confident.tolist(),
+            'is_uncertain': self.is_uncertain.tolist(),
+            'evidence': descriptions[self.evidence_codes].tolist(),
+            'primary_evidence_type': type_values[self.primary_evidence_types].tolist(),
+        }
+    
+    def nbytes(self) -> int:
+        """배열 메모리 사용량 (바이트, 설명 테이블 제외)"""
+        return sum(array.nbytes for array in (self.states, self.confidence, self.evidence_mask,
+                                              self.evidence_codes, self.evidence_types,
+                                              self.evidence_weights, self.consistency))
+
+
 class ConfidenceCalculator:
     """신뢰도 계산 유틸리티"""
     
@@ -233,10 +456,15 @@ class ConfidenceCalculator:
         """
         연속된 상태들의 일관성을 기반으로 신뢰도 조정
         일관된 패턴이면 신뢰도 상승, 불규칙하면 하락
+        
+        StateSequence를 전달하면 배열 연산으로 조정한 StateSequence를 반환합니다.
         """
         if len(states) < window_size:
             return states
         
+        if isinstance(states, StateSequence):
+            return ConfidenceCalculator._adjust_sequence_by_consistency(states, window_size)
+        
         adjusted_states = []
         
         for i, current in enumerate(states):
@@ -272,6 +500,35 @@ class ConfidenceCalculator:
             adjusted_states.append(adjusted)
         
         return adjusted_states
+    
+    @staticmethod
+    def _adjust_sequence_by_consistency(sequence: StateSequence, window_size: int) -> StateSequence:
+        """adjust_confidence_by_consistency의 컬럼형 버전 (매칭 없는 행은 조정하지 않음)"""
+        size = len(sequence)
+        half = window_size // 2
+        positions = np.arange(size)
+        window_length = np.minimum(size, positions + half + 1) - np.maximum(0, positions - half)
+        
+        # 창 안의 각 오프셋에 대해 같은 상태 여부를 누적
+        same_count = np.zeros(size, dtype=np.int32)
+        for offset in range(-half, half + 1):
+            lo, hi = max(0, -offset), min(size, size - offset)
+            same_count[lo:hi] += sequence.states[lo:hi] == sequence.states[lo + offset:hi + offset]
+        
+        ratio = same_count / window_length
+        matched = sequence.matched
+        adjusted = np.clip(sequence.confidence + (ratio - 0.5) * 0.2, 0.0, 1.0)
+        
+        return StateSequence(
+            states=sequence.states,
+            confidence=np.where(matched, adjusted, sequence.confidence),
+            evidence_mask=np.where(matched, sequence.evidence_mask | _CONTEXT_BIT, sequence.evidence_mask),
+            evidence_codes=sequence.evidence_codes,
+            evidence_types=sequence.evidence_types,
+            evidence_weights=sequence.evidence_weights,
+            consistency=np.where(matched, ratio, np.nan),
+            descriptions=sequence.descriptions,
+        )
 
 
 # 사용 예시를 위한 헬퍼 함수들
@@ -4,16 +4,19 @@
 """
 
 import logging
-from datetime import datetime, timedelta
-from typing import Optional, Dict, List, Tuple
+from datetime import datetime, time, timedelta
+from typing import Optional, Dict, List, Tuple, Callable
 from dataclasses import dataclass
 from enum import Enum
 
+import numpy as np
+import pandas as pd
+
 from .confidence_state import (
     StateWithConfidence, Evidence, EvidenceType, 
-    ActivityState, create_rule_based_state
+    ActivityState, StateSequence, STATE_CODES, UNMATCHED, create_rule_based_state
 )
-from ..utils.time_normalizer import TimeNormalizer, MealType
+from ..utils.time_normalizer import TimeNormalizer, MealType, ShiftType
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +46,129 @@ class RuleConfig:
     medium_confidence: float = 0.90
 
 
+@dataclass
+class CompiledRule:
+    """결정 테이블의 한 행 (규칙 함수의 한 분기를 벡터화한 조건)"""
+    name: str
+    priority: RulePriority
+    rule_func: str  # 증거를 만들 때 호출할 규칙 함수 이름
+    state: ActivityState
+    confidence: float
+    weight: float  # 규칙 함수가 만드는 증거의 가중치
+    predicate: Callable[[Dict[str, pd.Series]], pd.Series]
+
+
+# 배치 입력 컬럼 (apply_rules의 tag_data 키와 같음)
+BATCH_COLUMNS = ('tag', 'previous_tag', 'next_tag', 'timestamp', 'duration_minutes',
+                 'to_next_minutes', 'has_o_tag', 'is_entry_gate', 'shift_type')
+
+
+# 규칙(결정 테이블 행)별 (신뢰도 설정 이름, 증거 가중치)
+# 규칙 함수와 결정 테이블이 함께 사용하는 단일 정의
+RULE_DEFINITIONS: Dict[str, Tuple[str, float]] = {
+    'o_tag': ('critical_confidence', 1.0),
+    'o_to_work_area': ('high_confidence', 0.95),
+    'meal_m1': ('critical_confidence', 1.0),
+    'meal_m2_takeout': ('critical_confidence', 1.0),
+    'takeout_to_rest': ('high_confidence', 0.9),
+    'entry': ('high_confidence', 0.9),
+    'exit': ('high_confidence', 0.9),
+    'gate_transit': ('medium_confidence', 0.9),
+    'meeting_g3': ('high_confidence', 0.9),
+    'meeting_g3_short': ('medium_confidence', 0.7),
+    'shift_change_meeting': ('medium_confidence', 0.8),
+    'education_g4': ('high_confidence', 0.9),
+    'entry_preparation': ('high_confidence', 0.9),
+    'exit_preparation': ('high_confidence', 0.9),
+    'rest': ('medium_confidence', 0.8),
+    'transit_t1': ('medium_confidence', 0.7),
+    'very_short_stay': ('medium_confidence', 0.6),
+}
+
+
+def _seconds_of_day(t: time) -> float:
+    return t.hour * 3600 + t.minute * 60 + t.second + t.microsecond / 1e6
+
+
+class RuleBatchResult:
+    """
+    배치 규칙 적용 결과
+    
+    행별 규칙 번호/상태/신뢰도만 배열로 보관하고, StateWithConfidence와 증거(Evidence)는
+    state_at()/to_states()를 호출할 때 해당 행의 규칙 함수로 만듭니다.
+    """
+    
+    def __init__(self, engine: 'DeterministicRuleEngine', frame: pd.DataFrame,
+                 rules: List[CompiledRule], rule_index: np.ndarray):
+        self.engine = engine
+        self.frame = frame
+        self.rules = rules
+        self.rule_index = rule_index  # 행별 결정 테이블 행 번호 (-1: 매칭 없음)
+        
+        matched = rule_index >= 0
+        states = np.array([rule.state.value for rule in rules] + [None], dtype=object)
+        confidences = np.array([rule.confidence for rule in rules] + [np.nan])
+        names = np.array([rule.name for rule in rules] + [None], dtype=object)
+        self.matched = matched
+        self.states = states[rule_index]  # 상태 값 (ActivityState.value, 매칭 없으면 None)
+        self.confidence = confidences[rule_index]
+        self.rule_names = names[rule_index]
+    
+    def __len__(self) -> int:
+        return len(self.rule_index)
+    
+    def to_frame(self) -> pd.DataFrame:
+        """행별 상태/신뢰도/규칙 이름 (입력 인덱스 유지)"""
+        return pd.DataFrame({
+            'state': self.states,
+            'confidence': self.confidence,
+            'rule': self.rule_names,
+        }, index=self.frame.index)
+    
+    def tag_data_at(self, position: int) -> Dict:
+        """행의 apply_rules 입력 형식 데이터"""
+        row = self.frame.iloc[position]
+        tag_data = {'tag': row['tag'], 'timestamp': pd.Timestamp(row['timestamp']).to_pydatetime()}
+        for key in ('previous_tag', 'next_tag', 'duration_minutes', 'to_next_minutes',
+                    'has_o_tag', 'is_entry_gate', 'shift_type'):
+            value = row.get(key)
+            if value is not None and not (isinstance(value, float) and np.isnan(value)):
+                tag_data[key] = value
+        return tag_data
+    
+    def state_at(self, position: int) -> Optional[StateWithConfidence]:
+        """행의 StateWithConfidence (증거 포함, 매칭 없으면 None)"""
+        index = self.rule_index[position]
+        if index < 0:
+            return None
+        rule = self.rules[index]
+        return getattr(self.engine, rule.rule_func)(self.tag_data_at(position))
+    
+    def to_states(self) -> List[Optional[StateWithConfidence]]:
+        """모든 행의 StateWithConfidence 리스트"""
+        return [self.state_at(position) for position in range(len(self))]
+    
+    def to_sequence(self) -> StateSequence:
+        """
+        컬럼형 StateSequence로 변환 (행별 객체를 만들지 않음)
+        
+        주 증거 설명은 규칙 이름이며, 상세 설명이 필요하면 state_at()을 사용합니다.
+        """
+        state_codes = np.array([STATE_CODES.index(rule.state) for rule in self.rules] + [UNMATCHED],
+                               dtype=np.int8)
+        rule_bit = 1 << list(EvidenceType).index(EvidenceType.RULE)
+        matched = self.matched
+        return StateSequence(
+            states=state_codes[self.rule_index],
+            confidence=np.where(matched, self.confidence, 0.0),
+            evidence_mask=np.where(matched, rule_bit, 0),
+            evidence_codes=np.where(matched, self.rule_index, -1),
+            evidence_types=np.where(matched, list(EvidenceType).index(EvidenceType.RULE), -1),
+            evidence_weights=np.array([rule.weight for rule in self.rules] + [0.0])[self.rule_index],
+            descriptions=[rule.name for rule in self.rules],
+        )
+
+
 class DeterministicRuleEngine:
     """확정적 규칙 기반 분류 엔진"""
     
@@ -102,17 +228,146 @@ class DeterministicRuleEngine:
         
         return None
     
+    def _rule_confidence(self, name: str) -> float:
+        """규칙의 신뢰도 (RULE_DEFINITIONS의 설정 이름으로 현재 config에서 조회)"""
+        return getattr(self.config, RULE_DEFINITIONS[name][0])
+    
+    @staticmethod
+    def _rule_weight(name: str) -> float:
+        """규칙이 만드는 증거의 가중치"""
+        return RULE_DEFINITIONS[name][1]
+    
+    def compile_rules(self) -> List[CompiledRule]:
+        """
+        규칙 함수의 분기를 우선순위 순서의 결정 테이블로 변환
+        
+        각 행의 조건은 apply_rules가 같은 태그에 대해 해당 분기까지 도달해 반환하는 경우와
+        일치하며, 설정값은 호출 시점의 config를 사용합니다.
+        """
+        config = self.config
+        short = config.short_duration_threshold_minutes
+        normalizer = self.time_normalizer
+        
+        def between(c, start: time, end: time) -> pd.Series:
+            return c['seconds'].between(_seconds_of_day(start), _seconds_of_day(end))
+        
+        def gate_window(c, window: str) -> pd.Series:
+            # 시간대가 정의되지 않은 근무 유형(OFFICE 등)은 어느 창에도 속하지 않아 출입문 경유로 분류
+            in_window = pd.Series(False, index=c['tag'].index)
+            for shift_type, shift_info in normalizer.shift_times.items():
+                start, end = shift_info[window]
+                in_window |= (c['shift_type'] == shift_type) & between(c, start, end)
+            return in_window
+        
+        def shift_change(c) -> pd.Series:
+            return between(c, time(20, 0), time(20, 30)) | between(c, time(8, 0), time(8, 30))
+        
+        def is_gate(c) -> pd.Series:
+            return c['tag'].isin(['T2', 'T3'])
+        
+        def rule(name, priority, rule_func, state, predicate) -> CompiledRule:
+            return CompiledRule(name, priority, rule_func, state, self._rule_confidence(name),
+                                self._rule_weight(name), predicate)
+        
+        critical, high, medium, low = (RulePriority.CRITICAL, RulePriority.HIGH,
+                                       RulePriority.MEDIUM, RulePriority.LOW)
+        return [
+            rule('o_tag', critical, '_check_o_tag_rule', ActivityState.WORK_CONFIRMED,
+                 lambda c: c['has_o_tag'] | (c['tag'] == 'O')),
+            rule('o_to_work_area', critical, '_check_o_tag_rule', ActivityState.WORK,
+                 lambda c: (c['previous_tag'] == 'O') & c['tag'].isin(['G1', 'G2', 'G3'])),
+            rule('meal_m1', high, '_check_meal_rule', ActivityState.MEAL,
+                 lambda c: c['tag'] == 'M1'),
+            rule('meal_m2_takeout', high, '_check_meal_rule', ActivityState.TRANSIT,
+                 lambda c: c['tag'] == 'M2'),
+            rule('takeout_to_rest', high, '_check_meal_rule', ActivityState.REST,
+                 lambda c: (c['previous_tag'] == 'M2') & (c['tag'] == 'N2')),
+            rule('entry', high, '_check_entry_exit_rule', ActivityState.ENTRY,
+                 lambda c: is_gate(c) & c['is_entry_gate'] & gate_window(c, 'entry_window')),
+            rule('exit', high, '_check_entry_exit_rule', ActivityState.EXIT,
+                 lambda c: is_gate(c) & ~c['is_entry_gate'] & gate_window(c, 'exit_window')),
+            rule('gate_transit', high, '_check_entry_exit_rule', ActivityState.TRANSIT, is_gate),
+            rule('meeting_g3', medium, '_check_meeting_rule', ActivityState.MEETING,
+                 lambda c: (c['tag'] == 'G3') & (c['duration'] >= 30)),
+            rule('meeting_g3_short', medium, '_check_meeting_rule', ActivityState.TRANSIT,
+                 lambda c: (c['tag'] == 'G3') & (c['duration'] < short)),
+            rule('shift_change_meeting', medium, '_check_meeting_rule', ActivityState.MEETING,
+                 lambda c: c['tag'].isin(['G1', 'G3']) & shift_change(c)),
+            rule('education_g4', medium, '_check_education_rule', ActivityState.EDUCATION,
+                 lambda c: (c['tag'] == 'G4') & (c['duration'] >= 60)),
+            rule('entry_preparation', medium, '_check_preparation_rule', ActivityState.PREPARATION,
+                 lambda c: (c['tag'] == 'G2') & (c['previous_tag'] == 'T2')),
+            rule('exit_preparation', medium, '_check_preparation_rule', ActivityState.PREPARATION,
+                 lambda c: (c['tag'] == 'G2') & (c['next_tag'] == 'T3')),
+            rule('rest', low, '_check_rest_rule', ActivityState.REST,
+                 lambda c: c['tag'].isin(['N1', 'N2']) & (c['duration'] >= 30)),
+            rule('transit_t1', low, '_check_transit_rule', ActivityState.TRANSIT,
+                 lambda c: (c['tag'] == 'T1') & (c['duration'] < short)),
+            rule('very_short_stay', low, '_check_transit_rule', ActivityState.TRANSIT,
+                 lambda c: c['duration'] < 2),
+        ]
+    
+    def apply_rules_batch(self, frame: pd.DataFrame) -> RuleBatchResult:
+        """
+        여러 태그에 규칙을 한 번에 적용 (결정 테이블 행마다 불리언 마스크 한 번씩 계산)
+        
+        Args:
+            frame: BATCH_COLUMNS 컬럼의 DataFrame (행마다 apply_rules의 tag_data와 같은 의미,
+                   previous_tag/next_tag/to_next_minutes는 없으면 결측값)
+        
+        Returns:
+            RuleBatchResult: 행마다 apply_rules와 같은 상태/신뢰도
+        """
+        missing = [column for column in ('tag', 'timestamp') if column not in frame.columns]
+        if missing:
+            raise ValueError(f"규칙 적용에 필요한 컬럼이 없습니다: {missing}")
+        
+        index = pd.RangeIndex(len(frame))
+        
+        def column(name, default=None) -> pd.Series:
+            if name in frame.columns:
+                return pd.Series(frame[name].to_numpy(), index=index)
+            return pd.Series(default, index=index, dtype=object if default is None else None)
+        
+        tags = column('tag')
+        timestamps = pd.to_datetime(column('timestamp'))
+        shift_types = column('shift_type').map(lambda value: value if isinstance(value, ShiftType)
+                                               else ShiftType(value) if value else None)
+        columns = {
+            'tag': tags,
+            'previous_tag': column('previous_tag'),
+            'next_tag': column('next_tag'),
+            'seconds': (timestamps.dt.hour * 3600 + timestamps.dt.minute * 60 + timestamps.dt.second
+                        + timestamps.dt.microsecond / 1e6),
+            'duration': pd.to_numeric(column('duration_minutes', 0), errors='coerce').fillna(0),
+            'has_o_tag': column('has_o_tag', False).fillna(False).astype(bool),
+            'is_entry_gate': column('is_entry_gate').where(column('is_entry_gate').notna(), tags == 'T2').astype(bool),
+            'shift_type': shift_types,
+        }
+        
+        rules = self.compile_rules()
+        rule_index = np.full(len(frame), -1, dtype=np.int16)
+        unassigned = np.ones(len(frame), dtype=bool)
+        for number, compiled in enumerate(rules):
+            hit = compiled.predicate(columns).to_numpy(dtype=bool) & unassigned
+            rule_index[hit] = number
+            unassigned &= ~hit
+            if not unassigned.any():
+                break
+        
+        return RuleBatchResult(self, frame, rules, rule_index)
+    
     def _check_o_tag_rule(self, tag_data: Dict) -> Optional[StateWithConfidence]:
         """O 태그 규칙 - 최우선"""
         if tag_data.get('has_o_tag') or tag_data.get('tag') == 'O':
             return StateWithConfidence(
                 state=ActivityState.WORK_CONFIRMED,
-                confidence=self.config.critical_confidence,
+                confidence=self._rule_confidence('o_tag'),
                 evidence=[
                     Evidence(
                         type=EvidenceType.RULE,
                         description="O 태그 존재로 업무 확정",
-                        weight=1.0,
+                        weight=self._rule_weight('o_tag'),
                         metadata={'rule': 'o_tag', 'priority': 'critical'}
                     )
                 ],
@@ -135,12 +390,12 @@ class DeterministicRuleEngine:
             elif current_tag in ['G1', 'G2', 'G3']:
                 return StateWithConfidence(
                     state=ActivityState.WORK,
-                    confidence=self.config.high_confidence,
+                    confidence=self._rule_confidence('o_to_work_area'),
                     evidence=[
                         Evidence(
                             type=EvidenceType.RULE,
                             description="O 태그 후 업무 공간 이동",
-                            weight=0.95,
+                            weight=self._rule_weight('o_to_work_area'),
                             metadata={'rule': 'o_to_work_area'}
                         )
                     ],
@@ -166,12 +421,12 @@ class DeterministicRuleEngine:
             
             return StateWithConfidence(
                 state=ActivityState.MEAL,
-                confidence=self.config.critical_confidence,
+                confidence=self._rule_confidence('meal_m1'),
                 evidence=[
                     Evidence(
                         type=EvidenceType.RULE,
                         description=f"M1 태그 - {meal_name} (실제 {actual_duration:.0f}분)",
-                        weight=1.0,
+                        weight=self._rule_weight('meal_m1'),
                         metadata={
                             'rule': 'meal_m1',
                             'meal_type': meal_type.value if meal_type else 'unknown',
@@ -187,12 +442,12 @@ class DeterministicRuleEngine:
         elif current_tag == 'M2':
             return StateWithConfidence(
                 state=ActivityState.TRANSIT,  # 테이크아웃은 경유로 분류
-                confidence=self.config.critical_confidence,
+                confidence=self._rule_confidence('meal_m2_takeout'),
                 evidence=[
                     Evidence(
                         type=EvidenceType.RULE,
                         description=f"M2 태그 - 테이크아웃 구매 (고정 {self.config.takeout_fixed_duration_minutes}분)",
-                        weight=1.0,
+                        weight=self._rule_weight('meal_m2_takeout'),
                         metadata={
                             'rule': 'meal_m2_takeout',
                             'duration_minutes': self.config.takeout_fixed_duration_minutes,
@@ -207,12 +462,12 @@ class DeterministicRuleEngine:
         elif tag_data.get('previous_tag') == 'M2' and current_tag == 'N2':
             return StateWithConfidence(
                 state=ActivityState.REST,  # 휴게실에서 식사
-                confidence=self.config.high_confidence,
+                confidence=self._rule_confidence('takeout_to_rest'),
                 evidence=[
                     Evidence(
                         type=EvidenceType.RULE,
                         description="테이크아웃 후 휴게실 식사",
-                        weight=0.9,
+                        weight=self._rule_weight('takeout_to_rest'),
                         metadata={'rule': 'takeout_to_rest'}
                     )
                 ],
@@ -232,31 +487,36 @@ class DeterministicRuleEngine:
         shift_type = tag_data.get('shift_type')
         is_entry_gate = tag_data.get('is_entry_gate', current_tag == 'T2')
         
-        # 출입 분류
-        state_str = self.time_normalizer.classify_entry_exit(
-            timestamp, shift_type, is_entry_gate
-        )
+        # 출입 분류 (출퇴근 시간대가 정의되지 않은 근무 유형(OFFICE 등)은 경유)
+        window_shift = ShiftType(shift_type) if isinstance(shift_type, str) else shift_type
+        if window_shift in self.time_normalizer.shift_times:
+            state_str = self.time_normalizer.classify_entry_exit(
+                timestamp, window_shift, is_entry_gate
+            )
+        else:
+            state_str = "경유"
         
         if state_str == "출입(IN)":
             state = ActivityState.ENTRY
             description = "출근 시간대 입문"
+            rule_name = 'entry'
         elif state_str == "출입(OUT)":
             state = ActivityState.EXIT
             description = "퇴근 시간대 출문"
+            rule_name = 'exit'
         else:
             state = ActivityState.TRANSIT
             description = "출입문 경유"
-        
-        confidence = self.config.high_confidence if state != ActivityState.TRANSIT else self.config.medium_confidence
+            rule_name = 'gate_transit'
         
         return StateWithConfidence(
             state=state,
-            confidence=confidence,
+            confidence=self._rule_confidence(rule_name),
             evidence=[
                 Evidence(
                     type=EvidenceType.RULE,
                     description=f"{current_tag} - {description}",
-                    weight=0.9,
+                    weight=self._rule_weight(rule_name),
                     metadata={
                         'rule': 'entry_exit',
                         'gate_type': current_tag,
@@ -277,12 +537,12 @@ class DeterministicRuleEngine:
             if duration_minutes >= 30:
                 return StateWithConfidence(
                     state=ActivityState.MEETING,
-                    confidence=self.config.high_confidence,
+                    confidence=self._rule_confidence('meeting_g3'),
                     evidence=[
                         Evidence(
                             type=EvidenceType.RULE,
                             description=f"G3 태그 - 회의 공간 ({duration_minutes:.0f}분)",
-                            weight=0.9,
+                            weight=self._rule_weight('meeting_g3'),
                             metadata={'rule': 'meeting_g3', 'duration_minutes': duration_minutes}
                         )
                     ],
@@ -292,12 +552,12 @@ class DeterministicRuleEngine:
             elif duration_minutes < self.config.short_duration_threshold_minutes:
                 return StateWithConfidence(
                     state=ActivityState.TRANSIT,
-                    confidence=self.config.medium_confidence,
+                    confidence=self._rule_confidence('meeting_g3_short'),
                     evidence=[
                         Evidence(
                             type=EvidenceType.RULE,
                             description=f"G3 짧은 체류 ({duration_minutes:.0f}분)",
-                            weight=0.7,
+                            weight=self._rule_weight('meeting_g3_short'),
                             metadata={'rule': 'meeting_g3_short'}
                         )
                     ],
@@ -311,12 +571,12 @@ class DeterministicRuleEngine:
         if is_shift_change and current_tag in ['G1', 'G3']:
             return StateWithConfidence(
                 state=ActivityState.MEETING,
-                confidence=self.config.medium_confidence,
+                confidence=self._rule_confidence('shift_change_meeting'),
                 evidence=[
                     Evidence(
                         type=EvidenceType.RULE,
                         description=f"교대 시간 인수인계 ({direction})",
-                        weight=0.8,
+                        weight=self._rule_weight('shift_change_meeting'),
                         metadata={
                             'rule': 'shift_change_meeting',
                             'direction': direction
@@ -338,12 +598,12 @@ class DeterministicRuleEngine:
             if duration_minutes >= 60:
                 return StateWithConfidence(
                     state=ActivityState.EDUCATION,
-                    confidence=self.config.high_confidence,
+                    confidence=self._rule_confidence('education_g4'),
                     evidence=[
                         Evidence(
                             type=EvidenceType.RULE,
                             description=f"G4 태그 - 교육 공간 ({duration_minutes:.0f}분)",
-                            weight=0.9,
+                            weight=self._rule_weight('education_g4'),
                             metadata={'rule': 'education_g4', 'duration_minutes': duration_minutes}
                         )
                     ],
@@ -363,12 +623,12 @@ class DeterministicRuleEngine:
             if previous_tag == 'T2':
                 return StateWithConfidence(
                     state=ActivityState.PREPARATION,
-                    confidence=self.config.high_confidence,
+                    confidence=self._rule_confidence('entry_preparation'),
                     evidence=[
                         Evidence(
                             type=EvidenceType.RULE,
                             description="출근 후 작업 준비",
-                            weight=0.9,
+                            weight=self._rule_weight('entry_preparation'),
                             metadata={'rule': 'entry_preparation'}
                         )
                     ],
@@ -379,12 +639,12 @@ class DeterministicRuleEngine:
             elif next_tag == 'T3':
                 return StateWithConfidence(
                     state=ActivityState.PREPARATION,
-                    confidence=self.config.high_confidence,
+                    confidence=self._rule_confidence('exit_preparation'),
                     evidence=[
                         Evidence(
                             type=EvidenceType.RULE,
                             description="퇴근 전 정리",
-                            weight=0.9,
+                            weight=self._rule_weight('exit_preparation'),
                             metadata={'rule': 'exit_preparation'}
                         )
                     ],
@@ -403,12 +663,12 @@ class DeterministicRuleEngine:
             if duration_minutes >= 30:
                 return StateWithConfidence(
                     state=ActivityState.REST,
-                    confidence=self.config.medium_confidence,
+                    confidence=self._rule_confidence('rest'),
                     evidence=[
                         Evidence(
                             type=EvidenceType.RULE,
                             description=f"{current_tag} - 휴게 ({duration_minutes:.0f}분)",
-                            weight=0.8,
+                            weight=self._rule_weight('rest'),
                             metadata={'rule': f'rest_{current_tag.lower()}'}
                         )
                     ],
@@ -428,12 +688,12 @@ class DeterministicRuleEngine:
             if duration_minutes < self.config.short_duration_threshold_minutes:
                 return StateWithConfidence(
                     state=ActivityState.TRANSIT,
-                    confidence=self.config.medium_confidence,
+                    confidence=self._rule_confidence('transit_t1'),
                     evidence=[
                         Evidence(
                             type=EvidenceType.RULE,
                             description=f"T1 - 이동 경로 ({duration_minutes:.0f}분)",
-                            weight=0.7,
+                            weight=self._rule_weight('transit_t1'),
                             metadata={'rule': 'transit_t1'}
                         )
                     ],
@@ -444,12 +704,12 @@ class DeterministicRuleEngine:
         if duration_minutes < 2:
             return StateWithConfidence(
                 state=ActivityState.TRANSIT,
-                confidence=self.config.medium_confidence,
+                confidence=self._rule_confidence('very_short_stay'),
                 evidence=[
                     Evidence(
                         type=EvidenceType.RULE,
                         description=f"매우 짧은 체류 ({duration_minutes:.0f}분)",
-                        weight=0.6,
+                        weight=self._rule_weight('very_short_stay'),
                         metadata={'rule': 'very_short_stay'}
                     )
                 ],
@@ -4,11 +4,13 @@
 """
 
 import logging
-from datetime import datetime
 from typing import Optional, Dict, List, Tuple
 from pathlib import Path
 
-from .rule_engine import DeterministicRuleEngine, RuleConfig
+import numpy as np
+import pandas as pd
+
+from .rule_engine import DeterministicRuleEngine, RuleConfig, RuleBatchResult
 from .rule_loader import RuleLoader, load_rule_config
 from .confidence_state import StateWithConfidence, ActivityState
 from ..utils.time_normalizer import TimeNormalizer, ShiftType
@@ -59,94 +61,86 @@ class RuleIntegration:
         if not tags:
             return []
         
-        results = []
+        frame = pd.DataFrame({
+            'tag': [tag_info['tag'] for tag_info in tags],
+            'timestamp': [tag_info['timestamp'] for tag_info in tags],
+            'has_o_tag': [tag_info.get('has_o_tag', tag_info['tag'] == 'O') for tag_info in tags],
+        })
         
-        # 근무 유형 결정
-        shift_type = self._determine_shift_type(tags[0]['timestamp'], employee_info)
+        # 규칙에 매칭되지 않으면 None (확률적 추론이나 기본값 처리는 상위 레벨에서)
+        return self.classify_tag_frame(frame, employee_info=employee_info).to_states()
+    
+    def build_rule_frame(
+        self,
+        tags: pd.DataFrame,
+        group_column: Optional[str] = None,
+        employee_info: Optional[Dict] = None
+    ) -> pd.DataFrame:
+        """
+        태그 DataFrame을 규칙 엔진 배치 입력으로 변환
         
-        for i, tag_info in enumerate(tags):
-            # 태그 데이터 준비
-            tag_data = self._prepare_tag_data(
-                tag_info, 
-                i, 
-                tags, 
-                shift_type
-            )
-            
-            # 확정적 규칙 적용
-            state = self.rule_engine.apply_rules(tag_data)
-            
-            # 규칙에 매칭되지 않으면 None
-            if state is None:
-                # No rule match - removed debug logging
-                # 확률적 추론이나 기본값 처리는 상위 레벨에서
-                results.append(None)
-            else:
-                results.append(state)
+        이전/다음 태그, 체류 시간, 근무 유형을 시퀀스(group_column 값)별로 계산하며,
+        각 시퀀스 안에서는 행 순서를 시간 순서로 간주합니다.
         
-        return results
-    
-    def _prepare_tag_data(
-        self, 
-        tag_info: Dict,
-        index: int,
-        all_tags: List[Dict],
-        shift_type: ShiftType
-    ) -> Dict:
-        """태그 데이터를 규칙 엔진용으로 준비"""
-        tag_data = {
-            'tag': tag_info['tag'],
-            'timestamp': tag_info['timestamp'],
-            'shift_type': shift_type,
-            'has_o_tag': tag_info.get('has_o_tag', tag_info['tag'] == 'O')
-        }
+        Args:
+            tags: tag, timestamp 컬럼 (선택: has_o_tag, shift_type)
+            group_column: 시퀀스 구분 컬럼 (예: 사번-날짜), 없으면 전체가 한 시퀀스
+            employee_info: 직원 정보 (shift_type이 있으면 모든 시퀀스에 적용)
+        """
+        timestamps = pd.to_datetime(tags['timestamp'])
+        groups = tags[group_column] if group_column else pd.Series(0, index=tags.index)
+        first = groups.ne(groups.shift()).to_numpy()
+        last = np.r_[first[1:], True] if len(first) else first
         
-        # 이전/다음 태그
-        if index > 0:
-            tag_data['previous_tag'] = all_tags[index - 1]['tag']
+        frame = pd.DataFrame({'tag': tags['tag'], 'timestamp': timestamps}, index=tags.index)
+        frame['previous_tag'] = tags['tag'].shift().where(~first)
+        frame['next_tag'] = tags['tag'].shift(-1).where(~last)
         
-        if index < len(all_tags) - 1:
-            tag_data['next_tag'] = all_tags[index + 1]['tag']
-            
-            # 다음 태그까지 시간 계산
-            next_time = all_tags[index + 1]['timestamp']
-            duration = self.time_normalizer.calculate_time_difference(
-                tag_info['timestamp'], 
-                next_time
-            )
-            tag_data['to_next_minutes'] = duration.total_seconds() / 60
+        # 체류 시간 (이전 태그부터 현재까지, 음수면 자정을 넘은 것으로 보고 24시간 추가)
+        minutes = timestamps.diff().dt.total_seconds() / 60
+        minutes = minutes.where(minutes >= 0, minutes + 24 * 60)
+        frame['duration_minutes'] = minutes.where(~first, 0.0)
+        frame['to_next_minutes'] = minutes.shift(-1).where(~last)
         
-        # 체류 시간 (이전 태그부터 현재까지)
-        if index > 0:
-            prev_time = all_tags[index - 1]['timestamp']
-            duration = self.time_normalizer.calculate_time_difference(
-                prev_time,
-                tag_info['timestamp']
-            )
-            tag_data['duration_minutes'] = duration.total_seconds() / 60
+        if 'has_o_tag' in tags.columns:
+            frame['has_o_tag'] = tags['has_o_tag'].fillna(tags['tag'] == 'O').astype(bool)
         else:
-            tag_data['duration_minutes'] = 0
-        
-        # 출입문 구분
-        tag_data['is_entry_gate'] = tag_info['tag'] == 'T2'
+            frame['has_o_tag'] = tags['tag'] == 'O'
+        frame['is_entry_gate'] = tags['tag'] == 'T2'
         
-        return tag_data
-    
-    def _determine_shift_type(
-        self, 
-        first_timestamp: datetime,
-        employee_info: Optional[Dict]
-    ) -> ShiftType:
-        """근무 유형 결정"""
+        # 근무 유형: 직원 정보 > shift_type 컬럼 > 시퀀스 첫 태그 시간으로 자동 감지
+        fixed_shift = None
         if employee_info and 'shift_type' in employee_info:
-            shift_str = employee_info['shift_type']
             try:
-                return ShiftType(shift_str)
+                fixed_shift = ShiftType(employee_info['shift_type'])
             except ValueError:
                 pass
         
-        # 첫 태그 시간으로 자동 감지
-        return self.time_normalizer.detect_shift_type(first_timestamp)
+        if fixed_shift is not None:
+            frame['shift_type'] = fixed_shift
+        elif 'shift_type' in tags.columns:
+            frame['shift_type'] = tags['shift_type']
+        else:
+            first_hours = timestamps.dt.hour.where(first).ffill()
+            frame['shift_type'] = np.where((first_hours >= 18) | (first_hours <= 6),
+                                           ShiftType.NIGHT, ShiftType.DAY)
+        
+        return frame
+    
+    def classify_tag_frame(
+        self,
+        tags: pd.DataFrame,
+        group_column: Optional[str] = None,
+        employee_info: Optional[Dict] = None
+    ) -> RuleBatchResult:
+        """
+        여러 직원/일자의 태그를 한 번에 분류 (결정 테이블 배치 적용)
+        
+        Returns:
+            RuleBatchResult: 행별 상태/신뢰도 배열 (증거는 state_at/to_states 호출 시 생성)
+        """
+        frame = self.build_rule_frame(tags, group_column, employee_info)
+        return self.rule_engine.apply_rules_batch(frame)
     
     def get_meal_duration(self, tag: str, to_next_minutes: Optional[float] = None) -> float:
         """식사 시간 계산"""
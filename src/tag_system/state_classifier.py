@@ -3,8 +3,8 @@
 """
 
 import logging
-from typing import Dict, List, Optional, Tuple
-from datetime import datetime, time, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+from datetime import date, datetime, time, timedelta
 import pandas as pd
 import numpy as np
 from enum import Enum
@@ -25,6 +25,14 @@ class ActivityState(Enum):
     EXIT = "출입(OUT)"
     NON_WORK = "비업무"
 
+# 배열 분류에서 사용하는 상태 코드 (코드 = 열거형 정의 순서)
+STATE_CODES: Tuple[ActivityState, ...] = tuple(ActivityState)
+_STATE_INDEX = {state: code for code, state in enumerate(STATE_CODES)}
+
+# 하루 시간 슬롯: 분마다 정각(:00.000)과 분 내부(그 외) 두 칸
+# 시간대 경계가 모두 분 단위이므로 같은 칸 안에서는 시간 조정 결과가 같음
+TIME_SLOTS = 24 * 60 * 2
+
 class TagStateClassifier:
     """태그 기반 상태 분류 엔진"""
     
@@ -46,6 +54,12 @@ class TagStateClassifier:
         # 전환 규칙 정의
         self.transition_rules = self._initialize_transition_rules()
         
+        # 태그별 기본 상태 매핑
+        self.tag_state_map = self._initialize_tag_state_map()
+        
+        # 배열 분류용 조회 테이블 (첫 배열 분류 시 생성)
+        self._lookup_tables: Optional[Dict[str, object]] = None
+    
     def _initialize_transition_rules(self) -> Dict[Tuple[str, str], Dict]:
         """전환 규칙 초기화"""
         rules = {}
@@ -91,6 +105,23 @@ class TagStateClassifier:
         
         return rules
     
+    def _initialize_tag_state_map(self) -> Dict[str, Tuple[ActivityState, float]]:
+        """태그별 기본 상태와 확률"""
+        return {
+            'G1': (ActivityState.WORK, 0.7),
+            'G2': (ActivityState.PREPARATION, 0.8),
+            'G3': (ActivityState.MEETING, 0.85),
+            'G4': (ActivityState.EDUCATION, 0.85),
+            'N1': (ActivityState.REST, 0.8),
+            'N2': (ActivityState.REST, 0.7),
+            'T1': (ActivityState.TRANSIT, 0.8),
+            'T2': (ActivityState.ENTRY, 0.9),
+            'T3': (ActivityState.EXIT, 0.9),
+            'M1': (ActivityState.MEAL, 1.0),
+            'M2': (ActivityState.TRANSIT, 0.9),
+            'O': (ActivityState.WORK_CONFIRMED, 0.98)
+        }
+    
     def classify_state(self, current_tag: str, previous_tag: Optional[str] = None,
                       timestamp: Optional[datetime] = None, 
                       duration_minutes: Optional[float] = None,
@@ -124,24 +155,8 @@ class TagStateClassifier:
     def _classify_single_tag(self, tag: str, timestamp: Optional[datetime] = None,
                            duration_minutes: Optional[float] = None) -> Tuple[str, float]:
         """단일 태그 기반 상태 분류"""
-        # 태그별 기본 상태 매핑
-        tag_state_map = {
-            'G1': (ActivityState.WORK, 0.7),
-            'G2': (ActivityState.PREPARATION, 0.8),
-            'G3': (ActivityState.MEETING, 0.85),
-            'G4': (ActivityState.EDUCATION, 0.85),
-            'N1': (ActivityState.REST, 0.8),
-            'N2': (ActivityState.REST, 0.7),
-            'T1': (ActivityState.TRANSIT, 0.8),
-            'T2': (ActivityState.ENTRY, 0.9),
-            'T3': (ActivityState.EXIT, 0.9),
-            'M1': (ActivityState.MEAL, 1.0),
-            'M2': (ActivityState.TRANSIT, 0.9),
-            'O': (ActivityState.WORK_CONFIRMED, 0.98)
-        }
-        
-        if tag in tag_state_map:
-            state, base_prob = tag_state_map[tag]
+        if tag in self.tag_state_map:
+            state, base_prob = self.tag_state_map[tag]
             
             # 시간 기반 조정
             if timestamp and state == ActivityState.WORK:
@@ -257,49 +272,235 @@ class TagStateClassifier:
         return False
     
     def classify_sequence(self, tag_sequence: List[Dict]) -> List[Dict]:
-        """태그 시퀀스를 상태 시퀀스로 분류"""
-        classified_sequence = []
+        """태그 시퀀스를 상태 시퀀스로 분류 (classify_frame 결과를 딕셔너리 리스트로 변환)"""
+        if not tag_sequence:
+            return []
         
-        for i, tag_data in enumerate(tag_sequence):
-            # 이전 태그 정보
-            previous_tag = None
-            if i > 0:
-                previous_tag = tag_sequence[i-1].get('tag_code')
-            
-            # 현재 태그 정보
-            current_tag = tag_data.get('tag_code')
-            timestamp = tag_data.get('timestamp')
-            has_o_tag = tag_data.get('has_o_tag', False)
-            
-            # 지속 시간 계산
-            duration_minutes = None
-            if i > 0 and timestamp and tag_sequence[i-1].get('timestamp'):
-                duration = timestamp - tag_sequence[i-1]['timestamp']
-                duration_minutes = duration.total_seconds() / 60
-            
-            # 상태 분류
-            state, confidence = self.classify_state(
-                current_tag, previous_tag, timestamp, 
-                duration_minutes, has_o_tag
-            )
-            
-            # 결과 저장
+        timestamps = [tag_data.get('timestamp') for tag_data in tag_sequence]
+        has_o_tags = [tag_data.get('has_o_tag', False) for tag_data in tag_sequence]
+        frame = pd.DataFrame({
+            'tag_code': [tag_data.get('tag_code') for tag_data in tag_sequence],
+            'timestamp': pd.to_datetime(pd.Series(timestamps, dtype=object)),
+            'has_o_tag': [bool(value) for value in has_o_tags],
+        })
+        classified = self.classify_frame(frame)
+        
+        durations = classified['duration_minutes'].to_numpy()
+        anomalies = classified['anomaly'].to_numpy()
+        anomaly_confidences = classified['anomaly_confidence'].to_numpy()
+        classified_sequence = []
+        for i, (state, confidence) in enumerate(zip(classified['state'].tolist(),
+                                                    classified['confidence'].tolist())):
             result = {
-                'timestamp': timestamp,
-                'tag_code': current_tag,
+                'timestamp': timestamps[i],
+                'tag_code': tag_sequence[i].get('tag_code'),
                 'state': state,
                 'confidence': confidence,
-                'duration_minutes': duration_minutes,
-                'has_o_tag': has_o_tag
+                'duration_minutes': None if np.isnan(durations[i]) else float(durations[i]),
+                'has_o_tag': has_o_tags[i]
             }
-            
+            if anomalies[i] is not None:
+                result['anomaly'] = anomalies[i]
+                result['anomaly_confidence'] = float(anomaly_confidences[i])
             classified_sequence.append(result)
         
-        # 후처리: 이상 패턴 감지
-        self._detect_anomalies(classified_sequence)
-        
         return classified_sequence
     
+    def _build_lookup_tables(self) -> Dict[str, object]:
+        """
+        배열 분류용 조회 테이블 생성
+        
+        - 태그 코드: 전환 규칙과 기본 매핑의 태그 (마지막 코드는 없음/알 수 없는 태그)
+        - 전환 테이블: (이전 태그 × 현재 태그) 상태 코드(-1: 규칙 없음)와 확률
+        - 시간 조정 테이블: 시간 슬롯별 배율과 상한 (스칼라 조정 함수를 슬롯마다 호출해 생성)
+        """
+        tags = sorted({tag for pair in self.transition_rules for tag in pair} | set(self.tag_state_map))
+        tag_index = {tag: code for code, tag in enumerate(tags)}
+        size = len(tags) + 1
+        
+        transition_states = np.full((size, size), -1, dtype=np.int8)
+        transition_probabilities = np.full((size, size), np.nan)
+        for (previous_tag, current_tag), rule in self.transition_rules.items():
+            code = tag_index[previous_tag], tag_index[current_tag]
+            transition_states[code] = _STATE_INDEX[rule['state']]
+            transition_probabilities[code] = rule['probability']
+        
+        single_states = np.full(size, _STATE_INDEX[ActivityState.TRANSIT], dtype=np.int8)
+        single_probabilities = np.full(size, 0.5)
+        for tag, (state, probability) in self.tag_state_map.items():
+            single_states[tag_index[tag]] = _STATE_INDEX[state]
+            single_probabilities[tag_index[tag]] = probability
+        
+        # 상태별 시간대 조정 (_adjust_probability_by_time)
+        time_factors = np.ones((len(STATE_CODES), TIME_SLOTS))
+        time_caps = np.ones((len(STATE_CODES), TIME_SLOTS))
+        for code, state in enumerate(STATE_CODES):
+            time_factors[code], time_caps[code] = self._probe_time_adjustment(
+                lambda timestamp, p, state=state: self._adjust_probability_by_time(state.value, timestamp, p))
+        work_factors, work_caps = self._probe_time_adjustment(self._adjust_work_probability)
+        
+        return {
+            'tag_index': tag_index,
+            'unknown_tag': len(tags),
+            'transition_states': transition_states,
+            'transition_probabilities': transition_probabilities,
+            'single_states': single_states,
+            'single_probabilities': single_probabilities,
+            'time_factors': time_factors,
+            'time_caps': time_caps,
+            'work_factors': work_factors,
+            'work_caps': work_caps,
+        }
+    
+    @staticmethod
+    def _probe_time_adjustment(adjust: Callable[[datetime, float], float]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        시간 조정 함수를 슬롯별 배율/상한으로 변환
+        
+        조정 함수는 확률에 배율을 곱하고 배율이 1보다 크면 상한으로 자르는 형태이므로,
+        0.5(배율을 정확히 복원)와 1.0(상한)으로 한 번씩 호출해 두 값을 얻습니다.
+        """
+        factors = np.ones(TIME_SLOTS)
+        caps = np.ones(TIME_SLOTS)
+        base = date(2000, 1, 1)
+        for slot in range(TIME_SLOTS):
+            minute, inside = divmod(slot, 2)
+            timestamp = datetime.combine(base, time(minute // 60, minute % 60, 30 if inside else 0))
+            factors[slot] = adjust(timestamp, 0.5) / 0.5
+            caps[slot] = adjust(timestamp, 1.0)
+        return factors, caps
+    
+    @staticmethod
+    def _apply_time_adjustment(probabilities: np.ndarray, factors: np.ndarray, caps: np.ndarray) -> np.ndarray:
+        adjusted = probabilities * factors
+        return np.where(factors > 1, np.minimum(adjusted, caps), adjusted)
+    
+    def _adjust_probability_by_duration_array(self, states: np.ndarray, durations: np.ndarray,
+                                              probabilities: np.ndarray) -> np.ndarray:
+        """_adjust_probability_by_duration의 배열 버전 (지속 시간이 0/결측이면 조정하지 않음)"""
+        d = durations
+        with np.errstate(invalid='ignore'):
+            transit = states == _STATE_INDEX[ActivityState.TRANSIT]
+            rest = states == _STATE_INDEX[ActivityState.REST]
+            meal = states == _STATE_INDEX[ActivityState.MEAL]
+            work = states == _STATE_INDEX[ActivityState.WORK]
+            p = probabilities
+            conditions = [
+                transit & (d < 5), transit & (d > 30),
+                rest & (d >= 10) & (d <= 30), rest & (d > 120),
+                meal & (d >= 20) & (d <= 60), meal & ((d < 10) | (d > 90)),
+                work & (d >= 30) & (d <= 180), work & (d > 180), work & (d < 10),
+            ]
+            choices = [
+                np.minimum(p * 1.2, 1.0), p * 0.5,
+                np.minimum(p * 1.1, 1.0), p * 0.8,
+                np.minimum(p * 1.1, 1.0), p * 0.7,
+                np.minimum(p * 1.2, 0.85), np.minimum(p * 1.1, 0.75), p * 0.8,
+            ]
+            adjusted = np.select(conditions, choices, default=p)
+        return np.where((d != 0) & ~np.isnan(d), adjusted, p)
+    
+    def classify_frame(self, tags: pd.DataFrame, group_column: Optional[str] = None) -> pd.DataFrame:
+        """
+        태그 DataFrame을 배열 연산으로 상태 분류 (classify_sequence와 같은 결과)
+        
+        Args:
+            tags: tag_code, timestamp 컬럼 (선택: has_o_tag), 시퀀스 안에서는 행 순서가 시간 순서
+            group_column: 시퀀스 구분 컬럼 (예: 사번), 없으면 전체가 한 시퀀스
+        
+        Returns:
+            pd.DataFrame: timestamp, tag_code, state, confidence, duration_minutes, has_o_tag,
+                anomaly(없으면 None), anomaly_confidence 컬럼 (입력 인덱스 유지)
+        """
+        if self._lookup_tables is None:
+            self._lookup_tables = self._build_lookup_tables()
+        tables = self._lookup_tables
+        
+        size = len(tags)
+        tag_values = tags['tag_code']
+        timestamps = pd.to_datetime(tags['timestamp'])
+        has_o_tag = (tags['has_o_tag'].fillna(False).astype(bool).to_numpy() if 'has_o_tag' in tags.columns
+                     else np.zeros(size, dtype=bool))
+        groups = tags[group_column] if group_column else pd.Series(0, index=tags.index)
+        first = groups.ne(groups.shift()).to_numpy()
+        
+        tag_codes = tag_values.map(tables['tag_index']).fillna(tables['unknown_tag']).to_numpy(dtype=np.int64)
+        previous_codes = np.r_[tables['unknown_tag'], tag_codes[:-1]] if size else tag_codes
+        previous_codes = np.where(first, tables['unknown_tag'], previous_codes)
+        
+        # 지속 시간 (이전 태그부터, 시각이 없거나 시퀀스 첫 태그면 결측)
+        durations = (timestamps.diff().dt.total_seconds() / 60).to_numpy(dtype=float)
+        durations = np.where(first, np.nan, durations)
+        
+        # 시간 슬롯 (시각이 없으면 시간 조정 생략)
+        has_time = timestamps.notna().to_numpy()
+        seconds = (timestamps.dt.second + timestamps.dt.microsecond + timestamps.dt.nanosecond).fillna(0)
+        minutes = (timestamps.dt.hour * 60 + timestamps.dt.minute).fillna(0)
+        slots = (minutes * 2 + (seconds > 0)).to_numpy(dtype=np.int64)
+        
+        # 1) 전환 규칙 + 시간대 조정
+        transition_states = tables['transition_states'][previous_codes, tag_codes]
+        transition_probabilities = tables['transition_probabilities'][previous_codes, tag_codes]
+        state_codes = np.maximum(transition_states, 0)
+        timed = self._apply_time_adjustment(transition_probabilities,
+                                            tables['time_factors'][state_codes, slots],
+                                            tables['time_caps'][state_codes, slots])
+        transition_probabilities = np.where(has_time, timed, transition_probabilities)
+        
+        # 2) 단일 태그 기본값 + 업무 시간대 조정 + 지속 시간 조정
+        single_states = tables['single_states'][tag_codes]
+        single_probabilities = tables['single_probabilities'][tag_codes]
+        is_work = has_time & (single_states == _STATE_INDEX[ActivityState.WORK])
+        work_adjusted = self._apply_time_adjustment(single_probabilities, tables['work_factors'][slots],
+                                                    tables['work_caps'][slots])
+        single_probabilities = np.where(is_work, work_adjusted, single_probabilities)
+        known = tag_codes != tables['unknown_tag']
+        single_probabilities = np.where(
+            known, self._adjust_probability_by_duration_array(single_states, durations, single_probabilities),
+            single_probabilities)
+        
+        # O 태그 > 전환 규칙 > 단일 태그
+        confirmed = has_o_tag | (tag_values == 'O').to_numpy()
+        has_rule = transition_states >= 0
+        states = np.select([confirmed, has_rule], [_STATE_INDEX[ActivityState.WORK_CONFIRMED], transition_states],
+                           default=single_states)
+        confidence = np.select([confirmed, has_rule], [0.98, transition_probabilities],
+                               default=single_probabilities)
+        
+        anomaly, anomaly_confidence = self._detect_anomalies_array(tag_codes, previous_codes, first, states,
+                                                                   durations, has_o_tag, tables)
+        
+        state_values = np.array([state.value for state in STATE_CODES], dtype=object)
+        return pd.DataFrame({
+            'timestamp': timestamps,
+            'tag_code': tag_values,
+            'state': pd.Series(state_values[states], index=tags.index, dtype=object),
+            'confidence': confidence,
+            'duration_minutes': durations,
+            'has_o_tag': has_o_tag,
+            'anomaly': pd.Series(anomaly, index=tags.index, dtype=object),
+            'anomaly_confidence': anomaly_confidence,
+        }, index=tags.index)
+    
+    def _detect_anomalies_array(self, tag_codes: np.ndarray, previous_codes: np.ndarray, first: np.ndarray,
+                                states: np.ndarray, durations: np.ndarray, has_o_tag: np.ndarray,
+                                tables: Dict[str, object]) -> Tuple[np.ndarray, np.ndarray]:
+        """_detect_anomalies의 배열 버전 (뒤 조건이 앞 조건을 덮어씀)"""
+        tag_index = tables['tag_index']
+        gate_codes = [tag_index[tag] for tag in ('T1', 'T2') if tag in tag_index]
+        with np.errstate(invalid='ignore'):
+            tailgating = (~first & np.isin(tag_codes, gate_codes) & (previous_codes == tag_codes)
+                          & (durations > 30))
+            long_rest = (durations > 120) & (states == _STATE_INDEX[ActivityState.REST])
+            unconfirmed_work = ((durations > 180) & (states == _STATE_INDEX[ActivityState.WORK])
+                                & ~has_o_tag)
+        
+        conditions = [unconfirmed_work, long_rest, tailgating]
+        anomaly = np.select(conditions, ['unconfirmed_work', 'long_rest', 'tailgating'], default='')
+        anomaly = np.where(anomaly == '', None, anomaly.astype(object))
+        anomaly_confidence = np.select(conditions, [0.6, 0.7, 0.8], default=np.nan)
+        return anomaly, anomaly_confidence
+    
     def _detect_anomalies(self, sequence: List[Dict]):
         """이상 패턴 감지 및 표시"""
         for i in range(len(sequence)):
@@ -9,14 +9,26 @@ import logging
 import time
 import os
 import json
+import shutil
+import tempfile
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 from ...database import DatabaseManager, get_pickle_manager
 from ...data_processing import DataTransformer, ExcelLoader
+from ...data_processing.excel_loader import LARGE_FILE_MB, PYARROW_AVAILABLE
+from ...data_processing.data_transformer import TRANSFORMER_VERSION
+from ...data_processing.ingestion_scheduler import (
+    IngestionScheduler, DependencyError, try_parse_excel_sheet, stream_excel_files, merge_and_process
+)
 from ...data.equipment_processors import process_eam_data, process_lams_data, process_mes_data
 from ...data.knox_processors import process_knox_approval_data, process_knox_pims_data, process_knox_mail_data
-from ...data.integrated_data_processor import IntegratedDataProcessor
+from ...data.integrated_data_processor import IntegratedDataProcessor, INTEGRATION_VERSION
+
+# 통합 처리 대상 원천 데이터
+KNOX_TABLES = ('knox_approval_data', 'knox_pims_data', 'knox_mail_data')
+EQUIPMENT_TABLES = ('eam_data', 'lams_data', 'mes_data')
+
 
 class DataUploadComponent:
     """데이터 업로드 컴포넌트"""
@@ -440,45 +452,58 @@ class DataUploadComponent:
                 st.success(f"'{new_type_name}' 데이터 유형이 추가되었습니다.")
     
     def _load_all_data(self):
-        """모든 데이터 로드"""
+        """모든 데이터 로드 (파일/시트별 파싱과 유형별 병합을 병렬 DAG로 실행)"""
         progress_bar = st.progress(0)
         status_text = st.empty()
         detail_text = st.empty()  # 상세 진행상황 표시용
         
-        total_types = len(self.data_types)
+        scheduler = IngestionScheduler()
+        work_dir = tempfile.mkdtemp(prefix='sambio_upload_')
+        final_tasks = {}  # 데이터 유형 → 마지막 작업 이름
         
-        for idx, (data_type, info) in enumerate(self.data_types.items()):
-            config = st.session_state.upload_config[data_type]
-            
-            # 진행률 업데이트
-            progress = (idx) / total_types
-            progress_bar.progress(progress)
-            status_text.text(f"처리 중: {info['display_name']} ({idx + 1}/{total_types})")
+        try:
+            for data_type, info in self.data_types.items():
+                config = st.session_state.upload_config[data_type]
+                
+                # 파일이 변경되었는지 확인
+                pickle_files = self.pickle_manager.list_pickle_files(info['table_name'])
+                
+                if len(config['files']) > 0:
+                    # 엑셀 파일에서 로드 (파싱 → 병합/전처리 → 저장)
+                    final_tasks[data_type] = self._add_excel_load_tasks(scheduler, data_type, info, config, work_dir)
+                elif len(pickle_files) > 0:
+                    # Pickle 파일에서 로드
+                    detail_text.text(f"{info['display_name']} 캐시에서 로딩 중...")
+                    self._load_from_pickle(data_type, info)
             
-            # 파일이 변경되었는지 확인
-            pickle_files = self.pickle_manager.list_pickle_files(info['table_name'])
-            needs_reload = (
-                len(config['files']) > 0 or  # 새 파일이 추가됨
-                (len(pickle_files) == 0 and len(config['files']) == 0)  # pickle도 없고 파일도 없음
-            )
+            # Knox/Equipment 통합은 이번에 적재하는 원천 데이터가 모두 저장된 뒤 실행
+            for task_name, table_names, integrate in (
+                    ('integrate:knox', KNOX_TABLES, self._integrate_knox_data),
+                    ('integrate:equipment', EQUIPMENT_TABLES, self._integrate_equipment_data)):
+                depends_on = [final_tasks[data_type] for data_type, info in self.data_types.items()
+                              if info['table_name'] in table_names and data_type in final_tasks]
+                scheduler.add_task(task_name, integrate, depends_on=depends_on, in_process=True)
             
-            if needs_reload and len(config['files']) > 0:
-                # 엑셀 파일에서 로드
-                detail_text.text(f"{info['display_name']} 파일 로딩 중...")
-                self._load_from_excel(data_type, info, config, detail_text)
-            elif len(pickle_files) > 0 and len(config['files']) == 0:
-                # Pickle 파일에서 로드
-                detail_text.text(f"{info['display_name']} 캐시에서 로딩 중...")
-                self._load_from_pickle(data_type, info)
+            def report_progress(done: int, total: int, task_name: str):
+                progress_bar.progress(done / total)
+                status_text.text(f"처리 중: {done}/{total} 작업 완료")
+                detail_text.text(f"{task_name} 완료")
             
-            time.sleep(0.1)  # UI 업데이트를 위한 짧은 대기
+            outcome = scheduler.run(progress_callback=report_progress)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
         
         progress_bar.empty()
         status_text.empty()
         detail_text.empty()
         
-        # Knox 및 Equipment 데이터 통합 처리
-        self._integrate_knox_and_equipment_data()
+        # 실패한 데이터 유형 표시 (선행 작업 실패로 건너뛴 작업 제외)
+        for task_name, error in outcome.errors.items():
+            if isinstance(error, DependencyError):
+                continue
+            data_type = task_name.split(':')[1]
+            display_name = self.data_types[data_type]['display_name'] if data_type in self.data_types else data_type
+            st.error(f"{display_name} 로드 실패: {error}")
         
         # 설정 저장 - 세션 상태가 이미 업데이트되어 있으므로 바로 저장
         self._save_upload_config()
@@ -490,162 +515,230 @@ class DataUploadComponent:
         # 버튼 클릭 후에만 rerun
         time.sleep(2)  # 성공 메시지를 보여주기 위한 대기
     
-    def _integrate_knox_and_equipment_data(self):
-        """Knox 및 Equipment 데이터를 daily_logs와 통합"""
-        try:
-            # Knox 데이터 로드
-            knox_approval_df = self.pickle_manager.load_dataframe('knox_approval_data')
-            knox_pims_df = self.pickle_manager.load_dataframe('knox_pims_data')
-            knox_mail_df = self.pickle_manager.load_dataframe('knox_mail_data')
-            
-            # Equipment 데이터 로드
-            eam_df = self.pickle_manager.load_dataframe('eam_data')
-            lams_df = self.pickle_manager.load_dataframe('lams_data')
-            mes_df = self.pickle_manager.load_dataframe('mes_data')
-            
-            # Knox 데이터 통합
-            if any(df is not None for df in [knox_approval_df, knox_pims_df, knox_mail_df]):
-                self.logger.info("Knox 데이터 통합 처리 시작")
-                self.integrated_processor.process_and_integrate_knox_data(
-                    approval_df=knox_approval_df,
-                    pims_df=knox_pims_df,
-                    mail_df=knox_mail_df
-                )
-                self.logger.info("Knox 데이터 통합 완료")
-            
-            # Equipment 데이터 통합
-            if any(df is not None for df in [eam_df, lams_df, mes_df]):
-                self.logger.info("Equipment 데이터 통합 처리 시작")
-                self.integrated_processor.process_and_integrate_equipment_data(
-                    eam_df=eam_df,
-                    lams_df=lams_df,
-                    mes_df=mes_df
-                )
-                self.logger.info("Equipment 데이터 통합 완료")
-                
-        except Exception as e:
-            self.logger.error(f"데이터 통합 중 오류 발생: {e}")
-            st.warning(f"일부 데이터 통합에 실패했습니다: {str(e)}")
+    def _add_excel_load_tasks(self, scheduler: IngestionScheduler, data_type: str, info: Dict,
+                              config: Dict, work_dir: str) -> str:
+        """
+        엑셀 파일 적재 작업 추가
+        
+        - 파일/시트마다 파싱 작업 (프로세스 풀)
+        - 유형별 병합/전처리 작업 (프로세스 풀)
+        - 저장 작업 (메인 프로세스: Pickle/DB 저장, 설정 갱신)
+        
+        대용량 업로드를 전처리/DB 저장 없이 적재하면 모든 파일을 하나의 Parquet 파일로
+        스트리밍하고 DataFrame 없이 저장소에 등록합니다.
+        
+        업로드 파일 내용과 전처리 버전이 지난 적재와 같으면 파싱/전처리 없이 저장된 데이터를
+        그대로 사용합니다.
+        
+        Returns:
+            str: 마지막(저장) 작업 이름
+        """
+        process_data = bool(info['process_func']) and st.session_state.get('process_data', False)
+        save_to_db = bool(self.db_manager) and st.session_state.get('save_to_db', False)
+        process_func_name = info['process_func'].__name__ if process_data else None
+        file_names = [file_info['name'] for file_info in config['files']]
+        
+        upload_key = self.pickle_manager.artifact_key(
+            {f"file_{idx:04d}": file_info['file'].getbuffer() for idx, file_info in enumerate(config['files'])},
+            version=f"{TRANSFORMER_VERSION}:{process_func_name or 'raw'}")
+        cached_info = self.pickle_manager.find_artifact(info['table_name'], upload_key)
+        if cached_info is not None:
+            return scheduler.add_task(f"save:{data_type}", self._reuse_stored_data,
+                                      data_type, info, config, file_names, cached_info,
+                                      in_process=True)
+        
+        # UploadedFile 객체는 직접 경로로 접근 불가하므로 작업 디렉토리에 저장
+        file_paths = []
+        for idx, file_info in enumerate(config['files']):
+            file_path = os.path.join(work_dir, f"{info['table_name']}_{idx}.xlsx")
+            with open(file_path, 'wb') as f:
+                f.write(file_info['file'].getbuffer())
+            file_paths.append(file_path)
+        
+        total_size_mb = sum(os.path.getsize(path) for path in file_paths) / (1024 * 1024)
+        chunk_size = self.excel_loader.chunk_size
+        
+        if info['process_func'] and not process_data:
+            self.logger.info(f"{data_type} 로딩만 수행 (전처리 건너뜀)")
+        
+        if total_size_mb > LARGE_FILE_MB and PYARROW_AVAILABLE and not (process_data or save_to_db):
+            # 대용량 업로드: 하나의 Parquet 파일로 스트리밍 후 그대로 등록 (메모리 = 청크 크기)
+            spill_path = os.path.join(work_dir, f"{info['table_name']}.parquet")
+            stream_task = scheduler.add_task(f"stream:{data_type}", stream_excel_files,
+                                             file_paths, spill_path, chunk_size)
+            return scheduler.add_task(f"save:{data_type}", self._register_streamed_data,
+                                      data_type, info, config, file_names, spill_path, upload_key,
+                                      depends_on=[stream_task], in_process=True, pass_inputs=True)
+        
+        parse_tasks = []
+        file_sheet_counts = []
+        for idx, file_path in enumerate(file_paths):
+            file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
+            sheets = ExcelLoader._select_sheets(self.excel_loader.get_sheet_names(file_path))
+            file_sheet_counts.append(len(sheets))
+            
+            for sheet in sheets:
+                # 대용량 시트는 Parquet로 스트리밍해 프로세스 간에 경로만 전달
+                spill_path = None
+                if file_size_mb > LARGE_FILE_MB and PYARROW_AVAILABLE:
+                    spill_path = os.path.join(work_dir, f"{info['table_name']}_{idx}_{len(parse_tasks)}.parquet")
+                parse_tasks.append(scheduler.add_task(
+                    f"parse:{data_type}:{idx}:{sheet}", try_parse_excel_sheet,
+                    file_path, sheet, spill_path, chunk_size))
+        
+        merge_task = scheduler.add_task(
+            f"merge:{data_type}", merge_and_process, file_sheet_counts, process_func_name,
+            depends_on=parse_tasks, pass_inputs=True)
+        
+        return scheduler.add_task(f"save:{data_type}", self._save_merged_data,
+                                  data_type, info, config, file_names, upload_key,
+                                  depends_on=[merge_task], in_process=True, pass_inputs=True)
+    
+    def _save_merged_data(self, inputs: List[pd.DataFrame], data_type: str, info: Dict,
+                          config: Dict, file_names: List[str], upload_key: str) -> int:
+        """병합/전처리된 데이터를 Pickle(및 DB)에 저장하고 설정 갱신 (메인 프로세스)"""
+        processed_df = inputs[0]
+        
+        version = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.pickle_manager.save_dataframe(
+            processed_df,
+            name=info['table_name'],
+            version=version,
+            description=f"Combined from {len(file_names)} files",
+            artifact_key=upload_key
+        )
+        
+        self._save_loaded_data_to_db(info, processed_df)
+        self._update_loaded_config(data_type, info, config, file_names, len(processed_df))
+        return len(processed_df)
+    
+    def _register_streamed_data(self, inputs: List[Dict], data_type: str, info: Dict, config: Dict,
+                                file_names: List[str], spill_path: str, upload_key: str) -> int:
+        """스트리밍으로 기록한 Parquet 파일을 저장소에 등록하고 설정 갱신 (메인 프로세스)"""
+        stream_info = inputs[0]
+        
+        version = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.pickle_manager.save_parquet_file(spill_path, name=info['table_name'], version=version,
+                                              description=f"Combined from {len(file_names)} files",
+                                              artifact_key=upload_key)
+        
+        self._update_loaded_config(data_type, info, config, file_names, stream_info['rows'])
+        return stream_info['rows']
+    
+    def _reuse_stored_data(self, data_type: str, info: Dict, config: Dict,
+                           file_names: List[str], cached_info: Dict) -> int:
+        """지난 적재와 같은 업로드는 저장된 데이터를 그대로 사용하고 설정만 갱신 (메인 프로세스)"""
+        self.logger.info(f"{data_type} 업로드 내용이 바뀌지 않아 파싱/전처리를 건너뜁니다")
+        
+        if self.db_manager and st.session_state.get('save_to_db', False):
+            self._save_loaded_data_to_db(info, self.pickle_manager.load_dataframe(info['table_name']))
+        
+        self._update_loaded_config(data_type, info, config, file_names, cached_info['rows'])
+        return cached_info['rows']
+    
+    def _integrate_knox_data(self):
+        """Knox 데이터를 daily_logs와 통합 (원천 데이터가 바뀌었거나 DB에 없는 경우에만)"""
+        self._integrate_source_data(
+            'knox_integrated_logs', KNOX_TABLES, KNOX_TABLES,
+            self.integrated_processor.build_knox_logs,
+            self.integrated_processor.save_knox_data,
+            display_name='Knox'
+        )
+    
+    def _integrate_equipment_data(self):
+        """Equipment 데이터를 daily_logs와 통합 (원천 데이터가 바뀌었거나 DB에 없는 경우에만)"""
+        self._integrate_source_data(
+            'equipment_integrated_logs', EQUIPMENT_TABLES, ('equipment_data',),
+            self.integrated_processor.build_equipment_logs,
+            self.integrated_processor.save_equipment_data,
+            display_name='Equipment'
+        )
     
-    def _load_from_excel(self, data_type: str, info: Dict, config: Dict, detail_text=None):
-        """엑셀 파일에서 데이터 로드"""
-        temp_files_to_delete = []  # 나중에 삭제할 임시 파일 목록
+    def _integrate_source_data(self, artifact_name: str, table_names: Tuple[str, ...], db_tables: Tuple[str, ...],
+                               build_logs: Callable, save_data: Callable, display_name: str):
+        """
+        원천 데이터를 통합 로그로 변환하고 데이터베이스에 반영
         
+        캐시는 로그 변환(순수 DataFrame 변환)에만 사용하고, DB 쓰기는 캐시 밖에서 합니다.
+        입력이 그대로이고 대상 DB에 이미 반영되어 있을 때만 DB 쓰기를 건너뛰므로
+        새로 만들었거나 초기화한 DB에는 다시 채워집니다.
+        """
         try:
-            all_dfs = []
+            sources = [self._load_optional_dataframe(name) for name in table_names]
+            if all(df is None for df in sources):
+                return
             
-            # 파일 이름 목록 수집
-            file_names = []
+            inputs = {name: name for name in table_names}
+            key = self.pickle_manager.artifact_key(inputs, INTEGRATION_VERSION)
+            unchanged = self.pickle_manager.find_artifact(artifact_name, key) is not None
             
-            # 모든 파일 읽기
-            for idx, file_info in enumerate(config['files']):
-                self.logger.info(f"[{idx+1}/{len(config['files'])}] {file_info['name']} 로딩 시작...")
-                
-                # 파일을 임시로 저장 (UploadedFile 객체는 직접 경로로 접근 불가)
-                import tempfile
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
-                    tmp_file.write(file_info['file'].getbuffer())
-                    tmp_path = tmp_file.name
-                
-                try:
-                    # ExcelLoader 사용하여 로드 (여러 시트 자동 병합)
-                    if detail_text:
-                        detail_text.text(f"{file_info['name']} 파일 분석 중...")
-                    df = self.excel_loader.load_excel_file(tmp_path, auto_merge_sheets=True)
-                    all_dfs.append(df)
-                    file_names.append(file_info['name'])
-                    self.logger.info(f"{file_info['name']} 로드 완료: {len(df):,}행")
-                    if detail_text:
-                        detail_text.text(f"{file_info['name']} 로드 완료: {len(df):,}행")
-                    
-                    # 삭제 대상으로 추가
-                    temp_files_to_delete.append(tmp_path)
-                    
-                except Exception as e:
-                    # 오류 발생 시 임시 파일 삭제 시도
-                    import os
-                    try:
-                        if os.path.exists(tmp_path):
-                            os.unlink(tmp_path)
-                    except:
-                        pass  # 삭제 실패해도 무시
-                    raise e
-            
-            # 데이터프레임 병합
-            if all_dfs:
-                combined_df = pd.concat(all_dfs, ignore_index=True)
-                
-                # 데이터 변환 (옵션이 켜져있을 때만)
-                if info['process_func'] and st.session_state.get('process_data', False):
-                    self.logger.info(f"{data_type} 전처리 시작...")
-                    processed_df = info['process_func'](combined_df)
-                else:
-                    processed_df = combined_df
-                    if info['process_func']:
-                        self.logger.info(f"{data_type} 로딩만 수행 (전처리 건너뜀)")
-                
-                # Pickle로 저장
-                version = datetime.now().strftime('%Y%m%d_%H%M%S')
-                self.pickle_manager.save_dataframe(
-                    processed_df,
-                    name=info['table_name'],
-                    version=version,
-                    description=f"Combined from {len(config['files'])} files"
-                )
-                
-                # 데이터베이스에 저장 (옵션이 켜져있을 때만)
-                if self.db_manager and st.session_state.get('save_to_db', False):
-                    try:
-                        # 기존 데이터 삭제
-                        table_class = self.db_manager.get_table_class(info['table_name'])
-                        if table_class:
-                            with self.db_manager.get_session() as session:
-                                session.query(table_class).delete()
-                                session.commit()
-                        
-                        # 새 데이터 삽입
-                        self.db_manager.dataframe_to_table(
-                            processed_df, 
-                            info['table_name'], 
-                            if_exists='append'
-                        )
-                        self.logger.info(f"{info['display_name']} 데이터베이스 저장 완료")
-                    except Exception as db_error:
-                        self.logger.warning(f"데이터베이스 저장 실패 (Pickle은 성공): {db_error}")
-                
-                # 설정 업데이트
-                config['file_names'] = file_names  # 위에서 수집한 파일 이름 목록 사용
-                config['files'] = []  # 로드 완료 후 파일 목록 초기화
-                config['pickle_exists'] = True
-                config['dataframe_name'] = info['table_name']
-                config['row_count'] = len(processed_df)
-                config['last_modified'] = datetime.now().isoformat()
-                
-                # 디버깅용 로그
-                self.logger.info(f"{data_type} 파일명 수집 결과: {file_names}")
-                
-                # 세션 상태 업데이트
-                st.session_state.upload_config[data_type] = config
-                self.logger.info(f"{data_type} 설정 업데이트: {config}")
-                
-                st.success(f"{info['display_name']} 로드 완료: {len(processed_df):,}행")
-                
+            logs_df = self.pickle_manager.get_or_build_artifact(
+                artifact_name, lambda: pd.DataFrame(build_logs(*sources)),
+                inputs=inputs,
+                version=INTEGRATION_VERSION,
+                description=f"{display_name} 통합 로그 (tag_logs 반영분)"
+            )
+            
+            if unchanged and any(self.integrated_processor.has_saved_data(table) for table in db_tables):
+                self.logger.info(f"{display_name} 데이터가 이미 데이터베이스에 반영되어 통합을 건너뜁니다")
+                return
+            
+            self.logger.info(f"{display_name} 데이터 통합 처리 시작")
+            save_data(*sources, logs_df.to_dict('records'))
+            self.logger.info(f"{display_name} 데이터 통합 완료")
+        
         except Exception as e:
-            st.error(f"{info['display_name']} 로드 실패: {e}")
-            self.logger.error(f"{data_type} 로드 오류: {e}")
-        finally:
-            # 모든 처리가 끝난 후 임시 파일 삭제
-            import os
-            import time
-            for tmp_path in temp_files_to_delete:
-                try:
-                    # Windows에서 파일이 아직 사용 중일 수 있으므로 잠시 대기
-                    time.sleep(0.5)
-                    if os.path.exists(tmp_path):
-                        os.unlink(tmp_path)
-                        self.logger.debug(f"임시 파일 삭제 성공: {tmp_path}")
-                except Exception as del_error:
-                    self.logger.warning(f"임시 파일 삭제 실패 (무시): {tmp_path} - {del_error}")
+            self.logger.error(f"{display_name} 데이터 통합 중 오류 발생: {e}")
+            st.warning(f"{display_name} 데이터 통합에 실패했습니다: {str(e)}")
+    
+    def _load_optional_dataframe(self, name: str) -> Optional[pd.DataFrame]:
+        """저장된 데이터 로드 (없으면 None)"""
+        try:
+            return self.pickle_manager.load_dataframe(name)
+        except FileNotFoundError:
+            return None
+    
+    def _save_loaded_data_to_db(self, info: Dict, processed_df: pd.DataFrame):
+        """데이터베이스에 저장 (옵션이 켜져있을 때만)"""
+        if not (self.db_manager and st.session_state.get('save_to_db', False)):
+            return
+        
+        try:
+            # 기존 데이터 삭제
+            table_class = self.db_manager.get_table_class(info['table_name'])
+            if table_class:
+                with self.db_manager.get_session() as session:
+                    session.query(table_class).delete()
+                    session.commit()
+            
+            # 새 데이터 삽입
+            self.db_manager.dataframe_to_table(
+                processed_df, 
+                info['table_name'], 
+                if_exists='append'
+            )
+            self.logger.info(f"{info['display_name']} 데이터베이스 저장 완료")
+        except Exception as db_error:
+            self.logger.warning(f"데이터베이스 저장 실패 (Pickle은 성공): {db_error}")
+    
+    def _update_loaded_config(self, data_type: str, info: Dict, config: Dict,
+                              file_names: List[str], row_count: int):
+        """로드 완료 후 업로드 설정과 세션 상태 업데이트"""
+        config['file_names'] = file_names  # 로드한 파일 이름 목록 사용
+        config['files'] = []  # 로드 완료 후 파일 목록 초기화
+        config['pickle_exists'] = True
+        config['dataframe_name'] = info['table_name']
+        config['row_count'] = row_count
+        config['last_modified'] = datetime.now().isoformat()
+        
+        # 디버깅용 로그
+        self.logger.info(f"{data_type} 파일명 수집 결과: {file_names}")
+        
+        # 세션 상태 업데이트
+        st.session_state.upload_config[data_type] = config
+        self.logger.info(f"{data_type} 설정 업데이트: {config}")
+        
+        st.success(f"{info['display_name']} 로드 완료: {row_count:,}행")
     
     def _load_from_pickle(self, data_type: str, info: Dict):
         """Pickle 파일에서 데이터 로드"""
@@ -728,13 +821,10 @@ class DataUploadComponent:
             with col1:
                 if st.button("확인", type="primary", key="confirm_clear_cache"):
                     try:
-                        # 모든 pickle 파일 삭제
-                        pickle_dir = Path("data/pickles")
-                        if pickle_dir.exists():
-                            for file in pickle_dir.glob("*.pkl.gz"):
-                                file.unlink()
+                        # 모든 저장 파일(Parquet/pickle) 삭제 및 메타데이터 초기화
+                        deleted_count = self.pickle_manager.clear_all()
                         
-                        st.success("캐시가 초기화되었습니다.")
+                        st.success(f"캐시가 초기화되었습니다. ({deleted_count}개 파일 삭제)")
                         time.sleep(1)
                         
                     except Exception as e:
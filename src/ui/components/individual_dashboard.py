@@ -24,12 +24,11 @@ from ...utils.recent_views_manager import RecentViewsManager, render_recent_view
 from ...analysis import IndividualAnalyzer
 from ...analysis.network_analyzer import NetworkAnalyzer
 from ...analysis.work_time_estimator import WorkTimeEstimator
+from ...analysis.activity_classification_engine import ActivityClassificationEngine
 from ...tag_system.confidence_calculator_v2 import ConfidenceCalculatorV2
-from ...tag_system.rule_integration import apply_rules_to_tags, get_rule_integration
 from ...tag_system.confidence_state import ActivityState
 from ...config.activity_types import (
-    ACTIVITY_TYPES, get_activity_color, get_activity_name,
-    get_activity_type, ActivityType
+    ACTIVITY_TYPES, get_activity_color, get_activity_name
 )
 
 class IndividualDashboard:
@@ -806,178 +805,54 @@ class IndividualDashboard:
     def _get_knox_and_equipment_tags(self, employee_id: str, selected_date: date, work_type: str) -> pd.DataFrame:
         """Knox 및 Equipment 데이터를 태그 형식으로 변환하여 반환"""
         try:
-            from ...database import get_pickle_manager
-            pickle_manager = get_pickle_manager()
+            from ...utils.performance_cache import get_performance_cache
+            cache = get_performance_cache()
             
-            all_tags = []
-            emp_id_str = str(employee_id)
-            self.logger.info(f"_get_knox_and_equipment_tags 호출 - 사번: {emp_id_str}, 날짜: {selected_date}, 근무유형: {work_type}")
-            
-            # 1. Knox Approval 데이터
-            knox_approval = pickle_manager.load_dataframe(name='knox_approval_data')
-            if knox_approval is not None:
-                # 사번 컬럼 확인 및 변환
-                if 'UserNo' in knox_approval.columns:
-                    knox_approval['employee_id'] = knox_approval['UserNo'].astype(str)
-                elif '사번' in knox_approval.columns:
-                    knox_approval['employee_id'] = knox_approval['사번'].astype(str)
-                
-                # 해당 직원의 데이터 필터링
-                if 'employee_id' in knox_approval.columns:
-                    emp_data = knox_approval[knox_approval['employee_id'] == emp_id_str]
-                    if not emp_data.empty:
-                        for _, row in emp_data.iterrows():
-                            timestamp = pd.to_datetime(row.get('Timestamp', row.get('timestamp')))
-                            if timestamp.date() == selected_date:
-                                tag = {
-                                    'ENTE_DT': int(timestamp.strftime('%Y%m%d')),
-                                    '출입시각': int(timestamp.strftime('%H%M%S')),
-                                    '사번': int(employee_id),
-                                    'DR_NO': 'O_KNOX_APPROVAL',
-                                    'DR_NM': 'Knox 결재 시스템',
-                                    'INOUT_GB': 'O',
-                                    'datetime': timestamp,
-                                    'time': timestamp.strftime('%H%M%S'),
-                                    'Tag_Code': 'O',
-                                    'source': 'knox_approval'
-                                }
-                                all_tags.append(tag)
-            
-            # 2. Knox PIMS 데이터 (G3 태그)
-            knox_pims = pickle_manager.load_dataframe(name='knox_pims_data')
-            if knox_pims is not None:
-                self.logger.info(f"Knox PIMS 데이터 로드됨: {len(knox_pims)}건")
-                self.logger.info(f"Knox PIMS 컬럼: {list(knox_pims.columns)}")
-                
-                # 사번 컬럼 변환
-                if '사번' in knox_pims.columns:
-                    knox_pims['employee_id'] = knox_pims['사번'].astype(str)
-                    self.logger.info(f"사번 컬럼 변환 완료")
-                else:
-                    self.logger.warning(f"Knox PIMS에 '사번' 컬럼이 없습니다. 컬럼: {list(knox_pims.columns)}")
-                
-                # 해당 직원의 데이터 필터링
-                if 'employee_id' in knox_pims.columns:
-                    emp_data = knox_pims[knox_pims['employee_id'] == emp_id_str]
-                    self.logger.info(f"Knox PIMS - {emp_id_str} 사번 데이터: {len(emp_data)}건")
-                    
-                    # 20220245 사번 데이터 상세 확인
-                    if emp_id_str == '20220245' and not emp_data.empty:
-                        self.logger.info(f"20220245 사번의 전체 Knox PIMS 데이터:")
-                        for idx, row in emp_data.iterrows():
-                            start_time_str = row.get('시작일시_GMT+9', row.get('start_time', ''))
-                            self.logger.info(f"  - 일정ID: {row.get('일정ID', '')}, 시작: {start_time_str}")
-                    
-                    if not emp_data.empty:
-                        matched_count = 0
-                        for _, row in emp_data.iterrows():
-                            # 시작 시간 처리
-                            start_time_str = row.get('시작일시_GMT+9', row.get('start_time'))
-                            if pd.isna(start_time_str):
-                                self.logger.warning(f"시작 시간이 없음: 일정ID {row.get('일정ID', '')}")
-                                continue
-                                
-                            start_time = pd.to_datetime(start_time_str)
-                            end_time_str = row.get('종료일시_GMT+9', row.get('end_time'))
-                            end_time = pd.to_datetime(end_time_str) if pd.notna(end_time_str) else None
-                            
-                            self.logger.debug(f"Knox PIMS 시간 확인 - 일정ID: {row.get('일정ID', '')}, 시작시간: {start_time}, 종료시간: {end_time}, 선택날짜: {selected_date}")
-                            
-                            if start_time.date() == selected_date:
-                                matched_count += 1
-                                self.logger.info(f"Knox PIMS 매칭 - 시간: {start_time} ~ {end_time}, 일정ID: {row.get('일정ID', '')}, 일정구분: {row.get('일정_구분', '')}")
-                                
-                                # 회의 시간 계산 (분 단위)
-                                meeting_duration = None
-                                if end_time:
-                                    meeting_duration = (end_time - start_time).total_seconds() / 60
-                                    self.logger.info(f"Knox PIMS 회의 duration 계산: {start_time} ~ {end_time} = {meeting_duration:.1f}분")
-                                
-                                tag = {
-                                    'ENTE_DT': int(start_time.strftime('%Y%m%d')),
-                                    '출입시각': int(start_time.strftime('%H%M%S')),
-                                    '사번': int(employee_id),
-                                    'DR_NO': 'G3_KNOX_PIMS',
-                                    'DR_NM': 'Knox PIMS 회의',
-                                    'INOUT_GB': 'G3',
-                                    'datetime': start_time,
-                                    'time': start_time.strftime('%H%M%S'),
-                                    'Tag_Code': 'G3',
-                                    'source': 'knox_pims',
-                                    'meeting_id': row.get('일정ID', row.get('meeting_id', '')),
-                                    'knox_end_time': end_time,  # Knox PIMS 종료시간 저장
-                                    'knox_duration': meeting_duration  # Knox PIMS 회의 시간(분) 저장
-                                }
-                                self.logger.info(f"Knox PIMS 태그 생성: {tag}")
-                                all_tags.append(tag)
-                        self.logger.info(f"Knox PIMS - {selected_date} 날짜로 매칭된 데이터: {matched_count}건")
-            
-            # 3. Knox Mail 데이터
-            knox_mail = pickle_manager.load_dataframe(name='knox_mail_data')
-            if knox_mail is not None:
-                # 사번 컬럼 변환
-                if '발신인사번_text' in knox_mail.columns:
-                    knox_mail['employee_id'] = knox_mail['발신인사번_text'].astype(str)
-                
-                # 해당 직원의 데이터 필터링
-                if 'employee_id' in knox_mail.columns:
-                    emp_data = knox_mail[knox_mail['employee_id'] == emp_id_str]
-                    if not emp_data.empty:
-                        for _, row in emp_data.iterrows():
-                            timestamp = pd.to_datetime(row.get('발신일시_GMT9', row.get('timestamp')))
-                            if timestamp.date() == selected_date:
-                                tag = {
-                                    'ENTE_DT': int(timestamp.strftime('%Y%m%d')),
-                                    '출입시각': int(timestamp.strftime('%H%M%S')),
-                                    '사번': int(employee_id),
-                                    'DR_NO': 'O_KNOX_MAIL',
-                                    'DR_NM': 'Knox 메일 시스템',
-                                    'INOUT_GB': 'O',
-                                    'datetime': timestamp,
-                                    'time': timestamp.strftime('%H%M%S'),
-                                    'Tag_Code': 'O',
-                                    'source': 'knox_mail'
-                                }
-                                all_tags.append(tag)
+            self.logger.info(f"_get_knox_and_equipment_tags 호출 - 사번: {employee_id}, 날짜: {selected_date}, 근무유형: {work_type}")
+            
+            tag_frames = []
+            
+            # 1~3. Knox 결재/PIMS/메일 데이터 (태그 형식으로 정규화된 직원-일자 인덱스에서 슬라이스)
+            knox_index = cache.get_knox_tag_index()
+            if knox_index is not None:
+                knox_tags = knox_index.get(employee_id, selected_date)
+                if not knox_tags.empty:
+                    tag_frames.append(knox_tags)
             
             # 4. Equipment 데이터 (EAM, LAMS, MES)
             equipment_data = self.get_employee_equipment_data(employee_id, selected_date)
             if equipment_data is not None and not equipment_data.empty:
-                for _, equip in equipment_data.iterrows():
-                    timestamp = pd.to_datetime(equip['timestamp'])
-                    tag = {
-                        'ENTE_DT': int(timestamp.strftime('%Y%m%d')),
-                        '출입시각': int(timestamp.strftime('%H%M%S')),
-                        '사번': int(employee_id),
-                        'DR_NO': f"O_{equip.get('system_type', 'EQUIP')}",
-                        'DR_NM': f"{equip.get('system_type', 'Equipment')} 사용",
-                        'INOUT_GB': 'O',
-                        'datetime': timestamp,
-                        'time': timestamp.strftime('%H%M%S'),
-                        'Tag_Code': 'O',
-                        'source': f"equipment_{equip.get('system_type', '').lower()}"
-                    }
-                    all_tags.append(tag)
+                timestamps = pd.to_datetime(equipment_data['timestamp'])
+                if 'system_type' in equipment_data.columns:
+                    system_type = equipment_data['system_type'].astype(str)
+                    dr_no = 'O_' + system_type
+                    dr_nm = system_type + ' 사용'
+                    source = 'equipment_' + system_type.str.lower()
+                else:
+                    dr_no, dr_nm, source = 'O_EQUIP', 'Equipment 사용', 'equipment_'
+                seconds = timestamps.dt.hour * 10000 + timestamps.dt.minute * 100 + timestamps.dt.second
+                tag_frames.append(pd.DataFrame({
+                    'ENTE_DT': timestamps.dt.year * 10000 + timestamps.dt.month * 100 + timestamps.dt.day,
+                    '출입시각': seconds,
+                    '사번': int(employee_id),
+                    'DR_NO': dr_no,
+                    'DR_NM': dr_nm,
+                    'INOUT_GB': 'O',
+                    'datetime': timestamps,
+                    'time': seconds.astype(str).str.zfill(6),
+                    'Tag_Code': 'O',
+                    'source': source
+                }).reset_index(drop=True))
             
             # DataFrame으로 변환
-            if all_tags:
-                tags_df = pd.DataFrame(all_tags)
+            if tag_frames:
+                tags_df = pd.concat(tag_frames, ignore_index=True)
                 self.logger.info(f"Knox/Equipment 태그 생성: 총 {len(tags_df)}건")
                 
                 # 태그 종류별 통계
-                if 'Tag_Code' in tags_df.columns:
-                    tag_stats = tags_df.groupby('Tag_Code').size()
-                    for Tag_Code, count in tag_stats.items():
-                        self.logger.info(f"  - {Tag_Code} 태그: {count}건")
-                
-                # G3 태그 상세 확인
-                g3_tags = tags_df[tags_df['Tag_Code'] == 'G3']
-                if not g3_tags.empty:
-                    self.logger.info(f"G3 태그 {len(g3_tags)}건 상세:")
-                    for _, tag in g3_tags.iterrows():
-                        self.logger.info(f"  - {tag['datetime']}: {tag['DR_NM']} (meeting_id: {tag.get('meeting_id', 'N/A')})")
-                else:
-                    self.logger.info("G3 태그가 없음")
+                tag_stats = tags_df.groupby('Tag_Code').size()
+                for Tag_Code, count in tag_stats.items():
+                    self.logger.info(f"  - {Tag_Code} 태그: {count}건")
                 
                 return tags_df
             else:
@@ -1074,9 +949,9 @@ class IndividualDashboard:
             if equipment_data is not None:
                 return equipment_data
                 
-            # DB에 데이터가 없으면 pickle 파일에서 로드
-            from ...database import get_pickle_manager
-            pickle_manager = get_pickle_manager()
+            # DB에 데이터가 없으면 pickle 원천 데이터의 직원-일자 인덱스에서 조회
+            from ...utils.performance_cache import get_performance_cache
+            equipment_index = get_performance_cache().get_equipment_index()
             
             # 사번 형식 맞추기
             if ' - ' in str(employee_id):
@@ -1085,94 +960,22 @@ class IndividualDashboard:
             # 근무 유형 확인
             work_type = self.get_employee_work_type(employee_id, selected_date)
             
-            equipment_data_list = []
-            
-            # LAMS 데이터 로드
-            lams_data = pickle_manager.load_dataframe(name='lams_data')
-            if lams_data is not None and not lams_data.empty:
-                try:
-                    # 사번을 숫자로 변환
-                    emp_id_int = int(employee_id)
-                    lams_data['employee_id'] = pd.to_numeric(lams_data['employee_id'], errors='coerce')
-                    
-                    # 날짜 필터링
-                    daily_lams = lams_data[
-                        (lams_data['employee_id'] == emp_id_int) & 
-                        (pd.to_datetime(lams_data['timestamp']).dt.date == selected_date)
-                    ].copy()
-                    
-                    if not daily_lams.empty:
-                        daily_lams['system'] = 'LAMS(품질시스템)'
-                        equipment_data_list.append(daily_lams)
-                        self.logger.info(f"LAMS 데이터 {len(daily_lams)}건 로드")
-                        
-                except Exception as e:
-                    self.logger.debug(f"LAMS 데이터 로드 실패: {e}")
-            
-            # MES 데이터 로드
-            mes_data = pickle_manager.load_dataframe(name='mes_data')
-            if mes_data is not None and not mes_data.empty:
-                try:
-                    # 사번을 숫자로 변환
-                    emp_id_int = int(employee_id)
-                    mes_data['employee_id'] = pd.to_numeric(mes_data['employee_id'], errors='coerce')
-                    
-                    # 날짜 필터링
-                    daily_mes = mes_data[
-                        (mes_data['employee_id'] == emp_id_int) & 
-                        (pd.to_datetime(mes_data['timestamp']).dt.date == selected_date)
-                    ].copy()
-                    
-                    if not daily_mes.empty:
-                        daily_mes['system'] = 'MES(생산시스템)'
-                        equipment_data_list.append(daily_mes)
-                        self.logger.info(f"MES 데이터 {len(daily_mes)}건 로드")
-                        
-                except Exception as e:
-                    self.logger.debug(f"MES 데이터 로드 실패: {e}")
-            
-            # EAM 데이터 로드
-            eam_data = pickle_manager.load_dataframe(name='eam_data')
-            if eam_data is not None and not eam_data.empty:
-                try:
-                    # 사번을 숫자로 변환
-                    emp_id_int = int(employee_id)
-                    eam_data['employee_id'] = pd.to_numeric(eam_data['employee_id'], errors='coerce')
-                    
-                    # 날짜 필터링
-                    daily_eam = eam_data[
-                        (eam_data['employee_id'] == emp_id_int) & 
-                        (pd.to_datetime(eam_data['timestamp']).dt.date == selected_date)
-                    ].copy()
-                    
-                    if not daily_eam.empty:
-                        daily_eam['system'] = 'EAM(안전설비시스템)'
-                        equipment_data_list.append(daily_eam)
-                        self.logger.info(f"EAM 데이터 {len(daily_eam)}건 로드")
-                        
-                except Exception as e:
-                    self.logger.debug(f"EAM 데이터 로드 실패: {e}")
+            # 통합된 장비 데이터 (equipment_data_merged)가 있으면 우선 사용
+            if 'equipment_data_merged' in equipment_index:
+                daily_merged = equipment_index['equipment_data_merged'].get(employee_id, selected_date)
+                if not daily_merged.empty:
+                    self.logger.info(f"통합 장비 데이터 {len(daily_merged)}건 로드")
+                    return daily_merged.copy()
             
-            # 통합된 장비 데이터 로드 (equipment_data_merged)
-            merged_data = pickle_manager.load_dataframe(name='equipment_data_merged')
-            if merged_data is not None and not merged_data.empty:
-                try:
-                    # 사번을 숫자로 변환
-                    emp_id_int = int(employee_id)
-                    merged_data['employee_id'] = pd.to_numeric(merged_data['employee_id'], errors='coerce')
-                    
-                    # 날짜 필터링
-                    daily_merged = merged_data[
-                        (merged_data['employee_id'] == emp_id_int) & 
-                        (pd.to_datetime(merged_data['timestamp']).dt.date == selected_date)
-                    ].copy()
-                    
-                    if not daily_merged.empty:
-                        self.logger.info(f"통합 장비 데이터 {len(daily_merged)}건 로드")
-                        return daily_merged
-                        
-                except Exception as e:
-                    self.logger.warning(f"통합 장비 데이터 로드 실패: {e}")
+            # LAMS, MES, EAM 데이터
+            equipment_data_list = []
+            for name in ('lams_data', 'mes_data', 'eam_data'):
+                if name not in equipment_index:
+                    continue
+                daily_data = equipment_index[name].get(employee_id, selected_date)
+                if not daily_data.empty:
+                    equipment_data_list.append(daily_data)
+                    self.logger.info(f"{daily_data['system'].iloc[0]} 데이터 {len(daily_data)}건 로드")
             
             # 개별 데이터를 통합
             if equipment_data_list:
@@ -1304,1936 +1107,48 @@ class IndividualDashboard:
         return count
 
     def classify_activities(self, daily_data: pd.DataFrame, employee_id: str = None, selected_date: date = None):
-        """활동 분류 수행 (HMM 기반)"""
-        try:
-            # 태깅지점 마스터 데이터 로드
-            tag_location_master = self.get_tag_location_master()
-            
-            # 위치 기반 우선 분류 제거 - 태그 기반으로만 처리
-            # location_based_count = self._apply_location_based_classification(daily_data)
-            # self.logger.info(f"🔍 위치 기반 우선 분류: {location_based_count}건 처리")
-            
-            # 기본 활동 분류 - 기존 값이 없는 경우에만 설정
-            if 'activity_code' not in daily_data.columns:
-                daily_data['activity_code'] = 'WORK'  # 기본값
-            if 'work_area_type' not in daily_data.columns:
-                daily_data['work_area_type'] = 'Y'  # 기본값 (근무구역)
-            if 'work_status' not in daily_data.columns:
-                daily_data['work_status'] = 'W'  # 기본값 (근무상태)
-            if 'activity_label' not in daily_data.columns:
-                daily_data['activity_label'] = 'YW'  # 기본값 (근무구역에서 근무중)
-            if 'confidence' not in daily_data.columns:
-                daily_data['confidence'] = 80  # 기본 신뢰도
-            if 'is_takeout' not in daily_data.columns:
-                daily_data['is_takeout'] = False  # 테이크아웃 여부 기본값 False
-            # Tag_Code는 기본값을 설정하지 않음 - 마스터 데이터에서 가져와야 함
-            if 'protected_from_meal' not in daily_data.columns:
-                daily_data['protected_from_meal'] = False  # 식사 분류 보호 플래그
-            
-            # O 태그 (장비 사용) 처리
-            o_tag_mask = daily_data['INOUT_GB'] == 'O'
-            if o_tag_mask.any():
-                daily_data.loc[o_tag_mask, 'activity_code'] = 'EQUIPMENT_OPERATION'
-                daily_data.loc[o_tag_mask, 'confidence'] = 98  # 장비 사용 로그는 높은 신뢰도
-                daily_data.loc[o_tag_mask, 'work_area_type'] = 'Y'  # 장비 사용은 근무구역
-                daily_data.loc[o_tag_mask, 'work_status'] = 'O'  # 장비 조작 상태
-                daily_data.loc[o_tag_mask, 'activity_label'] = 'YO'  # 근무구역에서 장비조작
-                self.logger.info(f"O 태그 {o_tag_mask.sum()}건을 EQUIPMENT_OPERATION으로 분류")
-            
-            # Tag_Code 기반 추가 분류 (Knox/Equipment 데이터)
-            if 'Tag_Code' in daily_data.columns:
-                # G3 태그 (회의) 처리
-                g3_mask = daily_data['Tag_Code'] == 'G3'
-                if g3_mask.any():
-                    daily_data.loc[g3_mask, 'activity_code'] = 'G3_MEETING'
-                    daily_data.loc[g3_mask, 'confidence'] = 100  # 회의 데이터는 확실함
-                    daily_data.loc[g3_mask, 'work_area_type'] = 'Y'
-                    daily_data.loc[g3_mask, 'work_status'] = 'M'  # Meeting
-                    daily_data.loc[g3_mask, 'activity_label'] = 'YM'
-                    self.logger.info(f"G3 태그 {g3_mask.sum()}건을 G3_MEETING으로 분류")
-                
-                # O 태그 추가 처리 (Knox/Equipment 데이터)
-                o_Tag_Code_mask = daily_data['Tag_Code'] == 'O'
-                if o_Tag_Code_mask.any():
-                    # source 정보로 세부 분류
-                    if 'source' in daily_data.columns:
-                        knox_approval_mask = o_Tag_Code_mask & (daily_data['source'] == 'knox_approval')
-                        knox_mail_mask = o_Tag_Code_mask & (daily_data['source'] == 'knox_mail')
-                        eam_mask = o_Tag_Code_mask & (daily_data['source'] == 'equipment_eam')
-                        lams_mask = o_Tag_Code_mask & (daily_data['source'] == 'equipment_lams')
-                        mes_mask = o_Tag_Code_mask & (daily_data['source'] == 'equipment_mes')
-                        
-                        if knox_approval_mask.any():
-                            daily_data.loc[knox_approval_mask, 'activity_code'] = 'KNOX_APPROVAL'
-                            self.logger.info(f"Knox Approval {knox_approval_mask.sum()}건 분류")
-                        
-                        if knox_mail_mask.any():
-                            daily_data.loc[knox_mail_mask, 'activity_code'] = 'KNOX_MAIL'
-                            self.logger.info(f"Knox Mail {knox_mail_mask.sum()}건 분류")
-                        
-                        if eam_mask.any():
-                            daily_data.loc[eam_mask, 'activity_code'] = 'EAM_WORK'
-                            self.logger.info(f"EAM {eam_mask.sum()}건 분류")
-                        
-                        if lams_mask.any():
-                            daily_data.loc[lams_mask, 'activity_code'] = 'LAMS_WORK'
-                            self.logger.info(f"LAMS {lams_mask.sum()}건 분류")
-                        
-                        if mes_mask.any():
-                            daily_data.loc[mes_mask, 'activity_code'] = 'MES_WORK'
-                            self.logger.info(f"MES {mes_mask.sum()}건 분류")
-                    else:
-                        # source 정보가 없으면 일반 O태그 작업으로
-                        daily_data.loc[o_Tag_Code_mask, 'activity_code'] = 'O_TAG_WORK'
-                    
-                    daily_data.loc[o_Tag_Code_mask, 'confidence'] = 95
-                    daily_data.loc[o_Tag_Code_mask, 'work_area_type'] = 'Y'
-                    daily_data.loc[o_Tag_Code_mask, 'work_status'] = 'W'
-                    daily_data.loc[o_Tag_Code_mask, 'activity_label'] = 'YW'
-            
-            # 디버깅: DR_NM 값 확인
-            unique_dr_nm = daily_data['DR_NM'].unique()
-            gate_related = [dr for dr in unique_dr_nm if any(keyword in str(dr).upper() for keyword in ['정문', '게이트', 'GATE', 'SPEED', '입구', '출구'])]
-            if gate_related:
-                self.logger.info(f"게이트 관련 DR_NM 발견: {gate_related}")
-            
-            # 근무 유형 확인
-            work_type = self.get_employee_work_type(employee_id, selected_date) if employee_id and selected_date else 'standard'
-            
-            # 태깅지점 마스터 데이터와 조인
-            if tag_location_master is not None and 'DR_NO' in tag_location_master.columns:
-                # DR_NO 데이터 타입 맞추기
-                daily_data['DR_NO_str'] = daily_data['DR_NO'].astype(str).str.strip()
-                
-                # 마스터 데이터의 DR_NO가 숫자형이면 문자열로 변환
-                if tag_location_master['DR_NO'].dtype in ['int64', 'float64']:
-                    tag_location_master['DR_NO_str'] = tag_location_master['DR_NO'].astype(int).astype(str)
-                else:
-                    tag_location_master['DR_NO_str'] = tag_location_master['DR_NO'].astype(str).str.strip()
-                
-                # 조인 전 데이터 확인
-                self.logger.info(f"조인 전 - daily_data DR_NO 샘플: {daily_data['DR_NO_str'].head().tolist()}")
-                self.logger.info(f"조인 전 - master DR_NO 샘플: {tag_location_master['DR_NO_str'].head().tolist()}")
-                
-                # 701-10-1-1 특별 체크
-                if '701-10-1-1' in daily_data['DR_NO_str'].values:
-                    self.logger.info("701-10-1-1이 daily_data에 있음")
-                    matching_master = tag_location_master[tag_location_master['DR_NO_str'] == '701-10-1-1']
-                    if not matching_master.empty:
-                        self.logger.info(f"701-10-1-1 마스터 데이터: Tag_Code={matching_master.iloc[0]['Tag_Code']}")
-                    else:
-                        self.logger.info("701-10-1-1이 마스터에 없음")
-                        # 701-10으로 매칭 시도 (DR_NO의 앞부분만)
-                        dr_no_prefix = '701-10'
-                        matching_prefix = tag_location_master[tag_location_master['DR_NO_str'].str.startswith(dr_no_prefix)]
-                        if not matching_prefix.empty:
-                            self.logger.info(f"{dr_no_prefix}로 시작하는 마스터 {len(matching_prefix)}건:")
-                            for idx, row in matching_prefix.head(3).iterrows():
-                                self.logger.info(f"  - DR_NO={row['DR_NO_str']}, DR_NM={row['DR_NM']}, Tag_Code={row.get('Tag_Code', 'N/A')}")
-                        
-                        # 정문 SPEED GATE 관련 마스터 데이터 확인
-                        speed_gate_masters = tag_location_master[tag_location_master['DR_NM'].str.contains('정문.*SPEED GATE', case=False, na=False, regex=True)]
-                        if not speed_gate_masters.empty:
-                            self.logger.info(f"정문 SPEED GATE 관련 마스터 {len(speed_gate_masters)}건:")
-                            for idx, row in speed_gate_masters.head(5).iterrows():
-                                self.logger.info(f"  - DR_NO={row['DR_NO_str']}, DR_NM={row['DR_NM']}, Tag_Code={row.get('Tag_Code', 'N/A')}")
-                
-                # 조인할 컬럼 확인 (새로운 태그 코드 체계 적용)
-                join_columns = ['DR_NO_str']
-                if 'Tag_Code' in tag_location_master.columns:
-                    join_columns.append('Tag_Code')
-                if '공간구분_NM' in tag_location_master.columns:
-                    join_columns.append('공간구분_NM')
-                if '세부유형_NM' in tag_location_master.columns:
-                    join_columns.append('세부유형_NM')
-                if '라벨링_활동' in tag_location_master.columns:
-                    join_columns.append('라벨링_활동')
-                # 기존 컬럼들도 체크 (호환성)
-                if '근무구역여부' in tag_location_master.columns:
-                    join_columns.append('근무구역여부')
-                if '근무' in tag_location_master.columns:
-                    join_columns.append('근무')
-                if '라벨링' in tag_location_master.columns:
-                    join_columns.append('라벨링')
-                
-                # INOUT_GB가 있으면 포함 (정확한 매칭을 위해)
-                if 'INOUT_GB' in tag_location_master.columns:
-                    join_columns.append('INOUT_GB')
-                
-                # INOUT_GB 값 표준화 (입문/출문 -> IN/OUT 또는 그 반대)
-                if 'INOUT_GB' in daily_data.columns:
-                    # 원본 값 백업
-                    daily_data['INOUT_GB_ORIGINAL'] = daily_data['INOUT_GB'].copy()
-                    
-                    # 데이터와 마스터의 INOUT_GB 값 형식 확인
-                    data_inout_values = set(daily_data['INOUT_GB'].dropna().unique())
-                    master_inout_values = set(tag_location_master['INOUT_GB'].dropna().unique()) if 'INOUT_GB' in tag_location_master.columns else set()
-                    
-                    self.logger.info(f"데이터 INOUT_GB 값: {data_inout_values}")
-                    self.logger.info(f"마스터 INOUT_GB 값: {master_inout_values}")
-                    
-                    # 값 형식이 다른 경우 변환
-                    if '입문' in data_inout_values and 'IN' in master_inout_values:
-                        # 한글 -> 영문 변환
-                        daily_data['INOUT_GB'] = daily_data['INOUT_GB'].replace({'입문': 'IN', '출문': 'OUT'})
-                        self.logger.info("INOUT_GB 값 변환: 입문->IN, 출문->OUT")
-                    elif 'IN' in data_inout_values and '입문' in master_inout_values:
-                        # 영문 -> 한글 변환
-                        daily_data['INOUT_GB'] = daily_data['INOUT_GB'].replace({'IN': '입문', 'OUT': '출문'})
-                        self.logger.info("INOUT_GB 값 변환: IN->입문, OUT->출문")
-                
-                # 🚨 DR_NM 기반 매칭 우선 시도 (표기명 우선, 게이트명 차선)
-                Tag_Code_matched = False
-                
-                # 1. DR_NM과 표기명으로 매칭 시도
-                if 'DR_NM' in daily_data.columns and '표기명' in tag_location_master.columns:
-                    self.logger.info("🔍 DR_NM과 표기명으로 Tag_Code 조회 시도")
-                    
-                    # 필요한 컬럼만 선택
-                    display_columns = ['표기명', 'Tag_Code']
-                    for col in ['공간구분_NM', '세부유형_NM', '라벨링_활동', '근무구역여부', '근무', '라벨링', 'INOUT_GB']:
-                        if col in tag_location_master.columns:
-                            display_columns.append(col)
-                    
-                    # DR_NM과 표기명으로 매칭
-                    daily_data_temp = daily_data.merge(
-                        tag_location_master[display_columns],
-                        left_on='DR_NM',
-                        right_on='표기명',
-                        how='left',
-                        suffixes=('', '_display')
-                    )
-                    
-                    # 표기명으로 매칭된 경우 정보 업데이트
-                    if 'Tag_Code_display' in daily_data_temp.columns:
-                        display_matched = daily_data_temp['Tag_Code_display'].notna()
-                        if display_matched.any():
-                            for col in display_columns:
-                                if col != '표기명' and f'{col}_display' in daily_data_temp.columns:
-                                    daily_data.loc[display_matched, col] = daily_data_temp.loc[display_matched, f'{col}_display']
-                            self.logger.info(f"✅ 표기명 매칭으로 {display_matched.sum()}건의 Tag_Code 찾음")
-                            Tag_Code_matched = True
-                
-                # 2. 표기명으로 못 찾은 경우 게이트명으로 매칭 시도
-                if not Tag_Code_matched and 'DR_NM' in daily_data.columns and '게이트명' in tag_location_master.columns:
-                    self.logger.info("🔍 DR_NM과 게이트명으로 Tag_Code 조회 시도")
-                    
-                    # 필요한 컬럼만 선택
-                    gate_columns = ['게이트명', 'Tag_Code']
-                    for col in ['공간구분_NM', '세부유형_NM', '라벨링_활동', '근무구역여부', '근무', '라벨링']:
-                        if col in tag_location_master.columns:
-                            gate_columns.append(col)
-                    
-                    # DR_NM과 게이트명으로 매칭
-                    daily_data_temp = daily_data.merge(
-                        tag_location_master[gate_columns],
-                        left_on='DR_NM',
-                        right_on='게이트명',
-                        how='left',
-                        suffixes=('', '_gate')
-                    )
-                    
-                    # 게이트명으로 매칭된 경우 정보 업데이트 (Tag_Code가 없는 것만)
-                    gate_matched = daily_data_temp['Tag_Code_gate'].notna()
-                    no_tag_mask = daily_data['Tag_Code'].isna() if 'Tag_Code' in daily_data.columns else pd.Series([True] * len(daily_data))
-                    update_mask = gate_matched & no_tag_mask
-                    
-                    if update_mask.any():
-                        for col in gate_columns:
-                            if col != '게이트명' and f'{col}_gate' in daily_data_temp.columns:
-                                daily_data.loc[update_mask, col] = daily_data_temp.loc[update_mask, f'{col}_gate']
-                        self.logger.info(f"✅ 게이트명 매칭으로 {update_mask.sum()}건의 Tag_Code 찾음")
-                
-                # DR_NO_str + INOUT_GB로 추가 매칭 (게이트명으로 못 찾은 경우)
-                if 'INOUT_GB' in daily_data.columns and 'INOUT_GB' in tag_location_master.columns:
-                    self.logger.info("DR_NO + INOUT_GB 조합으로 추가 조인")
-                    
-                    # 이동 관련 태그 디버깅
-                    movement_tags = daily_data[daily_data['DR_NO_str'].str.startswith('701', na=False)].head(5)
-                    if not movement_tags.empty:
-                        self.logger.info(f"이동 태그 샘플 (조인 전):")
-                        for idx, row in movement_tags.iterrows():
-                            self.logger.info(f"  - DR_NO={row['DR_NO_str']}, INOUT_GB={row.get('INOUT_GB', 'N/A')}")
-                        
-                        # 마스터 데이터의 INOUT_GB 값 확인
-                        master_inout_values = tag_location_master['INOUT_GB'].unique()
-                        self.logger.info(f"마스터 데이터의 INOUT_GB 고유값: {master_inout_values}")
-                        
-                        # 701로 시작하는 마스터 샘플
-                        master_701 = tag_location_master[tag_location_master['DR_NO_str'].str.startswith('701', na=False)].head(10)
-                        if not master_701.empty:
-                            self.logger.info("701로 시작하는 마스터 데이터 샘플:")
-                            for idx, row in master_701.iterrows():
-                                self.logger.info(f"  - DR_NO={row['DR_NO_str']}, INOUT_GB={row.get('INOUT_GB', 'N/A')}, Tag_Code={row.get('Tag_Code', 'N/A')}")
-                        
-                        # 마스터에서 매칭되는 것 찾기
-                        for idx, row in movement_tags.iterrows():
-                            dr_no = row['DR_NO_str']
-                            inout_gb = row.get('INOUT_GB', '')
-                            master_match = tag_location_master[
-                                (tag_location_master['DR_NO_str'] == dr_no) & 
-                                (tag_location_master['INOUT_GB'] == inout_gb)
-                            ]
-                            if not master_match.empty:
-                                self.logger.info(f"  마스터 매치 발견: DR_NO={dr_no}, INOUT_GB={inout_gb}, Tag_Code={master_match.iloc[0].get('Tag_Code', 'N/A')}")
-                            else:
-                                self.logger.info(f"  마스터 매치 없음: DR_NO={dr_no}, INOUT_GB={inout_gb}")
-                    
-                    daily_data = daily_data.merge(
-                        tag_location_master[join_columns],
-                        on=['DR_NO_str', 'INOUT_GB'],
-                        how='left',
-                        suffixes=('', '_master')
-                    )
-                    
-                    # 조인 후 이동 태그 확인
-                    movement_tags_after = daily_data[daily_data['DR_NO_str'].str.startswith('701', na=False)].head(5)
-                    if not movement_tags_after.empty:
-                        self.logger.info(f"이동 태그 샘플 (조인 후):")
-                        for idx, row in movement_tags_after.iterrows():
-                            self.logger.info(f"  - DR_NO={row['DR_NO_str']}, INOUT_GB={row.get('INOUT_GB', 'N/A')}, Tag_Code={row.get('Tag_Code', 'N/A')}")
-                else:
-                    # DR_NO_str만으로 조인 (fallback)
-                    self.logger.info("DR_NO만으로 조인 (fallback)")
-                    daily_data = daily_data.merge(
-                        tag_location_master[join_columns],
-                        on='DR_NO_str',
-                        how='left',
-                        suffixes=('', '_master')
-                    )
-                
-                # 매칭되지 않은 레코드에 대해 prefix 매칭 시도
-                unmatched_mask = daily_data['Tag_Code'].isna() if 'Tag_Code' in daily_data.columns else pd.Series([True] * len(daily_data))
-                if unmatched_mask.any():
-                    self.logger.info(f"매칭되지 않은 {unmatched_mask.sum()}건에 대해 prefix 매칭 시도")
-                    
-                    # 각 매칭되지 않은 레코드에 대해 처리
-                    for idx in daily_data[unmatched_mask].index:
-                        dr_no = daily_data.loc[idx, 'DR_NO_str']
-                        dr_nm = daily_data.loc[idx, 'DR_NM']
-                        
-                        # DR_NO의 prefix로 매칭 시도 (예: '701-10-1-1' -> '701-10')
-                        if '-' in dr_no:
-                            dr_prefix = '-'.join(dr_no.split('-')[:2])  # 첫 두 부분만 사용
-                            prefix_match = tag_location_master[tag_location_master['DR_NO_str'].str.startswith(dr_prefix)]
-                            
-                            # DR_NM도 비슷한지 확인
-                            if not prefix_match.empty:
-                                # DR_NM에서 유사한 것 찾기
-                                for _, master_row in prefix_match.iterrows():
-                                    if any(word in dr_nm for word in str(master_row['DR_NM']).split()):
-                                        # 매칭된 마스터 데이터 적용
-                                        for col in join_columns:
-                                            if col != 'DR_NO_str' and col in master_row:
-                                                daily_data.loc[idx, col] = master_row[col]
-                                        self.logger.info(f"Prefix 매칭 성공: {dr_no} -> {master_row['DR_NO_str']}")
-                                        break
-                
-                # 조인 후 결과 확인
-                if 'Tag_Code' in daily_data.columns:
-                    matched_count = daily_data['Tag_Code'].notna().sum()
-                elif '근무구역여부' in daily_data.columns:
-                    matched_count = daily_data['근무구역여부'].notna().sum()
-                else:
-                    matched_count = 0
-                self.logger.info(f"조인 결과: {matched_count}/{len(daily_data)} 매칭됨")
-                
-                # 701-10-1-1 조인 후 체크
-                if '701-10-1-1' in daily_data['DR_NO_str'].values:
-                    test_rows = daily_data[daily_data['DR_NO_str'] == '701-10-1-1']
-                    self.logger.info(f"701-10-1-1 조인 후 {len(test_rows)}건:")
-                    for idx, test_row in test_rows.head(3).iterrows():
-                        self.logger.info(f"  - INOUT_GB={test_row.get('INOUT_GB', 'N/A')}, Tag_Code={test_row.get('Tag_Code', 'None')}")
-                
-                # 새로운 태그 코드 체계 적용
-                if 'Tag_Code' in daily_data.columns:
-                    # Tag_Code 기반 활동 분류
-                    # G1~G4: 근무영역, N1~N2: 비근무영역, T1~T3: 이동구간
-                    # Tag_Code가 없는 경우 정문 태그를 수동으로 매핑
-                    # 디버깅: Tag_Code 상태 확인
-                    Tag_Code_na_count = daily_data['Tag_Code'].isna().sum()
-                    self.logger.info(f"Tag_Code가 없는 레코드: {Tag_Code_na_count}건")
-                    
-                    # 정문 데이터 확인
-                    gate_data = daily_data[daily_data['DR_NM'].str.contains('정문|SPEED\s*GATE', case=False, na=False, regex=True)]
-                    if not gate_data.empty:
-                        self.logger.info(f"정문 관련 데이터 {len(gate_data)}건 발견:")
-                        for idx, row in gate_data.head(3).iterrows():
-                            self.logger.info(f"  - {row['datetime']}: DR_NM={row['DR_NM']}, Tag_Code={row.get('Tag_Code')}, INOUT_GB={row.get('INOUT_GB')}")
-                    
-                    # 매칭 후 특별 처리: 정문/SPEED GATE는 무조건 T2/T3로 매핑
-                    # 정문 입문 -> T2
-                    gate_entry_mask = (daily_data['DR_NM'].str.contains('정문|SPEED\s*GATE', case=False, na=False, regex=True)) & \
-                                    (daily_data['INOUT_GB'] == '입문')
-                    if gate_entry_mask.any():
-                        daily_data.loc[gate_entry_mask, 'Tag_Code'] = 'T2'
-                        self.logger.info(f"정문 입문 {gate_entry_mask.sum()}건을 강제로 T2로 매핑")
-                    
-                    # 정문 출문 -> T3
-                    gate_exit_mask = (daily_data['DR_NM'].str.contains('정문|SPEED\s*GATE', case=False, na=False, regex=True)) & \
-                                    (daily_data['INOUT_GB'] == '출문')
-                    if gate_exit_mask.any():
-                        daily_data.loc[gate_exit_mask, 'Tag_Code'] = 'T3'
-                        self.logger.info(f"정문 출문 {gate_exit_mask.sum()}건을 강제로 T3로 매핑")
-                    
-                    # Tag_Code가 없거나 잘못된 정문 데이터를 찾기
-                    gate_entry_mask = ((daily_data['Tag_Code'].isna()) | (daily_data['Tag_Code'] != 'T2')) & \
-                                    (daily_data['DR_NM'].str.contains('정문|SPEED\s*GATE', case=False, na=False, regex=True)) & \
-                                    (daily_data['INOUT_GB'] == '입문')
-                    gate_exit_mask = ((daily_data['Tag_Code'].isna()) | (daily_data['Tag_Code'] != 'T3')) & \
-                                   (daily_data['DR_NM'].str.contains('정문|SPEED\s*GATE', case=False, na=False, regex=True)) & \
-                                   (daily_data['INOUT_GB'] == '출문')
-                    
-                    # 정문 태그 매핑
-                    if gate_entry_mask.any():
-                        daily_data.loc[gate_entry_mask, 'Tag_Code'] = 'T2'
-                        self.logger.info(f"Tag_Code 누락된 정문 입문을 T2로 매핑: {gate_entry_mask.sum()}건")
-                    
-                    if gate_exit_mask.any():
-                        daily_data.loc[gate_exit_mask, 'Tag_Code'] = 'T3'
-                        self.logger.info(f"Tag_Code 누락된 정문 출문을 T3로 매핑: {gate_exit_mask.sum()}건")
-                    
-                    # 태그 기반 시스템에서는 DR_NM 키워드로 Tag_Code를 강제 변경하지 않음
-                    # M1/M2 태그는 마스터 데이터에서만 할당됨
-                    
-                    # Tag_Code를 Tag_Code로 복사 (기본값은 G1)
-                    daily_data['Tag_Code'] = daily_data['Tag_Code'].fillna('G1')
-                    
-                    # 디버깅: Tag_Code 설정 후 확인
-                    gate_tags = daily_data[daily_data['DR_NM'].str.contains('정문|SPEED GATE', case=False, na=False)]
-                    if not gate_tags.empty:
-                        self.logger.info(f"정문/SPEED GATE 태그 설정 확인:")
-                        for idx, row in gate_tags.head().iterrows():
-                            self.logger.info(f"  - {row['datetime']}: {row['DR_NM']} -> Tag_Code={row.get('Tag_Code', 'N/A')}, Tag_Code={row.get('Tag_Code', 'N/A')}")
-                    
-                    # 디버깅: 701-10-1-1의 Tag_Code 확인
-                    gate_701_after = daily_data[daily_data['DR_NO'] == '701-10-1-1']
-                    if not gate_701_after.empty:
-                        self.logger.info(f"[조인 후] 701-10-1-1의 Tag_Code 설정됨:")
-                        for idx, row in gate_701_after.head().iterrows():
-                            self.logger.info(f"  - {row['datetime']}: Tag_Code={row.get('Tag_Code')}, Tag_Code={row.get('Tag_Code')}, INOUT_GB={row.get('INOUT_GB')}")
-                    daily_data['space_type'] = daily_data['공간구분_NM'].fillna('근무영역')  # 기본값
-                    daily_data['detail_type'] = daily_data['세부유형_NM'].fillna('주업무공간')  # 기본값
-                    daily_data['allowed_activities'] = daily_data['라벨링_활동'].fillna('업무, 식사, 휴게')  # 기본값
-                    
-                    # 기존 컬럼과의 호환성 유지
-                    # Tag_Code를 기반으로 work_area_type 설정
-                    daily_data.loc[daily_data['Tag_Code'].str.startswith('G'), 'work_area_type'] = 'Y'  # 근무영역
-                    daily_data.loc[daily_data['Tag_Code'].str.startswith('N'), 'work_area_type'] = 'N'  # 비근무영역
-                    daily_data.loc[daily_data['Tag_Code'].str.startswith('T'), 'work_area_type'] = 'T'  # 이동구간
-                else:
-                    # 기존 방식 유지 (호환성)
-                    if '근무구역여부' in daily_data.columns:
-                        daily_data['work_area_type'] = daily_data['근무구역여부'].fillna('Y')
-                    if '근무' in daily_data.columns:
-                        daily_data['work_status'] = daily_data['근무'].fillna('W')
-                    if '라벨링' in daily_data.columns:
-                        daily_data['activity_label'] = daily_data['라벨링'].fillna('YW')
-                        
-                        # 라벨링이 T2/T3가 아닌 경우, 정문 태그를 수동으로 매핑
-                        gate_entry_mask = (daily_data['DR_NM'].str.contains('정문|SPEED\s*GATE', case=False, na=False, regex=True)) & \
-                                        (daily_data['INOUT_GB'] == '입문')
-                        gate_exit_mask = (daily_data['DR_NM'].str.contains('정문|SPEED\s*GATE', case=False, na=False, regex=True)) & \
-                                       (daily_data['INOUT_GB'] == '출문')
-                        
-                        if gate_entry_mask.any():
-                            daily_data.loc[gate_entry_mask, 'Tag_Code'] = 'T2'
-                            self.logger.info(f"정문 입문을 T2로 매핑: {gate_entry_mask.sum()}건")
-                        
-                        if gate_exit_mask.any():
-                            daily_data.loc[gate_exit_mask, 'Tag_Code'] = 'T3'
-                            self.logger.info(f"정문 출문을 T3로 매핑: {gate_exit_mask.sum()}건")
-                
-                # Tag_Code 기반 기본 활동 분류
-                if 'Tag_Code' in daily_data.columns:
-                    # G1: 주업무공간 -> 업무
-                    daily_data.loc[daily_data['Tag_Code'] == 'G1', 'activity_code'] = 'WORK'
-                    
-                    # G2: 보조업무공간 -> 준비
-                    daily_data.loc[daily_data['Tag_Code'] == 'G2', 'activity_code'] = 'WORK_PREPARATION'
-                    
-                    # G3: 협업공간 -> 회의
-                    daily_data.loc[daily_data['Tag_Code'] == 'G3', 'activity_code'] = 'MEETING'
-                    
-                    # G4: 교육공간 -> 교육
-                    daily_data.loc[daily_data['Tag_Code'] == 'G4', 'activity_code'] = 'TRAINING'
-                    
-                    # N1: 휴게공간 -> 휴게
-                    daily_data.loc[daily_data['Tag_Code'] == 'N1', 'activity_code'] = 'REST'
-                    
-                    # N2: 복지공간 -> 휴게
-                    daily_data.loc[daily_data['Tag_Code'] == 'N2', 'activity_code'] = 'REST'
-                    
-                    # T1: 건물/구역 연결 -> 짧은 시간만 이동으로 분류
-                    t1_mask = daily_data['Tag_Code'] == 'T1'
-                    if t1_mask.any():
-                        # T1 태그의 duration을 확인하여 짧은 것만 이동으로 분류
-                        t1_movement_count = 0
-                        t1_work_count = 0
-                        for idx in daily_data[t1_mask].index:
-                            duration = daily_data.loc[idx, 'duration_minutes'] if 'duration_minutes' in daily_data.columns else 0
-                            if pd.isna(duration) or duration <= 10:  # 10분 이하만 이동
-                                daily_data.loc[idx, 'activity_code'] = 'MOVEMENT'
-                                t1_movement_count += 1
-                            else:  # 10분 초과는 작업으로 분류
-                                daily_data.loc[idx, 'activity_code'] = 'WORK'
-                                t1_work_count += 1
-                        self.logger.info(f"🔍 T1 태그 처리: 총 {t1_mask.sum()}건 → MOVEMENT {t1_movement_count}건, WORK {t1_work_count}건")
-                    
-                    # T2: 출입포인트(IN) -> 출근으로 처리
-                    t2_mask = daily_data['Tag_Code'] == 'T2'
-                    if t2_mask.any():
-                        # T2는 무조건 COMMUTE_IN으로 처리 (시간대 제한 제거)
-                        daily_data.loc[t2_mask, 'activity_code'] = 'COMMUTE_IN'
-                        daily_data.loc[t2_mask, 'activity_type'] = 'commute'
-                        daily_data.loc[t2_mask, 'confidence'] = 100
-                        daily_data.loc[t2_mask, 'activity_label'] = ''  # YW 대신 빈 문자열로 설정
-                        activity_type_obj = get_activity_type('COMMUTE_IN')
-                        if activity_type_obj:
-                            daily_data.loc[t2_mask, '활동분류'] = activity_type_obj.name_ko
-                        self.logger.info(f"T2 태그 처리: {t2_mask.sum()}건 -> 모두 COMMUTE_IN으로 설정")
-                        
-                        # 디버깅: T2 태그 처리 결과 확인
-                        t2_data_after = daily_data[t2_mask]
-                        if not t2_data_after.empty:
-                            self.logger.info(f"[T2 처리 후] 활동 분류 결과:")
-                            for idx, row in t2_data_after.head().iterrows():
-                                self.logger.info(f"  - {row['datetime']}: activity_code={row.get('activity_code')}, DR_NM={row.get('DR_NM')}")
-                        
-                        # T2 태그는 식사로 분류되지 않도록 표시
-                        daily_data.loc[t2_mask, 'protected_from_meal'] = True
-                    
-                    # T3: 출입포인트(OUT) -> 시간대별 출퇴근 처리
-                    t3_mask = daily_data['Tag_Code'] == 'T3'
-                    if t3_mask.any():
-                        for idx in daily_data[t3_mask].index:
-                            hour = daily_data.loc[idx, 'datetime'].hour
-                            # 야간 근무자는 5-10시 퇴근, 일반 근무자는 17-22시 퇴근
-                            if (work_type == 'night_shift' and 5 <= hour <= 10) or \
-                               (work_type != 'night_shift' and 17 <= hour <= 22):
-                                daily_data.loc[idx, 'activity_code'] = 'COMMUTE_OUT'
-                                daily_data.loc[idx, 'activity_type'] = 'commute'
-                                daily_data.loc[idx, 'confidence'] = 100
-                            else:
-                                daily_data.loc[idx, 'activity_code'] = 'MOVEMENT'
-                                daily_data.loc[idx, 'activity_type'] = 'movement'
-                        self.logger.info(f"T3 태그 처리: {t3_mask.sum()}건")
-                        
-                        # T3 태그는 식사로 분류되지 않도록 표시
-                        daily_data.loc[t3_mask, 'protected_from_meal'] = True
-                
-                # 이미 위에서 정문 태그를 처리했으므로 이 부분은 삭제
-                else:
-                    # 기존 라벨링 기반 분류 (호환성)
-                    if 'activity_label' in daily_data.columns:
-                        # GM: 근무구역 중 1선게이트로 들어옴 (이동)
-                        daily_data.loc[daily_data['activity_label'] == 'GM', 'activity_code'] = 'MOVEMENT'
-                        
-                        # NM: 비근무구역에서 이동중
-                        daily_data.loc[daily_data['activity_label'] == 'NM', 'activity_code'] = 'MOVEMENT'
-                        
-                        # YW: 근무구역에서 근무중
-                        daily_data.loc[daily_data['activity_label'] == 'YW', 'activity_code'] = 'WORK'
-                        
-                        # NN: 비근무구역에서 비근무중 (휴식)
-                        daily_data.loc[daily_data['activity_label'] == 'NN', 'activity_code'] = 'REST'
-                        
-                        # YM: 근무구역에서 이동중 -> 짧은 시간만 이동으로 분류
-                        ym_mask = daily_data['activity_label'] == 'YM'
-                        if ym_mask.any():
-                            ym_movement_count = 0
-                            ym_work_count = 0
-                            for idx in daily_data[ym_mask].index:
-                                duration = daily_data.loc[idx, 'duration_minutes'] if 'duration_minutes' in daily_data.columns else 0
-                                if pd.isna(duration) or duration <= 15:  # 15분 이하만 이동
-                                    daily_data.loc[idx, 'activity_code'] = 'MOVEMENT'
-                                    ym_movement_count += 1
-                                else:  # 15분 초과는 작업으로 분류 (근무구역에서 장시간)
-                                    daily_data.loc[idx, 'activity_code'] = 'WORK'
-                                    ym_work_count += 1
-                            self.logger.info(f"🔍 YM 태그 처리: 총 {ym_mask.sum()}건 → MOVEMENT {ym_movement_count}건, WORK {ym_work_count}건")
-            
-            # HMM 분류기 사용 전에 is_actual_meal 플래그 확인
-            if 'is_actual_meal' not in daily_data.columns:
-                daily_data['is_actual_meal'] = False
-            
-            # HMM 분류 전에 식사 관련 태그 미리 표시하여 HMM이 잘못 분류하지 않도록 함
-            meal_mask = (daily_data['INOUT_GB'] == '식사') | (daily_data['is_actual_meal'] == True)
-            if meal_mask.any():
-                self.logger.info("HMM 분류 전 식사 관련 태그 사전 처리")
-                
-                # 연속된 식사를 그룹으로 처리
-                meal_groups = []
-                in_meal = False
-                current_group = []
-                
-                for idx in daily_data.index:
-                    if meal_mask[idx]:
-                        if not in_meal:
-                            in_meal = True
-                            current_group = [idx]
-                        else:
-                            current_group.append(idx)
-                    else:
-                        if in_meal and current_group:
-                            meal_groups.append(current_group)
-                            in_meal = False
-                            current_group = []
-                
-                if in_meal and current_group:
-                    meal_groups.append(current_group)
-                
-                # 각 식사 그룹에 대해 전후 처리
-                for group in meal_groups:
-                    first_meal_time = daily_data.loc[group[0], 'datetime']
-                    last_meal_time = daily_data.loc[group[-1], 'datetime']
-                    
-                    # 식사 전 출문은 MOVEMENT로 강제 설정 (원래대로 복원)
-                    before_mask = (
-                        (daily_data['datetime'] >= first_meal_time - timedelta(minutes=30)) & 
-                        (daily_data['datetime'] < first_meal_time) &
-                        (daily_data['INOUT_GB'] == '출문')
-                    )
-                    if before_mask.any():
-                        # 디버깅: 변경 전 상태 확인
-                        for idx in daily_data[before_mask].index:
-                            prev_code = daily_data.loc[idx, 'activity_code']
-                            self.logger.info(f"식사 전 출문 사전 설정 - {daily_data.loc[idx, 'datetime']}: {prev_code} -> MOVEMENT")
-                        
-                        daily_data.loc[before_mask, 'activity_code'] = 'MOVEMENT'
-                        daily_data.loc[before_mask, 'confidence'] = 95
-                        self.logger.info(f"식사 전 출문 사전 설정 완료: {before_mask.sum()}건")
-                    
-                    # 식사 후 첫 입문은 WORK로 강제 설정
-                    after_mask = (
-                        (daily_data['datetime'] > last_meal_time) & 
-                        (daily_data['datetime'] <= last_meal_time + timedelta(minutes=30)) &
-                        (daily_data['INOUT_GB'] == '입문')
-                    )
-                    if after_mask.any():
-                        first_idx = daily_data[after_mask].index[0]
-                        daily_data.loc[first_idx, 'activity_code'] = 'WORK'
-                        daily_data.loc[first_idx, 'confidence'] = 95
-                        self.logger.info(f"식사 후 입문 사전 설정: {daily_data.loc[first_idx, 'datetime']}")
-            
-            # HMM 분류기 비활성화 - 태그 기반 규칙만 사용
-            # HMM은 태그 기반 시스템과 충돌하므로 사용하지 않음
-            # 참조: /Users/hanskim/Project/SambioHR2/태그 기반 근무유형 분석 시스템 - 참조 문서.md
-            self.logger.info("HMM 분류 대신 태그 기반 규칙 사용")
-            
-            # 디버깅: 스피드게이트 태그 확인
-            speed_gate_data = daily_data[daily_data['DR_NM'].str.contains('SPEED GATE', case=False, na=False)]
-            if not speed_gate_data.empty:
-                self.logger.info(f"스피드게이트 태그 {len(speed_gate_data)}개 발견:")
-                for idx, row in speed_gate_data.iterrows():
-                    self.logger.info(f"  - {row['datetime']}: {row['DR_NM']}, Tag_Code={row.get('Tag_Code', 'N/A')}, activity={row['activity_code']}")
-            
-            # 태그 기반 규칙 적용
-            try:
-                daily_data = self._apply_tag_based_rules(daily_data, tag_location_master)
-                
-                # 태그 기반 규칙 적용 후 추가 확인
-                # T2/T3 태그가 제대로 설정된 경우 확인
-                t2_count = (daily_data['Tag_Code'] == 'T2').sum()
-                t3_count = (daily_data['Tag_Code'] == 'T3').sum()
-                self.logger.info(f"태그 기반 규칙 적용 후: T2 태그 {t2_count}건, T3 태그 {t3_count}건")
-                
-                # T2 태그의 activity_code 확인
-                t2_data = daily_data[daily_data['Tag_Code'] == 'T2']
-                if not t2_data.empty:
-                    self.logger.info(f"T2 태그의 activity_code 상태:")
-                    for idx, row in t2_data.head(3).iterrows():
-                        self.logger.info(f"  - {row['datetime']}: activity_code={row.get('activity_code', 'N/A')}, DR_NM={row['DR_NM']}")
-                
-                # 디버깅: 태그 기반 규칙 후에도 정문 태그가 WORK로 되어 있는지 확인
-                gate_work_mask = daily_data['DR_NM'].str.contains('정문|SPEED GATE', case=False, na=False) & \
-                                (daily_data['activity_code'] == 'WORK')
-                if gate_work_mask.any():
-                    self.logger.warning(f"태그 기반 규칙 후에도 정문 태그가 WORK로 분류됨: {gate_work_mask.sum()}건")
-                    for idx in daily_data[gate_work_mask].index:
-                        self.logger.warning(f"  - {daily_data.loc[idx, 'datetime']} at {daily_data.loc[idx, 'DR_NM']}, Tag_Code={daily_data.loc[idx, 'Tag_Code']}")
-                
-                # 실제 식사 태그가 없는데 식사로 분류된 경우 확인
-                if 'is_actual_meal' in daily_data.columns:
-                    false_meals = daily_data[
-                        (daily_data['activity_code'].isin(['BREAKFAST', 'LUNCH', 'DINNER', 'MIDNIGHT_MEAL'])) &
-                        (~daily_data['is_actual_meal'])
-                    ]
-                    if not false_meals.empty:
-                        self.logger.warning(f"식사 태그 없이 식사로 분류된 건수: {len(false_meals)}")
-                        for idx, row in false_meals.iterrows():
-                            self.logger.warning(f"  - {row['datetime']}: {row['DR_NM']} -> {row['activity_code']}")
-                
-                # 식사 태그가 없는데 식사로 분류된 경우 강제로 수정
-                if 'is_actual_meal' in daily_data.columns:
-                    false_meal_mask = (
-                        daily_data['activity_code'].isin(['BREAKFAST', 'LUNCH', 'DINNER', 'MIDNIGHT_MEAL']) &
-                        (~daily_data['is_actual_meal'])
-                    )
-                    if false_meal_mask.any():
-                        self.logger.info(f"식사 태그 없이 분류된 {false_meal_mask.sum()}건을 수정")
-                        # 스피드게이트 입문이면 COMMUTE_IN으로
-                        gate_in_mask = false_meal_mask & daily_data['DR_NM'].str.contains('SPEED GATE.*입문|정문.*입문', case=False, na=False)
-                        daily_data.loc[gate_in_mask, 'activity_code'] = 'COMMUTE_IN'
-                        daily_data.loc[gate_in_mask, 'confidence'] = 100
-                        
-                        # 나머지는 WORK로
-                        other_mask = false_meal_mask & (~gate_in_mask)
-                        daily_data.loc[other_mask, 'activity_code'] = 'WORK'
-                        daily_data.loc[other_mask, 'confidence'] = 85
-                
-                # 스피드게이트 입문을 출근으로 강제 수정 (추가 확인)
-                speed_gate_mask = daily_data['DR_NM'].str.contains('SPEED GATE.*입문|정문.*입문', case=False, na=False)
-                if speed_gate_mask.any():
-                    self.logger.info(f"게이트 입문 {speed_gate_mask.sum()}건을 수정")
-                    # 시간대에 따른 분류
-                    for idx in daily_data[speed_gate_mask].index:
-                        hour = daily_data.loc[idx, 'datetime'].hour
-                        if work_type == 'night_shift' and 17 <= hour <= 22:  # 야간 근무자는 저녁 출근
-                            daily_data.loc[idx, 'activity_code'] = 'COMMUTE_IN'
-                            daily_data.loc[idx, 'confidence'] = 100
-                        elif work_type != 'night_shift' and 5 <= hour < 10:  # 일반 근무자는 아침 출근
-                            daily_data.loc[idx, 'activity_code'] = 'COMMUTE_IN'
-                            daily_data.loc[idx, 'confidence'] = 100
-                        else:  # 그 외 시간대는 이동
-                            daily_data.loc[idx, 'activity_code'] = 'MOVEMENT'
-                            daily_data.loc[idx, 'confidence'] = 90
-                
-                # 스피드게이트/정문 출문을 퇴근으로 처리
-                gate_exit_mask = daily_data['DR_NM'].str.contains('SPEED GATE.*출문|정문.*출문', case=False, na=False)
-                if gate_exit_mask.any():
-                    self.logger.info(f"게이트 출문 {gate_exit_mask.sum()}건을 수정")
-                    # 시간대에 따른 분류
-                    for idx in daily_data[gate_exit_mask].index:
-                        hour = daily_data.loc[idx, 'datetime'].hour
-                        if work_type == 'night_shift' and 5 <= hour <= 10:  # 야간 근무자는 아침 퇴근
-                            daily_data.loc[idx, 'activity_code'] = 'COMMUTE_OUT'
-                            daily_data.loc[idx, 'confidence'] = 100
-                        elif work_type != 'night_shift' and 17 <= hour <= 22:  # 일반 근무자는 저녁 퇴근
-                            daily_data.loc[idx, 'activity_code'] = 'COMMUTE_OUT'
-                            daily_data.loc[idx, 'confidence'] = 100
-                
-                # 식사 전후 출문/입문 처리
-                # 1. 식사 그룹 찾기 (연속된 식사 태그를 하나의 그룹으로)
-                meal_mask = (daily_data['activity_code'].isin(['BREAKFAST', 'LUNCH', 'DINNER', 'MIDNIGHT_MEAL'])) | (daily_data['INOUT_GB'] == '식사')
-                meal_groups = []
-                
-                if meal_mask.any():
-                    # 연속된 식사 태그를 그룹으로 묶기
-                    in_meal_group = False
-                    current_group = []
-                    
-                    for idx in daily_data.index:
-                        if meal_mask[idx]:
-                            if not in_meal_group:
-                                in_meal_group = True
-                                current_group = [idx]
-                            else:
-                                current_group.append(idx)
-                        else:
-                            if in_meal_group:
-                                # 식사 그룹 종료
-                                meal_groups.append(current_group)
-                                in_meal_group = False
-                                current_group = []
-                    
-                    # 마지막 그룹 처리
-                    if in_meal_group and current_group:
-                        meal_groups.append(current_group)
-                
-                self.logger.info(f"식사 그룹 {len(meal_groups)}개 발견")
-                
-                # 2. 각 식사 그룹에 대해 전후 처리
-                for group in meal_groups:
-                    # 그룹의 첫 식사 시간과 마지막 식사 시간
-                    first_meal_time = daily_data.loc[group[0], 'datetime']
-                    last_meal_time = daily_data.loc[group[-1], 'datetime']
-                    
-                    # 식사 전 출문 처리 (첫 식사 기준)
-                    before_meal_mask = (
-                        (daily_data['datetime'] >= first_meal_time - timedelta(minutes=30)) & 
-                        (daily_data['datetime'] < first_meal_time) &
-                        (daily_data['INOUT_GB'] == '출문')
-                    )
-                    if before_meal_mask.any():
-                        for idx in daily_data[before_meal_mask].index:
-                            prev_code = daily_data.loc[idx, 'activity_code']
-                            daily_data.loc[idx, 'activity_code'] = 'MOVEMENT'
-                            daily_data.loc[idx, 'confidence'] = 90
-                            self.logger.info(f"식사 전 출문 처리: {daily_data.loc[idx, 'datetime']} (이전: {prev_code} -> MOVEMENT)")
-                    
-                    # 식사 후 입문 처리 (마지막 식사 기준)
-                    after_meal_mask = (
-                        (daily_data['datetime'] > last_meal_time) & 
-                        (daily_data['datetime'] <= last_meal_time + timedelta(minutes=30)) &
-                        (daily_data['INOUT_GB'] == '입문')
-                    )
-                    if after_meal_mask.any():
-                        # 식사 후 최초 입문만 업무 복귀로
-                        first_entry_idx = daily_data[after_meal_mask].index[0]
-                        prev_code = daily_data.loc[first_entry_idx, 'activity_code']
-                        if prev_code != 'COMMUTE_IN':
-                            daily_data.loc[first_entry_idx, 'activity_code'] = 'WORK'
-                            daily_data.loc[first_entry_idx, 'confidence'] = 95
-                            self.logger.info(f"식사 후 업무복귀 처리: {daily_data.loc[first_entry_idx, 'datetime']} (이전: {prev_code} -> WORK)")
-                
-                # meal_indices 초기화 (meal_groups를 사용)
-                meal_indices = []
-                for group in meal_groups:
-                    meal_indices.extend(group)
-                self.logger.info(f"식사 태그 {len(meal_indices)}개 발견")
-                
-                # 디버깅: 식사 전후 출문/입문 데이터 확인
-                for idx in daily_data.index:
-                    time_obj = daily_data.loc[idx, 'datetime'].time()
-                    time_str = time_obj.strftime('%H:%M')
-                    # 문제가 되는 시간대 확인
-                    if time_str in ['07:39', '12:16', '17:37', '07:48', '12:33']:
-                        self.logger.info(f"{time_obj} 데이터 발견 - 식사 처리 전: activity_code={daily_data.loc[idx, 'activity_code']}, INOUT_GB={daily_data.loc[idx, 'INOUT_GB']}")
-                
-                for meal_idx in meal_indices:
-                    # 식사 후 30분 이내의 입문 태그 찾기
-                    meal_time = daily_data.loc[meal_idx, 'datetime']
-                    meal_code = daily_data.loc[meal_idx, 'activity_code']
-                    self.logger.info(f"식사 확인: {meal_time} - {meal_code}")
-                    
-                    after_meal_mask = (
-                        (daily_data['datetime'] > meal_time) & 
-                        (daily_data['datetime'] <= meal_time + timedelta(minutes=30)) &
-                        (daily_data['INOUT_GB'] == '입문')
-                    )
-                    
-                    if after_meal_mask.any():
-                        self.logger.info(f"식사 후 입문 태그 {after_meal_mask.sum()}개 발견")
-                        # 식사 후 최초 입문은 무조건 업무 복귀
-                        for idx in daily_data[after_meal_mask].index:
-                            prev_code = daily_data.loc[idx, 'activity_code']
-                            # 이미 출근으로 분류된 경우는 제외
-                            if prev_code != 'COMMUTE_IN':
-                                daily_data.loc[idx, 'activity_code'] = 'WORK'
-                                daily_data.loc[idx, 'confidence'] = 95
-                                self.logger.info(f"식사 후 업무복귀 처리: {daily_data.loc[idx, 'datetime']} - {daily_data.loc[idx, 'DR_NM']} (이전: {prev_code} -> WORK)")
-                                
-                                # 디버깅: 변경 확인
-                                time_obj = daily_data.loc[idx, 'datetime'].time()
-                                if (time_obj.hour == 12 and time_obj.minute == 33) or (time_obj.hour == 12 and time_obj.minute == 49):
-                                    self.logger.info(f"{time_obj} 데이터 - 처리 후: activity_code={daily_data.loc[idx, 'activity_code']}")
-                                break  # 첫 번째 입문만 처리
-                
-                self.logger.info("태그 기반 분류 성공")
-            except Exception as hmm_error:
-                self.logger.warning(f"태그 기반 분류 실패, 규칙 기반으로 대체: {hmm_error}")
-                # 규칙 기반 분류로 폴백
-                daily_data = self._apply_rule_based_classification(daily_data, tag_location_master)
-            
-            # 태그 기반 분류 후 Tag_Code가 T2/T3인 게이트를 강제로 출퇴근으로 설정
-            if 'Tag_Code' in daily_data.columns:
-                # T2 (출입포인트-IN) 태그를 출근으로 강제 설정
-                t2_mask = (daily_data['Tag_Code'] == 'T2')
-                if t2_mask.any():
-                    t2_wrong = t2_mask & (~daily_data['activity_code'].isin(['COMMUTE_IN']))
-                    if t2_wrong.any():
-                        # self.logger.warning(f"태그 기반 분류 후 T2 태그 {t2_wrong.sum()}건을 COMMUTE_IN으로 수정")
-                        daily_data.loc[t2_wrong, 'activity_code'] = 'COMMUTE_IN'
-                        daily_data.loc[t2_wrong, 'activity_type'] = 'commute'
-                        daily_data.loc[t2_wrong, 'confidence'] = 100
-                
-                # T3 (출입포인트-OUT) 태그를 퇴근으로 강제 설정
-                t3_mask = (daily_data['Tag_Code'] == 'T3')
-                if t3_mask.any():
-                    t3_wrong = t3_mask & (~daily_data['activity_code'].isin(['COMMUTE_OUT']))
-                    if t3_wrong.any():
-                        self.logger.warning(f"태그 기반 분류 후 T3 태그 {t3_wrong.sum()}건을 COMMUTE_OUT으로 수정")
-                        daily_data.loc[t3_wrong, 'activity_code'] = 'COMMUTE_OUT'
-                        daily_data.loc[t3_wrong, 'activity_type'] = 'commute'
-                        daily_data.loc[t3_wrong, 'confidence'] = 100
-            
-            # Tag_Code 기반 신뢰도 세분화
-            if 'Tag_Code' in daily_data.columns:
-                # T2, T3 (출퇴근 포인트)는 가장 확실한 데이터 - 100%
-                daily_data.loc[daily_data['Tag_Code'].isin(['T2', 'T3']), 'confidence'] = 100
-                
-                # G3 (협업공간), G4 (교육공간)는 명확한 활동 - 95%
-                daily_data.loc[daily_data['Tag_Code'].isin(['G3', 'G4']), 'confidence'] = 95
-                
-                # G1 (주업무공간), G2 (보조업무공간)는 일반 작업 - 90%
-                daily_data.loc[daily_data['Tag_Code'].isin(['G1', 'G2']), 'confidence'] = 90
-                
-                # N1, N2 (휴게/복지공간) - 90%
-                daily_data.loc[daily_data['Tag_Code'].isin(['N1', 'N2']), 'confidence'] = 90
-                
-                # T1 (내부 이동) - 85%
-                daily_data.loc[daily_data['Tag_Code'] == 'T1', 'confidence'] = 85
-            
-            # 우선순위 기반 상세 활동 분류
-            # 참고: Tag_Code T2(출근), T3(퇴근)이 이미 설정되어 있으므로, 
-            # 더 정확한 출퇴근 시간대 검증만 추가
-            
-            # 0. M1/M2 태그 기반 식사 분류 (최우선) - 확정적 규칙 엔진 사용
-            # M1: 바이오플라자 식사, M2: 테이크아웃
-            if 'Tag_Code' in daily_data.columns:
-                m1_mask = daily_data['Tag_Code'] == 'M1'
-                m2_mask = daily_data['Tag_Code'] == 'M2'
-                
-                if m1_mask.any() or m2_mask.any():
-                    self.logger.info(f"M1 태그 {m1_mask.sum()}건, M2 태그 {m2_mask.sum()}건 발견 - 확정적 규칙 엔진 적용")
-                    
-                    # M1/M2 태그가 있는 행의 정보 출력
-                    for idx in daily_data[m1_mask | m2_mask].index[:5]:
-                        self.logger.info(f"  - {daily_data.loc[idx, 'datetime']}: {daily_data.loc[idx, 'DR_NM']} (Tag_Code={daily_data.loc[idx, 'Tag_Code']})")
-                    
-                    # 확정적 규칙 엔진 가져오기
-                    rule_integration = get_rule_integration()
-                    
-                    # M1/M2 태그에 대해 시간대별 식사 분류 및 duration 계산
-                    for idx in daily_data[m1_mask | m2_mask].index:
-                        hour = daily_data.loc[idx, 'datetime'].hour
-                        minute = daily_data.loc[idx, 'datetime'].minute
-                        time_in_minutes = hour * 60 + minute
-                        
-                        # 다음 태그까지의 시간 계산
-                        idx_position = daily_data.index.get_loc(idx)
-                        to_next_minutes = None
-                        if idx_position + 1 < len(daily_data):
-                            next_idx = daily_data.index[idx_position + 1]
-                            time_diff = (daily_data.loc[next_idx, 'datetime'] - daily_data.loc[idx, 'datetime']).total_seconds() / 60
-                            to_next_minutes = time_diff
-                        
-                        # 규칙 엔진을 통한 식사 시간 계산
-                        meal_duration = rule_integration.get_meal_duration(
-                            daily_data.loc[idx, 'Tag_Code'],
-                            to_next_minutes
-                        )
-                        
-                        # duration_minutes 설정 (activity_summary 계산에 사용됨)
-                        daily_data.loc[idx, 'duration_minutes'] = meal_duration
-                        self.logger.info(f"[M1/M2 duration 설정] idx={idx}, tag={daily_data.loc[idx, 'Tag_Code']}, "
-                                        f"duration_minutes={meal_duration}, to_next_minutes={to_next_minutes}")
-                        
-                        # M1/M2 태그는 식사로 분류하지만 시간대별 activity_code는 설정하지 않음
-                        # 태그 기반 시스템에서는 Tag_Code가 분류의 기준
-                        daily_data.loc[idx, 'activity_code'] = 'MEAL'  # 일반 식사 활동
-                        daily_data.loc[idx, '활동분류'] = '식사중'
-                        
-                        # M1/M2 태그 기반이므로 높은 신뢰도
-                        daily_data.loc[idx, 'confidence'] = 100
-                        daily_data.loc[idx, 'is_actual_meal'] = True
-                        daily_data.loc[idx, 'activity_type'] = 'meal'
-                        
-                        # M2는 테이크아웃
-                        if daily_data.loc[idx, 'Tag_Code'] == 'M2':
-                            daily_data.loc[idx, 'is_takeout'] = True
-                            self.logger.info(f"M2 테이크아웃 - {daily_data.loc[idx, 'datetime']}: {daily_data.loc[idx, 'activity_code']} (duration: {meal_duration}분)")
-            
-            # 1. 식사시간 분류 - 태그 기반 시스템에서는 M1/M2 태그만 식사로 분류
-            # 실제 식사 데이터는 검증용으로만 사용하고, 태그를 변경하지 않음
-            # 🚨 중요: 태그 기반 시스템에서는 마스터 데이터의 Tag_Code를 변경하지 않음
-            meal_data = None
-            if employee_id and selected_date:
-                meal_data = self.get_meal_data(employee_id, selected_date)
-            
-            if meal_data is not None and not meal_data.empty:
-                # 실제 식사 데이터는 로깅용으로만 사용
-                self.logger.info(f"식사 데이터 {len(meal_data)}건 확인 (태그 변경 없음)")
-                date_column = 'meal_datetime' if 'meal_datetime' in meal_data.columns else '취식일시'
-                category_column = 'meal_category' if 'meal_category' in meal_data.columns else '식사대분류'
-                
-                if date_column in meal_data.columns:
-                    meal_data[date_column] = pd.to_datetime(meal_data[date_column])
-                    
-                    # 각 식사별로 처리 - 🚨 태그 변경 로직 제거
-                    for _, meal in meal_data.iterrows():
-                        meal_time = meal[date_column]
-                        meal_category = meal.get(category_column, '')
-                        
-                        # 해당 시간대 근처의 M1/M2 태그만 확인 (태그 변경 없음)
-                        time_window = timedelta(minutes=15)
-                        nearby_tags = daily_data[
-                            (daily_data['datetime'] >= meal_time - time_window) &
-                            (daily_data['datetime'] <= meal_time + time_window) &
-                            (daily_data['Tag_Code'].isin(['M1', 'M2']))
-                        ]
-                        
-                        if not nearby_tags.empty:
-                            # M1/M2 태그가 있는 경우만 로깅 (태그 변경 없음)
-                            self.logger.info(f"식사 시간 {meal_time}에 M1/M2 태그 {len(nearby_tags)}개 확인 (태그 변경 없음)")
-                            
-                            # 실제 식사 데이터와 M1/M2 태그의 매칭 정보만 로깅
-                            for idx in nearby_tags.index:
-                                tag_time = daily_data.loc[idx, 'datetime']
-                                tag_code = daily_data.loc[idx, 'Tag_Code']
-                                self.logger.info(f"  - {tag_time}: Tag_Code={tag_code}, 식사 종류={meal_category}")
-            
-            # 식사 태그 데이터가 없는 경우에는 식사로 분류하지 않음
-            # 실제 식사 태그가 있는 경우에만 위에서 이미 처리됨
-            
-            # is_actual_meal 플래그 초기화 (식사 태그가 없는 경우 False)
-            if 'is_actual_meal' not in daily_data.columns:
-                daily_data['is_actual_meal'] = False
-            
-            # 식사 태그 중 위치명에 '테이크아웃'이 포함된 경우 is_takeout 설정
-            meal_tag_mask = (daily_data['INOUT_GB'] == '식사')
-            if meal_tag_mask.any():
-                takeout_location_mask = meal_tag_mask & daily_data['DR_NM'].str.contains('테이크아웃', case=False, na=False)
-                if takeout_location_mask.any():
-                    daily_data.loc[takeout_location_mask, 'is_takeout'] = True
-                    self.logger.info(f"위치명 기반 테이크아웃 설정: {takeout_location_mask.sum()}건")
-            
-            # 식사 활동의 신뢰도 조정
-            meal_activity_codes = ['BREAKFAST', 'LUNCH', 'DINNER', 'MIDNIGHT_MEAL']
-            meal_activity_mask = daily_data['activity_code'].isin(meal_activity_codes)
-            if meal_activity_mask.any() and 'Tag_Code' in daily_data.columns:
-                # 식사 활동이면서 Tag_Code가 G1인 경우만 95%로 상향 (나머지는 기존 유지)
-                daily_data.loc[meal_activity_mask & (daily_data['Tag_Code'] == 'G1'), 'confidence'] = 95
-            
-            # 1.5. 장비 사용 데이터 반영
-            if employee_id and selected_date:
-                equipment_data = self.get_employee_equipment_data(employee_id, selected_date)
-                if equipment_data is not None and not equipment_data.empty:
-                    self.logger.info(f"장비 사용 데이터 {len(equipment_data)}건을 활동 분류에 반영합니다.")
-                    
-                    # 장비 사용 시간대의 태그를 EQUIPMENT_OPERATION으로 변경
-                    for _, equip in equipment_data.iterrows():
-                        equip_time = pd.to_datetime(equip['timestamp'])
-                        system_type = equip.get('system_type', equip.get('system', ''))
-                        
-                        # 해당 시간대 근처의 태그 찾기 (±5분)
-                        time_window = timedelta(minutes=5)
-                        nearby_tags = daily_data[
-                            (daily_data['datetime'] >= equip_time - time_window) &
-                            (daily_data['datetime'] <= equip_time + time_window)
-                        ]
-                        
-                        if not nearby_tags.empty:
-                            # 가장 가까운 시간의 태그 찾기
-                            time_diffs = abs(nearby_tags['datetime'] - equip_time)
-                            closest_idx = time_diffs.idxmin()
-                            
-                            # 장비 조작으로 분류
-                            daily_data.loc[closest_idx, 'activity_code'] = 'EQUIPMENT_OPERATION'
-                            daily_data.loc[closest_idx, 'confidence'] = 98  # 실제 장비 사용 로그이므로 높은 신뢰도
-                            daily_data.loc[closest_idx, 'equipment_type'] = system_type
-                            
-                            # 장비 사용 세션 확장 (전후 10분간 같은 위치에 있었다면)
-                            session_start = equip_time - timedelta(minutes=10)
-                            session_end = equip_time + timedelta(minutes=10)
-                            session_mask = (
-                                (daily_data['datetime'] >= session_start) &
-                                (daily_data['datetime'] <= session_end) &
-                                (daily_data['DR_NO'] == daily_data.loc[closest_idx, 'DR_NO']) &
-                                (daily_data['activity_code'] == 'WORK')
-                            )
-                            daily_data.loc[session_mask, 'activity_code'] = 'EQUIPMENT_OPERATION'
-                            daily_data.loc[session_mask, 'confidence'] = 95
-                            daily_data.loc[session_mask, 'equipment_type'] = system_type
-            
-            # 2. 특수 활동 분류 (위치명 기반 세부 분류)
-            # 회의실
-            meeting_mask = daily_data['DR_NM'].str.contains('MEETING|회의|CONFERENCE', case=False, na=False)
-            daily_data.loc[meeting_mask, 'activity_code'] = 'MEETING'
-            # Tag_Code가 G3(협업공간)이 아닌 경우만 신뢰도 조정
-            if 'Tag_Code' in daily_data.columns:
-                daily_data.loc[meeting_mask & (daily_data['Tag_Code'] != 'G3'), 'confidence'] = 88
-            
-            # 피트니스/운동실
-            fitness_mask = daily_data['DR_NM'].str.contains('FITNESS|GYM|체력단련|운동실', case=False, na=False)
-            daily_data.loc[fitness_mask, 'activity_code'] = 'FITNESS'
-            # Tag_Code가 N2(복지공간)이 아닌 경우만 신뢰도 조정
-            if 'Tag_Code' in daily_data.columns:
-                daily_data.loc[fitness_mask & (daily_data['Tag_Code'] != 'N2'), 'confidence'] = 87
-            
-            # 장비실/기계실
-            equipment_mask = daily_data['DR_NM'].str.contains('EQUIPMENT|MACHINE|장비|기계실', case=False, na=False)
-            daily_data.loc[equipment_mask & (daily_data['activity_code'] == 'WORK'), 'activity_code'] = 'EQUIPMENT_OPERATION'
-            
-            # 작업준비실
-            prep_mask = daily_data['DR_NM'].str.contains('PREP|준비실|SETUP', case=False, na=False)
-            daily_data.loc[prep_mask & (daily_data['activity_code'] == 'WORK'), 'activity_code'] = 'WORK_PREPARATION'
-            
-            # 휴게실
-            rest_mask = daily_data['DR_NM'].str.contains('REST|LOUNGE|휴게실|탈의실', case=False, na=False)
-            daily_data.loc[rest_mask, 'activity_code'] = 'REST'
-            # Tag_Code가 N1(휴게공간)이 아닌 경우만 신뢰도 조정
-            if 'Tag_Code' in daily_data.columns:
-                daily_data.loc[rest_mask & (daily_data['Tag_Code'] != 'N1'), 'confidence'] = 86
-            
-            # 3. 집중근무 판별 (같은 작업 위치에 30분 이상 체류)
-            # 체류시간 계산 (M1/M2 태그는 위에서 이미 계산됨)
-            # M1/M2 태그와 Knox PIMS의 duration을 먼저 백업
-            if 'Tag_Code' in daily_data.columns:
-                m1_m2_mask = daily_data['Tag_Code'].isin(['M1', 'M2'])
-                m1_m2_durations = daily_data.loc[m1_m2_mask, 'duration_minutes'].copy() if 'duration_minutes' in daily_data.columns and m1_m2_mask.any() else pd.Series(dtype='float64')
-            
-            # Knox PIMS duration 백업
-            knox_pims_mask = pd.Series([False] * len(daily_data))
-            knox_durations = pd.Series(dtype='float64')
-            if 'source' in daily_data.columns:
-                knox_pims_mask = daily_data['source'] == 'knox_pims'
-                if knox_pims_mask.any() and 'knox_duration' in daily_data.columns:
-                    knox_durations = daily_data.loc[knox_pims_mask, 'knox_duration'].copy()
-            
-            daily_data['next_time'] = daily_data['datetime'].shift(-1)
-            daily_data['duration_minutes'] = (daily_data['next_time'] - daily_data['datetime']).dt.total_seconds() / 60
-            
-            # 🔍 Duration 계산 디버깅 (첫 번째 계산)
-            for idx in daily_data.index:
-                if '탕맛기픈' in str(daily_data.loc[idx, 'DR_NM']):
-                    self.logger.info(f"🔍 [1차 계산] 탕맛기픈 duration: {daily_data.loc[idx, 'datetime']} → {daily_data.loc[idx, 'duration_minutes']:.1f}분")
-            
-            # NaN 값 처리
-            daily_data['duration_minutes'] = daily_data['duration_minutes'].fillna(5)  # 기본값 5분
-            
-            # 마지막 레코드는 5분으로 가정
-            if len(daily_data) > 0:
-                daily_data.loc[daily_data.index[-1], 'duration_minutes'] = 5
-            
-            # M1/M2 태그의 duration 복원
-            if 'Tag_Code' in daily_data.columns and m1_m2_mask.any() and not m1_m2_durations.empty:
-                daily_data.loc[m1_m2_mask, 'duration_minutes'] = m1_m2_durations
-                self.logger.info(f"[첫 번째 duration 계산] M1/M2 태그 duration 복원: {m1_m2_mask.sum()}건")
-            
-            # Knox PIMS duration 복원
-            if knox_pims_mask.any() and not knox_durations.empty:
-                daily_data.loc[knox_pims_mask, 'duration_minutes'] = knox_durations
-                self.logger.info(f"[첫 번째 duration 계산] Knox PIMS duration 복원: {knox_pims_mask.sum()}건")
-            
-            # O 태그 (장비 사용)의 체류시간 설정
-            o_tag_indices = daily_data[daily_data['INOUT_GB'] == 'O'].index
-            for idx in o_tag_indices:
-                # 장비 사용은 기본적으로 10분으로 설정
-                daily_data.loc[idx, 'duration_minutes'] = 10
-                # 다음 태그까지의 시간이 30분 이내면 그 시간으로 조정
-                if idx < len(daily_data) - 1:
-                    next_idx = daily_data.index[daily_data.index.get_loc(idx) + 1]
-                    time_to_next = (daily_data.loc[next_idx, 'datetime'] - daily_data.loc[idx, 'datetime']).total_seconds() / 60
-                    if time_to_next < 30:
-                        daily_data.loc[idx, 'duration_minutes'] = time_to_next
-            
-            # 식사 태그 전후 처리 - 식사 전까지의 작업 시간 조정
-            meal_activities = ['BREAKFAST', 'LUNCH', 'DINNER', 'MIDNIGHT_MEAL']
-            for idx in daily_data.index:
-                if daily_data.loc[idx, 'activity_code'] in meal_activities:
-                    # 이전 레코드가 작업 활동인 경우
-                    if idx > 0:
-                        prev_idx = daily_data.index[daily_data.index.get_loc(idx) - 1]
-                        if daily_data.loc[prev_idx, 'activity_code'] in ['WORK', 'FOCUSED_WORK', 'EQUIPMENT_OPERATION']:
-                            # 식사 시작 시간을 이전 활동의 종료 시간으로 설정
-                            meal_start = daily_data.loc[idx, 'datetime']
-                            daily_data.loc[prev_idx, 'next_time'] = meal_start
-                            # duration 재계산
-                            duration = (meal_start - daily_data.loc[prev_idx, 'datetime']).total_seconds() / 60
-                            daily_data.loc[prev_idx, 'duration_minutes'] = duration
-                    
-                    # 식사 태그에 meal_location 정보 반영
-                    if daily_data.loc[idx, 'is_actual_meal']:
-                        # meal_location이 있으면 무조건 사용 (배식구 정보가 여기에 들어있음)
-                        if 'meal_location' in daily_data.columns and pd.notna(daily_data.loc[idx, 'meal_location']):
-                            daily_data.loc[idx, 'DR_NM'] = daily_data.loc[idx, 'meal_location']
-                        # meal_location이 없는 경우에만 기본값 사용
-                        elif not ('BP' in str(daily_data.loc[idx, 'DR_NM']) or '식당' in str(daily_data.loc[idx, 'DR_NM']) or 'CAFETERIA' in str(daily_data.loc[idx, 'DR_NM'])):
-                            daily_data.loc[idx, 'DR_NM'] = 'BP_CAFETERIA'
-                        
-                        # 🚨 가상 MOVEMENT_TO_BP 태그 생성 중단 - 불필요한 이동시간 추가 방지
-                        # BP로 이동하는 가상 태그 추가 (식사 5분 전) - DISABLED
-                        # if idx > 0:
-                        #     move_to_bp_time = daily_data.loc[idx, 'datetime'] - timedelta(minutes=5)
-                        #     # 새로운 이동 레코드 생성
-                        #     move_record = daily_data.loc[idx].copy()
-                        #     move_record['datetime'] = move_to_bp_time
-                        #     move_record['activity_code'] = 'MOVEMENT'
-                        #     move_record['DR_NM'] = 'MOVEMENT_TO_BP'
-                        #     move_record['duration_minutes'] = 5
-                        #     move_record['is_actual_meal'] = False
-                        #     move_record['confidence'] = 85
-                            
-                            # # DataFrame에 추가 (나중에 정렬 필요) - DISABLED
-                            # daily_data = pd.concat([daily_data, pd.DataFrame([move_record])], ignore_index=True)
-            
-            # 시간순 재정렬
-            daily_data = daily_data.sort_values('datetime').reset_index(drop=True)
-            
-            # duration_minutes 재계산 (M1/M2 태그와 Knox PIMS는 제외)
-            # M1/M2 태그의 duration을 먼저 백업
-            m1_m2_mask = daily_data['Tag_Code'].isin(['M1', 'M2'])
-            m1_m2_durations = daily_data.loc[m1_m2_mask, 'duration_minutes'].copy()
-            
-            # Knox PIMS duration 백업
-            knox_pims_mask = pd.Series([False] * len(daily_data))
-            knox_durations = pd.Series(dtype='float64')
-            if 'source' in daily_data.columns:
-                knox_pims_mask = daily_data['source'] == 'knox_pims'
-                knox_durations = daily_data.loc[knox_pims_mask, 'duration_minutes'].copy() if knox_pims_mask.any() else pd.Series(dtype='float64')
-            
-            daily_data['next_time'] = daily_data['datetime'].shift(-1)
-            daily_data['duration_minutes'] = (daily_data['next_time'] - daily_data['datetime']).dt.total_seconds() / 60
-            daily_data['duration_minutes'] = daily_data['duration_minutes'].fillna(5)
-            
-            # 🔍 Duration 계산 디버깅 (두 번째 계산)
-            for idx in daily_data.index:
-                if '탕맛기픈' in str(daily_data.loc[idx, 'DR_NM']):
-                    self.logger.info(f"🔍 [2차 계산] 탕맛기픈 duration: {daily_data.loc[idx, 'datetime']} → {daily_data.loc[idx, 'duration_minutes']:.1f}분")
-            
-            # M1/M2 태그의 duration 복원
-            if m1_m2_mask.any():
-                daily_data.loc[m1_m2_mask, 'duration_minutes'] = m1_m2_durations
-                self.logger.info(f"M1/M2 태그 duration 복원: {m1_m2_mask.sum()}건")
-            
-            # Knox PIMS duration 복원
-            if knox_pims_mask.any() and not knox_durations.empty:
-                daily_data.loc[knox_pims_mask, 'duration_minutes'] = knox_durations
-                self.logger.info(f"Knox PIMS duration 복원: {knox_pims_mask.sum()}건")
-            
-            # 같은 위치에서 30분 이상 작업한 경우 집중근무로 분류
-            focused_work_mask = (
-                (daily_data['activity_code'] == 'WORK') & 
-                (daily_data['duration_minutes'] >= 30) &
-                (daily_data['DR_NM'].str.contains('WORK_AREA', case=False, na=False))
-            )
-            daily_data.loc[focused_work_mask, 'activity_code'] = 'FOCUSED_WORK'
-            # 집중근무는 추론 기반이므로 약간 낮은 신뢰도
-            daily_data.loc[focused_work_mask & (daily_data['confidence'] > 85), 'confidence'] = 83
-            
-            # 4. 꼬리물기 현상 처리
-            # 작업 중 동료와 함께 게이트를 나간 후 식사하는 경우
-            meal_indices = daily_data[daily_data['activity_code'].isin(['BREAKFAST', 'LUNCH', 'DINNER', 'MIDNIGHT_MEAL'])].index
-            
-            for meal_idx in meal_indices:
-                if meal_idx > 0:
-                    meal_time = daily_data.loc[meal_idx, 'datetime']
-                    # 식사 30분 전부터 확인
-                    time_window_start = meal_time - timedelta(minutes=30)
-                    
-                    # 해당 시간 범위의 레코드들
-                    window_mask = (daily_data['datetime'] >= time_window_start) & (daily_data['datetime'] < meal_time)
-                    window_data = daily_data[window_mask]
-                    
-                    # GATE_OUT이 있는지 확인
-                    if not window_data.empty and 'INOUT_GB' in window_data.columns and window_data['INOUT_GB'].eq('T3').any():
-                        # 출문 이후 첫 식사까지를 비근무로 처리
-                        gate_out_idx = window_data[window_data['INOUT_GB'] == 'T3'].index[-1]
-                        
-                        # 출문부터 식사 직전까지 비근무로 표시
-                        mask = (daily_data.index >= gate_out_idx) & (daily_data.index < meal_idx)
-                        daily_data.loc[mask, 'activity_code'] = 'NON_WORK'
-                        if 'is_tailgating' not in daily_data.columns:
-                            daily_data['is_tailgating'] = False
-                        daily_data.loc[mask, 'is_tailgating'] = True
-            
-            # 5. 활동 타입 매핑 (이전 버전과의 호환성)
-            activity_type_mapping = {
-                'WORK': 'work',
-                'FOCUSED_WORK': 'work',
-                'EQUIPMENT_OPERATION': 'work',
-                'WORK_PREPARATION': 'work',
-                'WORKING': 'work',
-                'TRAINING': 'education',
-                'MEETING': 'meeting',
-                'G3_MEETING': 'meeting',  # Knox PIMS 회의 추가
-                'MOVEMENT': 'movement',
-                'COMMUTE_IN': 'commute',
-                'COMMUTE_OUT': 'commute',
-                'BREAKFAST': 'meal',
-                'LUNCH': 'meal',
-                'DINNER': 'meal',
-                'MIDNIGHT_MEAL': 'meal',
-                'REST': 'rest',
-                'FITNESS': 'rest',
-                'LEAVE': 'rest',
-                'IDLE': 'rest',
-                'NON_WORK': 'non_work',
-                'UNKNOWN': 'work'
-            }
-            # Knox PIMS 보호된 항목의 activity_type은 건드리지 않음
-            if 'is_knox_pims_protected' in daily_data.columns:
-                non_protected_mask = ~daily_data['is_knox_pims_protected'].fillna(False)
-                daily_data.loc[non_protected_mask, 'activity_type'] = daily_data.loc[non_protected_mask, 'activity_code'].map(activity_type_mapping).fillna('work')
-            else:
-                daily_data['activity_type'] = daily_data['activity_code'].map(activity_type_mapping).fillna('work')
-            
-            # 출문-재입문 패턴 감지 및 분류
-            if 'Tag_Code' in daily_data.columns:
-                # 출문(T3) - 재입문(T2) 패턴 찾기
-                for i in range(1, len(daily_data)):
-                    if (daily_data.iloc[i-1]['Tag_Code'] == 'T3' and 
-                        daily_data.iloc[i]['Tag_Code'] == 'T2'):
-                        
-                        # 시간 차이 계산
-                        time_diff = (daily_data.iloc[i]['datetime'] - 
-                                   daily_data.iloc[i-1]['datetime']).total_seconds() / 3600
-                        
-                        exit_time = daily_data.iloc[i-1]['datetime'].time()
-                        entry_time = daily_data.iloc[i]['datetime'].time()
-                        
-                        # 출문과 재입문 사이의 시간 분류 (태그 기반 시스템에서는 시간대 기반 식사 분류 제거)
-                        if 0 < time_diff < 3:  # 3시간 이내의 외출
-                            # 모든 단시간 외출은 비근무로 분류 (식사는 M1/M2 태그로만 분류)
-                            daily_data.loc[daily_data.index[i-1]:daily_data.index[i], 'activity_code'] = 'NON_WORK'
-                            daily_data.loc[daily_data.index[i-1]:daily_data.index[i], 'confidence'] = 90
-                            daily_data.loc[daily_data.index[i-1]:daily_data.index[i], 'activity_type'] = 'non_work'
-                            self.logger.info(f"외출: {exit_time} - {entry_time} ({time_diff:.1f}시간)")
-                        else:
-                            # 3시간 이상의 장시간 외출 -> 비근무
-                            daily_data.loc[daily_data.index[i-1]:daily_data.index[i], 'activity_code'] = 'NON_WORK'
-                            daily_data.loc[daily_data.index[i-1]:daily_data.index[i], 'confidence'] = 95
-                            daily_data.loc[daily_data.index[i-1]:daily_data.index[i], 'activity_type'] = 'non_work'
-                            self.logger.info(f"장시간 비근무: {exit_time} - {entry_time} ({time_diff:.1f}시간)")
-            
-            # 비근무지역에서 일정시간 이상 체류 시 비근무로 분류
-            if 'work_area_type' in daily_data.columns:
-                # 비근무지역(N) 태그를 그룹화
-                daily_data['group_id'] = (daily_data['work_area_type'] != daily_data['work_area_type'].shift()).cumsum()
-                
-                for group_id, group in daily_data.groupby('group_id'):
-                    if len(group) > 0 and group.iloc[0]['work_area_type'] == 'N':
-                        # 그룹의 첫번째와 마지막 시간 차이 계산
-                        if len(group) > 1:
-                            duration = (group.iloc[-1]['datetime'] - group.iloc[0]['datetime']).total_seconds() / 60
-                        else:
-                            # 다음 태그까지의 시간 확인
-                            next_idx = group.index[-1] + 1
-                            if next_idx < len(daily_data):
-                                duration = (daily_data.iloc[next_idx]['datetime'] - group.iloc[0]['datetime']).total_seconds() / 60
-                            else:
-                                duration = 5  # 기본값
-                        
-                        # 10분 이상 비근무지역에 체류한 경우 비근무로 분류
-                        if duration >= 10:
-                            daily_data.loc[group.index, 'activity_code'] = 'NON_WORK'
-                            daily_data.loc[group.index, 'confidence'] = 85
-                            daily_data.loc[group.index, 'activity_type'] = 'non_work'
-                            self.logger.info(f"비근무지역 체류: {group.iloc[0]['datetime']} ({duration:.0f}분)")
-                
-                # 임시 컬럼 제거
-                daily_data.drop('group_id', axis=1, inplace=True)
-            
-            # 마지막으로 한 번 더 식사 전후 출입문 처리 (HMM이 덮어쓴 경우 대비)
-            self.logger.info("최종 식사 전후 출입문 처리 시작")
-            
-            # 1. 모든 출입문 태그 중 식사로 잘못 분류된 것 찾기
-            entry_exit_mask = daily_data['INOUT_GB'].isin(['입문', '출문'])
-            meal_activity_mask = daily_data['activity_code'].isin(['BREAKFAST', 'LUNCH', 'DINNER', 'MIDNIGHT_MEAL'])
-            wrong_classification = entry_exit_mask & meal_activity_mask
-            
-            if wrong_classification.any():
-                self.logger.info(f"잘못 분류된 출입문 {wrong_classification.sum()}개 발견")
-                # 출입문은 절대 식사가 아님
-                daily_data.loc[wrong_classification & (daily_data['INOUT_GB'] == '출문'), 'activity_code'] = 'MOVEMENT'
-                daily_data.loc[wrong_classification & (daily_data['INOUT_GB'] == '출문'), 'activity_type'] = 'movement'
-                
-                # 입문의 경우, 이미 COMMUTE_IN으로 분류된 것을 보존하기 위해 추가 체크
-                entry_mask = wrong_classification & (daily_data['INOUT_GB'] == '입문')
-                for idx in daily_data[entry_mask].index:
-                    # 근무 유형에 따라 출근 시간대 다르게 판단
-                    hour = daily_data.loc[idx, 'datetime'].hour
-                    dr_nm = daily_data.loc[idx, 'DR_NM']
-                    is_gate = 'SPEED GATE' in str(dr_nm).upper() or '정문' in str(dr_nm)
-                    
-                    if is_gate:
-                        if work_type == 'night_shift' and 17 <= hour <= 22:
-                            # 야간 근무자의 저녁 출근
-                            daily_data.loc[idx, 'activity_code'] = 'COMMUTE_IN'
-                            daily_data.loc[idx, 'activity_type'] = 'commute'
-                            self.logger.info(f"야간 출근 시간대 게이트 입문: {daily_data.loc[idx, 'datetime']} - {dr_nm}")
-                        elif work_type != 'night_shift' and 5 <= hour < 10:
-                            # 일반 근무자의 아침 출근
-                            daily_data.loc[idx, 'activity_code'] = 'COMMUTE_IN'
-                            daily_data.loc[idx, 'activity_type'] = 'commute'
-                            self.logger.info(f"일반 출근 시간대 게이트 입문: {daily_data.loc[idx, 'datetime']} - {dr_nm}")
-                        else:
-                            daily_data.loc[idx, 'activity_code'] = 'WORK'
-                            daily_data.loc[idx, 'activity_type'] = 'work'
-                    else:
-                        daily_data.loc[idx, 'activity_code'] = 'WORK'
-                        daily_data.loc[idx, 'activity_type'] = 'work'
-                
-                daily_data.loc[wrong_classification, 'confidence'] = 100
-            
-            # 2. 추가로 정문/스피드게이트 입문이 조식으로 분류된 모든 케이스 확인
-            gate_entry_mask = daily_data['INOUT_GB'] == '입문'
-            gate_name_mask = daily_data['DR_NM'].str.contains('정문|SPEED GATE', case=False, na=False)
-            
-            # 근무 유형에 따라 출근 시간대 다르게 설정
-            if work_type == 'night_shift':
-                # 야간 근무자는 저녁 시간대를 출근으로
-                commute_time_mask = daily_data['datetime'].dt.hour.between(17, 22)
-            else:
-                # 일반 근무자는 아침 시간대를 출근으로
-                commute_time_mask = daily_data['datetime'].dt.hour.between(5, 10)
-                
-            gate_commute_entry = gate_entry_mask & gate_name_mask & commute_time_mask
-            
-            # 식사로 잘못 분류된 정문 입문 수정
-            meal_gate_entries = gate_commute_entry & (daily_data['activity_code'].isin(['BREAKFAST', 'LUNCH', 'DINNER', 'MIDNIGHT_MEAL']))
-            if meal_gate_entries.any():
-                self.logger.info(f"식사로 잘못 분류된 정문 입문 {meal_gate_entries.sum()}개 발견 및 수정 (근무유형: {work_type})")
-                daily_data.loc[meal_gate_entries, 'activity_code'] = 'COMMUTE_IN'
-                daily_data.loc[meal_gate_entries, 'activity_type'] = 'commute'
-                daily_data.loc[meal_gate_entries, 'confidence'] = 100
-                
-                # 로그 출력
-                for idx in daily_data[meal_gate_entries].index:
-                    self.logger.info(f"  - {daily_data.loc[idx, 'datetime']} at {daily_data.loc[idx, 'DR_NM']} : {daily_data.loc[idx, 'activity_code']} -> COMMUTE_IN")
-            
-            # 테이크아웃 정보 최종 확인 및 로깅
-            if 'is_takeout' in daily_data.columns:
-                takeout_meals = daily_data[(daily_data['INOUT_GB'] == '식사') & (daily_data['is_takeout'] == True)]
-                if not takeout_meals.empty:
-                    self.logger.info(f"테이크아웃 식사 {len(takeout_meals)}개 확인:")
-                    for idx, row in takeout_meals.iterrows():
-                        self.logger.info(f"  - {row['datetime']}: {row['DR_NM']}, activity={row['activity_code']}, is_takeout={row['is_takeout']}")
-            
-            # 최종 리턴 전에 한 번 더 정문 입문 체크
-            if work_type == 'night_shift':
-                # 야간 근무자는 저녁 시간대 체크
-                final_check = daily_data[
-                    (daily_data['INOUT_GB'] == '입문') & 
-                    (daily_data['DR_NM'].str.contains('정문|SPEED GATE', case=False, na=False)) &
-                    (daily_data['datetime'].dt.hour.between(17, 22)) &
-                    (daily_data['activity_code'].isin(['BREAKFAST', 'LUNCH', 'DINNER', 'MIDNIGHT_MEAL']))
-                ]
-            else:
-                # 일반 근무자는 아침 시간대 체크
-                final_check = daily_data[
-                    (daily_data['INOUT_GB'] == '입문') & 
-                    (daily_data['DR_NM'].str.contains('정문|SPEED GATE', case=False, na=False)) &
-                    (daily_data['datetime'].dt.hour.between(5, 10)) &
-                    (daily_data['activity_code'].isin(['BREAKFAST', 'LUNCH', 'DINNER', 'MIDNIGHT_MEAL']))
-                ]
-            
-            if not final_check.empty:
-                self.logger.warning(f"최종 체크: 식사로 분류된 정문 입문 {len(final_check)}개 발견! (근무유형: {work_type})")
-                daily_data.loc[final_check.index, 'activity_code'] = 'COMMUTE_IN'
-                daily_data.loc[final_check.index, 'confidence'] = 100
-                daily_data.loc[final_check.index, 'activity_type'] = 'commute'
-                
-                for idx in final_check.index:
-                    self.logger.warning(f"  최종 수정: {daily_data.loc[idx, 'datetime']} - {daily_data.loc[idx, 'DR_NM']} : {daily_data.loc[idx, 'activity_code']} -> COMMUTE_IN")
-            
-            # 최종적으로 activity_type이 비어있는 경우 재매핑
-            activity_type_mapping = {
-                'WORK': 'work',
-                'FOCUSED_WORK': 'work',
-                'EQUIPMENT_OPERATION': 'work',
-                'WORK_PREPARATION': 'work',
-                'WORKING': 'work',
-                'TRAINING': 'education',
-                'MEETING': 'meeting',
-                'G3_MEETING': 'meeting',  # Knox PIMS 회의 추가
-                'MOVEMENT': 'movement',
-                'COMMUTE_IN': 'commute',
-                'COMMUTE_OUT': 'commute',
-                'BREAKFAST': 'meal',
-                'LUNCH': 'meal',
-                'DINNER': 'meal',
-                'MIDNIGHT_MEAL': 'meal',
-                'REST': 'rest',
-                'FITNESS': 'rest',
-                'LEAVE': 'rest',
-                'IDLE': 'rest',
-                'NON_WORK': 'non_work',
-                'UNKNOWN': 'work'
-            }
-            
-            # activity_type이 비어있거나 None인 경우 재매핑
-            empty_type_mask = daily_data['activity_type'].isna() | (daily_data['activity_type'] == '')
-            if empty_type_mask.any():
-                self.logger.info(f"activity_type이 비어있는 {empty_type_mask.sum()}개 발견, 재매핑 수행")
-                daily_data.loc[empty_type_mask, 'activity_type'] = daily_data.loc[empty_type_mask, 'activity_code'].map(activity_type_mapping).fillna('work')
-            
-            # 최종 Tag_Code 기반 보호 (HMM이나 다른 로직이 덮어쓴 것을 복구)
-            if 'Tag_Code' in daily_data.columns:
-                # T2 태그 (출입포인트 IN) 보호 - 모든 T2는 출근
-                t2_mask = daily_data['Tag_Code'] == 'T2'
-                if t2_mask.any():
-                    t2_wrong = t2_mask & (~daily_data['activity_code'].isin(['COMMUTE_IN']))
-                    if t2_wrong.any():
-                        # self.logger.warning(f"최종 보호: T2 태그 {t2_wrong.sum()}건을 COMMUTE_IN으로 수정")
-                        for idx in daily_data[t2_wrong].index:
-                            prev_code = daily_data.loc[idx, 'activity_code']
-                            daily_data.loc[idx, 'activity_code'] = 'COMMUTE_IN'
-                            daily_data.loc[idx, 'activity_type'] = 'commute'
-                            daily_data.loc[idx, 'confidence'] = 100
-                            self.logger.info(f"  - {daily_data.loc[idx, 'datetime']}: {prev_code} -> COMMUTE_IN at {daily_data.loc[idx, 'DR_NM']}")
-                
-                # T3 태그 (출입포인트 OUT) 보호 - 모든 T3는 퇴근
-                t3_mask = daily_data['Tag_Code'] == 'T3'
-                if t3_mask.any():
-                    t3_wrong = t3_mask & (~daily_data['activity_code'].isin(['COMMUTE_OUT']))
-                    if t3_wrong.any():
-                        self.logger.warning(f"최종 보호: T3 태그 {t3_wrong.sum()}건을 COMMUTE_OUT으로 수정")
-                        for idx in daily_data[t3_wrong].index:
-                            prev_code = daily_data.loc[idx, 'activity_code']
-                            daily_data.loc[idx, 'activity_code'] = 'COMMUTE_OUT'
-                            daily_data.loc[idx, 'activity_type'] = 'commute'
-                            daily_data.loc[idx, 'confidence'] = 100
-                            self.logger.info(f"  - {daily_data.loc[idx, 'datetime']}: {prev_code} -> COMMUTE_OUT at {daily_data.loc[idx, 'DR_NM']}")
-            
-            # 701-10-1-1 특별 확인
-            if '701-10-1-1' in daily_data['DR_NO'].values:
-                test_rows = daily_data[daily_data['DR_NO'] == '701-10-1-1']
-                for idx, row in test_rows.iterrows():
-                    self.logger.info(f"701-10-1-1 최종 상태: {row['datetime']} Tag_Code={row.get('Tag_Code', 'None')} activity={row['activity_code']}")
-            
-            return daily_data
-            
-        except Exception as e:
-            self.logger.error(f"활동 분류 실패: {e}")
-            # 오류 시에도 기본값 설정
-            if 'activity_code' not in daily_data.columns:
-                daily_data['activity_code'] = 'WORK'
-            if 'activity_type' not in daily_data.columns:
-                # activity_type_mapping 정의
-                activity_type_mapping = {
-                    'WORK': 'work',
-                    'FOCUSED_WORK': 'work',
-                    'EQUIPMENT_OPERATION': 'work',
-                    'WORK_PREPARATION': 'work',
-                    'WORKING': 'work',
-                    'MEETING': 'meeting',
-                    'BREAKFAST': 'meal',
-                    'LUNCH': 'meal',
-                    'DINNER': 'meal',
-                    'MIDNIGHT_MEAL': 'meal',
-                    'BREAK': 'rest',
-                    'MOVEMENT': 'movement',
-                    'COMMUTE_IN': 'commute',
-                    'COMMUTE_OUT': 'commute',
-                    'LEAVE': 'rest',
-                    'IDLE': 'rest',
-                    'NON_WORK': 'non_work',
-                    'UNKNOWN': 'work'
-                }
-                # activity_code가 있으면 매핑
-                if 'activity_code' in daily_data.columns:
-                    # Knox PIMS 보호된 항목의 activity_type은 건드리지 않음
-                    if 'is_knox_pims_protected' in daily_data.columns:
-                        non_protected_mask = ~daily_data['is_knox_pims_protected'].fillna(False)
-                        daily_data.loc[non_protected_mask, 'activity_type'] = daily_data.loc[non_protected_mask, 'activity_code'].map(activity_type_mapping).fillna('work')
-                    else:
-                        daily_data['activity_type'] = daily_data['activity_code'].map(activity_type_mapping).fillna('work')
-                else:
-                    daily_data['activity_type'] = 'work'
-            if 'duration_minutes' not in daily_data.columns:
-                daily_data['duration_minutes'] = 5
-            if 'confidence' not in daily_data.columns:
-                daily_data['confidence'] = 80
-                
-            # 분류 완료 후 Tag_Code 재확인
-            if 'Tag_Code' in daily_data.columns:
-                t2_count = (daily_data['Tag_Code'] == 'T2').sum()
-                t3_count = (daily_data['Tag_Code'] == 'T3').sum()
-                self.logger.info(f"최종 분류 결과: T2={t2_count}개, T3={t3_count}개")
-                
-                # T2 태그 확인
-                t2_data = daily_data[daily_data['Tag_Code'] == 'T2']
-                if not t2_data.empty:
-                    for idx, row in t2_data.head().iterrows():
-                        self.logger.info(f"T2 태그: {row['datetime']} - {row['DR_NM']}, activity={row['activity_code']}")
-                        
-                # 701-10-1-1 게이트 확인
-                gate_701 = daily_data[daily_data['DR_NO'] == '701-10-1-1']
-                if not gate_701.empty:
-                    self.logger.info(f"701-10-1-1 게이트 {len(gate_701)}건:")
-                    for idx, row in gate_701.head().iterrows():
-                        self.logger.info(f"  - {row['datetime']}: Tag_Code={row.get('Tag_Code', 'N/A')}, activity={row['activity_code']}, work_area_type={row.get('work_area_type', 'N/A')}")
-            
-            # 최종 Knox PIMS 보호 - 마지막에 한번 더 확인
-            if 'is_knox_pims_protected' in daily_data.columns:
-                knox_protected_mask = daily_data['is_knox_pims_protected'].fillna(False)
-                if knox_protected_mask.any():
-                    # Knox PIMS 항목이 G3_MEETING이 아닌 경우 복원
-                    wrong_activity_mask = knox_protected_mask & (daily_data['activity_code'] != 'G3_MEETING')
-                    if wrong_activity_mask.any():
-                        daily_data.loc[wrong_activity_mask, 'activity_code'] = 'G3_MEETING'
-                        daily_data.loc[wrong_activity_mask, 'activity_type'] = 'meeting'
-                        daily_data.loc[wrong_activity_mask, '활동분류'] = 'G3회의'
-                        self.logger.warning(f"Knox PIMS {wrong_activity_mask.sum()}건이 잘못 변경되어 복원됨")
-                    
-                    # Knox PIMS duration 최종 확인
-                    knox_with_duration = knox_protected_mask & daily_data['knox_duration'].notna()
-                    if knox_with_duration.any():
-                        daily_data.loc[knox_with_duration, 'duration_minutes'] = daily_data.loc[knox_with_duration, 'knox_duration']
-                        
-                    # 최종 상태 로그 - 더 상세하게
-                    for idx in daily_data[knox_protected_mask].index:
-                        row = daily_data.loc[idx]
-                        self.logger.info(f"Knox PIMS 최종 상태 [{idx}]: {row['datetime']} - activity_code={row['activity_code']}, duration={row.get('duration_minutes', 'N/A')}분, knox_duration={row.get('knox_duration', 'N/A')}, is_protected={row.get('is_knox_pims_protected', False)}")
-                        
-            return daily_data
-    
-    def _apply_rule_based_classification(self, daily_data: pd.DataFrame, tag_location_master: pd.DataFrame) -> pd.DataFrame:
-        """
-        규칙 기반 활동 분류 (HMM 실패 시 폴백)
         """
-        # 기존 규칙 기반 로직을 여기에 구현
-        # 현재 코드에서는 이미 기본값이 설정되어 있으므로
-        # 추가적인 규칙 기반 분류는 필요시 구현
-        return daily_data
-    
-    def _apply_tag_based_rules(self, daily_data: pd.DataFrame, tag_location_master: pd.DataFrame) -> pd.DataFrame:
-        """
-        태그 기반 규칙 적용
-        참조: /Users/hanskim/Project/SambioHR2/태그 기반 근무유형 분석 시스템 - 참조 문서.md
+        활동 분류 수행 (태그 기반 규칙 파이프라인)
+        
+        직원/날짜가 주어지면 같은 입력 데이터의 분류 결과를 분석 캐시에서 재사용합니다.
         """
-        self.logger.info("태그 기반 규칙 적용 시작")
-        
-        # 1. T2 태그는 항상 COMMUTE_IN (출입(IN))
-        t2_mask = daily_data['Tag_Code'] == 'T2'
-        if t2_mask.any():
-            activity_type = get_activity_type('COMMUTE_IN')
-            daily_data.loc[t2_mask, 'activity_code'] = 'COMMUTE_IN'
-            daily_data.loc[t2_mask, 'activity_type'] = 'commute'  # activity_type.category가 아니라 직접 'commute' 설정
-            daily_data.loc[t2_mask, '활동분류'] = '출근'
-            daily_data.loc[t2_mask, 'confidence'] = 100
-            daily_data.loc[t2_mask, 'activity_label'] = ''  # YW 대신 빈 문자열로 설정
-            self.logger.info(f"T2 태그 {t2_mask.sum()}개를 COMMUTE_IN으로 설정")
-            
-            # 디버깅: T2 태그 처리 결과 확인
-            for idx in daily_data[t2_mask].index[:3]:  # 처음 3개만
-                self.logger.info(f"  - {daily_data.loc[idx, 'datetime']}: activity_code={daily_data.loc[idx, 'activity_code']}, activity_type={daily_data.loc[idx, 'activity_type']}")
-        
-        # 2. T3 태그는 항상 COMMUTE_OUT (출입(OUT))
-        t3_mask = daily_data['Tag_Code'] == 'T3'
-        if t3_mask.any():
-            daily_data.loc[t3_mask, 'activity_code'] = 'COMMUTE_OUT'
-            daily_data.loc[t3_mask, 'activity_type'] = 'commute'  # 직접 설정
-            daily_data.loc[t3_mask, '활동분류'] = '퇴근'
-            daily_data.loc[t3_mask, 'confidence'] = 100
-            self.logger.info(f"T3 태그 {t3_mask.sum()}개를 COMMUTE_OUT으로 설정")
-        
-        # 3. O 태그 (실제 업무 수행 로그) 처리
-        o_mask = daily_data['Tag_Code'] == 'O'
-        if o_mask.any():
-            activity_type = get_activity_type('WORK')
-            daily_data.loc[o_mask, 'activity_code'] = 'WORK'
-            daily_data.loc[o_mask, 'activity_type'] = activity_type.category if activity_type else 'work'
-            daily_data.loc[o_mask, '활동분류'] = activity_type.name_ko if activity_type else '작업'
-            daily_data.loc[o_mask, 'confidence'] = 98
-            self.logger.info(f"O 태그 {o_mask.sum()}개를 WORK로 설정")
-        
-        # 4. G1 태그 (주업무공간) 처리
-        g1_mask = daily_data['Tag_Code'] == 'G1'
-        if g1_mask.any():
-            activity_type = get_activity_type('WORK')
-            daily_data.loc[g1_mask, 'activity_code'] = 'WORK'
-            daily_data.loc[g1_mask, 'activity_type'] = activity_type.category if activity_type else 'work'
-            daily_data.loc[g1_mask, '활동분류'] = activity_type.name_ko if activity_type else '작업'
-            daily_data.loc[g1_mask, 'confidence'] = 85
-            self.logger.info(f"G1 태그 {g1_mask.sum()}개를 WORK로 설정")
-        
-        # 5. G2 태그 (준비공간) 처리
-        g2_mask = daily_data['Tag_Code'] == 'G2'
-        if g2_mask.any():
-            activity_type = get_activity_type('WORK_PREPARATION')
-            daily_data.loc[g2_mask, 'activity_code'] = 'WORK_PREPARATION'
-            daily_data.loc[g2_mask, 'activity_type'] = activity_type.category if activity_type else 'work'
-            daily_data.loc[g2_mask, '활동분류'] = activity_type.name_ko if activity_type else '준비'
-            daily_data.loc[g2_mask, 'confidence'] = 90
-            self.logger.info(f"G2 태그 {g2_mask.sum()}개를 WORK_PREPARATION으로 설정")
-        
-        # 6. G3 태그 (회의공간) 처리
-        g3_mask = daily_data['Tag_Code'] == 'G3'
-        if g3_mask.any():
-            # Knox PIMS G3 태그는 G3_MEETING 유지
-            if 'source' in daily_data.columns:
-                knox_pims_mask = g3_mask & (daily_data['source'] == 'knox_pims')
-                regular_g3_mask = g3_mask & (daily_data['source'] != 'knox_pims')
-            else:
-                knox_pims_mask = pd.Series([False] * len(daily_data))
-                regular_g3_mask = g3_mask
-            
-            # Knox PIMS G3 태그 처리
-            if knox_pims_mask.any():
-                self.logger.info(f"[_apply_tag_based_rules] Knox PIMS G3 태그 처리 시작: {knox_pims_mask.sum()}개")
-                activity_type = get_activity_type('G3_MEETING')
-                if activity_type:
-                    daily_data.loc[knox_pims_mask, 'activity_code'] = 'G3_MEETING'
-                    daily_data.loc[knox_pims_mask, 'activity_type'] = 'meeting'
-                    daily_data.loc[knox_pims_mask, '활동분류'] = activity_type.name_ko
-                    self.logger.info(f"Knox PIMS activity_type 사용: {activity_type.name_ko}")
-                else:
-                    # get_activity_type이 None을 반환한 경우 기본값 사용
-                    daily_data.loc[knox_pims_mask, 'activity_code'] = 'G3_MEETING'
-                    daily_data.loc[knox_pims_mask, 'activity_type'] = 'meeting'
-                    daily_data.loc[knox_pims_mask, '활동분류'] = 'G3회의'
-                    self.logger.info(f"Knox PIMS 기본값 사용: G3회의")
-                daily_data.loc[knox_pims_mask, 'confidence'] = 100
-                # 보호 플래그 추가 - Knox PIMS 데이터가 나중에 변경되지 않도록
-                daily_data.loc[knox_pims_mask, 'is_knox_pims_protected'] = True
-                self.logger.info(f"Knox PIMS G3 태그 {knox_pims_mask.sum()}개를 G3_MEETING으로 설정")
-                
-                # 디버깅: Knox PIMS 설정 후 상태 확인
-                for idx in daily_data[knox_pims_mask].index:
-                    row = daily_data.loc[idx]
-                    self.logger.info(f"Knox PIMS 설정 완료 [{idx}]: {row['datetime']} - activity_code={row['activity_code']}, duration={row.get('knox_duration', row.get('duration_minutes', 'N/A'))}분, is_protected=True")
-            else:
-                self.logger.info(f"[_apply_tag_based_rules] Knox PIMS 마스크 없음")
-            
-            # 일반 G3 태그 처리 (Knox PIMS 보호된 항목 제외)
-            if regular_g3_mask.any():
-                # Knox PIMS 보호된 항목은 제외
-                if 'is_knox_pims_protected' in daily_data.columns:
-                    regular_g3_mask = regular_g3_mask & (~daily_data['is_knox_pims_protected'].fillna(False))
-                
-                if regular_g3_mask.any():
-                    activity_type = get_activity_type('MEETING')
-                    daily_data.loc[regular_g3_mask, 'activity_code'] = 'MEETING'
-                    daily_data.loc[regular_g3_mask, 'activity_type'] = activity_type.category if activity_type else 'meeting'
-                    daily_data.loc[regular_g3_mask, '활동분류'] = activity_type.name_ko if activity_type else '회의'
-                    daily_data.loc[regular_g3_mask, 'confidence'] = 95
-                    self.logger.info(f"일반 G3 태그 {regular_g3_mask.sum()}개를 MEETING으로 설정")
-        
-        # 7. M1 태그 (바이오플라자 식사) 처리 - 확정적 규칙 엔진 사용
-        m1_mask = daily_data['Tag_Code'] == 'M1'
-        if m1_mask.any():
-            # 확정적 규칙 엔진 가져오기
-            rule_integration = get_rule_integration()
-            
-            # 시간대별로 식사 종류 결정
-            for idx in daily_data[m1_mask].index:
-                hour = daily_data.loc[idx, 'datetime'].hour
-                minute = daily_data.loc[idx, 'datetime'].minute
-                time_in_minutes = hour * 60 + minute
-                
-                # 다음 태그까지의 시간 계산
-                next_idx = daily_data.index.get_loc(idx) + 1
-                to_next_minutes = None
-                if next_idx < len(daily_data):
-                    time_diff = (daily_data.iloc[next_idx]['datetime'] - daily_data.loc[idx, 'datetime']).total_seconds() / 60
-                    to_next_minutes = time_diff
-                
-                # 규칙 엔진을 통한 식사 시간 계산
-                meal_duration = rule_integration.get_meal_duration('M1', to_next_minutes)
-                daily_data.loc[idx, 'duration_minutes'] = meal_duration
-                
-                # M2 태그는 테이크아웃 식사로 분류하지만 시간대별 activity_code는 설정하지 않음
-                daily_data.loc[idx, 'activity_code'] = 'MEAL'
-                daily_data.loc[idx, 'activity_type'] = 'meal'
-                daily_data.loc[idx, '활동분류'] = '식사중'
-                
-                daily_data.loc[idx, 'confidence'] = 100
-                self.logger.info(f"M1 태그 - {daily_data.loc[idx, 'datetime']}: {daily_data.loc[idx, 'activity_code']} (duration: {meal_duration}분)")
-            
-            self.logger.info(f"M1 태그 {m1_mask.sum()}개를 시간대별 식사로 설정")
-        
-        # 7-1. M2 태그 (테이크아웃) 처리 - 확정적 규칙 엔진 사용
-        m2_mask = daily_data['Tag_Code'] == 'M2'
-        if m2_mask.any():
-            # 확정적 규칙 엔진 가져오기
-            rule_integration = get_rule_integration()
-            
-            # 시간대별로 식사 종류 결정
-            for idx in daily_data[m2_mask].index:
-                hour = daily_data.loc[idx, 'datetime'].hour
-                minute = daily_data.loc[idx, 'datetime'].minute
-                time_in_minutes = hour * 60 + minute
-                
-                # M2는 고정 10분
-                meal_duration = rule_integration.get_meal_duration('M2', None)
-                daily_data.loc[idx, 'duration_minutes'] = meal_duration
-                
-                # M2 태그는 테이크아웃 식사로 분류하지만 시간대별 activity_code는 설정하지 않음
-                daily_data.loc[idx, 'activity_code'] = 'MEAL'
-                daily_data.loc[idx, 'activity_type'] = 'meal'
-                daily_data.loc[idx, '활동분류'] = '식사중'
-                
-                daily_data.loc[idx, 'confidence'] = 100
-                daily_data.loc[idx, 'is_takeout'] = True
-                self.logger.info(f"M2 테이크아웃 - {daily_data.loc[idx, 'datetime']}: {daily_data.loc[idx, 'activity_code']} (duration: {meal_duration}분)")
-            
-            self.logger.info(f"M2 태그 {m2_mask.sum()}개를 테이크아웃 식사로 설정")
-        
-        # 8. N1 태그 (휴게공간) 처리
-        n1_mask = daily_data['Tag_Code'] == 'N1'
-        if n1_mask.any():
-            activity_type = get_activity_type('REST')
-            daily_data.loc[n1_mask, 'activity_code'] = 'REST'
-            daily_data.loc[n1_mask, 'activity_type'] = activity_type.category if activity_type else 'rest'
-            daily_data.loc[n1_mask, '활동분류'] = activity_type.name_ko if activity_type else '휴식'
-            daily_data.loc[n1_mask, 'confidence'] = 90
-            self.logger.info(f"N1 태그 {n1_mask.sum()}개를 REST로 설정")
-        
-        # 9. 꼬리물기 감지 - 긴 T1 구간
-        # T1 태그가 연속적으로 나타나는 구간 찾기
-        t1_mask = daily_data['Tag_Code'] == 'T1'
-        if t1_mask.any():
-            # 시간순 정렬
-            daily_data = daily_data.sort_values('datetime').reset_index(drop=True)
-            
-            # T1 태그 인덱스 찾기
-            t1_indices = daily_data[t1_mask].index.tolist()
-            
-            # 연속된 T1 블록 찾기
-            t1_blocks = []
-            current_block = []
-            
-            for i, idx in enumerate(t1_indices):
-                if not current_block:
-                    current_block = [idx]
-                else:
-                    # 이전 인덱스와 연속되거나 시간이 가까운 경우
-                    prev_idx = current_block[-1]
-                    time_diff = (daily_data.loc[idx, 'datetime'] - daily_data.loc[prev_idx, 'datetime']).total_seconds() / 60
-                    
-                    if idx == prev_idx + 1 or time_diff <= 5:  # 연속이거나 5분 이내
-                        current_block.append(idx)
-                    else:
-                        # 블록 종료
-                        if len(current_block) > 1:
-                            t1_blocks.append(current_block)
-                        current_block = [idx]
-            
-            # 마지막 블록 처리
-            if len(current_block) > 1:
-                t1_blocks.append(current_block)
-            
-            # 각 T1 블록의 지속시간 계산 및 꼬리물기 판정
-            for block in t1_blocks:
-                start_time = daily_data.loc[block[0], 'datetime']
-                end_time = daily_data.loc[block[-1], 'datetime']
-                duration_minutes = (end_time - start_time).total_seconds() / 60
-                
-                if duration_minutes >= 30:  # 30분 이상 T1 구간
-                    # 꼬리물기로 판정 - WORK로 변경
-                    activity_type = get_activity_type('WORK')
-                    for idx in block:
-                        daily_data.loc[idx, 'activity_code'] = 'WORK'
-                        daily_data.loc[idx, 'activity_type'] = activity_type.category if activity_type else 'work'
-                        daily_data.loc[idx, '활동분류'] = activity_type.name_ko if activity_type else '작업'
-                        
-                        if duration_minutes >= 120:  # 2시간 이상
-                            daily_data.loc[idx, 'confidence'] = 85
-                        else:  # 30분-2시간
-                            daily_data.loc[idx, 'confidence'] = 60
-                    
-                    self.logger.info(f"꼬리물기 감지: {start_time} ~ {end_time} ({duration_minutes:.1f}분) - {len(block)}개 태그를 WORK로 변경")
-                else:
-                    # 짧은 T1은 MOVEMENT로 유지
-                    activity_type = get_activity_type('MOVEMENT')
-                    for idx in block:
-                        daily_data.loc[idx, 'activity_code'] = 'MOVEMENT'
-                        daily_data.loc[idx, 'activity_type'] = activity_type.category if activity_type else 'movement'
-                        daily_data.loc[idx, '활동분류'] = activity_type.name_ko if activity_type else '이동'
-                        daily_data.loc[idx, 'confidence'] = 85
-        
-        # 10. 정문/스피드게이트 입문 최종 검증
-        # T2가 아닌데 정문 입문으로 표시된 경우 수정
-        gate_entry_mask = (
-            (daily_data['INOUT_GB'] == '입문') & 
-            (daily_data['DR_NM'].str.contains('정문|SPEED GATE', case=False, na=False)) &
-            (daily_data['Tag_Code'] != 'T2')
-        )
-        if gate_entry_mask.any():
-            activity_type = get_activity_type('COMMUTE_IN')
-            daily_data.loc[gate_entry_mask, 'activity_code'] = 'COMMUTE_IN'
-            daily_data.loc[gate_entry_mask, 'activity_type'] = activity_type.category if activity_type else 'movement'
-            daily_data.loc[gate_entry_mask, '활동분류'] = activity_type.name_ko if activity_type else '출근'
-            daily_data.loc[gate_entry_mask, 'confidence'] = 95
-            self.logger.info(f"정문 입문 {gate_entry_mask.sum()}개를 COMMUTE_IN으로 수정")
-        
-        self.logger.info("태그 기반 규칙 적용 완료")
-        return daily_data
-    
-    def _fill_time_gaps(self, data: pd.DataFrame) -> pd.DataFrame:
-        """태그 사이의 시간 간격을 채워서 연속적인 활동 데이터 생성"""
-        if data.empty:
-            return data
-            
-        # 결과를 저장할 리스트
-        filled_data = []
+        cache = None
+        if employee_id and selected_date:
+            from ...utils.performance_cache import get_performance_cache, frame_signature
+            cache = get_performance_cache()
+            signature = frame_signature(daily_data)
+            cached = cache.get_analysis_cache('classified', employee_id, selected_date, signature)
+            if cached is not None:
+                return cached.copy()
         
-        # 시간순으로 정렬
-        data = data.sort_values('datetime').reset_index(drop=True)
+        tag_location_master = self.get_tag_location_master()
         
-        # 마지막 태그 시간 확인 (야간 근무자 처리를 위해)
-        last_tag_time = data.iloc[-1]['datetime']
+        # 근무 유형과 장비 사용 데이터는 직원/날짜가 주어진 경우에만 조회
+        work_type = 'standard'
+        equipment_data = None
+        if employee_id and selected_date:
+            work_type = self.get_employee_work_type(employee_id, selected_date)
+            equipment_data = self.get_employee_equipment_data(employee_id, selected_date)
         
-        for i in range(len(data)):
-            current_row = data.iloc[i].copy()
-            
-            # Knox PIMS 보호 - 이미 duration이 설정된 경우 유지
-            if (current_row.get('is_knox_pims_protected', False) and 
-                pd.notna(current_row.get('knox_duration'))):
-                duration = current_row.get('knox_duration')
-                self.logger.info(f"Knox PIMS duration 보존: {current_row['datetime']} - {duration}분")
-            else:
-                # 다음 태그까지의 시간 계산
-                if i < len(data) - 1:
-                    next_time = data.iloc[i + 1]['datetime']
-                    duration = (next_time - current_row['datetime']).total_seconds() / 60
-                    
-                    # 60분을 초과하는 간격은 5분으로 제한 (비정상적인 gap 방지)
-                    if duration > 60:
-                        # self.logger.warning(f"긴 시간 간격 감지: {current_row['datetime']} ~ {next_time} ({duration:.0f}분) -> 5분으로 제한")
-                        duration = 5
-                else:
-                    # 마지막 태그는 5분으로 설정
-                    duration = 5
-            
-            # O 태그(장비 사용)의 경우 최소 10분, 최대 30분으로 제한
-            if current_row.get('INOUT_GB') == 'O' or current_row.get('activity_code') == 'EQUIPMENT_OPERATION':
-                duration = min(max(duration, 10), 30)
-            
-            # 식사 활동의 duration 설정
-            if current_row.get('activity_code') in ['BREAKFAST', 'LUNCH', 'DINNER', 'MIDNIGHT_MEAL']:
-                # 실제 식사 태그가 있는 경우에만 식사로 처리
-                if current_row.get('is_actual_meal', False):
-                    # 테이크아웃 여부 확인
-                    is_takeout = current_row.get('is_takeout', False)
-                    if is_takeout:
-                        # 테이크아웃은 10분 고정
-                        duration = 10
-                    else:
-                        # 식당 식사는 다음 이동태그까지 (최대 1시간)
-                        # duration은 이미 다음 태그까지의 시간으로 계산됨
-                        if duration > 60:
-                            duration = 60  # 최대 1시간으로 제한
-                else:
-                    # 식사 태그가 없는데 식사로 분류된 경우 WORK로 변경
-                    # 단, EQUIPMENT_OPERATION은 보존
-                    if current_row.get('activity_code') != 'EQUIPMENT_OPERATION':
-                        current_row['activity_code'] = 'WORK'
-                        current_row['activity_type'] = 'work'
-                        current_row['confidence'] = 85
-            
-            # Knox PIMS 보호 - duration_minutes 덮어쓰기 방지
-            if not (current_row.get('is_knox_pims_protected', False) and pd.notna(current_row.get('knox_duration'))):
-                current_row['duration_minutes'] = duration
-            else:
-                current_row['duration_minutes'] = current_row.get('knox_duration')
-                self.logger.info(f"Knox PIMS duration_minutes 보존: {current_row['datetime']} - {current_row['duration_minutes']}분")
-            filled_data.append(current_row)
-            
-            # 출문(T3) 후 재입문(T2) 사이의 시간을 채우기
-            if (i < len(data) - 1 and 
-                'Tag_Code' in data.columns and
-                current_row['Tag_Code'] == 'T3' and 
-                data.iloc[i + 1]['Tag_Code'] == 'T2'):
-                
-                # 출문과 재입문 사이의 전체 시간
-                gap_start = current_row['datetime']
-                gap_end = data.iloc[i + 1]['datetime']
-                gap_duration = (gap_end - gap_start).total_seconds() / 60
-                
-                # 5분 이상의 간격이 있으면 비근무 시간으로 채우기
-                if gap_duration > 5:
-                    # 출문 시간을 5분으로 제한
-                    filled_data[-1]['duration_minutes'] = 5
-                    
-                    # 나머지 시간을 비근무로 채우기
-                    gap_row = current_row.copy()
-                    gap_row['datetime'] = gap_start + pd.Timedelta(minutes=5)
-                    gap_row['duration_minutes'] = gap_duration - 10  # 출문 5분, 재입문 5분 제외
-                    
-                    # 이미 활동이 분류된 경우 (점심 등) 그대로 유지
-                    if data.iloc[i + 1].get('activity_code') not in ['LUNCH', 'BREAKFAST', 'DINNER', 'MIDNIGHT_MEAL']:
-                        gap_row['activity_code'] = 'NON_WORK'
-                        gap_row['activity_type'] = 'non_work'
-                        gap_row['confidence'] = 90
-                    
-                    filled_data.append(gap_row)
+        engine = self._get_classification_engine(tag_location_master)
+        classified = engine.classify(daily_data, work_type=work_type, equipment_data=equipment_data)
         
-        return pd.DataFrame(filled_data)
+        if cache is not None and classified is not None:
+            cache.set_analysis_cache(classified.copy(), 'classified', employee_id, selected_date, signature)
+        return classified
+    
+    def _get_classification_engine(self, tag_location_master: pd.DataFrame = None) -> ActivityClassificationEngine:
+        """활동 분류 엔진 (같은 마스터 데이터면 재사용)"""
+        engine = getattr(self, '_classification_engine', None)
+        if engine is None or engine.tag_location_master is not tag_location_master:
+            engine = ActivityClassificationEngine(tag_location_master)
+            self._classification_engine = engine
+        return engine
+    
+    def _fill_time_gaps(self, data: pd.DataFrame) -> pd.DataFrame:
+        """태그 사이의 시간 간격을 채워서 연속적인 활동 데이터 생성"""
+        engine = getattr(self, '_classification_engine', None) or ActivityClassificationEngine()
+        return engine.fill_time_gaps(data)
     
     def analyze_daily_data(self, employee_id: str, selected_date: date, classified_data: pd.DataFrame):
         """일일 데이터 분석"""
@@ -4072,135 +1987,16 @@ class IndividualDashboard:
             return None
         
         try:
-            import time
-            analysis_times = {}  # 각 단계별 시간 측정
-            
-            # 분석 실행
-            step_start = time.time()
-            if return_data:
-                # 데이터만 반환하는 경우 스피너 없이 실행
-                daily_data = self.get_daily_tag_data(employee_id, selected_date)
-            else:
-                # UI 렌더링하는 경우 스피너 표시
-                with st.spinner("분석 중..."):
-                    daily_data = self.get_daily_tag_data(employee_id, selected_date)
-            analysis_times['tag_data'] = time.time() - step_start
-            
-            if daily_data is None or daily_data.empty:
-                if not return_data:
-                    st.warning(f"선택한 날짜({selected_date})에 해당 직원({employee_id})의 데이터가 없습니다.")
-                return None
-            
-            # 장비 데이터 로드
-            step_start = time.time()
-            equipment_data = self.get_employee_equipment_data(employee_id, selected_date)
-            analysis_times['equipment_data'] = time.time() - step_start
-            if equipment_data is not None and not equipment_data.empty and not return_data:
-                st.info(f"🔧 장비 사용 데이터: {len(equipment_data)}건 발견")
-                
-            # 근태 데이터 로드
-            step_start = time.time()
-            attendance_data = self.get_employee_attendance_data(employee_id, selected_date)
-            analysis_times['attendance_data'] = time.time() - step_start
-            if attendance_data is not None and not attendance_data.empty and not return_data:
-                st.info(f"📋 근태 정보: {len(attendance_data)}건 발견")
-                
-            # Knox/Equipment 데이터 확인
-            # Tag_Code 컬럼이 있는지 확인
-            if 'Tag_Code' in daily_data.columns:
-                knox_tags = daily_data[daily_data['Tag_Code'] == 'G3']
-            else:
-                knox_tags = pd.DataFrame()
-            if not knox_tags.empty:
-                self.logger.info(f"[분류 전] G3 태그 {len(knox_tags)}건 발견:")
-                for idx, row in knox_tags.iterrows():
-                    self.logger.info(f"  - {row['datetime']}: Tag_Code={row.get('Tag_Code')}, source={row.get('source', 'N/A')}, " +
-                                   f"activity_code={row.get('activity_code', 'N/A')}, 활동분류={row.get('활동분류', 'N/A')}")
-            
-            # 활동 분류 수행 (employee_id와 selected_date 전달)
-            step_start = time.time()
-            classified_data = self.classify_activities(daily_data, employee_id, selected_date)
-            analysis_times['classify_activities'] = time.time() - step_start
-            
-            # 추정률 계산
-            step_start = time.time()
-            # 직원 정보 가져오기
-            employee_info = self.get_employee_info(employee_id)
-            
-            # 추정 지표 계산
-            estimation_metrics = self.work_time_estimator.calculate_estimation_metrics(
-                classified_data, 
-                employee_info
-            )
-            analysis_times['estimation_calculation'] = time.time() - step_start
-            
-            # 집중근무 시간대 분석
-            step_start = time.time()
-            focus_time_analysis = self.focus_analyzer.analyze_focus_time(
-                classified_data,
-                employee_info
-            )
-            analysis_times['focus_time_analysis'] = time.time() - step_start
-            
-            # 분류 후 T2 태그 상태 확인 (Tag_Code 컬럼이 있는 경우만)
-            if 'Tag_Code' in classified_data.columns:
-                t2_classified = classified_data[classified_data['Tag_Code'] == 'T2']
-                if not t2_classified.empty:
-                    self.logger.info(f"[classify_activities 후] T2 태그 {len(t2_classified)}건:")
-                    for idx, row in t2_classified.head(3).iterrows():
-                        self.logger.info(f"  - {row['datetime']}: activity_code={row.get('activity_code')}, activity_type={row.get('activity_type')}, DR_NM={row['DR_NM']}")
-            
-                # 분류 후 G3 태그 상태 확인
-                g3_classified = classified_data[classified_data['Tag_Code'] == 'G3']
-                if not g3_classified.empty:
-                    self.logger.info(f"[classify_activities 후] G3 태그 {len(g3_classified)}건:")
-                    for idx, row in g3_classified.iterrows():
-                        self.logger.info(f"  - {row['datetime']}: activity_code={row.get('activity_code', 'N/A')}, " +
-                                       f"활동분류={row.get('활동분류', 'N/A')}, source={row.get('source', 'N/A')}")
+            # 같은 직원/날짜의 분석 결과는 분석 캐시에서 재사용 (화면 재실행 시 재계산 방지)
+            from ...utils.performance_cache import get_performance_cache
+            cached_result = get_performance_cache().get_analysis_cache('analysis', employee_id, selected_date)
+            if cached_result is not None:
+                analysis_result = dict(cached_result)
             else:
-                self.logger.info("[classify_activities 후] Tag_Code 컬럼이 없어 태그별 확인 생략")
-            
-            # 분석 결과 생성
-            step_start = time.time()
-            analysis_result = self.analyze_daily_data(employee_id, selected_date, classified_data)
-            analysis_times['analyze_daily_data'] = time.time() - step_start
-            
-            # 추정 메트릭을 분석 결과에 추가
-            if analysis_result and estimation_metrics:
-                analysis_result['estimation_metrics'] = estimation_metrics
-            
-            # 집중근무 시간대 분석을 분석 결과에 추가
-            if analysis_result and focus_time_analysis:
-                analysis_result['focus_time_analysis'] = focus_time_analysis
-            
-            # 성능 로깅 (return_data일 때만)
-            if return_data:
-                total_time = sum(analysis_times.values())
-                self.logger.info(f"[execute_analysis 성능 분석] 총 {total_time:.3f}초")
-                self.logger.info(f"  - tag_data 로드: {analysis_times.get('tag_data', 0):.3f}초")
-                self.logger.info(f"  - equipment_data 로드: {analysis_times.get('equipment_data', 0):.3f}초")
-                self.logger.info(f"  - attendance_data 로드: {analysis_times.get('attendance_data', 0):.3f}초")
-                self.logger.info(f"  - classify_activities: {analysis_times.get('classify_activities', 0):.3f}초")
-                self.logger.info(f"  - estimation_calculation: {analysis_times.get('estimation_calculation', 0):.3f}초")
-                self.logger.info(f"  - analyze_daily_data: {analysis_times.get('analyze_daily_data', 0):.3f}초")
-            
-            # analyze_daily_data가 실패한 경우 기본 결과 생성
-            if analysis_result is None:
-                if not return_data:
-                    st.error("데이터 분석 중 오류가 발생했습니다. 기본 정보만 표시합니다.")
-                analysis_result = self.create_sample_analysis_result(employee_id, (selected_date, selected_date))
-            
-            # 장비 데이터를 분석 결과에 추가
-            if equipment_data is not None and not equipment_data.empty:
-                analysis_result['equipment_data'] = equipment_data
-            
-            # 근태 데이터를 분석 결과에 추가
-            if attendance_data is not None and not attendance_data.empty:
-                analysis_result['attendance_data'] = attendance_data
-            
-            # 직원 정보 추가 (최근 조회 기록 저장용)
-            employee_info = self.get_employee_info(employee_id)
-            analysis_result['employee_info'] = employee_info
+                analysis_result = self._compute_analysis_result(employee_id, selected_date, return_data)
+                if analysis_result is None:
+                    return None
+            employee_info = analysis_result['employee_info']
             
             # 최근 조회 기록에 추가 (UI 모드일 때만)
             if not return_data and 'recent_views_manager' in st.session_state:
@@ -4228,6 +2024,146 @@ class IndividualDashboard:
             self.logger.error(f"전체 스택 트레이스:\n{traceback.format_exc()}")
             return None
     
+    def _compute_analysis_result(self, employee_id, selected_date, return_data: bool):
+        """태그 로드부터 분석 결과 생성까지 수행 (데이터가 없으면 None)"""
+        from ...utils.performance_cache import get_performance_cache
+        cache = get_performance_cache()
+        
+        import time
+        analysis_times = {}  # 각 단계별 시간 측정
+        
+        # 분석 실행
+        step_start = time.time()
+        if return_data:
+            # 데이터만 반환하는 경우 스피너 없이 실행
+            daily_data = self.get_daily_tag_data(employee_id, selected_date)
+        else:
+            # UI 렌더링하는 경우 스피너 표시
+            with st.spinner("분석 중..."):
+                daily_data = self.get_daily_tag_data(employee_id, selected_date)
+        analysis_times['tag_data'] = time.time() - step_start
+        
+        if daily_data is None or daily_data.empty:
+            if not return_data:
+                st.warning(f"선택한 날짜({selected_date})에 해당 직원({employee_id})의 데이터가 없습니다.")
+            return None
+        
+        # 장비 데이터 로드
+        step_start = time.time()
+        equipment_data = self.get_employee_equipment_data(employee_id, selected_date)
+        analysis_times['equipment_data'] = time.time() - step_start
+        if equipment_data is not None and not equipment_data.empty and not return_data:
+            st.info(f"🔧 장비 사용 데이터: {len(equipment_data)}건 발견")
+        
+        # 근태 데이터 로드
+        step_start = time.time()
+        attendance_data = self.get_employee_attendance_data(employee_id, selected_date)
+        analysis_times['attendance_data'] = time.time() - step_start
+        if attendance_data is not None and not attendance_data.empty and not return_data:
+            st.info(f"📋 근태 정보: {len(attendance_data)}건 발견")
+        
+        # Knox/Equipment 데이터 확인
+        # Tag_Code 컬럼이 있는지 확인
+        if 'Tag_Code' in daily_data.columns:
+            knox_tags = daily_data[daily_data['Tag_Code'] == 'G3']
+        else:
+            knox_tags = pd.DataFrame()
+        if not knox_tags.empty:
+            self.logger.info(f"[분류 전] G3 태그 {len(knox_tags)}건 발견:")
+            for idx, row in knox_tags.iterrows():
+                self.logger.info(f"  - {row['datetime']}: Tag_Code={row.get('Tag_Code')}, source={row.get('source', 'N/A')}, " +
+                               f"activity_code={row.get('activity_code', 'N/A')}, 활동분류={row.get('활동분류', 'N/A')}")
+        
+        # 활동 분류 수행 (employee_id와 selected_date 전달)
+        step_start = time.time()
+        classified_data = self.classify_activities(daily_data, employee_id, selected_date)
+        analysis_times['classify_activities'] = time.time() - step_start
+        
+        # 추정률 계산
+        step_start = time.time()
+        # 직원 정보 가져오기
+        employee_info = self.get_employee_info(employee_id)
+        
+        # 추정 지표 계산
+        estimation_metrics = self.work_time_estimator.calculate_estimation_metrics(
+            classified_data, 
+            employee_info
+        )
+        analysis_times['estimation_calculation'] = time.time() - step_start
+        
+        # 집중근무 시간대 분석
+        step_start = time.time()
+        focus_time_analysis = self.focus_analyzer.analyze_focus_time(
+            classified_data,
+            employee_info
+        )
+        analysis_times['focus_time_analysis'] = time.time() - step_start
+        
+        # 분류 후 T2 태그 상태 확인 (Tag_Code 컬럼이 있는 경우만)
+        if 'Tag_Code' in classified_data.columns:
+            t2_classified = classified_data[classified_data['Tag_Code'] == 'T2']
+            if not t2_classified.empty:
+                self.logger.info(f"[classify_activities 후] T2 태그 {len(t2_classified)}건:")
+                for idx, row in t2_classified.head(3).iterrows():
+                    self.logger.info(f"  - {row['datetime']}: activity_code={row.get('activity_code')}, activity_type={row.get('activity_type')}, DR_NM={row['DR_NM']}")
+            
+            # 분류 후 G3 태그 상태 확인
+            g3_classified = classified_data[classified_data['Tag_Code'] == 'G3']
+            if not g3_classified.empty:
+                self.logger.info(f"[classify_activities 후] G3 태그 {len(g3_classified)}건:")
+                for idx, row in g3_classified.iterrows():
+                    self.logger.info(f"  - {row['datetime']}: activity_code={row.get('activity_code', 'N/A')}, " +
+                                   f"활동분류={row.get('활동분류', 'N/A')}, source={row.get('source', 'N/A')}")
+        else:
+            self.logger.info("[classify_activities 후] Tag_Code 컬럼이 없어 태그별 확인 생략")
+        
+        # 분석 결과 생성
+        step_start = time.time()
+        analysis_result = self.analyze_daily_data(employee_id, selected_date, classified_data)
+        analysis_times['analyze_daily_data'] = time.time() - step_start
+        
+        # 추정 메트릭을 분석 결과에 추가
+        if analysis_result and estimation_metrics:
+            analysis_result['estimation_metrics'] = estimation_metrics
+        
+        # 집중근무 시간대 분석을 분석 결과에 추가
+        if analysis_result and focus_time_analysis:
+            analysis_result['focus_time_analysis'] = focus_time_analysis
+        
+        # 성능 로깅 (return_data일 때만)
+        if return_data:
+            total_time = sum(analysis_times.values())
+            self.logger.info(f"[execute_analysis 성능 분석] 총 {total_time:.3f}초")
+            self.logger.info(f"  - tag_data 로드: {analysis_times.get('tag_data', 0):.3f}초")
+            self.logger.info(f"  - equipment_data 로드: {analysis_times.get('equipment_data', 0):.3f}초")
+            self.logger.info(f"  - attendance_data 로드: {analysis_times.get('attendance_data', 0):.3f}초")
+            self.logger.info(f"  - classify_activities: {analysis_times.get('classify_activities', 0):.3f}초")
+            self.logger.info(f"  - estimation_calculation: {analysis_times.get('estimation_calculation', 0):.3f}초")
+            self.logger.info(f"  - analyze_daily_data: {analysis_times.get('analyze_daily_data', 0):.3f}초")
+        
+        # analyze_daily_data가 실패한 경우 기본 결과 생성 (캐시하지 않음)
+        analysis_failed = analysis_result is None
+        if analysis_failed:
+            if not return_data:
+                st.error("데이터 분석 중 오류가 발생했습니다. 기본 정보만 표시합니다.")
+            analysis_result = self.create_sample_analysis_result(employee_id, (selected_date, selected_date))
+        
+        # 장비 데이터를 분석 결과에 추가
+        if equipment_data is not None and not equipment_data.empty:
+            analysis_result['equipment_data'] = equipment_data
+        
+        # 근태 데이터를 분석 결과에 추가
+        if attendance_data is not None and not attendance_data.empty:
+            analysis_result['attendance_data'] = attendance_data
+        
+        # 직원 정보 추가 (최근 조회 기록 저장용)
+        employee_info = self.get_employee_info(employee_id)
+        analysis_result['employee_info'] = employee_info
+        
+        if not analysis_failed:
+            cache.set_analysis_cache(dict(analysis_result), 'analysis', employee_id, selected_date)
+        return analysis_result
+    
     def create_sample_analysis_result(self, employee_id: str, date_range: tuple):
         """샘플 분석 결과 생성"""
         return {
@@ -8,12 +8,17 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import date, datetime, timedelta
+from pathlib import Path
 from typing import Dict, List, Optional, Any
 import logging
 from sqlalchemy import text
 
 from ...database import DatabaseManager
 from ...data_processing import PickleManager
+from ...utils.org_rollup import RollupNotBuiltError, get_rollup_cube
+
+# 배치 분석 결과 DB (조직 롤업 큐브 포함)
+ANALYTICS_DB_PATH = Path(__file__).parent.parent.parent.parent / 'data' / 'sambio_analytics.db'
 
 class OrganizationDashboard:
     """조직별 대시보드 컴포넌트"""
@@ -23,6 +28,7 @@ class OrganizationDashboard:
         self.pickle_manager = pickle_manager
         self.logger = logging.getLogger(__name__)
         self._organizations_cache = {}
+        self._employees_cache = {}
     
     def get_organizations_by_level(self, org_level: str) -> list:
         """조직 레벨에 따른 조직 목록 조회"""
@@ -75,8 +81,12 @@ class OrganizationDashboard:
             return []
     
     def get_organization_statistics(self, org_id: str, org_level: str, start_date, end_date):
-        """조직 통계 데이터 조회 - 실제 데이터베이스에서 조회"""
+        """조직 통계 데이터 조회 - 롤업 큐브 우선, 없으면 실제 데이터베이스에서 조회"""
         try:
+            rollup_stats = self._get_rollup_statistics(org_id, org_level, start_date, end_date)
+            if rollup_stats is not None:
+                return rollup_stats
+            
             # 조직 정보 조회
             org_query = text("""
                 SELECT org_name FROM organization_master
@@ -212,6 +222,45 @@ class OrganizationDashboard:
             self.logger.error(f"조직 통계 조회 오류: {e}", exc_info=True)
             return None
     
+    def _get_rollup_statistics(self, org_id: str, org_level: str, start_date, end_date) -> Optional[Dict[str, Any]]:
+        """배치 분석 롤업 큐브에서 조직 기간 통계 조회 (롤업에 없는 조직이면 None)"""
+        if org_level not in ('center', 'team', 'group') or not ANALYTICS_DB_PATH.exists():
+            return None
+        
+        try:
+            cube = get_rollup_cube(ANALYTICS_DB_PATH)
+            rollup_id = cube.find_org(org_level, org_id)
+            if rollup_id is None:
+                return None
+            
+            stats = cube.query(org_level, start_date, end_date)
+            stats = stats[stats['org_id'] == rollup_id]
+            if stats.empty:
+                return None
+            row = stats.iloc[0]
+            
+            avg_work_hours = float(row['avg_work_hours']) if pd.notna(row['avg_work_hours']) else 0
+            utilization_rate = min(100, (avg_work_hours / 8) * 100)
+            if pd.notna(row['avg_efficiency_ratio']):
+                efficiency_score = min(100, float(row['avg_efficiency_ratio']))
+            else:
+                efficiency_score = min(100, utilization_rate * 0.95)
+            
+            return {
+                'total_employees': int(round(row['avg_employees'])),
+                'avg_work_hours': avg_work_hours,
+                'utilization_rate': utilization_rate,
+                'efficiency_score': efficiency_score,
+                'org_name': row['org_name'],
+                'org_level': org_level
+            }
+        except RollupNotBuiltError:
+            # 배치 분석 전이면 원본 데이터로 조회
+            return None
+        except Exception as e:
+            self.logger.warning(f"롤업 통계 조회 실패, 원본 데이터로 조회: {e}")
+            return None
+    
     def get_available_date_range(self):
         """데이터베이스에서 사용 가능한 날짜 범위 가져오기"""
         try:
@@ -859,7 +908,20 @@ class OrganizationDashboard:
             return org_id
     
     def _get_organization_employees(self, org_name: str, org_level: str) -> List[str]:
-        """조직에 속한 직원 ID 목록 가져오기"""
+        """조직에 속한 직원 ID 목록 가져오기 (조직/Claim 데이터가 바뀌지 않았으면 캐시 사용)"""
+        cache_key = (org_name, org_level) + tuple(
+            self.pickle_manager.stored_data_hash(name)
+            for name in ('organization_data', 'organization', 'claim_data'))
+        if cache_key in self._employees_cache:
+            return list(self._employees_cache[cache_key])
+        
+        employees = self._load_organization_employees(org_name, org_level)
+        if employees:
+            self._employees_cache[cache_key] = list(employees)
+        return employees
+    
+    def _load_organization_employees(self, org_name: str, org_level: str) -> List[str]:
+        """조직/Claim 데이터에서 조직에 속한 직원 ID 목록 계산"""
         try:
             self.logger.info(f"조직 직원 조회: {org_name} ({org_level})")
             
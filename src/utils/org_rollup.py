@@ -0,0 +1,325 @@
+"""
+조직 롤업 큐브
+daily_analysis 행을 센터/팀/그룹 × 날짜 × 직급 셀로 미리 집계해 분석 DB에 저장하고,
+셀의 누적합(prefix sum)으로 여러 날짜 구간 조회를 원본 스캔 없이 처리합니다.
+
+셀에는 합계와 건수만 저장하므로 날짜/직급을 합쳐도 평균이 정확히 합성되며,
+분석 결과가 바뀐 날짜의 셀만 다시 계산합니다(증분 갱신).
+
+롤업 생성/갱신(refresh)은 배치 분석과 분석 DB 생성 스크립트(쓰기 경로)에서만 수행하고,
+조회는 읽기 전용 연결 풀을 사용하며 롤업이 없으면 RollupNotBuiltError를 발생시킵니다.
+"""
+
+import logging
+import sqlite3
+import threading
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .sqlite_pool import SQLiteReadPool
+
+logger = logging.getLogger(__name__)
+
+# 조직 레벨 → (ID 컬럼, 이름 컬럼, 상위 ID 컬럼, 상위 이름 컬럼)
+ROLLUP_LEVELS: Dict[str, Tuple[str, str, Optional[str], Optional[str]]] = {
+    'center': ('center_id', 'center_name', None, None),
+    'team': ('team_id', 'team_name', 'center_id', 'center_name'),
+    'group': ('group_id', 'group_name', 'team_id', 'team_name'),
+}
+
+# 평균을 제공하는 지표 (셀에는 합계와 NULL이 아닌 건수를 저장)
+ROLLUP_MEASURES = ('efficiency_ratio', 'work_hours', 'focus_ratio', 'productivity_score')
+
+# 직급 구분 없이 합친 시리즈의 직급 값
+ALL_GRADES = '*'
+
+_COUNT_COLUMNS = ['employees', 'analyzed']
+_VALUE_COLUMNS = _COUNT_COLUMNS + [f'{m}_{kind}' for m in ROLLUP_MEASURES for kind in ('sum', 'count')]
+
+
+def stored_generation(conn: sqlite3.Connection) -> Optional[int]:
+    """
+    분석 DB 세대 번호 (롤업이 없으면 None)
+
+    배치 분석이 끝날 때 롤업 갱신과 함께 증가하므로, 분석 결과 캐시의 무효화 기준으로도 사용합니다.
+    """
+    try:
+        row = conn.execute("SELECT generation FROM org_rollup_state WHERE id = 1").fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
+
+
+class RollupNotBuiltError(RuntimeError):
+    """분석 DB에 롤업이 아직 생성되지 않음 (배치 분석 또는 refresh() 실행 필요)"""
+
+
+def _day_number(value: Union[date, str]) -> int:
+    """날짜를 일 단위 정수로 변환 (누적합 구간 검색용)"""
+    if isinstance(value, str):
+        value = date.fromisoformat(value[:10])
+    return value.toordinal()
+
+
+class OrgRollupCube:
+    """분석 DB의 조직 롤업 셀 저장/갱신과 구간 조회"""
+
+    def __init__(self, db_path: Union[str, Path], read_pool: Optional[SQLiteReadPool] = None):
+        """
+        Args:
+            db_path: daily_analysis 테이블이 있는 분석 DB 경로
+            read_pool: 조회에 사용할 읽기 전용 연결 풀 (없으면 첫 조회 시 생성)
+        """
+        self.db_path = str(db_path)
+        self.logger = logging.getLogger(__name__)
+        self._read_pool = read_pool
+        self._lock = threading.Lock()
+        self._generation: Optional[int] = None
+        self._series: Optional[pd.DataFrame] = None
+        self._keys = np.empty(0, dtype=np.int64)
+        self._prefix = np.zeros((1, len(_VALUE_COLUMNS) + 1))
+
+    def _connect(self) -> sqlite3.Connection:
+        """쓰기 연결 (refresh 전용)"""
+        return sqlite3.connect(self.db_path)
+
+    def _reader(self) -> SQLiteReadPool:
+        """조회용 읽기 전용 연결 풀"""
+        if self._read_pool is None:
+            self._read_pool = SQLiteReadPool(self.db_path)
+        return self._read_pool
+
+    @staticmethod
+    def ensure_schema(conn: sqlite3.Connection):
+        """롤업 테이블 생성 (없을 때만)"""
+        value_columns = ',\n            '.join(
+            f"{column} {'INTEGER' if column in _COUNT_COLUMNS or column.endswith('_count') else 'REAL'}"
+            for column in _VALUE_COLUMNS)
+        conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS org_rollup_daily (
+            level TEXT NOT NULL,
+            org_id TEXT NOT NULL,
+            org_name TEXT,
+            parent_id TEXT,
+            parent_name TEXT,
+            analysis_date DATE NOT NULL,
+            job_grade TEXT NOT NULL,
+            {value_columns},
+            PRIMARY KEY (level, org_id, analysis_date, job_grade)
+        )""")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_rollup_date ON org_rollup_daily(analysis_date)")
+        conn.execute("""
+        CREATE TABLE IF NOT EXISTS org_rollup_state (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            generation INTEGER NOT NULL,
+            updated_at TIMESTAMP
+        )""")
+
+    def refresh(self, dates: Optional[Iterable[Union[date, str]]] = None) -> int:
+        """
+        daily_analysis에서 롤업 셀 다시 계산
+
+        날짜 단위로 셀을 지우고 다시 만들므로 소속이 바뀐 직원의 이전 조직 셀도 함께 갱신됩니다.
+
+        Args:
+            dates: 다시 계산할 날짜 (없으면 전체 재구성)
+
+        Returns:
+            int: 생성된 셀 수
+        """
+        start = pd.Timestamp.now()
+        conn = self._connect()
+        try:
+            self.ensure_schema(conn)
+            cursor = conn.cursor()
+
+            if dates is None:
+                cursor.execute("DELETE FROM org_rollup_daily")
+                date_filter = ""
+            else:
+                day_values = sorted({d.isoformat() if isinstance(d, date) else str(d)[:10] for d in dates})
+                if not day_values:
+                    return 0
+                cursor.execute("CREATE TEMP TABLE IF NOT EXISTS rollup_dates (analysis_date DATE PRIMARY KEY)")
+                cursor.execute("DELETE FROM rollup_dates")
+                cursor.executemany("INSERT INTO rollup_dates VALUES (?)", [(d,) for d in day_values])
+                cursor.execute("DELETE FROM org_rollup_daily "
+                               "WHERE analysis_date IN (SELECT analysis_date FROM rollup_dates)")
+                date_filter = "AND analysis_date IN (SELECT analysis_date FROM rollup_dates)"
+
+            measures = ',\n                    '.join(
+                f"SUM({m}), COUNT({m})" for m in ROLLUP_MEASURES)
+            cells = 0
+            for level, (id_column, name_column, parent_column, parent_name_column) in ROLLUP_LEVELS.items():
+                parent = f"MAX({parent_column}), MAX({parent_name_column})" if parent_column else "NULL, NULL"
+                cursor.execute(f"""
+                INSERT INTO org_rollup_daily (
+                    level, org_id, org_name, parent_id, parent_name, analysis_date, job_grade,
+                    {', '.join(_VALUE_COLUMNS)}
+                )
+                SELECT
+                    ?, {id_column}, MAX({name_column}), {parent},
+                    analysis_date, COALESCE(job_grade, ''),
+                    COUNT(*),
+                    SUM(CASE WHEN total_hours > 0 THEN 1 ELSE 0 END),
+                    {measures}
+                FROM daily_analysis
+                WHERE {id_column} IS NOT NULL {date_filter}
+                GROUP BY {id_column}, analysis_date, COALESCE(job_grade, '')
+                """, (level,))
+                cells += cursor.rowcount
+
+            cursor.execute("""
+            INSERT INTO org_rollup_state (id, generation, updated_at) VALUES (1, 1, CURRENT_TIMESTAMP)
+            ON CONFLICT(id) DO UPDATE SET generation = generation + 1, updated_at = CURRENT_TIMESTAMP
+            """)
+            conn.commit()
+        finally:
+            conn.close()
+
+        scope = '전체' if dates is None else f"{len(day_values)}일"
+        self.logger.info(f"조직 롤업 갱신 완료({scope}): 셀 {cells:,}개, "
+                         f"{(pd.Timestamp.now() - start).total_seconds():.3f}초")
+        return cells
+
+    def _ensure_loaded(self):
+        """
+        저장된 세대가 바뀌었으면 셀을 다시 읽어 누적합 재구성
+
+        동시에 들어온 첫 조회들이 같은 세대를 중복으로 읽지 않도록 락 안에서 확인/로드합니다.
+
+        Raises:
+            RollupNotBuiltError: 롤업이 아직 생성되지 않은 경우 (조회 경로에서는 생성하지 않음)
+        """
+        with self._lock:
+            with self._reader().connection() as conn:
+                generation = stored_generation(conn)
+                if generation is None:
+                    raise RollupNotBuiltError(f"조직 롤업이 없습니다: {self.db_path}")
+                if generation != self._generation:
+                    self._load(conn, generation)
+
+    def _load(self, conn: sqlite3.Connection, generation: int):
+        cells = pd.read_sql_query("SELECT * FROM org_rollup_daily", conn)
+
+        # 직급 합계 시리즈 추가
+        totals = (cells.groupby(['level', 'org_id', 'analysis_date'], as_index=False, sort=False)
+                  .agg({**{c: 'sum' for c in _VALUE_COLUMNS},
+                        'org_name': 'max', 'parent_id': 'max', 'parent_name': 'max'}))
+        totals['job_grade'] = ALL_GRADES
+        cells = pd.concat([cells, totals], ignore_index=True)
+        cells['day'] = [_day_number(d) for d in cells['analysis_date']]
+        cells = cells.sort_values(['level', 'org_id', 'job_grade', 'day'], kind='stable').reset_index(drop=True)
+
+        # 시리즈(레벨, 조직, 직급)별 정보: 이름/상위 조직은 마지막 날짜 기준
+        series_ids = cells.groupby(['level', 'org_id', 'job_grade'], sort=False).ngroup().to_numpy()
+        self._series = (cells.groupby(series_ids, sort=True)
+                        [['level', 'org_id', 'job_grade', 'org_name', 'parent_id', 'parent_name']].last())
+
+        # (시리즈, 날짜) 복합 키로 정렬되어 있으므로 모든 시리즈의 구간을 한 번에 검색
+        days = cells['day'].to_numpy(dtype=np.int64)
+        self._keys = series_ids.astype(np.int64) * 10_000_000 + days
+        values = np.column_stack([np.ones(len(cells)), cells[_VALUE_COLUMNS].fillna(0).to_numpy(dtype=float)])
+        self._prefix = np.vstack([np.zeros((1, values.shape[1])), np.cumsum(values, axis=0)])
+        self._generation = generation
+        self.logger.info(f"조직 롤업 로드: 세대 {generation}, 시리즈 {len(self._series):,}개, 셀 {len(cells):,}개")
+
+    def query(self, level: str, start_date: Union[date, str], end_date: Union[date, str] = None,
+              parent_id: str = None, by_grade: bool = False) -> pd.DataFrame:
+        """
+        기간 집계 조회 (누적합 차이로 계산)
+
+        Args:
+            level: 'center', 'team', 'group'
+            start_date: 시작 날짜
+            end_date: 종료 날짜 (없으면 start_date 하루)
+            parent_id: 상위 조직 ID로 제한 (팀 → 센터, 그룹 → 팀)
+            by_grade: True면 직급별 행, False면 조직별 행
+
+        Returns:
+            pd.DataFrame: 조직(직급)별 days, employee_days, analyzed_days, avg_employees,
+                avg_analyzed_employees, avg_<지표> 컬럼
+        """
+        if level not in ROLLUP_LEVELS:
+            raise ValueError(f"알 수 없는 조직 레벨: {level}")
+        self._ensure_loaded()
+
+        with self._lock:
+            series = self._series
+            keys, prefix = self._keys, self._prefix
+
+        mask = (series['level'] == level).to_numpy()
+        grade_mask = (series['job_grade'] == ALL_GRADES).to_numpy()
+        mask = mask & (~grade_mask if by_grade else grade_mask)
+        if parent_id is not None:
+            mask = mask & (series['parent_id'] == str(parent_id)).to_numpy()
+        selected = series[mask]
+
+        series_index = selected.index.to_numpy(dtype=np.int64) * 10_000_000
+        lo = np.searchsorted(keys, series_index + _day_number(start_date), side='left')
+        hi = np.searchsorted(keys, series_index + _day_number(end_date or start_date), side='right')
+        sums = prefix[hi] - prefix[lo]
+
+        result = selected.reset_index(drop=True)
+        result['days'] = sums[:, 0].astype(int)
+        values = pd.DataFrame(sums[:, 1:], columns=_VALUE_COLUMNS)
+        result['employee_days'] = values['employees'].astype(int)
+        result['analyzed_days'] = values['analyzed'].astype(int)
+        days = result['days'].replace(0, np.nan)
+        result['avg_employees'] = result['employee_days'] / days
+        result['avg_analyzed_employees'] = result['analyzed_days'] / days
+        for measure in ROLLUP_MEASURES:
+            counts = values[f'{measure}_count'].replace(0, np.nan)
+            result[f'avg_{measure}'] = values[f'{measure}_sum'] / counts
+
+        result = result[result['days'] > 0]
+        if not by_grade:
+            result = result.drop(columns=['job_grade'])
+        return result.sort_values('org_name', kind='stable').reset_index(drop=True)
+
+    def find_org(self, level: str, key: str) -> Optional[str]:
+        """조직 ID 또는 조직명으로 롤업 조직 ID 찾기"""
+        self._ensure_loaded()
+        with self._lock:
+            series = self._series
+        candidates = series[(series['level'] == level) & (series['job_grade'] == ALL_GRADES)]
+        for column in ('org_id', 'org_name'):
+            matched = candidates[candidates[column] == str(key)]
+            if not matched.empty:
+                return matched['org_id'].iloc[0]
+        return None
+
+    def date_range(self) -> Optional[Tuple[date, date]]:
+        """롤업에 있는 날짜 범위"""
+        self._ensure_loaded()
+        with self._lock:
+            keys = self._keys
+        if not len(keys):
+            return None
+        days = keys % 10_000_000
+        return date.fromordinal(int(days.min())), date.fromordinal(int(days.max()))
+
+
+_cubes: Dict[str, OrgRollupCube] = {}
+_cubes_lock = threading.Lock()
+
+
+def get_rollup_cube(db_path: Union[str, Path],
+                    read_pool: Optional[SQLiteReadPool] = None) -> OrgRollupCube:
+    """
+    DB 경로별 공유 롤업 큐브 (프로세스 내 누적합을 재사용)
+
+    Args:
+        db_path: 분석 DB 경로
+        read_pool: 공유할 읽기 전용 연결 풀 (API 서버의 풀 등, 없으면 큐브가 생성)
+    """
+    key = str(Path(db_path).resolve())
+    with _cubes_lock:
+        cube = _cubes.get(key)
+        if cube is None or (read_pool is not None and cube._read_pool is not read_pool):
+            cube = _cubes[key] = OrgRollupCube(key, read_pool)
+        return cube
@@ -4,14 +4,169 @@
 """
 
 import pandas as pd
+import numpy as np
+import hashlib
 import logging
-from typing import Optional, Dict, Any
-from datetime import datetime, timedelta
+import sys
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+from datetime import datetime
 import threading
 from pathlib import Path
 
+from .tag_data_index import TagDataIndex
+from .source_tag_index import (
+    EmployeeDayIndex, KNOX_TAG_SOURCES, EQUIPMENT_SOURCES, build_knox_tag_index, build_equipment_index
+)
+from ..config.performance_settings import ANALYSIS_CACHE_MAX_MB, ANALYSIS_CACHE_TTL_SECONDS
+
 logger = logging.getLogger(__name__)
 
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """캐시 항목의 메모리 크기 추정 (바이트, DataFrame은 memory_usage(deep=True) 기준)"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if _depth < 4:
+        if isinstance(value, dict):
+            return sys.getsizeof(value) + sum(estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1)
+                                              for k, v in value.items())
+        if isinstance(value, (list, tuple, set)):
+            return sys.getsizeof(value) + sum(estimate_size(item, _depth + 1) for item in value)
+    return sys.getsizeof(value)
+
+
+def frame_signature(df: pd.DataFrame) -> str:
+    """DataFrame 내용 식별자 (컬럼과 행 순서/해시 기준, 캐시 키 구성용)"""
+    try:
+        row_hashes = pd.util.hash_pandas_object(df, index=False)
+    except TypeError:
+        row_hashes = pd.util.hash_pandas_object(df.astype(str), index=False)
+    digest = hashlib.md5('|'.join(str(col) for col in df.columns).encode('utf-8'))
+    digest.update(row_hashes.to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class SizedLRUCache:
+    """
+    바이트 예산과 TTL을 가진 LRU 캐시 (스레드 안전)
+    
+    항목을 넣을 때 크기를 계산해 두고, 예산을 넘으면 가장 오래 사용하지 않은 항목부터
+    제거합니다. 만료된 항목은 조회 시 제거됩니다.
+    """
+    
+    def __init__(self, max_bytes: int, ttl_seconds: float):
+        """
+        Args:
+            max_bytes: 전체 항목 크기 상한 (바이트)
+            ttl_seconds: 항목 유지 시간 (초)
+        """
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[Any, int, float]]" = OrderedDict()  # 키 → (값, 크기, 저장 시각)
+        self._lock = threading.RLock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def get(self, key: str) -> Optional[Any]:
+        """항목 조회 (없거나 만료되면 None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            value, _, stored_at = entry
+            if time.monotonic() - stored_at >= self.ttl_seconds:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def put(self, key: str, value: Any) -> bool:
+        """
+        항목 저장 (예산을 넘으면 오래된 항목부터 제거)
+        
+        Returns:
+            bool: 저장 여부 (항목 하나가 예산보다 크면 저장하지 않음)
+        """
+        size = estimate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                return False
+            
+            while self._entries and self.current_bytes + size > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+            
+            self._entries[key] = (value, size, time.monotonic())
+            self.current_bytes += size
+            return True
+    
+    def discard(self, key: str):
+        """항목 제거 (없으면 무시)"""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+    
+    def purge_expired(self) -> int:
+        """만료된 항목 일괄 제거"""
+        with self._lock:
+            now = time.monotonic()
+            expired = [key for key, (_, _, stored_at) in self._entries.items()
+                       if now - stored_at >= self.ttl_seconds]
+            for key in expired:
+                self._remove(key)
+            self.expirations += len(expired)
+            return len(expired)
+    
+    def clear(self):
+        """모든 항목 제거 (통계는 유지)"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+    
+    def _remove(self, key: str):
+        _, size, _ = self._entries.pop(key)
+        self.current_bytes -= size
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+    
+    def stats(self) -> Dict[str, Any]:
+        """적중/미스/제거 통계"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'size_mb': self.current_bytes / 1024 / 1024,
+                'max_mb': self.max_bytes / 1024 / 1024,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+
+
 class PerformanceCache:
     """성능 최적화를 위한 메모리 캐싱 시스템"""
     
@@ -31,6 +186,7 @@ class PerformanceCache:
         """캐시 초기화"""
         self.tag_data_cache: Optional[pd.DataFrame] = None
         self.tag_data_loaded_at: Optional[datetime] = None
+        self.tag_index: Optional[TagDataIndex] = None
         
         self.organization_data_cache: Optional[pd.DataFrame] = None
         self.organization_loaded_at: Optional[datetime] = None
@@ -41,9 +197,23 @@ class PerformanceCache:
         self.claim_data_cache: Optional[pd.DataFrame] = None
         self.claim_data_loaded_at: Optional[datetime] = None
         
-        self.analysis_results_cache: Dict[str, Any] = {}
+        # Knox/장비 원천 데이터의 직원-일자 인덱스
+        self.knox_tag_index: Optional[EmployeeDayIndex] = None
+        self.knox_tags_loaded_at: Optional[datetime] = None
+        
+        self.equipment_index: Optional[Dict[str, EmployeeDayIndex]] = None
+        self.equipment_loaded_at: Optional[datetime] = None
+        
+        # 직원-일자 단위 캐시 (일별 태그, 활동 분류 결과, 분석 결과)
+        self.analysis_results_cache = SizedLRUCache(
+            max_bytes=ANALYSIS_CACHE_MAX_MB * 1024 * 1024,
+            ttl_seconds=ANALYSIS_CACHE_TTL_SECONDS
+        )
         self.cache_ttl_minutes = 30  # 캐시 유지 시간
         
+        # preload로 고정된 캐시 (TTL 만료 없음)
+        self.pinned_caches: set = set()
+        
         logger.info("PerformanceCache 초기화 완료")
     
     def get_tag_data(self, pickle_manager=None) -> Optional[pd.DataFrame]:
@@ -64,6 +234,7 @@ class PerformanceCache:
             start_time = datetime.now()
             self.tag_data_cache = pickle_manager.load_dataframe('tag_data')
             self.tag_data_loaded_at = start_time
+            self.tag_index = None
             
             load_time = (datetime.now() - start_time).total_seconds()
             
@@ -111,68 +282,97 @@ class PerformanceCache:
             logger.error(f"조직 데이터 캐시 로드 실패: {e}")
             return None
     
-    def get_daily_tag_data(self, employee_id: str, selected_date, work_type: str = 'day_shift') -> Optional[pd.DataFrame]:
-        """개인별 일별 태그 데이터 최적화 로드"""
+    def get_tag_index(self, pickle_manager=None) -> Optional[TagDataIndex]:
+        """(사번, 시각) 정렬 태그 데이터 인덱스 (태그 데이터 로드 시 1회 생성)"""
         try:
-            # 캐시 키 생성
-            cache_key = f"daily_tag_{employee_id}_{selected_date}_{work_type}"
-            
-            # 분석 결과 캐시 확인 (짧은 TTL)
-            if cache_key in self.analysis_results_cache:
-                cache_entry = self.analysis_results_cache[cache_key]
-                cache_time = cache_entry.get('cached_at')
-                if cache_time and (datetime.now() - cache_time).seconds < 300:  # 5분 TTL
-                    # Cache hit - removed debug logging
-                    return cache_entry.get('data')
-            
-            # 전체 태그 데이터 가져오기 (캐시 활용)
-            tag_data = self.get_tag_data()
+            tag_data = self.get_tag_data(pickle_manager)
             if tag_data is None:
                 return None
             
-            # 효율적인 필터링
-            date_int = int(selected_date.strftime('%Y%m%d'))
-            emp_id_int = int(employee_id)
+            if self.tag_index is None or self.tag_index.source is not tag_data:
+                with self._lock:
+                    if self.tag_index is None or self.tag_index.source is not tag_data:
+                        # 인덱스는 원본을 복사하지 않고 정렬 순열/오프셋만 보관
+                        self.tag_index = TagDataIndex(tag_data)
             
-            if work_type == 'night_shift':
-                # 야간 근무: 전날 + 당일 데이터
-                prev_date_int = int((selected_date - timedelta(days=1)).strftime('%Y%m%d'))
-                
-                # 벡터화된 필터링
-                mask = (tag_data['사번'] == emp_id_int) & (
-                    (tag_data['ENTE_DT'] == prev_date_int) | 
-                    (tag_data['ENTE_DT'] == date_int)
-                )
-                daily_data = tag_data[mask].copy()
-                
-                # 시간 필터링 최적화
-                if not daily_data.empty:
-                    daily_data['hour'] = daily_data['출입시각'].astype(str).str[:2].astype(int)
-                    mask = (
-                        (daily_data['ENTE_DT'] == prev_date_int) & (daily_data['hour'] >= 17)
-                    ) | (
-                        (daily_data['ENTE_DT'] == date_int) & (daily_data['hour'] < 12)
-                    )
-                    daily_data = daily_data[mask]
-            else:
-                # 일반 근무: 당일 데이터만
-                mask = (tag_data['사번'] == emp_id_int) & (tag_data['ENTE_DT'] == date_int)
-                daily_data = tag_data[mask].copy()
+            return self.tag_index
+            
+        except Exception as e:
+            logger.error(f"태그 데이터 인덱스 생성 실패: {e}")
+            return None
+    
+    def get_knox_tag_index(self, pickle_manager=None) -> Optional[EmployeeDayIndex]:
+        """태그 형식으로 정규화한 Knox 결재/PIMS/메일 데이터의 (사번, 날짜) 인덱스"""
+        try:
+            if self._is_cache_valid('knox_tags'):
+                return self.knox_tag_index
+            
+            with self._lock:
+                if not self._is_cache_valid('knox_tags'):
+                    sources = self._load_sources(KNOX_TAG_SOURCES, pickle_manager)
+                    self.knox_tag_index = build_knox_tag_index(sources)
+                    self.knox_tags_loaded_at = datetime.now()
+            
+            return self.knox_tag_index
+        
+        except Exception as e:
+            logger.error(f"Knox 태그 인덱스 생성 실패: {e}")
+            return None
+    
+    def get_equipment_index(self, pickle_manager=None) -> Dict[str, EmployeeDayIndex]:
+        """장비 사용 데이터(LAMS/MES/EAM/통합본)의 원천별 (사번, 날짜) 인덱스"""
+        try:
+            if self._is_cache_valid('equipment'):
+                return self.equipment_index
+            
+            with self._lock:
+                if not self._is_cache_valid('equipment'):
+                    sources = self._load_sources(EQUIPMENT_SOURCES, pickle_manager)
+                    self.equipment_index = build_equipment_index(sources)
+                    self.equipment_loaded_at = datetime.now()
+            
+            return self.equipment_index
+        
+        except Exception as e:
+            logger.error(f"장비 데이터 인덱스 생성 실패: {e}")
+            return {}
+    
+    @staticmethod
+    def _load_sources(names, pickle_manager=None) -> Dict[str, Optional[pd.DataFrame]]:
+        """원천 데이터 일괄 로드 (없는 데이터는 None)"""
+        if pickle_manager is None:
+            from ..database import get_pickle_manager
+            pickle_manager = get_pickle_manager()
+        
+        sources = {}
+        for name in names:
+            try:
+                sources[name] = pickle_manager.load_dataframe(name=name)
+            except FileNotFoundError:
+                sources[name] = None
+        return sources
+    
+    def get_daily_tag_data(self, employee_id: str, selected_date, work_type: str = 'day_shift') -> Optional[pd.DataFrame]:
+        """개인별 일별 태그 데이터 최적화 로드"""
+        try:
+            # 분석 캐시 확인 (짧은 TTL)
+            cached = self.get_analysis_cache('daily_tag', employee_id, selected_date, work_type)
+            if cached is not None:
+                return cached
+            
+            # 정렬 인덱스에서 근무시간대 구간만 슬라이스 (O(log n + k))
+            tag_index = self.get_tag_index()
+            if tag_index is None:
+                return None
+            
+            daily_data = tag_index.get_shift_window(int(employee_id), selected_date, work_type)
             
             # 결과 캐싱
             if not daily_data.empty:
-                # datetime 컬럼 생성 (필수)
+                # datetime 컬럼은 인덱스의 정렬 시각으로 채워져 있고 시각 순으로 정렬되어 있음
                 daily_data['time'] = daily_data['출입시각'].astype(str).str.zfill(6)
-                daily_data['datetime'] = pd.to_datetime(
-                    daily_data['ENTE_DT'].astype(str) + ' ' + daily_data['time'],
-                    format='%Y%m%d %H%M%S'
-                )
-                daily_data = daily_data.sort_values('datetime')
                 
-                self.analysis_results_cache[cache_key] = {
-                    'data': daily_data,
-                    'cached_at': datetime.now()
-                }
+                self.set_analysis_cache(daily_data, 'daily_tag', employee_id, selected_date, work_type)
                 
                 # Data filtering complete - removed debug logging
             
@@ -182,6 +382,24 @@ class PerformanceCache:
             logger.error(f"일별 태그 데이터 로드 실패: {employee_id}, {selected_date}, {e}")
             return None
     
+    def get_analysis_cache(self, kind: str, *key_parts) -> Optional[Any]:
+        """
+        직원-일자 단위 분석 캐시 조회
+        
+        Args:
+            kind: 항목 종류 ('daily_tag', 'classified', 'analysis' 등)
+            *key_parts: 사번, 날짜 등 키 구성 요소
+        """
+        return self.analysis_results_cache.get(self._analysis_key(kind, key_parts))
+    
+    def set_analysis_cache(self, value: Any, kind: str, *key_parts) -> bool:
+        """직원-일자 단위 분석 캐시 저장 (메모리 예산을 넘으면 오래된 항목부터 제거)"""
+        return self.analysis_results_cache.put(self._analysis_key(kind, key_parts), value)
+    
+    @staticmethod
+    def _analysis_key(kind: str, key_parts: Tuple) -> str:
+        return '_'.join([kind] + [str(part) for part in key_parts])
+    
     def get_tag_location_master(self, db_manager=None) -> Optional[pd.DataFrame]:
         """태깅지점 마스터 데이터 캐시된 로드"""
         try:
@@ -270,8 +488,35 @@ class PerformanceCache:
             logger.error(f"Claim 데이터 캐시 로드 실패: {e}")
             return None
     
+    def preload(self, cache_type: str, data: pd.DataFrame):
+        """
+        외부에서 준비된 데이터를 캐시에 고정 (병렬 분석 워커의 공유 데이터용)
+        
+        Args:
+            cache_type: 'tag_data', 'organization', 'claim_data'
+            data: 캐시할 DataFrame
+        """
+        now = datetime.now()
+        if cache_type == 'tag_data':
+            self.tag_data_cache = data
+            self.tag_data_loaded_at = now
+            self.tag_index = None
+        elif cache_type == 'organization':
+            self.organization_data_cache = data
+            self.organization_loaded_at = now
+        elif cache_type == 'claim_data':
+            self.claim_data_cache = data
+            self.claim_data_loaded_at = now
+        else:
+            raise ValueError(f"지원하지 않는 캐시 유형: {cache_type}")
+        
+        self.pinned_caches.add(cache_type)
+        logger.info(f"{cache_type} 캐시 고정: {len(data):,}건")
+    
     def _is_cache_valid(self, cache_type: str) -> bool:
         """캐시 유효성 검사"""
+        if cache_type in self.pinned_caches:
+            return True
         if cache_type == 'tag_data':
             return (self.tag_data_cache is not None and 
                    self.tag_data_loaded_at is not None and
@@ -288,13 +533,27 @@ class PerformanceCache:
             return (self.claim_data_cache is not None and 
                    self.claim_data_loaded_at is not None and
                    (datetime.now() - self.claim_data_loaded_at).seconds < self.cache_ttl_minutes * 60)
+        elif cache_type == 'knox_tags':
+            return (self.knox_tag_index is not None and 
+                   self.knox_tags_loaded_at is not None and
+                   (datetime.now() - self.knox_tags_loaded_at).seconds < self.cache_ttl_minutes * 60)
+        elif cache_type == 'equipment':
+            return (self.equipment_index is not None and 
+                   self.equipment_loaded_at is not None and
+                   (datetime.now() - self.equipment_loaded_at).seconds < self.cache_ttl_minutes * 60)
         return False
     
     def clear_cache(self, cache_type: str = 'all'):
         """캐시 클리어"""
+        if cache_type == 'all':
+            self.pinned_caches.clear()
+        else:
+            self.pinned_caches.discard(cache_type)
+        
         if cache_type in ['all', 'tag_data']:
             self.tag_data_cache = None
             self.tag_data_loaded_at = None
+            self.tag_index = None
             logger.info("태그 데이터 캐시 클리어")
         
         if cache_type in ['all', 'organization']:
@@ -315,19 +574,33 @@ class PerformanceCache:
             self.claim_data_cache = None
             self.claim_data_loaded_at = None
             logger.info("Claim 데이터 캐시 클리어")
+        
+        if cache_type in ['all', 'knox_tags']:
+            self.knox_tag_index = None
+            self.knox_tags_loaded_at = None
+            logger.info("Knox 태그 인덱스 클리어")
+        
+        if cache_type in ['all', 'equipment']:
+            self.equipment_index = None
+            self.equipment_loaded_at = None
+            logger.info("장비 데이터 인덱스 클리어")
     
     def get_cache_stats(self) -> Dict[str, Any]:
         """캐시 통계 정보"""
         stats = {
             'tag_data_cached': self.tag_data_cache is not None,
             'tag_data_size': len(self.tag_data_cache) if self.tag_data_cache is not None else 0,
+            'tag_index_built': self.tag_index is not None,
             'organization_cached': self.organization_data_cache is not None,
             'organization_size': len(self.organization_data_cache) if self.organization_data_cache is not None else 0,
             'tag_location_master_cached': self.tag_location_master_cache is not None,
             'tag_location_master_size': len(self.tag_location_master_cache) if self.tag_location_master_cache is not None else 0,
             'claim_data_cached': self.claim_data_cache is not None,
             'claim_data_size': len(self.claim_data_cache) if self.claim_data_cache is not None else 0,
+            'knox_tags_size': len(self.knox_tag_index) if self.knox_tag_index is not None else 0,
+            'equipment_index_size': sum(len(index) for index in (self.equipment_index or {}).values()),
             'analysis_cache_count': len(self.analysis_results_cache),
+            'analysis_cache': self.analysis_results_cache.stats(),
             'memory_usage_mb': self._calculate_memory_usage()
         }
         return stats
@@ -339,6 +612,10 @@ class PerformanceCache:
         if self.tag_data_cache is not None:
             total_bytes += self.tag_data_cache.memory_usage(deep=True).sum()
         
+        if self.tag_index is not None:
+            total_bytes += (self.tag_index.employee_ids.nbytes + self.tag_index.timestamps.nbytes
+                            + self.tag_index.positions.nbytes)
+        
         if self.organization_data_cache is not None:
             total_bytes += self.organization_data_cache.memory_usage(deep=True).sum()
         
@@ -348,8 +625,13 @@ class PerformanceCache:
         if self.claim_data_cache is not None:
             total_bytes += self.claim_data_cache.memory_usage(deep=True).sum()
         
-        # 분석 결과 캐시는 대략 추정
-        total_bytes += len(self.analysis_results_cache) * 10 * 1024  # 대략 10KB per entry
+        if self.knox_tag_index is not None:
+            total_bytes += self.knox_tag_index.data.memory_usage(deep=True).sum()
+        
+        for index in (self.equipment_index or {}).values():
+            total_bytes += index.data.memory_usage(deep=True).sum()
+        
+        total_bytes += self.analysis_results_cache.current_bytes
         
         return total_bytes / 1024 / 1024
 
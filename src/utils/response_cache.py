@@ -0,0 +1,201 @@
+"""
+분석 API 응답 캐시
+엔드포인트 경로와 쿼리 파라미터별로 인코딩된 응답 본문을 보관하고, 분석 DB 세대 번호가
+바뀌면(배치 분석 완료) 전체를 무효화합니다. ETag / If-None-Match 조건부 요청을 지원해
+클라이언트가 이미 가진 응답은 본문 없이 304로 응답합니다.
+
+ASGI 미들웨어로 동작하므로 캐시 적중 시 라우팅, 쿼리, JSON 인코딩을 모두 건너뜁니다.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.concurrency import run_in_threadpool
+
+from .performance_cache import SizedLRUCache
+from ..config.performance_settings import (
+    API_GENERATION_CHECK_SECONDS, API_RESPONSE_CACHE_MAX_MB, CACHE_EXPIRY_HOURS
+)
+
+logger = logging.getLogger(__name__)
+
+
+# 캐시 응답에 다시 붙이지 않는 헤더 (미들웨어가 다시 계산하거나 요청별로 달라지는 값)
+_UNCACHED_HEADERS = frozenset({b'content-length', b'etag', b'set-cookie'})
+
+
+class CachedResponse(NamedTuple):
+    """캐시된 응답 (본문, ETag, 앱이 설정한 헤더)"""
+    body: bytes
+    etag: bytes
+    headers: Tuple[Tuple[bytes, bytes], ...]
+
+
+class ResponseCache:
+    """세대 번호로 무효화되는 응답 캐시"""
+
+    def __init__(self, generation_func: Callable[[], int],
+                 max_bytes: int = API_RESPONSE_CACHE_MAX_MB * 1024 * 1024,
+                 check_seconds: float = API_GENERATION_CHECK_SECONDS):
+        """
+        Args:
+            generation_func: 현재 데이터 세대 번호를 반환하는 함수
+            max_bytes: 응답 본문 메모리 예산 (바이트)
+            check_seconds: 세대 번호 확인 주기 (이 시간 동안은 마지막 값을 사용)
+        """
+        self.generation_func = generation_func
+        self.check_seconds = check_seconds
+        self.entries = SizedLRUCache(max_bytes, ttl_seconds=CACHE_EXPIRY_HOURS * 3600)
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._generation: Optional[int] = None
+        self._checked_at = 0.0
+
+    def recent_generation(self) -> Optional[int]:
+        """확인 주기 안에 확인한 세대 번호 (DB를 읽지 않음, 주기가 지났으면 None)"""
+        if self._generation is not None and time.monotonic() - self._checked_at < self.check_seconds:
+            return self._generation
+        return None
+
+    def generation(self) -> int:
+        """현재 세대 번호 (바뀌었으면 캐시 비움, 확인 주기가 지났으면 generation_func 호출)"""
+        now = time.monotonic()
+        if self._generation is not None and now - self._checked_at < self.check_seconds:
+            return self._generation
+
+        generation = self.generation_func()
+        with self._lock:
+            if generation != self._generation:
+                if self._generation is not None:
+                    self.logger.info(f"데이터 세대 변경 {self._generation} → {generation}, 응답 캐시 초기화")
+                self.entries.clear()
+                self._generation = generation
+            self._checked_at = now
+        return generation
+
+    def get(self, key: str, generation: int) -> Optional[CachedResponse]:
+        """세대 번호의 캐시 응답 (없으면 None)"""
+        return self.entries.get(f"{generation}:{key}")
+
+    def put(self, key: str, generation: int, body: bytes,
+            headers: List[Tuple[bytes, bytes]]) -> CachedResponse:
+        """
+        응답 본문과 헤더 저장 (ETag는 세대 번호와 본문 해시로 생성)
+
+        Content-Length/ETag/Set-Cookie를 제외한 앱의 응답 헤더를 그대로 보관합니다.
+
+        generation은 응답을 계산하기 전에 확인한 세대 번호로, 계산 중에 세대가 바뀌었으면
+        이전 세대 키로 저장되어 다시 조회되지 않습니다.
+        """
+        digest = hashlib.blake2b(body, digest_size=8).hexdigest()
+        kept = tuple((name, value) for name, value in headers if name.lower() not in _UNCACHED_HEADERS)
+        entry = CachedResponse(body, f'"{generation}-{digest}"'.encode('ascii'), kept)
+        self.entries.put(f"{generation}:{key}", entry)
+        return entry
+
+    def stats(self) -> Dict[str, Any]:
+        """세대 번호와 캐시 통계"""
+        return {'generation': self._generation, **self.entries.stats()}
+
+
+def _etag_matches(if_none_match: Optional[bytes], etag: bytes) -> bool:
+    """If-None-Match 헤더가 ETag와 일치하는지 (여러 값, 약한 비교, * 지원)"""
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(b',')]
+    return b'*' in candidates or any(value.removeprefix(b'W/') == etag for value in candidates)
+
+
+class ResponseCacheMiddleware:
+    """GET 응답을 ResponseCache에 보관하고 조건부 요청을 처리하는 ASGI 미들웨어"""
+
+    def __init__(self, app, cache: ResponseCache, path_prefix: str = '/api/',
+                 exclude_paths: Tuple[str, ...] = ()):
+        """
+        Args:
+            app: 감쌀 ASGI 앱
+            cache: 응답 캐시
+            path_prefix: 캐시할 경로 접두어
+            exclude_paths: 캐시하지 않을 경로 (상태 확인 등 매번 달라지는 응답)
+        """
+        self.app = app
+        self.cache = cache
+        self.path_prefix = path_prefix
+        self.exclude_paths = frozenset(exclude_paths)
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def _cache_key(scope: Dict[str, Any]) -> str:
+        """경로 + 정렬된 쿼리 문자열 (파라미터 순서와 무관)"""
+        query = sorted(parse_qsl(scope.get('query_string', b'').decode('latin-1'), keep_blank_values=True))
+        return f"{scope['path']}?{urlencode(query)}"
+
+    async def __call__(self, scope, receive, send):
+        if (scope['type'] != 'http' or scope['method'] != 'GET'
+                or not scope['path'].startswith(self.path_prefix)
+                or scope['path'] in self.exclude_paths):
+            await self.app(scope, receive, send)
+            return
+
+        key = self._cache_key(scope)
+        try:
+            # 확인 주기가 지났을 때만 스레드 풀에서 DB 세대 번호 조회 (이벤트 루프를 막지 않음)
+            generation = self.cache.recent_generation()
+            if generation is None:
+                generation = await run_in_threadpool(self.cache.generation)
+        except Exception as e:
+            # 세대 번호를 읽을 수 없으면(DB 없음 등) 캐시 없이 처리
+            self.logger.warning(f"응답 캐시 사용 불가: {e}")
+            await self.app(scope, receive, send)
+            return
+
+        entry = self.cache.get(key, generation)
+        live_headers: List[Tuple[bytes, bytes]] = []
+        if entry is None:
+            messages: List[Dict[str, Any]] = []
+
+            async def capture(message):
+                messages.append(message)
+
+            await self.app(scope, receive, capture)
+
+            start = messages[0] if messages and messages[0]['type'] == 'http.response.start' else None
+            if start is None or start['status'] != 200:
+                for message in messages:
+                    await send(message)
+                return
+
+            body = b''.join(message.get('body', b'') for message in messages[1:])
+            response_headers = list(start.get('headers', []))
+            entry = self.cache.put(key, generation, body, response_headers)
+            # 이번 요청에 대한 Set-Cookie는 캐시하지 않고 이 응답에만 전달
+            live_headers = [(name, value) for name, value in response_headers
+                            if name.lower() == b'set-cookie']
+
+        await self._send_entry(scope, send, entry, live_headers)
+
+    async def _send_entry(self, scope, send, entry: CachedResponse,
+                          live_headers: List[Tuple[bytes, bytes]] = ()):
+        """캐시 응답 전송 (앱의 헤더 유지, ETag가 일치하면 본문 없이 304)"""
+        if_none_match = next((value for name, value in scope['headers'] if name == b'if-none-match'), None)
+        headers: List[Tuple[bytes, bytes]] = [(b'etag', entry.etag), *entry.headers, *live_headers]
+        if not any(name.lower() == b'cache-control' for name, _ in entry.headers):
+            # 앱이 지정하지 않았으면 항상 ETag로 재검증
+            headers.append((b'cache-control', b'no-cache'))
+
+        if _etag_matches(if_none_match, entry.etag):
+            # 304는 본문 관련 헤더 없이 전송
+            headers = [(name, value) for name, value in headers if name.lower() != b'content-type']
+            await send({'type': 'http.response.start', 'status': 304, 'headers': headers})
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+
+        if not any(name.lower() == b'content-type' for name, _ in headers):
+            headers.append((b'content-type', b'application/json'))
+        headers.append((b'content-length', str(len(entry.body)).encode('ascii')))
+        await send({'type': 'http.response.start', 'status': 200, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': entry.body})
@@ -0,0 +1,206 @@
+"""
+부가 원천 데이터(Knox, 장비) 직원-일자 인덱스
+원천 데이터를 한 번만 로드해 태그 형식으로 일괄 정규화하고 (사번, 날짜)별 오프셋 테이블을
+유지하여, 직원-일자 단위 조회를 딕셔너리 조회와 연속 구간 슬라이스로 처리
+"""
+
+import numpy as np
+import pandas as pd
+import logging
+from datetime import date, datetime
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Knox 원천별 태그 변환 규칙: (사번 컬럼 후보, 시각 컬럼 후보, DR_NO, DR_NM, Tag_Code, source)
+KNOX_TAG_SOURCES = {
+    'knox_approval_data': (('UserNo', '사번'), ('Timestamp', 'timestamp'),
+                           'O_KNOX_APPROVAL', 'Knox 결재 시스템', 'O', 'knox_approval'),
+    'knox_pims_data': (('사번',), ('시작일시_GMT+9', 'start_time'),
+                       'G3_KNOX_PIMS', 'Knox PIMS 회의', 'G3', 'knox_pims'),
+    'knox_mail_data': (('발신인사번_text',), ('발신일시_GMT9', 'timestamp'),
+                       'O_KNOX_MAIL', 'Knox 메일 시스템', 'O', 'knox_mail'),
+}
+
+# 장비 원천별 시스템 표시명 (equipment_data_merged는 통합본이라 표시명 없음)
+EQUIPMENT_SOURCES = {
+    'lams_data': 'LAMS(품질시스템)',
+    'mes_data': 'MES(생산시스템)',
+    'eam_data': 'EAM(안전설비시스템)',
+    'equipment_data_merged': None,
+}
+
+
+def _first_column(df: pd.DataFrame, candidates: Sequence[str]) -> Optional[str]:
+    """후보 중 DataFrame에 있는 첫 번째 컬럼"""
+    return next((col for col in candidates if col in df.columns), None)
+
+
+# pd.to_datetime(format='mixed')는 pandas 2.0부터 지원 (requirements는 1.5 이상 허용)
+_MIXED_FORMAT_SUPPORTED = int(pd.__version__.split('.')[0]) >= 2
+
+
+def _to_datetime(values: pd.Series) -> pd.Series:
+    """일괄 datetime 변환 (형식 추론에 실패한 값만 개별 형식으로 다시 파싱)"""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    parsed = pd.to_datetime(values, errors='coerce')
+    retry = parsed.isna() & values.notna()
+    if retry.any():
+        if _MIXED_FORMAT_SUPPORTED:
+            parsed[retry] = pd.to_datetime(values[retry], errors='coerce', format='mixed')
+        else:
+            # pandas 1.x: format='mixed' 미지원 - 값마다 형식 추론
+            parsed[retry] = values[retry].map(lambda value: pd.to_datetime(value, errors='coerce'))
+    return parsed
+
+
+def _day_keys(timestamps: pd.Series) -> np.ndarray:
+    """datetime 컬럼을 YYYYMMDD 정수 배열로 변환"""
+    return (timestamps.dt.year * 10000 + timestamps.dt.month * 100
+            + timestamps.dt.day).to_numpy(dtype=np.int64)
+
+
+def _date_key(value: Union[date, datetime]) -> int:
+    """날짜를 YYYYMMDD 정수로 변환"""
+    return value.year * 10000 + value.month * 100 + value.day
+
+
+class EmployeeDayIndex:
+    """(사번, 날짜) 정렬 데이터와 직원-일자별 오프셋 인덱스"""
+
+    def __init__(self, data: pd.DataFrame, employee_column: str, timestamp_column: str):
+        """
+        Args:
+            data: 인덱스할 데이터 (사번은 정수로, 시각은 datetime으로 정규화됨)
+            employee_column: 사번 컬럼
+            timestamp_column: 날짜를 결정하는 시각 컬럼
+        """
+        employee_ids = pd.to_numeric(data[employee_column], errors='coerce')
+        timestamps = _to_datetime(data[timestamp_column])
+        valid = (employee_ids.notna() & timestamps.notna()
+                 & (employee_ids == np.floor(employee_ids))).to_numpy()
+
+        data = data[valid].copy()
+        data[employee_column] = employee_ids[valid].astype(np.int64).to_numpy()
+        data[timestamp_column] = timestamps[valid].to_numpy()
+
+        employee_keys = data[employee_column].to_numpy(dtype=np.int64)
+        day_keys = _day_keys(data[timestamp_column])
+
+        # 원본 행 순서를 유지하는 안정 정렬
+        order = np.lexsort((day_keys, employee_keys))
+        self.data = data.iloc[order].reset_index(drop=True)
+        employee_keys = employee_keys[order]
+        day_keys = day_keys[order]
+
+        # 직원-일자별 [start, end) 오프셋 테이블
+        if len(order):
+            changed = np.r_[True, (employee_keys[1:] != employee_keys[:-1])
+                            | (day_keys[1:] != day_keys[:-1])]
+            starts = np.flatnonzero(changed)
+            ends = np.append(starts[1:], len(order))
+            self.offsets: Dict[Tuple[int, int], Tuple[int, int]] = dict(zip(
+                zip(employee_keys[starts].tolist(), day_keys[starts].tolist()),
+                zip(starts.tolist(), ends.tolist())
+            ))
+        else:
+            self.offsets = {}
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def get(self, employee_id: Union[int, str], selected_date: Union[date, datetime]) -> pd.DataFrame:
+        """직원-일자 데이터 (정렬된 연속 구간 슬라이스, 없으면 빈 DataFrame)"""
+        start, end = self.offsets.get((int(employee_id), _date_key(selected_date)), (0, 0))
+        return self.data.iloc[start:end]
+
+
+def knox_tags_frame(name: str, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+    """Knox 원천 데이터 하나를 태그 형식으로 일괄 변환 (사번/시각 컬럼이 없으면 None)"""
+    employee_columns, time_columns, dr_no, dr_nm, tag_code, source = KNOX_TAG_SOURCES[name]
+    employee_column = _first_column(df, employee_columns)
+    time_column = _first_column(df, time_columns)
+    if employee_column is None or time_column is None:
+        logger.warning(f"{name}: 사번/시각 컬럼이 없어 태그로 변환하지 않습니다. 컬럼: {list(df.columns)}")
+        return None
+
+    timestamps = _to_datetime(df[time_column])
+    seconds = (timestamps.dt.hour * 10000 + timestamps.dt.minute * 100 + timestamps.dt.second)
+    tags = pd.DataFrame({
+        'ENTE_DT': timestamps.dt.year * 10000 + timestamps.dt.month * 100 + timestamps.dt.day,
+        '출입시각': seconds,
+        '사번': df[employee_column],
+        'DR_NO': dr_no,
+        'DR_NM': dr_nm,
+        'INOUT_GB': tag_code,
+        'datetime': timestamps,
+        'time': seconds.astype('Int64').astype(str).str.zfill(6),
+        'Tag_Code': tag_code,
+        'source': source,
+    }, index=df.index)
+
+    if name == 'knox_pims_data':
+        end_column = _first_column(df, ('종료일시_GMT+9', 'end_time'))
+        meeting_column = _first_column(df, ('일정ID', 'meeting_id'))
+        end_times = _to_datetime(df[end_column]) if end_column else pd.Series(pd.NaT, index=df.index)
+        tags['meeting_id'] = df[meeting_column] if meeting_column else ''
+        tags['knox_end_time'] = end_times
+        tags['knox_duration'] = (end_times - timestamps).dt.total_seconds() / 60
+
+    return tags[timestamps.notna().to_numpy()]
+
+
+def build_knox_tag_index(sources: Dict[str, Optional[pd.DataFrame]]) -> EmployeeDayIndex:
+    """
+    Knox 결재/PIMS/메일 데이터를 태그 형식으로 변환해 (사번, 날짜)로 인덱스
+
+    Args:
+        sources: 데이터 이름(KNOX_TAG_SOURCES 키) → 원천 DataFrame (없으면 None)
+    """
+    start = datetime.now()
+
+    frames: List[pd.DataFrame] = []
+    for name in KNOX_TAG_SOURCES:
+        df = sources.get(name)
+        if df is None or df.empty:
+            continue
+        tags = knox_tags_frame(name, df)
+        if tags is not None and not tags.empty:
+            frames.append(tags)
+
+    tags = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(
+        columns=['ENTE_DT', '출입시각', '사번', 'DR_NO', 'DR_NM', 'INOUT_GB', 'datetime', 'time',
+                 'Tag_Code', 'source'])
+    index = EmployeeDayIndex(tags, '사번', 'datetime')
+    index.data['ENTE_DT'] = index.data['ENTE_DT'].astype(np.int64)
+    index.data['출입시각'] = index.data['출입시각'].astype(np.int64)
+
+    build_time = (datetime.now() - start).total_seconds()
+    logger.info(f"Knox 태그 인덱스 생성 완료: {len(index):,}건, "
+                f"직원-일자 {len(index.offsets):,}개, {build_time:.3f}초")
+    return index
+
+
+def build_equipment_index(sources: Dict[str, Optional[pd.DataFrame]]) -> Dict[str, EmployeeDayIndex]:
+    """
+    장비 사용 데이터(LAMS/MES/EAM/통합본)를 원천별로 (employee_id, timestamp 날짜)로 인덱스
+
+    Args:
+        sources: 데이터 이름(EQUIPMENT_SOURCES 키) → 원천 DataFrame (없으면 None)
+    """
+    indexes = {}
+    for name, system_label in EQUIPMENT_SOURCES.items():
+        df = sources.get(name)
+        if df is None or df.empty:
+            continue
+        if 'employee_id' not in df.columns or 'timestamp' not in df.columns:
+            logger.warning(f"{name}: employee_id/timestamp 컬럼이 없어 인덱스하지 않습니다")
+            continue
+
+        if system_label is not None:
+            df = df.assign(system=system_label)
+        index = EmployeeDayIndex(df, 'employee_id', 'timestamp')
+        indexes[name] = index
+        logger.info(f"{name} 인덱스 생성 완료: {len(index):,}건, 직원-일자 {len(index.offsets):,}개")
+    return indexes
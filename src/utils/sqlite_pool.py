@@ -0,0 +1,141 @@
+"""
+읽기 전용 SQLite 연결 풀
+요청마다 연결을 열지 않고 WAL/mmap 설정이 적용된 연결을 재사용합니다.
+연결별 준비된 문장 캐시(cached_statements)로 같은 쿼리의 재파싱을 피하며,
+여러 스레드(API 스레드 풀)에서 동시에 읽을 수 있습니다.
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    import json
+    ORJSON_AVAILABLE = False
+
+from ..config.performance_settings import SQLITE_CACHED_STATEMENTS, SQLITE_MMAP_MB, SQLITE_POOL_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+def loads_json(value: Optional[Union[str, bytes]], default: Any = None) -> Any:
+    """JSON 컬럼 값 파싱 (비었거나 잘못된 값이면 default)"""
+    if not value:
+        return default
+    try:
+        return orjson.loads(value) if ORJSON_AVAILABLE else json.loads(value)
+    except ValueError:
+        return default
+
+
+class SQLiteReadPool:
+    """읽기 전용 SQLite 연결 풀"""
+
+    def __init__(self, db_path: Union[str, Path], size: int = SQLITE_POOL_SIZE,
+                 mmap_mb: int = SQLITE_MMAP_MB):
+        """
+        Args:
+            db_path: SQLite DB 경로
+            size: 최대 연결 수 (동시에 실행되는 쿼리 수 상한)
+            mmap_mb: 연결별 메모리 맵 크기 (MB)
+        """
+        self.db_path = Path(db_path)
+        self.size = size
+        self.mmap_bytes = mmap_mb * 1024 * 1024
+        self.logger = logging.getLogger(__name__)
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._opened = 0
+        self._lock = threading.Lock()
+        self._enable_wal()
+
+    def _enable_wal(self):
+        """WAL 모드 설정 (DB 파일에 유지되므로 한 번만, 쓰기 권한이 없으면 건너뜀)"""
+        if not self.db_path.exists():
+            self.logger.warning(f"DB 파일이 없습니다: {self.db_path}")
+            return
+        try:
+            conn = sqlite3.connect(str(self.db_path))
+            try:
+                mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+            finally:
+                conn.close()
+            self.logger.info(f"SQLite 연결 풀: {self.db_path.name} (journal_mode={mode}, 최대 {self.size}개)")
+        except sqlite3.Error as e:
+            self.logger.warning(f"WAL 모드 설정 실패, 기존 저널 모드로 읽습니다: {e}")
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True,
+                               check_same_thread=False, cached_statements=SQLITE_CACHED_STATEMENTS)
+        conn.execute(f"PRAGMA mmap_size={self.mmap_bytes}")
+        conn.execute("PRAGMA query_only=1")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-16384")
+        with self._lock:
+            self._opened += 1
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """풀에서 연결 대여 (모두 사용 중이면 반납될 때까지 대기)"""
+        self._slots.acquire()
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._open()
+
+            broken = False
+            try:
+                yield conn
+            except sqlite3.Error:
+                broken = True
+                raise
+            finally:
+                if broken:
+                    # 상태를 알 수 없는 연결은 버림
+                    conn.close()
+                    with self._lock:
+                        self._opened -= 1
+                else:
+                    self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    def fetch_all(self, sql: str, params: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+        """쿼리 결과를 레코드(dict) 리스트로 반환"""
+        with self.connection() as conn:
+            cursor = conn.execute(sql, params)
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def fetch_one(self, sql: str, params: Sequence[Any] = ()) -> Optional[Dict[str, Any]]:
+        """쿼리 결과의 첫 레코드 (없으면 None)"""
+        with self.connection() as conn:
+            cursor = conn.execute(sql, params)
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            return dict(zip([column[0] for column in cursor.description], row))
+
+    def close(self):
+        """대기 중인 연결 모두 닫기"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+
+    def stats(self) -> Dict[str, int]:
+        """열린 연결 수와 대기 중인 연결 수"""
+        return {'size': self.size, 'opened': self._opened, 'idle': self._idle.qsize()}
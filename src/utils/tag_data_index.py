@@ -0,0 +1,134 @@
+"""
+태그 데이터 인덱스
+원본 태그 데이터의 (사번, 시각) 정렬 순열과 직원별 오프셋 테이블만 유지하여
+직원/날짜/근무시간대 단위 조회를 전체 스캔 없이 연속 구간 슬라이스로 처리
+(원본 DataFrame은 복사하지 않음)
+"""
+
+import numpy as np
+import pandas as pd
+import logging
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+NS_PER_SECOND = 1_000_000_000
+
+
+def tag_timestamps_ns(ente_dt: np.ndarray, entry_time: np.ndarray) -> np.ndarray:
+    """
+    ENTE_DT(YYYYMMDD)와 출입시각(HHMMSS) 정수 배열을 epoch 나노초(int64)로 변환
+
+    문자열 파싱 없이 정수 연산만 사용하며, 날짜 변환은 고유 날짜에 대해서만 수행합니다.
+    """
+    ente_dt = np.asarray(ente_dt, dtype=np.int64)
+    entry_time = np.asarray(entry_time, dtype=np.int64)
+
+    unique_dates, inverse = np.unique(ente_dt, return_inverse=True)
+    years = unique_dates // 10000
+    months = (unique_dates // 100) % 100
+    days = unique_dates % 100
+    day_values = ((years - 1970).astype('datetime64[Y]').astype('datetime64[M]')
+                  + (months - 1)).astype('datetime64[D]') + (days - 1)
+    day_ns = day_values.astype('datetime64[ns]').astype(np.int64)
+
+    seconds = (entry_time // 10000) * 3600 + ((entry_time // 100) % 100) * 60 + entry_time % 100
+    return day_ns[inverse] + seconds * NS_PER_SECOND
+
+
+def _to_ns(value: Union[datetime, date, pd.Timestamp]) -> int:
+    """datetime/date 값을 epoch 나노초로 변환"""
+    return pd.Timestamp(value).value
+
+
+class TagDataIndex:
+    """원본 태그 데이터의 (사번, 시각) 정렬 순열과 직원별 오프셋 인덱스"""
+
+    def __init__(self, tag_data: pd.DataFrame):
+        """
+        Args:
+            tag_data: 사번, ENTE_DT, 출입시각 컬럼을 가진 원본 태그 데이터 (참조만 유지)
+        """
+        start = datetime.now()
+        self.source = tag_data
+
+        employee_ids = pd.to_numeric(tag_data['사번'], errors='coerce')
+        valid = (employee_ids.notna() & tag_data['ENTE_DT'].notna()
+                 & tag_data['출입시각'].notna()).to_numpy()
+        positions = np.flatnonzero(valid)
+
+        employee_ids = employee_ids.to_numpy()[positions].astype(np.int64)
+        timestamps = tag_timestamps_ns(tag_data['ENTE_DT'].to_numpy()[positions],
+                                       tag_data['출입시각'].to_numpy()[positions])
+
+        order = np.lexsort((timestamps, employee_ids))
+        self.employee_ids = employee_ids[order]
+        self.timestamps = timestamps[order]
+        # 정렬 순서의 원본 행 위치 (사번/날짜/시각이 없는 행 제외)
+        self.positions = positions[order]
+
+        # 직원별 [start, end) 오프셋 테이블
+        unique_ids, starts = np.unique(self.employee_ids, return_index=True)
+        ends = np.append(starts[1:], len(self.employee_ids))
+        self.offsets: Dict[int, Tuple[int, int]] = dict(
+            zip(unique_ids.tolist(), zip(starts.tolist(), ends.tolist()))
+        )
+
+        build_time = (datetime.now() - start).total_seconds()
+        logger.info(f"태그 데이터 인덱스 생성 완료: {len(self.positions):,}건, "
+                    f"직원 {len(self.offsets):,}명, {build_time:.3f}초")
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def employee_range(self, employee_id: Union[int, str]) -> Tuple[int, int]:
+        """직원의 [start, end) 행 범위 (없으면 (0, 0))"""
+        return self.offsets.get(int(employee_id), (0, 0))
+
+    def window_range(self, employee_id: Union[int, str], start_ns: int,
+                     end_ns: int) -> Tuple[int, int]:
+        """직원의 [start_ns, end_ns) 시간 구간에 해당하는 행 범위"""
+        emp_start, emp_end = self.employee_range(employee_id)
+        if emp_start == emp_end:
+            return emp_start, emp_start
+
+        block = self.timestamps[emp_start:emp_end]
+        lo = emp_start + int(np.searchsorted(block, start_ns, side='left'))
+        hi = emp_start + int(np.searchsorted(block, end_ns, side='left'))
+        return lo, hi
+
+    def get_window(self, employee_id: Union[int, str], start: datetime,
+                   end: datetime) -> pd.DataFrame:
+        """
+        직원의 [start, end) 구간 태그 데이터 (원본 행을 시각 순으로 가져와 datetime 컬럼 추가)
+
+        반환값은 원본과 분리된 DataFrame이며, 인덱스는 원본 태그 데이터의 행 라벨입니다.
+        """
+        lo, hi = self.window_range(employee_id, _to_ns(start), _to_ns(end))
+        window = self.source.iloc[self.positions[lo:hi]].copy()
+        window['datetime'] = pd.to_datetime(self.timestamps[lo:hi], unit='ns')
+        return window
+
+    def get_shift_window(self, employee_id: Union[int, str], selected_date: date,
+                         work_type: str = 'day_shift') -> pd.DataFrame:
+        """
+        근무 유형별 하루 구간 태그 데이터
+
+        - day_shift: 당일 00:00 ~ 익일 00:00
+        - night_shift: 전날 17:00 ~ 당일 12:00
+        """
+        if work_type == 'night_shift':
+            start = datetime.combine(selected_date - timedelta(days=1), time(17, 0))
+            end = datetime.combine(selected_date, time(12, 0))
+        else:
+            start = datetime.combine(selected_date, time(0, 0))
+            end = start + timedelta(days=1)
+        return self.get_window(employee_id, start, end)
+
+    def get_date_range(self, employee_id: Union[int, str], start_date: date,
+                       end_date: date) -> pd.DataFrame:
+        """직원의 start_date ~ end_date(포함) 태그 데이터"""
+        start = datetime.combine(pd.Timestamp(start_date).date(), time(0, 0))
+        end = datetime.combine(pd.Timestamp(end_date).date(), time(0, 0)) + timedelta(days=1)
+        return self.get_window(employee_id, start, end)
@@ -0,0 +1,69 @@
+"""
+확정적 규칙 엔진 배치 모드 테스트
+"""
+
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from src.tag_system.confidence_state import ActivityState
+from src.tag_system.rule_engine import DeterministicRuleEngine, RuleConfig, RULE_DEFINITIONS
+from src.tag_system.rule_integration import RuleIntegration
+from src.utils.time_normalizer import ShiftType
+
+
+@pytest.fixture
+def engine():
+    return DeterministicRuleEngine(RuleConfig())
+
+
+def test_office_shift_gate_is_transit_in_batch_and_scalar_paths(engine):
+    """출퇴근 시간대가 없는 근무 유형(OFFICE)의 출입문 태그는 경유 (KeyError 없음)"""
+    frame = pd.DataFrame({
+        'tag': ['T2', 'T3'],
+        'timestamp': [datetime(2025, 6, 2, 8, 0), datetime(2025, 6, 2, 20, 0)],
+        'is_entry_gate': [True, False],
+        'shift_type': [ShiftType.OFFICE, ShiftType.OFFICE],
+    })
+
+    result = engine.apply_rules_batch(frame)
+    states = result.to_states()
+
+    assert list(result.rule_names) == ['gate_transit', 'gate_transit']
+    assert [state.state for state in states] == [ActivityState.TRANSIT, ActivityState.TRANSIT]
+    assert list(result.confidence) == [state.confidence for state in states]
+
+
+def test_classify_tag_sequence_with_office_employee():
+    integration = RuleIntegration(use_json_config=False)
+    tags = [
+        {'tag': 'T2', 'timestamp': datetime(2025, 6, 2, 8, 0)},
+        {'tag': 'G1', 'timestamp': datetime(2025, 6, 2, 8, 10)},
+    ]
+
+    states = integration.classify_tag_sequence(tags, employee_info={'shift_type': 'office'})
+
+    assert states[0].state == ActivityState.TRANSIT
+
+
+def test_batch_matches_rule_functions(engine):
+    """결정 테이블의 상태/신뢰도/가중치가 규칙 함수 결과와 같음"""
+    frame = pd.DataFrame({
+        'tag': ['T2', 'G2', 'O', 'G1', 'M1', 'M2', 'N2', 'G3', 'G4', 'N1', 'T1', 'T3'],
+        'previous_tag': [None, 'T2', 'G2', 'O', 'G1', 'M1', 'M2', 'N2', 'G3', 'G4', 'N1', 'T1'],
+        'timestamp': pd.date_range('2025-06-02 07:30', periods=12, freq='45min'),
+        'duration_minutes': [0, 10, 45, 45, 45, 45, 45, 45, 70, 45, 1, 45],
+        'shift_type': [ShiftType.DAY] * 12,
+    })
+
+    result = engine.apply_rules_batch(frame)
+
+    for position, state in enumerate(result.to_states()):
+        if state is None:
+            assert result.rule_index[position] < 0
+            continue
+        rule = result.rules[result.rule_index[position]]
+        assert state.state.value == result.states[position]
+        assert state.confidence == result.confidence[position]
+        assert state.evidence[0].weight == rule.weight == RULE_DEFINITIONS[rule.name][1]